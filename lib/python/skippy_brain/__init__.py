@@ -23,7 +23,9 @@ from .brain import Brain
 from .collectors import SystemCollector, AppCollector, ClaudeCollector
 from .patterns import PatternEngine
 from .prevention import PreventionGenerator
+from .store import EventStore
+from .tailer import LogTailer
 
-__version__ = "1.0.0"
+__version__ = "1.1.0"
 __all__ = ["Brain", "SystemCollector", "AppCollector", "ClaudeCollector",
-           "PatternEngine", "PreventionGenerator"]
+           "PatternEngine", "PreventionGenerator", "EventStore", "LogTailer"]
@@ -12,6 +12,8 @@ from typing import Optional
 from .collectors import SystemCollector, AppCollector, ClaudeCollector, LogEvent
 from .patterns import PatternEngine, Pattern
 from .prevention import PreventionGenerator, PreventionRule
+from .store import EventStore
+from .tailer import LogTailer
 
 
 class Brain:
@@ -21,6 +23,11 @@ class Brain:
     Aggregates logs from all sources, detects patterns, and
     auto-generates prevention rules.
 
+    With incremental=True (the default) log files are tailed from
+    checkpointed offsets, so each ingest only reads and stores events
+    appended since the previous one. Events go to a day-partitioned
+    EventStore and the in-memory window is capped at max_events.
+
     Usage:
         brain = Brain()
         brain.ingest_all()
@@ -29,9 +36,12 @@ class Brain:
         brain.get_report()
     """
 
-    def __init__(self, data_dir: Optional[Path] = None):
+    def __init__(self, data_dir: Optional[Path] = None, incremental: bool = True,
+                 max_events: int = 50000, retention_days: int = 14):
         self.data_dir = data_dir or Path("/home/dave/skippy/.claude/learning")
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.incremental = incremental
+        self.max_events = max_events
 
         # Initialize components
         self.system_collector = SystemCollector()
@@ -45,9 +55,23 @@ class Brain:
         self.state_file = self.data_dir / "brain_state.json"
         self.events: list[LogEvent] = []
 
+        # Incremental ingestion
+        self.tailer: Optional[LogTailer] = None
+        self.event_store: Optional[EventStore] = None
+        if incremental:
+            self.tailer = LogTailer(self.data_dir / "tail_checkpoints.json")
+            self.event_store = EventStore(
+                self.data_dir / "events",
+                retention_days=retention_days,
+                max_events=max_events,
+            )
+            for collector in (self.system_collector, self.app_collector, self.claude_collector):
+                collector.tailer = self.tailer
+
         # State
         self.last_ingest: Optional[datetime] = None
         self.last_analysis: Optional[datetime] = None
+        self.next_seq = 0
 
         # Load persisted state
         self._load_state()
@@ -57,11 +81,14 @@ class Brain:
         Ingest logs from all sources.
 
         Args:
-            since: Only collect logs since this time. Defaults to 24 hours ago.
+            since: Only collect logs since this time. Defaults to the last
+                ingest in incremental mode, otherwise 24 hours ago.
 
         Returns:
-            Dictionary with ingestion statistics.
+            Dictionary with ingestion statistics for the newly collected events.
         """
+        if since is None and self.incremental and self.last_ingest:
+            since = self.last_ingest
         since = since or datetime.now() - timedelta(hours=24)
         stats = {
             "system": 0,
@@ -73,34 +100,52 @@ class Brain:
         }
 
         # Collect from all sources
+        new_events: list[LogEvent] = []
         try:
             system_events = self.system_collector.collect(since)
             stats["system"] = len(system_events)
-            self.events.extend(system_events)
+            new_events.extend(system_events)
         except Exception as e:
             stats["system_error"] = str(e)
 
         try:
             app_events = self.app_collector.collect(since)
             stats["app"] = len(app_events)
-            self.events.extend(app_events)
+            new_events.extend(app_events)
         except Exception as e:
             stats["app_error"] = str(e)
 
         try:
             claude_events = self.claude_collector.collect(since)
             stats["claude"] = len(claude_events)
-            self.events.extend(claude_events)
+            new_events.extend(claude_events)
         except Exception as e:
             stats["claude_error"] = str(e)
 
         # Calculate totals
-        stats["total"] = len(self.events)
-        stats["errors"] = len([e for e in self.events if e.level in ("error", "critical")])
-        stats["warnings"] = len([e for e in self.events if e.level == "warning"])
-
-        # Save events and state
-        self._save_events()
+        stats["total"] = len(new_events)
+        stats["errors"] = len([e for e in new_events if e.level in ("error", "critical")])
+        stats["warnings"] = len([e for e in new_events if e.level == "warning"])
+
+        # Number events in ingest order so pattern watermarks do not depend
+        # on timestamps; the counter is saved first so numbers never repeat
+        for event in new_events:
+            event.seq = self.next_seq
+            self.next_seq += 1
+        if new_events:
+            self._save_state()
+
+        self.events.extend(new_events)
+        if len(self.events) > self.max_events:
+            self.events = self.events[-self.max_events:]
+
+        # Save events, then advance checkpoints so nothing is skipped on failure
+        if self.event_store is not None:
+            self.event_store.append(new_events)
+            self.event_store.prune()
+            self.tailer.commit()
+        else:
+            self._save_events()
         self.last_ingest = datetime.now()
         self._save_state()
 
@@ -286,6 +331,7 @@ class Brain:
         state = {
             "last_ingest": self.last_ingest.isoformat() if self.last_ingest else None,
             "last_analysis": self.last_analysis.isoformat() if self.last_analysis else None,
+            "next_seq": self.next_seq,
         }
         self.state_file.write_text(json.dumps(state, indent=2))
 
@@ -299,29 +345,35 @@ class Brain:
                 self.last_ingest = datetime.fromisoformat(state["last_ingest"])
             if state.get("last_analysis"):
                 self.last_analysis = datetime.fromisoformat(state["last_analysis"])
+            self.next_seq = state.get("next_seq", 0)
         except Exception:
             pass
 
     def _load_events(self):
-        """Load events from JSONL file."""
+        """Load events from the event store (and legacy JSONL file)."""
         self.events = []
-        if not self.events_file.exists():
-            return
-
-        try:
-            with open(self.events_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        self.events.append(LogEvent(**data))
-        except Exception:
-            pass
+        if self.events_file.exists():
+            try:
+                with open(self.events_file, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            data = json.loads(line)
+                            self.events.append(LogEvent(**data))
+            except Exception:
+                pass
+
+        if self.event_store is not None:
+            self.events.extend(self.event_store.load())
+        if len(self.events) > self.max_events:
+            self.events = self.events[-self.max_events:]
 
     def clear_events(self):
         """Clear all stored events."""
         self.events = []
         if self.events_file.exists():
             self.events_file.unlink()
+        if self.event_store is not None:
+            self.event_store.clear()
 
     def get_recent_errors(self, limit: int = 20) -> list[LogEvent]:
         """Get most recent error events."""
@@ -6,6 +6,7 @@ import json
 import os
 import re
 import subprocess
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Iterator, Optional
@@ -21,6 +22,7 @@ class LogEvent:
     level: str  # info, warning, error, critical
     message: str
     metadata: dict = None
+    seq: Optional[int] = None  # ingest order, assigned by Brain
 
     def to_dict(self):
         return asdict(self)
@@ -34,6 +36,37 @@ class BaseCollector:
 
     def __init__(self):
         self.events = []
+        # Optional LogTailer; when set, only lines appended since the last
+        # committed checkpoint are read from each log file.
+        self.tailer = None
+
+    @contextmanager
+    def _open_lines(self, path: Path):
+        """Open a log file for line iteration (tail-aware)."""
+        if self.tailer is not None:
+            yield self.tailer.read_new_lines(path)
+            return
+        with open(path, 'r', errors='replace') as f:
+            yield f
+
+    def _in_window(self, ts: datetime, since: datetime) -> bool:
+        """
+        Check whether a parsed line falls inside the collection window.
+
+        Tailed lines are new by byte offset, even when a late writer stamps
+        them with an older time, so only full re-reads filter on `since`.
+        """
+        return self.tailer is not None or ts >= since
+
+    def _cap(self, events: list[LogEvent], limit: int) -> list[LogEvent]:
+        """
+        Keep the last `limit` events of a full re-read.
+
+        Incremental reads only contain new lines, so nothing is dropped.
+        """
+        if self.tailer is not None:
+            return events
+        return events[-limit:]
 
     def collect(self, since: Optional[datetime] = None) -> list[LogEvent]:
         """Collect logs since given time. Override in subclasses."""
@@ -118,7 +151,7 @@ class SystemCollector(BaseCollector):
             return events
 
         try:
-            with open(auth_log, 'r', errors='replace') as f:
+            with self._open_lines(auth_log) as f:
                 for line in f:
                     # Parse syslog format: "Jan 24 17:20:01 hostname ..."
                     match = re.match(r'^(\w+\s+\d+\s+[\d:]+)\s+\S+\s+(.+)$', line)
@@ -142,7 +175,7 @@ class SystemCollector(BaseCollector):
                             ))
         except PermissionError:
             pass
-        return events[-100:]  # Last 100 events
+        return self._cap(events, 100)  # Last 100 events
 
     def _collect_fail2ban(self, since: datetime) -> list[LogEvent]:
         """Collect from fail2ban.log."""
@@ -152,7 +185,7 @@ class SystemCollector(BaseCollector):
             return events
 
         try:
-            with open(fail2ban_log, 'r', errors='replace') as f:
+            with self._open_lines(fail2ban_log) as f:
                 for line in f:
                     if "Ban" in line or "Unban" in line:
                         # Parse: "2026-01-23 12:52:01,234 fail2ban.actions ..."
@@ -168,7 +201,7 @@ class SystemCollector(BaseCollector):
                             ))
         except PermissionError:
             pass
-        return events[-50:]
+        return self._cap(events, 50)
 
 
 class AppCollector(BaseCollector):
@@ -207,7 +240,7 @@ class AppCollector(BaseCollector):
             return events
 
         try:
-            with open(log_file, 'r', errors='replace') as f:
+            with self._open_lines(log_file) as f:
                 for line in f:
                     # Parse: "[2026-01-24 12:00:00] ERROR: message"
                     match = re.match(r'^\[([\d-]+\s+[\d:]+)\]\s+(\w+):\s*(.+)$', line)
@@ -223,7 +256,7 @@ class AppCollector(BaseCollector):
                             ))
         except Exception:
             pass
-        return events[-100:]
+        return self._cap(events, 100)
 
     def _collect_mcp_logs(self, since: datetime) -> list[LogEvent]:
         """Collect MCP server logs."""
@@ -234,7 +267,7 @@ class AppCollector(BaseCollector):
 
         for log_file in mcp_log_dir.glob("*.log"):
             try:
-                with open(log_file, 'r', errors='replace') as f:
+                with self._open_lines(log_file) as f:
                     for line in f:
                         if "error" in line.lower() or "fail" in line.lower():
                             events.append(LogEvent(
@@ -247,7 +280,7 @@ class AppCollector(BaseCollector):
                             ))
             except Exception:
                 pass
-        return events[-50:]
+        return self._cap(events, 50)
 
     def _collect_wordpress_log(self, since: datetime) -> list[LogEvent]:
         """Collect WordPress backup/operation logs."""
@@ -257,7 +290,7 @@ class AppCollector(BaseCollector):
             return events
 
         try:
-            with open(log_file, 'r', errors='replace') as f:
+            with self._open_lines(log_file) as f:
                 for line in f:
                     if "error" in line.lower() or "fail" in line.lower():
                         events.append(LogEvent(
@@ -269,7 +302,7 @@ class AppCollector(BaseCollector):
                         ))
         except Exception:
             pass
-        return events[-50:]
+        return self._cap(events, 50)
 
     def _collect_maintenance_logs(self, since: datetime) -> list[LogEvent]:
         """Collect maintenance/cron logs."""
@@ -279,7 +312,7 @@ class AppCollector(BaseCollector):
             return events
 
         try:
-            with open(log_file, 'r', errors='replace') as f:
+            with self._open_lines(log_file) as f:
                 for line in f:
                     if "error" in line.lower() or "fail" in line.lower():
                         events.append(LogEvent(
@@ -291,7 +324,7 @@ class AppCollector(BaseCollector):
                         ))
         except Exception:
             pass
-        return events[-20:]
+        return self._cap(events, 20)
 
     def _collect_gmail_monitor_logs(self, since: datetime) -> list[LogEvent]:
         """Collect Gmail alert monitor logs (ebon server alerts, system notifications)."""
@@ -301,14 +334,14 @@ class AppCollector(BaseCollector):
             return events
 
         try:
-            with open(log_file, 'r', errors='replace') as f:
+            with self._open_lines(log_file) as f:
                 for line in f:
                     # Parse: "[2026-01-25 12:44:17] [INFO] message"
                     match = re.match(r'^\[([\d-]+\s+[\d:]+)\]\s+\[(\w+)\]\s*(.+)$', line)
                     if match:
                         ts_str, level, message = match.groups()
                         ts = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                        if ts >= since and level.upper() in ("ERROR", "WARNING"):
+                        if self._in_window(ts, since) and level.upper() in ("ERROR", "WARNING"):
                             events.append(LogEvent(
                                 timestamp=ts.isoformat(),
                                 source="app",
@@ -318,7 +351,7 @@ class AppCollector(BaseCollector):
                             ))
         except Exception:
             pass
-        return events[-50:]
+        return self._cap(events, 50)
 
 
 class ClaudeCollector(BaseCollector):
@@ -377,7 +410,7 @@ class ClaudeCollector(BaseCollector):
             if not log_file.exists():
                 continue
             try:
-                with open(log_file, 'r', errors='replace') as f:
+                with self._open_lines(log_file) as f:
                     for line in f:
                         # Parse: "[2026-01-24 17:00:00] BLOCKED: ..."
                         match = re.match(r'^\[([\d-]+\s+[\d:]+)\]\s+(\w+):\s*(.+)$', line)
@@ -392,7 +425,7 @@ class ClaudeCollector(BaseCollector):
                             ))
             except Exception:
                 pass
-        return events[-50:]
+        return self._cap(events, 50)
 
     def _collect_session_logs(self, since: datetime) -> list[LogEvent]:
         """Collect session cleanup logs."""
@@ -402,7 +435,7 @@ class ClaudeCollector(BaseCollector):
             return events
 
         try:
-            with open(log_file, 'r', errors='replace') as f:
+            with self._open_lines(log_file) as f:
                 for line in f:
                     if "error" in line.lower() or "warning" in line.lower():
                         events.append(LogEvent(
@@ -414,7 +447,7 @@ class ClaudeCollector(BaseCollector):
                         ))
         except Exception:
             pass
-        return events[-20:]
+        return self._cap(events, 20)
 
     def _collect_email_logs(self, since: datetime) -> list[LogEvent]:
         """Collect email audit logs."""
@@ -424,7 +457,7 @@ class ClaudeCollector(BaseCollector):
             return events
 
         try:
-            with open(log_file, 'r', errors='replace') as f:
+            with self._open_lines(log_file) as f:
                 for line in f:
                     match = re.match(r'^\[([\d-]+\s+[\d:]+)\]\s+EMAIL:\s*(.+)$', line)
                     if match:
@@ -438,7 +471,7 @@ class ClaudeCollector(BaseCollector):
                         ))
         except Exception:
             pass
-        return events[-20:]
+        return self._cap(events, 20)
 
     def _collect_learning_logs(self, since: datetime) -> list[LogEvent]:
         """Collect skippy-learn issues."""
@@ -448,7 +481,7 @@ class ClaudeCollector(BaseCollector):
             return events
 
         try:
-            with open(issues_file, 'r') as f:
+            with self._open_lines(issues_file) as f:
                 for line in f:
                     try:
                         issue = json.loads(line)
@@ -3,12 +3,45 @@ Pattern Detection Engine - Find recurring issues and correlations.
 """
 
 import json
+import os
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
+
+
+# Message normalizers, applied in order (numbers, paths, hashes)
+_NORMALIZERS = [
+    (re.compile(r'\d+'), 'N'),
+    (re.compile(r'/[\w/.-]+'), '/PATH'),
+    (re.compile(r'\b[a-f0-9]{8,}\b'), 'HASH'),
+]
+
+
+def _is_new(event, watermark: Optional[str], watermark_seq: Optional[int]) -> bool:
+    """
+    Whether an event comes after the newest one already consumed.
+
+    Events carry the ingest sequence number Brain assigns, so an event
+    stamped earlier than its predecessors (a late writer, a drained rotated
+    file) still counts once. Events without one (stored before sequence
+    numbers existed, or fed in directly) fall back to their timestamp.
+    """
+    seq = getattr(event, "seq", None)
+    if seq is not None:
+        return watermark_seq is None or seq > watermark_seq
+    return watermark is None or (event.timestamp or "") > watermark
+
+
+@lru_cache(maxsize=16384)
+def normalize_message(message: str) -> str:
+    """Mask variable parts of a log message (cached: messages repeat a lot)."""
+    for regex, replacement in _NORMALIZERS:
+        message = regex.sub(replacement, message)
+    return message
 
 
 @dataclass
@@ -28,15 +61,315 @@ class Pattern:
         return asdict(self)
 
 
-class PatternEngine:
-    """Detect patterns in collected log events."""
+@dataclass
+class LogCluster:
+    """A message template mined from similar log messages."""
+    cluster_id: int
+    template: list[str]
+    path: list[str] = field(default_factory=list)  # Tree route it is stored under
+    size: int = 0
+
+    @property
+    def template_str(self) -> str:
+        return " ".join(self.template)
+
+
+class _TreeNode:
+    __slots__ = ("children", "clusters")
 
     def __init__(self):
+        self.children: dict[str, "_TreeNode"] = {}
+        self.clusters: list[int] = []
+
+
+class TemplateMiner:
+    """
+    Drain-style online template miner.
+
+    Messages are normalized and tokenized, then routed through a tree of
+    fixed depth: token count first, then the leading tokens. Only the few
+    clusters in the reached leaf are compared with the message, so each
+    message is grouped in roughly constant time regardless of how many
+    templates exist. Positions where merged messages differ become "<*>".
+    Messages seen before are resolved from a bounded exact-match cache.
+    Cluster sizes are cumulative; `watermark_seq` (or `watermark`, the
+    timestamp, for events without a sequence number) marks the newest event
+    already counted, so re-fed events are grouped without being recounted.
+
+    Usage:
+        miner = TemplateMiner()
+        cluster = miner.add("Connection to 10.0.0.1 timed out")
+        print(cluster.template_str)
+    """
+
+    WILDCARD = "<*>"
+    _has_digit = re.compile(r'\d').search
+
+    def __init__(self, depth: int = 4, similarity: float = 0.5,
+                 max_children: int = 100, max_clusters: int = 10000,
+                 cache_size: int = 65536):
+        """
+        Args:
+            depth: Tree depth counting the root, token-count and leaf levels.
+            similarity: Fraction of equal tokens needed to join a cluster.
+            max_children: Fan-out per node before tokens route to "<*>".
+            max_clusters: New templates are not created beyond this.
+            cache_size: Distinct raw messages remembered (0 disables).
+        """
+        self.depth = max(depth, 3)
+        self.similarity = similarity
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.root = _TreeNode()
+        self.clusters: dict[int, LogCluster] = {}
+        self._next_id = 1
+        self.cache_size = cache_size
+        self._message_cache: dict[str, int] = {}
+        self.watermark: Optional[str] = None
+        self.watermark_seq: Optional[int] = None
+
+    def _route(self, tokens: list[str]) -> list[str]:
+        """Tree path for a token list: length, then leading tokens."""
+        path = [str(len(tokens))]
+        for token in tokens[:self.depth - 3]:
+            path.append(self.WILDCARD if self._has_digit(token) else token)
+        return path
+
+    def _find_leaf(self, path: list[str]) -> Optional[_TreeNode]:
+        node = self.root
+        for token in path:
+            child = node.children.get(token) or node.children.get(self.WILDCARD)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def _make_leaf(self, path: list[str]) -> _TreeNode:
+        node = self.root
+        for i, token in enumerate(path):
+            child = node.children.get(token)
+            if child is None:
+                # The token-count level is never collapsed
+                if i > 0 and len(node.children) >= self.max_children:
+                    token = self.WILDCARD
+                child = node.children.setdefault(token, _TreeNode())
+            node = child
+        return node
+
+    def _best_match(self, leaf: _TreeNode, tokens: list[str]) -> Optional[LogCluster]:
+        best, best_score = None, -1.0
+        for cluster_id in leaf.clusters:
+            cluster = self.clusters[cluster_id]
+            if cluster.template == tokens:
+                return cluster
+            equal = sum(map(str.__eq__, cluster.template, tokens))
+            score = equal / len(tokens) if tokens else 1.0
+            if score > best_score:
+                best, best_score = cluster, score
+        if best is not None and best_score >= self.similarity:
+            return best
+        return None
+
+    def add(self, message: str, count: bool = True) -> Optional[LogCluster]:
+        """
+        Assign a message to a cluster, creating or generalizing one.
+
+        Args:
+            message: Raw log message.
+            count: Add the message to the cluster size (False for events
+                already counted by an earlier pass).
+
+        Returns None only when the message matches nothing and the
+        cluster limit has been reached.
+        """
+        # Templates only ever generalize, so a known message keeps its cluster
+        cluster_id = self._message_cache.get(message)
+        if cluster_id is not None:
+            cluster = self.clusters[cluster_id]
+            cluster.size += count
+            return cluster
+
+        tokens = normalize_message(message).split()
+        path = self._route(tokens)
+
+        leaf = self._find_leaf(path)
+        cluster = self._best_match(leaf, tokens) if leaf is not None else None
+        if cluster is not None:
+            if cluster.template != tokens:
+                cluster.template = [
+                    t if t == m else self.WILDCARD for t, m in zip(cluster.template, tokens)
+                ]
+            cluster.size += count
+        else:
+            if len(self.clusters) >= self.max_clusters:
+                return None
+            cluster = LogCluster(cluster_id=self._next_id, template=tokens, path=path,
+                                 size=int(count))
+            self._next_id += 1
+            self.clusters[cluster.cluster_id] = cluster
+            self._make_leaf(path).clusters.append(cluster.cluster_id)
+
+        if self.cache_size:
+            if len(self._message_cache) >= self.cache_size:
+                self._message_cache.clear()
+            self._message_cache[message] = cluster.cluster_id
+        return cluster
+
+    def to_dict(self) -> dict:
+        return {
+            "next_id": self._next_id,
+            "watermark": self.watermark,
+            "watermark_seq": self.watermark_seq,
+            "clusters": [asdict(c) for c in self.clusters.values()],
+        }
+
+    def load_dict(self, data: dict):
+        """Restore clusters saved by to_dict() and rebuild the tree."""
+        self.root = _TreeNode()
+        self.clusters = {}
+        self._message_cache = {}
+        for item in data.get("clusters", []):
+            cluster = LogCluster(**item)
+            self.clusters[cluster.cluster_id] = cluster
+            self._make_leaf(cluster.path).clusters.append(cluster.cluster_id)
+        self._next_id = data.get("next_id", len(self.clusters) + 1)
+        self.watermark = data.get("watermark")
+        self.watermark_seq = data.get("watermark_seq")
+
+
+class CoOccurrenceCounter:
+    """
+    Streaming "A precedes B" counts for error/warning events.
+
+    Events are consumed in time order once (anything at or before the
+    watermark of a previous run is skipped; see _is_new). An event stamped
+    earlier than the current window is paired with that window. A deque holds the events of
+    the last `window_seconds`, with a Counter of their category:level keys,
+    so each new event is paired with the distinct keys that preceded it in
+    the window instead of scanning neighbouring events. Counts are kept
+    per day and dropped after `retention_days`.
+    """
+
+    LEVELS = ('error', 'warning')
+
+    def __init__(self, window_seconds: int = 300, retention_days: int = 7):
+        self.window_seconds = window_seconds
+        self.retention_days = retention_days
+        self.window: deque = deque()  # (epoch seconds, category, "category:level")
+        self.window_keys: Counter = Counter()  # (category, "category:level") -> events
+        self.daily_counts: dict[str, Counter] = {}  # day -> (key_a, key_b) -> count
+        self.watermark: Optional[str] = None
+        self.watermark_seq: Optional[int] = None
+
+    def update(self, events: list) -> int:
+        """Feed events newer than the watermark. Returns events consumed."""
+        fresh = []
+        newest, newest_seq = self.watermark, self.watermark_seq
+        for event in events:
+            if event.level not in self.LEVELS:
+                continue
+            if not _is_new(event, self.watermark, self.watermark_seq):
+                continue
+            try:
+                dt = datetime.fromisoformat(event.timestamp.replace('Z', '+00:00'))
+            except (TypeError, ValueError):
+                continue
+            fresh.append((dt.timestamp(), event.timestamp, event.category,
+                          f"{event.category}:{event.level}"))
+            seq = getattr(event, "seq", None)
+            if seq is not None:
+                newest_seq = seq if newest_seq is None else max(newest_seq, seq)
+            else:
+                newest = max(newest or "", event.timestamp)
+
+        fresh.sort()
+        window, window_keys = self.window, self.window_keys
+        for ts, ts_str, category, key in fresh:
+            while window and window[0][0] < ts - self.window_seconds:
+                _, old_category, old_key = window.popleft()
+                entry = (old_category, old_key)
+                window_keys[entry] -= 1
+                if window_keys[entry] <= 0:
+                    del window_keys[entry]
+
+            day = ts_str[:10]
+            counts = self.daily_counts.get(day)
+            if counts is None:
+                counts = self.daily_counts[day] = Counter()
+            counts.update([(prev_key, key) for prev_category, prev_key in window_keys
+                           if prev_category != category])
+
+            window.append((ts, category, key))
+            window_keys[(category, key)] += 1
+
+        if fresh:
+            self.watermark, self.watermark_seq = newest, newest_seq
+            self._prune()
+        return len(fresh)
+
+    def _prune(self):
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for day in [d for d in self.daily_counts if d < cutoff]:
+            del self.daily_counts[day]
+
+    def totals(self) -> Counter:
+        """Counts summed over the retained days, keyed "a:level -> b:level"."""
+        total = Counter()
+        for counts in self.daily_counts.values():
+            total.update(counts)
+        return Counter({f"{a} -> {b}": n for (a, b), n in total.items()})
+
+    def to_dict(self) -> dict:
+        return {
+            "watermark": self.watermark,
+            "watermark_seq": self.watermark_seq,
+            "window": list(self.window),
+            "daily_counts": {
+                day: {f"{a} -> {b}": n for (a, b), n in counts.items()}
+                for day, counts in self.daily_counts.items()
+            },
+        }
+
+    def load_dict(self, data: dict):
+        self.watermark = data.get("watermark")
+        self.watermark_seq = data.get("watermark_seq")
+        self.window = deque(tuple(item) for item in data.get("window", []))
+        self.window_keys = Counter((c, k) for _, c, k in self.window)
+        self.daily_counts = {
+            day: Counter({tuple(pair.split(" -> ", 1)): n for pair, n in counts.items()})
+            for day, counts in data.get("daily_counts", {}).items()
+        }
+
+
+class PatternEngine:
+    """
+    Detect patterns in collected log events.
+
+    Message grouping uses a TemplateMiner and correlations a
+    CoOccurrenceCounter; both are saved next to the patterns file so
+    templates stay stable and correlation counts accumulate across runs.
+    """
+
+    def __init__(self, window_minutes: int = 5, retention_days: int = 7):
         self.patterns_file = Path("/home/dave/skippy/.claude/learning/detected_patterns.json")
         self.patterns_file.parent.mkdir(parents=True, exist_ok=True)
+        self.miner = TemplateMiner()
+        self.cooccurrence = CoOccurrenceCounter(
+            window_seconds=window_minutes * 60,
+            retention_days=retention_days,
+        )
+        self._state_loaded = False
+
+    @property
+    def state_file(self) -> Path:
+        """Streaming state (templates, co-occurrence counts)."""
+        return self.patterns_file.with_name("pattern_state.json")
 
     def analyze(self, events: list) -> list[Pattern]:
         """Analyze events and detect patterns."""
+        if not self._state_loaded:
+            self._load_state()
+
         patterns = []
 
         # Group by message similarity
@@ -56,21 +389,45 @@ class PatternEngine:
 
         # Save patterns
         self._save_patterns(patterns)
+        self._save_state()
 
         return patterns
 
     def _group_similar_messages(self, events: list) -> dict:
-        """Group events by similar message content."""
-        groups = defaultdict(list)
+        """
+        Group events by mined message template.
+
+        Cluster sizes are updated as events are assigned; events at or
+        before the miner watermark were counted by an earlier pass and are
+        only grouped.
+        """
+        by_cluster = defaultdict(list)
+        overflow = defaultdict(list)
+        watermark, watermark_seq = self.miner.watermark, self.miner.watermark_seq
+        newest, newest_seq = watermark, watermark_seq
 
         for event in events:
-            # Normalize message (remove numbers, paths, timestamps)
-            normalized = re.sub(r'\d+', 'N', event.message)
-            normalized = re.sub(r'/[\w/.-]+', '/PATH', normalized)
-            normalized = re.sub(r'\b[a-f0-9]{8,}\b', 'HASH', normalized)
-            normalized = normalized[:100]  # First 100 chars as key
-
-            groups[normalized].append(event)
+            fresh = _is_new(event, watermark, watermark_seq)
+            if fresh:
+                seq = getattr(event, "seq", None)
+                if seq is not None:
+                    newest_seq = seq if newest_seq is None else max(newest_seq, seq)
+                elif newest is None or (event.timestamp or "") > newest:
+                    newest = event.timestamp or ""
+            cluster = self.miner.add(event.message, count=fresh)
+            if cluster is not None:
+                by_cluster[cluster.cluster_id].append(event)
+            else:
+                overflow[normalize_message(event.message)[:100]].append(event)
+
+        self.miner.watermark, self.miner.watermark_seq = newest, newest_seq
+
+        # Key by final template (templates generalize while events are added)
+        groups = defaultdict(list)
+        for cluster_id, cluster_events in by_cluster.items():
+            groups[self.miner.clusters[cluster_id].template_str[:100]].extend(cluster_events)
+        for key, overflow_events in overflow.items():
+            groups[key].extend(overflow_events)
 
         return groups
 
@@ -110,10 +467,14 @@ class PatternEngine:
         # Group by hour of day
         hour_groups = defaultdict(list)
         for event in events:
+            # ISO timestamps carry the hour at [11:13]; avoid a full parse
+            ts = event.timestamp
+            if len(ts) >= 13 and ts[10] == 'T' and ts[11:13].isdigit():
+                hour_groups[int(ts[11:13])].append(event)
+                continue
             try:
-                dt = datetime.fromisoformat(event.timestamp.replace('Z', '+00:00'))
-                hour = dt.hour
-                hour_groups[hour].append(event)
+                dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+                hour_groups[dt.hour].append(event)
             except:
                 continue
 
@@ -136,29 +497,14 @@ class PatternEngine:
         return patterns
 
     def _detect_correlations(self, events: list) -> list[Pattern]:
-        """Find events that correlate (A happens before B)."""
+        """Find events that correlate (A happens before B within the window)."""
         patterns = []
 
-        # Sort by timestamp
-        try:
-            sorted_events = sorted(events, key=lambda e: e.timestamp)
-        except:
-            return patterns
-
-        # Look for A -> B patterns within 5 minutes
-        correlations = defaultdict(int)
-        for i, event_a in enumerate(sorted_events):
-            if event_a.level not in ('error', 'warning'):
-                continue
-            for event_b in sorted_events[i+1:i+20]:  # Next 20 events
-                if event_b.level not in ('error', 'warning'):
-                    continue
-                if event_a.category != event_b.category:
-                    key = f"{event_a.category}:{event_a.level} -> {event_b.category}:{event_b.level}"
-                    correlations[key] += 1
+        # Only events newer than the previous run are counted
+        self.cooccurrence.update(events)
 
         # Report correlations that happen 3+ times
-        for correlation, count in correlations.items():
+        for correlation, count in self.cooccurrence.totals().items():
             if count >= 3:
                 parts = correlation.split(" -> ")
                 patterns.append(Pattern(
@@ -237,6 +583,33 @@ class PatternEngine:
         }
         self.patterns_file.write_text(json.dumps(data, indent=2))
 
+    def _save_state(self):
+        """Persist miner templates and co-occurrence counts."""
+        state = {
+            "last_updated": datetime.now().isoformat(),
+            "miner": self.miner.to_dict(),
+            "cooccurrence": self.cooccurrence.to_dict(),
+        }
+        tmp = self.state_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.state_file)
+
+    def _load_state(self):
+        """Load streaming state saved by a previous run."""
+        self._state_loaded = True
+        if not self.state_file.exists():
+            return
+        try:
+            state = json.loads(self.state_file.read_text())
+            self.miner.load_dict(state.get("miner", {}))
+            self.cooccurrence.load_dict(state.get("cooccurrence", {}))
+        except Exception:
+            self.miner = TemplateMiner()
+            self.cooccurrence = CoOccurrenceCounter(
+                window_seconds=self.cooccurrence.window_seconds,
+                retention_days=self.cooccurrence.retention_days,
+            )
+
     def load_patterns(self) -> list[Pattern]:
         """Load previously detected patterns."""
         if not self.patterns_file.exists():
@@ -0,0 +1,119 @@
+"""
+Event Store - Bounded, day-partitioned storage for aggregated events.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from .collectors import LogEvent
+
+
+class EventStore:
+    """
+    Append-only event storage split into one JSONL file per day.
+
+    Ingestion appends new events to the partition for their date instead
+    of rewriting the whole history, and retention is enforced by deleting
+    whole partitions rather than filtering lines.
+
+    Usage:
+        store = EventStore(Path("events"))
+        store.append(new_events)
+        recent = store.load(since=datetime.now() - timedelta(days=1))
+        store.prune()
+    """
+
+    def __init__(self, directory: Path, retention_days: int = 14, max_events: int = 50000):
+        """
+        Args:
+            directory: Directory holding events_YYYYMMDD.jsonl partitions.
+            retention_days: Partitions older than this are deleted by prune().
+            max_events: Upper bound on events returned by load().
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+        self.max_events = max_events
+
+    def _partition(self, day: str) -> Path:
+        return self.directory / f"events_{day}.jsonl"
+
+    @staticmethod
+    def _day_of(event: LogEvent) -> str:
+        """YYYYMMDD of an ISO timestamp (today if it can't be parsed)."""
+        day = event.timestamp[:10].replace("-", "")
+        if len(day) == 8 and day.isdigit():
+            return day
+        return datetime.now().strftime("%Y%m%d")
+
+    def partitions(self) -> list[Path]:
+        """Partition files, oldest first."""
+        return sorted(self.directory.glob("events_*.jsonl"))
+
+    def append(self, events: list[LogEvent]) -> int:
+        """Append events to their day partitions. Returns events written."""
+        by_day: dict[str, list[str]] = {}
+        for event in events:
+            by_day.setdefault(self._day_of(event), []).append(event.to_json() + "\n")
+
+        for day, lines in by_day.items():
+            with open(self._partition(day), 'a') as f:
+                f.writelines(lines)
+        return len(events)
+
+    def load(self, since: Optional[datetime] = None, limit: Optional[int] = None) -> list[LogEvent]:
+        """
+        Load the most recent events, oldest first.
+
+        Only partitions on or after `since` are opened, newest first, until
+        `limit` (default max_events) events have been read.
+        """
+        limit = limit or self.max_events
+        since_day = since.strftime("%Y%m%d") if since else None
+        since_iso = since.isoformat() if since else None
+
+        chunks = []
+        count = 0
+        for path in reversed(self.partitions()):
+            if since_day and path.stem[len("events_"):] < since_day:
+                break
+            events = []
+            try:
+                with open(path, 'r') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            event = LogEvent(**json.loads(line))
+                        except (json.JSONDecodeError, TypeError):
+                            continue
+                        if since_iso and event.timestamp < since_iso:
+                            continue
+                        events.append(event)
+            except OSError:
+                continue
+            chunks.append(events)
+            count += len(events)
+            if count >= limit:
+                break
+
+        result = [event for chunk in reversed(chunks) for event in chunk]
+        return result[-limit:]
+
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        """Delete partitions older than the retention window. Returns files removed."""
+        days = self.retention_days if retention_days is None else retention_days
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
+        removed = 0
+        for path in self.partitions():
+            if path.stem[len("events_"):] < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Delete all partitions."""
+        for path in self.partitions():
+            path.unlink(missing_ok=True)
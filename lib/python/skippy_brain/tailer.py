@@ -0,0 +1,145 @@
+"""
+Log Tailer - Resume log reads from checkpointed (inode, offset) positions.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class LogTailer:
+    """
+    Incremental reader for append-only log files.
+
+    Each source path has a checkpoint of (inode, offset). Reads resume at
+    the saved offset, so a brain cycle only reads bytes appended since the
+    previous one. Rotation is detected by an inode change (the rest of the
+    rotated file is drained from "<path>.1" when it is still there) and
+    truncation by the file shrinking below the saved offset.
+
+    New positions are staged while reading and only persisted by commit(),
+    so events are not lost if a cycle fails before they are saved.
+
+    Usage:
+        tailer = LogTailer(Path("checkpoints.json"))
+        for line in tailer.read_new_lines(Path("/var/log/app.log")):
+            ...
+        tailer.commit()
+    """
+
+    def __init__(self, checkpoint_file: Path, initial_bytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            checkpoint_file: JSON file holding per-source positions.
+            initial_bytes: On first sight of a file, only its last
+                initial_bytes are read instead of the whole history.
+        """
+        self.checkpoint_file = Path(checkpoint_file)
+        self.initial_bytes = initial_bytes
+        self.checkpoints: dict[str, dict] = {}
+        self._pending: dict[str, dict] = {}
+        self.bytes_read = 0
+        self._load()
+
+    def _load(self):
+        if not self.checkpoint_file.exists():
+            return
+        try:
+            self.checkpoints = json.loads(self.checkpoint_file.read_text())
+        except Exception:
+            self.checkpoints = {}
+
+    def commit(self):
+        """Persist positions of all fully consumed reads."""
+        if not self._pending:
+            return
+        self.checkpoints.update(self._pending)
+        self._pending = {}
+
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.checkpoints, indent=2))
+        os.replace(tmp, self.checkpoint_file)
+
+    def rollback(self):
+        """Discard positions staged since the last commit."""
+        self._pending = {}
+
+    def reset(self, path: Optional[Path] = None):
+        """Forget the checkpoint for one path (or all paths)."""
+        if path is None:
+            self.checkpoints = {}
+        else:
+            self.checkpoints.pop(str(path), None)
+        self._pending = {}
+
+    def read_new_lines(self, path: Path) -> Iterator[str]:
+        """
+        Yield complete lines appended to path since the last commit.
+
+        A trailing line without a newline is left for the next read. Each
+        line's end position is staged as the line is handed out, so a
+        consumer that fails on one line still moves past it and past every
+        line before it.
+        """
+        key = str(path)
+        st = os.stat(path)
+        checkpoint = self._pending.get(key) or self.checkpoints.get(key)
+
+        if checkpoint is None:
+            offset = max(0, st.st_size - self.initial_bytes)
+            skip_partial = offset > 0
+        elif checkpoint["inode"] != st.st_ino:
+            # Rotated: finish the old file if it was renamed alongside
+            rotated = Path(f"{path}.1")
+            try:
+                if rotated.exists() and os.stat(rotated).st_ino == checkpoint["inode"]:
+                    lines, _ = self._read_from(rotated, checkpoint["offset"])
+                    for line, end in lines:
+                        self._pending[key] = {"inode": checkpoint["inode"], "offset": end}
+                        yield line
+            except OSError:
+                pass
+            offset, skip_partial = 0, False
+        elif st.st_size < checkpoint["offset"]:
+            # Truncated in place
+            offset, skip_partial = 0, False
+        else:
+            offset, skip_partial = checkpoint["offset"], False
+
+        lines, end = self._read_from(path, offset, skip_partial)
+        self._pending[key] = {"inode": st.st_ino, "offset": offset if lines else end}
+        for line, line_end in lines:
+            self._pending[key] = {"inode": st.st_ino, "offset": line_end}
+            yield line
+
+    def _read_from(self, path: Path, offset: int, skip_partial: bool = False):
+        """Return ([(decoded line, offset after it)], offset after the last complete line)."""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+
+        if skip_partial:
+            # Started mid-file: drop the partial first line
+            newline = data.find(b'\n')
+            if newline == -1:
+                return [], offset
+            offset += newline + 1
+            data = data[newline + 1:]
+
+        last_newline = data.rfind(b'\n')
+        if last_newline == -1:
+            return [], offset
+
+        complete = data[:last_newline + 1]
+        self.bytes_read += len(complete)
+        # Split on '\n' only: str.splitlines() also breaks on \x0b, \x1c,
+        # \u2028 and friends, which would turn one record into several events.
+        # Split the bytes so each line's end offset stays exact.
+        lines = []
+        end = offset
+        for raw in complete.split(b'\n')[:-1]:
+            end += len(raw) + 1
+            lines.append((raw.decode('utf-8', errors='replace') + '\n', end))
+        return lines, end
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Skippy System Manager - Streaming File Reader
+Version: 1.0.0
+Author: Skippy Development Team
+Created: 2026-10-16
+
+Constant-memory file access for the MCP file tools.
+
+Features:
+- Lazy line iteration for start_line/num_lines paging
+- Sparse, mmap-built line-offset index cached per (path, mtime, size)
+- Byte-range reads for binary-safe access
+"""
+
+import mmap
+import os
+import threading
+import logging
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Bytes scanned between line-offset checkpoints
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# Number of per-file line indexes kept in memory
+DEFAULT_CACHE_SIZE = 64
+
+# Largest byte range a single read may return
+MAX_BYTE_RANGE = 1024 * 1024
+
+
+# =============================================================================
+# LINE OFFSET INDEX
+# =============================================================================
+
+class LineOffsetIndex:
+    """
+    Sparse index mapping line numbers to byte offsets.
+
+    One checkpoint (line_number, byte_offset) is recorded roughly every
+    block_size bytes, so the index stays small for multi-GB files. The
+    index is built lazily with mmap and only as deep as requested.
+
+    Example:
+        index = get_line_index("/var/log/syslog")
+        line, offset = index.locate(1_000_000)
+        # seek to offset, then skip (1_000_000 - line) lines
+    """
+
+    def __init__(self, path: str, size: int, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Initialize line offset index.
+
+        Args:
+            path: Path to the file
+            size: File size in bytes at index creation
+            block_size: Approximate bytes between checkpoints
+        """
+        self.path = path
+        self.size = size
+        self.block_size = block_size
+        self.lines: List[int] = [0]
+        self.offsets: List[int] = [0]
+        self.complete = size == 0
+        self.total_lines = 0 if self.complete else None
+        self._lock = threading.Lock()
+
+    def _extend(self, target_line: int):
+        """Scan forward until a checkpoint at or beyond target_line exists."""
+        if self.complete or self.lines[-1] >= target_line:
+            return
+
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = min(self.size, len(mm))
+                line, pos = self.lines[-1], self.offsets[-1]
+
+                while line < target_line:
+                    end = min(pos + self.block_size, size)
+                    line += mm[pos:end].count(b'\n')
+
+                    newline = mm.find(b'\n', end, size) if end < size else -1
+                    if newline == -1:
+                        self.complete = True
+                        break
+
+                    line += 1
+                    pos = newline + 1
+                    if pos >= size:
+                        self.complete = True
+                        break
+
+                    self.lines.append(line)
+                    self.offsets.append(pos)
+
+                if self.complete:
+                    # A trailing line without newline still counts as a line
+                    self.total_lines = line + (mm[size - 1:size] != b'\n')
+
+    def locate(self, line_number: int) -> Tuple[int, int]:
+        """
+        Get the nearest checkpoint at or before line_number.
+
+        Returns:
+            (checkpoint_line, byte_offset) tuple
+        """
+        with self._lock:
+            self._extend(line_number)
+            i = bisect_right(self.lines, line_number) - 1
+            return self.lines[i], self.offsets[i]
+
+    def line_count(self) -> int:
+        """Total number of lines (scans the rest of the file if needed)."""
+        with self._lock:
+            self._extend(float('inf'))
+            return self.total_lines
+
+    @property
+    def checkpoints(self) -> int:
+        """Number of checkpoints recorded so far."""
+        return len(self.lines)
+
+
+_index_cache: "OrderedDict[Tuple[str, int, int], LineOffsetIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def get_line_index(path: str, block_size: int = DEFAULT_BLOCK_SIZE) -> LineOffsetIndex:
+    """
+    Get the cached line index for a file, creating it if needed.
+
+    Indexes are keyed by (path, mtime, size) so a modified file gets a
+    fresh index automatically.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+        # Drop stale indexes for the same path
+        for stale in [k for k in _index_cache if k[0] == path]:
+            del _index_cache[stale]
+
+        index = LineOffsetIndex(path, st.st_size, block_size)
+        _index_cache[key] = index
+        while len(_index_cache) > DEFAULT_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+        return index
+
+
+def clear_line_index_cache():
+    """Forget all cached line indexes."""
+    with _index_cache_lock:
+        _index_cache.clear()
+
+
+# =============================================================================
+# READERS
+# =============================================================================
+
+def iter_lines(
+    path: str,
+    start_line: int = 0,
+    num_lines: int = -1,
+    encoding: str = 'utf-8'
+) -> Iterator[str]:
+    """
+    Lazily yield lines from a file.
+
+    Deep pages seek via the sparse line index instead of reading from the
+    start of the file. Line endings are normalized to '\\n' like text-mode
+    reads: '\\r\\n' and bare '\\r' both become '\\n'. Line numbering counts
+    '\\n' only, so a bare '\\r' stays inside its line and start_line/num_lines
+    match the line index rather than splitting on old Mac line endings.
+
+    Args:
+        path: Path to the file
+        start_line: First line to yield (0-indexed, negative counts from the end)
+        num_lines: Number of lines to yield (-1 for all remaining)
+        encoding: Text encoding (default utf-8)
+
+    Yields:
+        Decoded lines including their trailing newline
+    """
+    if num_lines == 0:
+        return
+
+    if start_line < 0:
+        # Negative start counts from the end, like list slicing
+        start_line = max(0, get_line_index(path).line_count() + start_line)
+
+    line, offset = get_line_index(path).locate(start_line) if start_line else (0, 0)
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for _ in range(start_line - line):
+            if not f.readline():
+                return
+
+        stop = None if num_lines < 0 else num_lines
+        for raw in islice(f, stop):
+            if raw.endswith(b'\r\n'):
+                raw = raw[:-2] + b'\n'
+            if b'\r' in raw:
+                raw = raw.replace(b'\r', b'\n')
+            yield raw.decode(encoding)
+
+
+def read_lines(path: str, start_line: int = 0, num_lines: int = -1, encoding: str = 'utf-8') -> str:
+    """Read a range of lines as a single string (see iter_lines)."""
+    return ''.join(iter_lines(path, start_line, num_lines, encoding))
+
+
+def read_byte_range(path: str, offset: int = 0, length: int = 65536) -> bytes:
+    """
+    Read raw bytes from a file.
+
+    Args:
+        path: Path to the file
+        offset: Byte offset to start at (negative counts from end of file)
+        length: Number of bytes to read (capped at MAX_BYTE_RANGE)
+
+    Returns:
+        Bytes read (may be shorter than length at end of file)
+    """
+    length = max(0, min(length, MAX_BYTE_RANGE))
+    with open(path, 'rb') as f:
+        if offset < 0:
+            f.seek(max(0, os.fstat(f.fileno()).st_size + offset))
+        else:
+            f.seek(offset)
+        return f.read(length)
+
+
+# =============================================================================
+# EXAMPLE USAGE
+# =============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    print("=" * 60)
+    print("Skippy Streaming File Reader - Example")
+    print("=" * 60)
+
+    with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as tmp:
+        for i in range(2_000_000):
+            tmp.write(f"2026-10-16 12:00:00 INFO line {i} of a large log file\n")
+        sample = tmp.name
+
+    try:
+        size_mb = os.path.getsize(sample) / (1024 * 1024)
+        print(f"\nSample file: {size_mb:.1f} MB")
+
+        for start in (0, 1_000_000, 1_999_990):
+            t0 = time.perf_counter()
+            page = read_lines(sample, start, 3)
+            print(f"   lines {start}+3 in {(time.perf_counter() - t0) * 1000:.1f}ms: "
+                  f"{page.splitlines()[0]}")
+
+        t0 = time.perf_counter()
+        read_lines(sample, 1_500_000, 3)
+        print(f"   cached deep page in {(time.perf_counter() - t0) * 1000:.1f}ms "
+              f"({get_line_index(sample).checkpoints} checkpoints)")
+
+        print(f"   last 32 bytes: {read_byte_range(sample, -32, 32)!r}")
+    finally:
+        os.unlink(sample)
@@ -1,14 +1,17 @@
 #!/usr/bin/env python3
 """
 Skippy System Manager - Performance Monitoring
-Version: 1.0.0
+Version: 1.1.0
 Purpose: Performance tracking, profiling, and metrics collection
 """
 
 import time
 import psutil
 import os
-from typing import Dict, Any, Optional, Callable
+import random
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Callable, List
 from contextlib import contextmanager
 from functools import wraps
 import logging
@@ -34,6 +37,7 @@ class PerformanceMetrics:
         self.disk_io_start: Optional[Dict[str, int]] = None
         self.disk_io_end: Optional[Dict[str, int]] = None
         self.custom_metrics: Dict[str, Any] = {}
+        self.sampled = True
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert metrics to dictionary"""
@@ -100,27 +104,161 @@ class PerformanceMetrics:
         return f"{sign}{bytes_val:.2f} PB"
 
 
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear latency histogram (HDR-style).
+
+    Durations are recorded in microseconds into buckets that are linear
+    below 32us and then split every power of two into 32 sub-buckets,
+    giving ~3% relative error from 1us to over an hour in under 1000
+    counters.
+
+    Example:
+        hist = LatencyHistogram()
+        hist.record(0.0042)
+        hist.percentile(99)  # seconds
+    """
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    MAX_EXPONENT = 32  # 2**32 us ~= 71 minutes
+    NUM_BUCKETS = SUB_BUCKETS * (MAX_EXPONENT - SUB_BUCKET_BITS + 1)
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * self.NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @classmethod
+    def _bucket_index(cls, micros: int) -> int:
+        if micros < cls.SUB_BUCKETS:
+            return max(micros, 0)
+        exponent = micros.bit_length() - 1
+        shift = exponent - cls.SUB_BUCKET_BITS
+        index = cls.SUB_BUCKETS * (shift + 1) + (micros >> shift) - cls.SUB_BUCKETS
+        return min(index, cls.NUM_BUCKETS - 1)
+
+    @classmethod
+    def _bucket_bounds(cls, index: int) -> tuple:
+        """(lower, upper) bound of a bucket in microseconds."""
+        if index < cls.SUB_BUCKETS:
+            return index, index + 1
+        shift = index // cls.SUB_BUCKETS - 1
+        lower = (cls.SUB_BUCKETS + index % cls.SUB_BUCKETS) << shift
+        return lower, lower + (1 << shift)
+
+    def record(self, seconds: float):
+        """Record one duration in seconds."""
+        self.counts[self._bucket_index(int(seconds * 1_000_000))] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Approximate duration (seconds) at the given percentile."""
+        if not self.count:
+            return 0.0
+
+        target = max(1, -(-self.count * pct // 100))  # ceil
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                lower, upper = self._bucket_bounds(index)
+                value = (lower + upper) / 2 / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact summary with only non-empty buckets."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "avg": self.total / self.count if self.count else 0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+
 class PerformanceMonitor:
-    """Performance monitoring and profiling"""
+    """
+    Performance monitoring and profiling.
+
+    Every monitored call is recorded in a per-operation LatencyHistogram.
+    In "full" mode each call also captures psutil resource usage and is
+    written to its own JSON file. In "sampling" mode only a fraction of
+    calls (sample_rate) capture resource usage, no per-call files are
+    written, and histograms are persisted as one compact snapshot every
+    snapshot_interval seconds.
+    """
 
-    def __init__(self, metrics_dir: Optional[str] = None):
+    def __init__(
+        self,
+        metrics_dir: Optional[str] = None,
+        mode: str = "full",
+        sample_rate: float = 0.01,
+        history_size: int = 100,
+        snapshot_interval: float = 300.0
+    ):
         self.metrics_dir = metrics_dir or os.getenv("SKIPPY_METRICS_DIR", "/tmp/skippy_metrics")
         Path(self.metrics_dir).mkdir(parents=True, exist_ok=True)
         self.process = psutil.Process()
-        self.metrics_history: Dict[str, list] = {}
-
-    def start_monitoring(self, name: str) -> PerformanceMetrics:
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.history_size = history_size
+        self.snapshot_interval = snapshot_interval
+        self.metrics_history: Dict[str, deque] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._last_snapshot = time.monotonic()
+
+    @property
+    def sampling(self) -> bool:
+        return self.mode == "sampling"
+
+    def should_sample(self) -> bool:
+        """Whether the next call should capture full resource metrics."""
+        return not self.sampling or random.random() < self.sample_rate
+
+    def record_duration(self, name: str, seconds: float):
+        """Record a duration without resource sampling (fast path)."""
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = LatencyHistogram()
+            hist.record(seconds)
+            snapshot_due = time.monotonic() - self._last_snapshot >= self.snapshot_interval
+            if snapshot_due:
+                self._last_snapshot = time.monotonic()
+
+        if snapshot_due:
+            self.save_snapshot()
+
+    def start_monitoring(self, name: str, sample: bool = True) -> PerformanceMetrics:
         """Start monitoring performance for a named operation"""
         metrics = PerformanceMetrics(name)
         metrics.start_time = time.time()
+        metrics.sampled = sample
 
         # Capture initial system state
-        try:
-            metrics.cpu_percent_start = self.process.cpu_percent()
-            metrics.memory_start = self.process.memory_info().rss
-            metrics.disk_io_start = self._get_disk_io()
-        except Exception as e:
-            logger.warning(f"Failed to capture initial metrics: {e}")
+        if sample:
+            try:
+                metrics.cpu_percent_start = self.process.cpu_percent()
+                metrics.memory_start = self.process.memory_info().rss
+                metrics.disk_io_start = self._get_disk_io()
+            except Exception as e:
+                logger.warning(f"Failed to capture initial metrics: {e}")
 
         return metrics
 
@@ -128,6 +266,10 @@ class PerformanceMonitor:
         """Stop monitoring and finalize metrics"""
         metrics.end_time = time.time()
         metrics.duration = metrics.end_time - metrics.start_time
+        self.record_duration(metrics.name, metrics.duration)
+
+        if not metrics.sampled:
+            return metrics
 
         # Capture final system state
         try:
@@ -137,25 +279,28 @@ class PerformanceMonitor:
         except Exception as e:
             logger.warning(f"Failed to capture final metrics: {e}")
 
-        # Store in history
-        if metrics.name not in self.metrics_history:
-            self.metrics_history[metrics.name] = []
-        self.metrics_history[metrics.name].append(metrics.to_dict())
+        # Store in bounded history
+        with self._lock:
+            if metrics.name not in self.metrics_history:
+                self.metrics_history[metrics.name] = deque(maxlen=self.history_size)
+            self.metrics_history[metrics.name].append(metrics.to_dict())
 
-        # Save to file
-        self._save_metrics(metrics)
+        # Per-call files only in full mode; sampling mode uses snapshots
+        if not self.sampling:
+            self._save_metrics(metrics)
 
         return metrics
 
     @contextmanager
     def monitor(self, name: str):
         """Context manager for monitoring a code block"""
-        metrics = self.start_monitoring(name)
+        metrics = self.start_monitoring(name, sample=self.should_sample())
         try:
             yield metrics
         finally:
             self.stop_monitoring(metrics)
-            logger.info(str(metrics))
+            if metrics.sampled:
+                logger.info(str(metrics))
 
     def _get_disk_io(self) -> Dict[str, int]:
         """Get current disk I/O counters"""
@@ -181,36 +326,82 @@ class PerformanceMonitor:
         except Exception as e:
             logger.warning(f"Failed to save metrics to file: {e}")
 
-    def get_summary(self, name: Optional[str] = None) -> Dict[str, Any]:
-        """Get performance summary for operations"""
-        if name and name in self.metrics_history:
-            history = self.metrics_history[name]
-        elif name:
-            return {"error": f"No metrics found for: {name}"}
-        else:
-            # Flatten all metrics
-            history = [m for metrics_list in self.metrics_history.values() for m in metrics_list]
+    def save_snapshot(self) -> Optional[str]:
+        """
+        Write all histograms to a single compact snapshot file.
 
-        if not history:
-            return {"error": "No metrics available"}
+        Returns:
+            Path to the snapshot, or None on failure
+        """
+        try:
+            with self._lock:
+                data = {
+                    "timestamp": datetime.now().isoformat(),
+                    "mode": self.mode,
+                    "operations": {name: h.to_dict() for name, h in self.histograms.items()}
+                }
+
+            filepath = Path(self.metrics_dir) / "performance_snapshot.json"
+            tmp_path = filepath.with_suffix(".json.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, filepath)
+            return str(filepath)
 
-        durations = [m.get("duration_seconds", 0) for m in history if m.get("duration_seconds")]
+        except Exception as e:
+            logger.warning(f"Failed to save performance snapshot: {e}")
+            return None
 
-        return {
-            "operation": name or "all",
-            "total_executions": len(history),
-            "duration": {
-                "min": min(durations) if durations else 0,
-                "max": max(durations) if durations else 0,
-                "avg": sum(durations) / len(durations) if durations else 0,
-                "total": sum(durations) if durations else 0
-            },
-            "recent_metrics": history[-5:]  # Last 5 executions
-        }
+    def get_summary(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Get performance summary for operations"""
+        with self._lock:
+            if name and name in self.histograms:
+                hists = [self.histograms[name]]
+                history = list(self.metrics_history.get(name, ()))
+            elif name:
+                return {"error": f"No metrics found for: {name}"}
+            else:
+                hists = list(self.histograms.values())
+                history = [m for metrics_list in self.metrics_history.values() for m in metrics_list]
+
+            if not hists:
+                return {"error": "No metrics available"}
+
+            if len(hists) == 1:
+                hist = hists[0]
+            else:
+                # Merge per-operation histograms for the "all" view
+                hist = LatencyHistogram()
+                for h in hists:
+                    hist.counts = [a + b for a, b in zip(hist.counts, h.counts)]
+                    hist.count += h.count
+                    hist.total += h.total
+                    if h.min is not None and (hist.min is None or h.min < hist.min):
+                        hist.min = h.min
+                    if h.max is not None and (hist.max is None or h.max > hist.max):
+                        hist.max = h.max
+
+            return {
+                "operation": name or "all",
+                "total_executions": hist.count,
+                "duration": {
+                    "min": hist.min or 0,
+                    "max": hist.max or 0,
+                    "avg": hist.total / hist.count if hist.count else 0,
+                    "total": hist.total,
+                    "p50": hist.percentile(50),
+                    "p95": hist.percentile(95),
+                    "p99": hist.percentile(99)
+                },
+                "recent_metrics": history[-5:]  # Last 5 sampled executions
+            }
 
 
-# Global monitor instance
-_global_monitor = PerformanceMonitor()
+# Global monitor instance (sampling by default; SKIPPY_PERF_MODE=full for per-call files)
+_global_monitor = PerformanceMonitor(
+    mode=os.getenv("SKIPPY_PERF_MODE", "sampling"),
+    sample_rate=float(os.getenv("SKIPPY_PERF_SAMPLE_RATE", "0.01"))
+)
 
 
 def monitor_performance(name: Optional[str] = None):
@@ -231,12 +422,24 @@ def monitor_performance(name: Optional[str] = None):
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            with _global_monitor.monitor(operation_name) as metrics:
+            if not _global_monitor.should_sample():
+                # Fast path: latency only
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    _global_monitor.record_duration(operation_name, time.perf_counter() - start)
+
+            metrics = _global_monitor.start_monitoring(operation_name)
+            try:
                 result = func(*args, **kwargs)
                 # Allow functions to add custom metrics
                 if hasattr(result, "__performance_metrics__"):
                     metrics.custom_metrics.update(result.__performance_metrics__)
                 return result
+            finally:
+                _global_monitor.stop_monitoring(metrics)
+                logger.info(str(metrics))
         return wrapper
     return decorator
 
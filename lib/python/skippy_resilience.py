@@ -10,11 +10,12 @@ Provides network retry logic, circuit breaker patterns, and fault tolerance.
 Features:
 - Exponential backoff retry decorator
 - Circuit breaker pattern for external services
-- Rate limiting
+- Rate limiting (threaded and non-blocking asyncio variants)
 - Timeout handling
 - Health monitoring
 """
 
+import asyncio
 import time
 import functools
 import logging
@@ -131,8 +132,6 @@ def async_retry_with_backoff(
             async with httpx.AsyncClient() as client:
                 return await client.get('https://api.example.com/data')
     """
-    import asyncio
-
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -363,6 +362,73 @@ class CircuitBreakerOpenError(Exception):
     pass
 
 
+class AsyncCircuitBreaker(CircuitBreaker):
+    """
+    Circuit breaker for async callables.
+
+    Shares state handling with CircuitBreaker but admits half-open trial
+    calls atomically and releases the slot when each trial finishes, so
+    concurrent coroutines can't flood a recovering service.
+
+    Example:
+        cb = AsyncCircuitBreaker("http-api")
+
+        @cb
+        async def fetch():
+            async with httpx.AsyncClient() as client:
+                return await client.get(url)
+
+        # Or explicitly
+        result = await cb.call(fetch_page, url)
+    """
+
+    def __call__(self, func: Callable) -> Callable:
+        """Decorator to wrap an async function with circuit breaker."""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.call(func, *args, **kwargs)
+        return wrapper
+
+    def _try_acquire(self) -> bool:
+        """Atomically check the circuit and reserve a half-open trial slot."""
+        with self._lock:
+            if not self._can_execute():
+                return False
+            if self.state == CircuitState.HALF_OPEN:
+                self.half_open_calls += 1
+            return True
+
+    def _release(self):
+        """Free a half-open trial slot once the call has finished."""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+
+    async def call(self, func: Callable, *args, **kwargs):
+        """
+        Await func(*args, **kwargs) through the circuit breaker.
+
+        Raises:
+            CircuitBreakerOpenError: If the circuit is open
+        """
+        if not self._try_acquire():
+            raise CircuitBreakerOpenError(
+                f"Circuit breaker '{self.name}' is OPEN. Service unavailable."
+            )
+
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            if not (self.config.excluded_exceptions and isinstance(e, self.config.excluded_exceptions)):
+                self._on_failure()
+            raise
+        else:
+            self._on_success()
+            return result
+        finally:
+            self._release()
+
+
 # =============================================================================
 # RATE LIMITER
 # =============================================================================
@@ -402,24 +468,25 @@ class RateLimiter:
 
     def _wait_if_needed(self):
         """Wait if rate limit would be exceeded."""
-        with self._lock:
-            now = time.time()
+        while True:
+            with self._lock:
+                now = time.time()
 
-            # Remove old calls outside the period window
-            while self.calls and self.calls[0] <= now - self.period:
-                self.calls.popleft()
+                # Remove old calls outside the period window
+                while self.calls and self.calls[0] <= now - self.period:
+                    self.calls.popleft()
+
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return
 
-            if len(self.calls) >= self.max_calls:
                 # Calculate wait time
                 sleep_time = self.calls[0] - (now - self.period)
-                if sleep_time > 0:
-                    logger.info(f"Rate limit reached. Waiting {sleep_time:.2f}s")
-                    time.sleep(sleep_time)
-                    # Recurse to re-check
-                    self._wait_if_needed()
-                    return
 
-            self.calls.append(now)
+            # Sleep outside the lock so other threads can check their own budget
+            if sleep_time > 0:
+                logger.info(f"Rate limit reached. Waiting {sleep_time:.2f}s")
+                time.sleep(sleep_time)
 
     def get_remaining_calls(self) -> int:
         """Get number of remaining calls in current period."""
@@ -430,6 +497,125 @@ class RateLimiter:
             return max(0, self.max_calls - len(self.calls))
 
 
+class AsyncRateLimiter:
+    """
+    Non-blocking token bucket rate limiter for asyncio code.
+
+    Each caller reserves a token under a short lock and then sleeps with
+    asyncio.sleep() outside of it, so a throttled call never blocks the
+    event loop. Reservations are handed out in arrival order, which makes
+    waiting fair (FIFO).
+
+    Example:
+        limiter = AsyncRateLimiter(max_calls=10, period=60.0)  # 10 calls per minute
+
+        @limiter
+        async def api_call():
+            async with httpx.AsyncClient() as client:
+                return await client.get('https://api.example.com/data')
+
+        # Or explicitly
+        await limiter.acquire()
+    """
+
+    def __init__(self, max_calls: int, period: float = 60.0, burst: Optional[int] = None):
+        """
+        Initialize async rate limiter.
+
+        Args:
+            max_calls: Maximum number of calls allowed per period
+            period: Time period in seconds
+            burst: Bucket capacity (default max_calls)
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self.capacity = burst if burst is not None else max_calls
+        self.rate = max_calls / period  # tokens per second
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._waiting = 0
+        self._total_acquired = 0
+        self._total_wait = 0.0
+        self._lock = threading.Lock()  # Never held across an await
+
+    def __call__(self, func: Callable) -> Callable:
+        """Decorator to wrap an async function with rate limiting."""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            await self.acquire()
+            return await func(*args, **kwargs)
+        return wrapper
+
+    def _refill(self, now: float):
+        """Add tokens earned since the last update (caller holds the lock)."""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def _reserve(self) -> float:
+        """Reserve one token and return how long the caller must wait."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            self._total_acquired += 1
+            if self._tokens >= 0:
+                return 0.0
+            # Negative balance is the queue of earlier reservations
+            return -self._tokens / self.rate
+
+    async def acquire(self):
+        """Wait (without blocking the event loop) until a call is allowed."""
+        delay = self._reserve()
+        if delay <= 0:
+            return
+
+        logger.info(f"Rate limit reached. Waiting {delay:.2f}s")
+        with self._lock:
+            self._waiting += 1
+            self._total_wait += delay
+        try:
+            await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled callers give their reservation back
+            with self._lock:
+                self._tokens = min(self.capacity, self._tokens + 1)
+                self._total_acquired -= 1
+            raise
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self._total_acquired += 1
+                return True
+            return False
+
+    def get_remaining_calls(self) -> int:
+        """Get number of calls that can be made right now without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0, int(self._tokens))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "max_calls": self.max_calls,
+                "period": self.period,
+                "available_tokens": max(0.0, self._tokens),
+                "waiting": self._waiting,
+                "total_acquired": self._total_acquired,
+                "total_wait_seconds": round(self._total_wait, 3),
+            }
+
+
 # =============================================================================
 # SAFE JSON PARSING
 # =============================================================================
@@ -630,6 +816,14 @@ def get_circuit_breaker(name: str, config: Optional[CircuitBreakerConfig] = None
     return _circuit_breakers[name]
 
 
+def get_async_circuit_breaker(name: str, config: Optional[CircuitBreakerConfig] = None) -> AsyncCircuitBreaker:
+    """Get or create an async circuit breaker by name (shares the global registry)."""
+    cb = _circuit_breakers.get(name)
+    if not isinstance(cb, AsyncCircuitBreaker):
+        _circuit_breakers[name] = AsyncCircuitBreaker(name, config or (cb.config if cb else None))
+    return _circuit_breakers[name]
+
+
 def get_all_circuit_breaker_states() -> Dict[str, Any]:
     """Get states of all circuit breakers."""
     return {
@@ -642,8 +836,6 @@ def get_all_circuit_breaker_states() -> Dict[str, Any]:
 # =============================================================================
 
 if __name__ == "__main__":
-    import asyncio
-
     print("=" * 60)
     print("Skippy Resilience Library - Examples")
     print("=" * 60)
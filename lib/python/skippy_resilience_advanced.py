@@ -1,27 +1,33 @@
 #!/usr/bin/env python3
 """
 Skippy System Manager - Advanced Resilience Features
-Version: 1.1.0
+Version: 1.2.0
 Author: Skippy Development Team
 Created: 2025-11-16
 
 Advanced resilience features including:
 - Metrics persistence
 - Request tracing
-- Graceful degradation with caching
+- Graceful degradation with caching (optional persistent disk tier)
 - Alert notifications
 - Bulkhead pattern
 """
 
+import sys
 import json
 import time
+import heapq
+import pickle
+import sqlite3
+import atexit
 import uuid
 import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Callable
+from typing import Any, Dict, Optional, List, Callable, Tuple
 from dataclasses import dataclass, field, asdict
-from collections import deque
+from collections import deque, OrderedDict
+from bisect import bisect_left, bisect_right
 import logging
 import os
 
@@ -177,25 +183,169 @@ class RequestTracer:
 # METRICS PERSISTENCE
 # =============================================================================
 
+class TimeSeriesStore:
+    """
+    Append-only JSONL records partitioned into per-day segments.
+
+    Segment files are named {name}_{YYYYMMDD}.jsonl. Each segment has a
+    sidecar {name}_{YYYYMMDD}.idx holding sparse "epoch_seconds offset"
+    entries, so a time-range query opens only the segments for the days
+    it covers and seeks past older records in the first one.
+
+    Example:
+        store = TimeSeriesStore(Path("/tmp/metrics"), "alerts")
+        store.append_many([(datetime.now(), {"title": "Disk full"})])
+        recent = list(store.query(datetime.now() - timedelta(hours=1)))
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        name: str,
+        timestamp_field: str = "timestamp",
+        index_every: int = 256
+    ):
+        """
+        Initialize time-series store.
+
+        Args:
+            directory: Directory holding the segment files
+            name: Segment file prefix
+            timestamp_field: ISO timestamp field used to filter records
+            index_every: Records between timestamp index entries
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self.timestamp_field = timestamp_field
+        self.index_every = index_every
+
+    def segment_path(self, day: datetime) -> Path:
+        return self.directory / f"{self.name}_{day.strftime('%Y%m%d')}.jsonl"
+
+    def _index_path(self, segment: Path) -> Path:
+        return segment.with_suffix(".idx")
+
+    def append_many(self, records: List[tuple]):
+        """
+        Append (timestamp, record) pairs in timestamp order.
+
+        Args:
+            records: List of (datetime, dict) tuples
+        """
+        by_segment: Dict[Path, List[tuple]] = {}
+        for ts, record in records:
+            by_segment.setdefault(self.segment_path(ts), []).append((ts, record))
+
+        for segment, items in by_segment.items():
+            index_lines = []
+            with open(segment, 'ab') as f:
+                for i, (ts, record) in enumerate(items):
+                    if i % self.index_every == 0:
+                        index_lines.append(f"{ts.timestamp():.6f} {f.tell()}\n")
+                    f.write(json.dumps(record).encode() + b'\n')
+
+            with open(self._index_path(segment), 'a') as f:
+                f.writelines(index_lines)
+
+    def _seek_offset(self, segment: Path, since: datetime) -> int:
+        """Byte offset of the last indexed record at or before since."""
+        index_file = self._index_path(segment)
+        if not index_file.exists():
+            return 0
+
+        times: List[float] = []
+        offsets: List[int] = []
+        with open(index_file, 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    times.append(float(parts[0]))
+                    offsets.append(int(parts[1]))
+
+        i = bisect_right(times, since.timestamp()) - 1
+        return offsets[i] if i >= 0 else 0
+
+    def query(self, since: datetime, until: Optional[datetime] = None):
+        """
+        Yield records with timestamp in (since, until].
+
+        Only segments for the days in range are opened.
+        """
+        until = until or datetime.now()
+        day = datetime(since.year, since.month, since.day)
+
+        while day <= until:
+            segment = self.segment_path(day)
+            if segment.exists():
+                offset = self._seek_offset(segment, since) if day.date() == since.date() else 0
+                with open(segment, 'rb') as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        ts = record.get(self.timestamp_field)
+                        if ts:
+                            record_time = datetime.fromisoformat(ts)
+                            if record_time <= since or record_time > until:
+                                continue
+                        yield record
+            day += timedelta(days=1)
+
+    def prune(self, keep_days: int) -> int:
+        """
+        Delete segments older than keep_days.
+
+        Returns:
+            Number of segments removed
+        """
+        cutoff = (datetime.now() - timedelta(days=keep_days)).strftime('%Y%m%d')
+        removed = 0
+        for segment in self.directory.glob(f"{self.name}_*.jsonl"):
+            day = segment.stem[len(self.name) + 1:]
+            if day.isdigit() and day < cutoff:
+                segment.unlink()
+                self._index_path(segment).unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
 class MetricsPersistence:
     """
     Persist metrics to disk for analysis and recovery.
 
+    Writes are buffered in memory and flushed in batches by a background
+    thread (and at interpreter exit). Traces, alerts and health snapshots
+    go to per-day TimeSeriesStore segments; circuit breaker states are
+    coalesced into a single circuit_breakers.json write per flush.
+
     Example:
         persistence = MetricsPersistence("/path/to/metrics")
         persistence.save_circuit_breaker_state("google-drive", cb.get_state())
-        persistence.save_request_trace(trace)
+        persistence.save_request_traces([trace.to_dict()])
 
         # On restart
         states = persistence.load_circuit_breaker_states()
     """
 
-    def __init__(self, metrics_dir: Optional[str] = None):
+    def __init__(
+        self,
+        metrics_dir: Optional[str] = None,
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+        retention_days: int = 30,
+        health_retention_hours: int = 24
+    ):
         """
         Initialize metrics persistence.
 
         Args:
             metrics_dir: Directory to store metrics files
+            flush_interval: Maximum seconds a record stays buffered
+                (0 writes synchronously on every save)
+            batch_size: Buffered records that trigger an early flush
+            retention_days: Days of trace and alert segments to keep
+            health_retention_hours: Hours of health snapshots to keep
         """
         if metrics_dir:
             self.metrics_dir = Path(metrics_dir)
@@ -205,111 +355,247 @@ class MetricsPersistence:
 
         self.metrics_dir.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
 
-    def save_circuit_breaker_state(self, name: str, state: Dict[str, Any]):
-        """Save circuit breaker state to disk."""
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.health_retention_hours = health_retention_hours
+
+        self.stores = {
+            "traces": TimeSeriesStore(self.metrics_dir, "traces", "start_time"),
+            "alerts": TimeSeriesStore(self.metrics_dir, "alerts", "timestamp"),
+            "health": TimeSeriesStore(self.metrics_dir, "health", "timestamp"),
+        }
+        self._pending: List[tuple] = []
+        self._cb_states: Optional[Dict[str, Any]] = None
+        self._cb_dirty = False
+        self._last_prune = 0.0
+
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -------------------------------------------------------------------------
+    # Buffering
+    # -------------------------------------------------------------------------
+
+    def _enqueue(self, kind: str, records: List[Dict[str, Any]]):
+        """Buffer records for the next batch flush."""
+        with self._lock:
+            # Timestamp under the lock so buffer order matches time order
+            now = datetime.now()
+            self._pending.extend((kind, now, record) for record in records)
+            pending = len(self._pending)
+
+        if not self.flush_interval:
+            self.flush()
+            return
+        self._ensure_writer()
+        if pending >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_writer(self):
+        """Start the background writer on first use."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._writer_loop, name="metrics-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _writer_loop(self):
+        """Flush buffered records every flush_interval or when a batch fills."""
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered records to disk.
+
+        Returns:
+            Number of records written
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                cb_states = dict(self._cb_states) if self._cb_dirty else None
+                self._cb_dirty = False
+
+            if cb_states is not None:
+                self._write_circuit_breaker_states(cb_states)
+
+            by_kind: Dict[str, List[tuple]] = {}
+            for kind, ts, record in pending:
+                by_kind.setdefault(kind, []).append((ts, record))
+
+            for kind, records in by_kind.items():
+                try:
+                    self.stores[kind].append_many(records)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(records)} {kind} records: {e}")
+
+            if time.time() - self._last_prune > 3600:
+                self._last_prune = time.time()
+                self._prune()
+
+            return len(pending)
+
+    def _prune(self):
+        """Apply retention to segment files."""
+        try:
+            self.stores["traces"].prune(self.retention_days)
+            self.stores["alerts"].prune(self.retention_days)
+            self.stores["health"].prune(self.health_retention_hours // 24 + 1)
+            # Snapshots written before segmenting (health_YYYYMMDD_HHMMSS.json)
+            self._cleanup_old_files("health_*.json", hours=self.health_retention_hours)
+        except Exception as e:
+            logger.warning(f"Failed to prune metrics segments: {e}")
+
+    def close(self):
+        """Stop the background writer and flush remaining records."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+
+    # -------------------------------------------------------------------------
+    # Circuit breaker state
+    # -------------------------------------------------------------------------
+
+    def _load_cb_states_locked(self) -> Dict[str, Any]:
+        """Load circuit breaker states from disk once (caller holds self._lock)."""
+        if self._cb_states is None:
+            self._cb_states = {}
+            cb_file = self.metrics_dir / "circuit_breakers.json"
+            if cb_file.exists():
+                with open(cb_file, 'r') as f:
+                    self._cb_states = json.load(f)
+        return self._cb_states
+
+    def _write_circuit_breaker_states(self, states: Dict[str, Any]):
+        """Atomically replace circuit_breakers.json."""
         try:
             cb_file = self.metrics_dir / "circuit_breakers.json"
+            tmp_file = cb_file.with_suffix(".json.tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(states, f, indent=2)
+            os.replace(tmp_file, cb_file)
+        except Exception as e:
+            logger.error(f"Failed to save circuit breaker state: {e}")
 
+    def save_circuit_breaker_state(self, name: str, state: Dict[str, Any]):
+        """Record circuit breaker state (written on the next flush)."""
+        try:
             with self._lock:
-                # Load existing states
-                if cb_file.exists():
-                    with open(cb_file, 'r') as f:
-                        all_states = json.load(f)
-                else:
-                    all_states = {}
-
-                # Update state
-                all_states[name] = {
+                states = self._load_cb_states_locked()
+                states[name] = {
                     **state,
                     "last_updated": datetime.now().isoformat()
                 }
+                self._cb_dirty = True
 
-                # Save
-                with open(cb_file, 'w') as f:
-                    json.dump(all_states, f, indent=2)
+            if not self.flush_interval:
+                self.flush()
+            else:
+                self._ensure_writer()
 
         except Exception as e:
             logger.error(f"Failed to save circuit breaker state: {e}")
 
     def load_circuit_breaker_states(self) -> Dict[str, Any]:
-        """Load all circuit breaker states from disk."""
+        """Load all circuit breaker states."""
         try:
-            cb_file = self.metrics_dir / "circuit_breakers.json"
-
-            if cb_file.exists():
-                with open(cb_file, 'r') as f:
-                    return json.load(f)
-            return {}
+            with self._lock:
+                return dict(self._load_cb_states_locked())
         except Exception as e:
             logger.error(f"Failed to load circuit breaker states: {e}")
             return {}
 
+    # -------------------------------------------------------------------------
+    # Time-series records
+    # -------------------------------------------------------------------------
+
     def save_request_traces(self, traces: List[Dict[str, Any]]):
-        """Save request traces to disk."""
+        """Buffer request traces for persistence."""
         try:
-            traces_file = self.metrics_dir / f"traces_{datetime.now().strftime('%Y%m%d')}.jsonl"
-
-            with self._lock:
-                with open(traces_file, 'a') as f:
-                    for trace in traces:
-                        f.write(json.dumps(trace) + '\n')
-
+            self._enqueue("traces", list(traces))
         except Exception as e:
             logger.error(f"Failed to save request traces: {e}")
 
     def save_health_snapshot(self, health_data: Dict[str, Any]):
-        """Save health check snapshot."""
+        """Buffer a health check snapshot for persistence."""
         try:
-            snapshot_file = self.metrics_dir / f"health_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-
-            with open(snapshot_file, 'w') as f:
-                json.dump(health_data, f, indent=2)
-
-            # Clean old snapshots (keep last 24 hours)
-            self._cleanup_old_files("health_*.json", hours=24)
-
+            self._enqueue("health", [{**health_data, "timestamp": datetime.now().isoformat()}])
         except Exception as e:
             logger.error(f"Failed to save health snapshot: {e}")
 
     def save_alert(self, alert: Dict[str, Any]):
-        """Save alert to disk for notification."""
+        """Buffer an alert for persistence."""
         try:
-            alerts_file = self.metrics_dir / "alerts.jsonl"
-
-            with self._lock:
-                with open(alerts_file, 'a') as f:
-                    alert["timestamp"] = datetime.now().isoformat()
-                    f.write(json.dumps(alert) + '\n')
-
+            alert["timestamp"] = datetime.now().isoformat()
+            self._enqueue("alerts", [alert])
         except Exception as e:
             logger.error(f"Failed to save alert: {e}")
 
     def get_recent_alerts(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get alerts from the last N hours."""
         try:
-            alerts_file = self.metrics_dir / "alerts.jsonl"
-
-            if not alerts_file.exists():
-                return []
-
+            self.flush()
             cutoff = datetime.now() - timedelta(hours=hours)
             recent_alerts = []
 
-            with open(alerts_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        alert = json.loads(line)
-                        alert_time = datetime.fromisoformat(alert["timestamp"])
-                        if alert_time > cutoff:
-                            recent_alerts.append(alert)
-
+            # Alerts written before segmenting
+            legacy_file = self.metrics_dir / "alerts.jsonl"
+            if legacy_file.exists():
+                with open(legacy_file, 'r') as f:
+                    for line in f:
+                        if line.strip():
+                            alert = json.loads(line)
+                            if datetime.fromisoformat(alert["timestamp"]) > cutoff:
+                                recent_alerts.append(alert)
+
+            recent_alerts.extend(self.stores["alerts"].query(cutoff))
             return recent_alerts
 
         except Exception as e:
             logger.error(f"Failed to load alerts: {e}")
             return []
 
+    def get_recent_traces(
+        self,
+        hours: int = 1,
+        service: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get request traces started in the last N hours, optionally for one service."""
+        try:
+            self.flush()
+            cutoff = datetime.now() - timedelta(hours=hours)
+            return [
+                trace for trace in self.stores["traces"].query(cutoff)
+                if service is None or trace.get("service") == service
+            ]
+        except Exception as e:
+            logger.error(f"Failed to load traces: {e}")
+            return []
+
+    def get_recent_health_snapshots(self, hours: int = 24) -> List[Dict[str, Any]]:
+        """Get health snapshots from the last N hours."""
+        try:
+            self.flush()
+            cutoff = datetime.now() - timedelta(hours=hours)
+            return list(self.stores["health"].query(cutoff))
+        except Exception as e:
+            logger.error(f"Failed to load health snapshots: {e}")
+            return []
+
     def _cleanup_old_files(self, pattern: str, hours: int):
         """Clean up old metrics files."""
         try:
@@ -325,6 +611,7 @@ class MetricsPersistence:
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of persisted metrics."""
         try:
+            self.flush()
             summary = {
                 "metrics_dir": str(self.metrics_dir),
                 "files": {},
@@ -360,20 +647,310 @@ class CacheEntry:
     timestamp: datetime
     ttl_seconds: int
     hit_count: int = 0
+    size_bytes: int = 0
+    expires_at: float = 0.0
+    # Pickled value held until its disk write, so the value is pickled once
+    blob: Optional[bytes] = field(default=None, repr=False, compare=False)
 
     def is_expired(self) -> bool:
         """Check if entry has expired."""
         return (datetime.now() - self.timestamp).total_seconds() > self.ttl_seconds
 
 
+def _estimate_size(key: str, value: Any) -> Tuple[int, Optional[bytes]]:
+    """
+    Approximate memory footprint of a cache entry in bytes.
+
+    Returns the size and the pickled value (None if it cannot be pickled),
+    which the disk tier reuses instead of pickling again.
+    """
+    try:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return len(key) + sys.getsizeof(value), None
+    return len(key) + len(blob), blob
+
+
+class _SortedKeyIndex:
+    """
+    Sorted list of cache keys for prefix invalidation.
+
+    Keys matching a prefix form one contiguous run, located with bisect.
+    The list only holds references to the cache's key strings, so it costs
+    one pointer per key (KEY_INDEX_SLOT_BYTES), which GracefulCache counts
+    toward max_bytes.
+    """
+
+    __slots__ = ("keys",)
+
+    def __init__(self):
+        self.keys: List[str] = []
+
+    def add(self, key: str):
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            self.keys.insert(i, key)
+
+    def remove(self, key: str):
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        keys = self.keys
+        start = bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return keys[start:end]
+
+    def clear(self):
+        self.keys = []
+
+
+# Bytes charged per key for the sorted key index (one list slot)
+KEY_INDEX_SLOT_BYTES = 8
+
+
+class DiskCacheTier:
+    """
+    SQLite-backed second tier for GracefulCache.
+
+    Entries evicted from memory (and flushed at shutdown) are stored here
+    and loaded back lazily on a memory miss, so stale-on-failure fallbacks
+    survive MCP server restarts. compact() trims the least recently
+    accessed rows to stay within max_bytes.
+
+    Example:
+        tier = DiskCacheTier("/tmp/cache.db", max_bytes=64 * 1024 * 1024)
+        cache = GracefulCache(disk_tier=tier)
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize disk cache tier.
+
+        Args:
+            db_path: Path to the SQLite cache file
+            max_bytes: Byte budget for stored values
+        """
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            base_path = os.getenv("SKIPPY_BASE_PATH", "/home/dave/skippy")
+            self.db_path = Path(os.getenv(
+                "SKIPPY_CACHE_DB",
+                str(Path(base_path) / "logs" / "graceful_cache.db")
+            ))
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        self._stats = {
+            "reads": 0,
+            "hits": 0,
+            "writes": 0,
+            "compactions": 0,
+            "compacted_entries": 0,
+        }
+
+    def _create_schema(self):
+        """Create cache table if it doesn't exist."""
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    timestamp REAL NOT NULL,
+                    ttl_seconds INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed);
+            """)
+
+    def put_many(self, entries: List[CacheEntry]) -> int:
+        """
+        Store entries, replacing existing rows for the same keys.
+
+        Returns:
+            Number of entries written (unpicklable values are skipped)
+        """
+        rows = []
+        now = time.time()
+        for entry in entries:
+            blob = entry.blob
+            if blob is None:
+                try:
+                    blob = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    logger.debug(f"Not spilling cache entry {entry.key}: {e}")
+                    continue
+            rows.append((
+                entry.key, blob, entry.timestamp.timestamp(),
+                entry.ttl_seconds, len(entry.key) + len(blob), now
+            ))
+
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries "
+                "(key, value, timestamp, ttl_seconds, size_bytes, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._stats["writes"] += len(rows)
+        for entry in entries:
+            entry.blob = None  # Written; don't keep a second copy in memory
+        return len(rows)
+
+    def put(self, entry: CacheEntry) -> bool:
+        """Store a single entry."""
+        return self.put_many([entry]) == 1
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Load an entry, or None if it is not on disk."""
+        with self._lock:
+            self._stats["reads"] += 1
+            row = self._conn.execute(
+                "SELECT value, timestamp, ttl_seconds, size_bytes FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            try:
+                value = pickle.loads(row[0])
+            except Exception as e:
+                logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                self.delete(key)
+                return None
+
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+                )
+            self._stats["hits"] += 1
+
+        return CacheEntry(
+            key=key,
+            value=value,
+            timestamp=datetime.fromtimestamp(row[1]),
+            ttl_seconds=row[2],
+            size_bytes=row[3],
+            expires_at=row[1] + row[2]
+        )
+
+    def delete(self, key: str):
+        """Remove a single entry."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_many(self, keys: List[str]):
+        """Remove several entries."""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove entries whose key starts with prefix (uses the key index)."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "DELETE FROM entries WHERE key >= ? AND key < ?",
+                (prefix, prefix + "\U0010ffff")
+            )
+            return cur.rowcount
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Remove entries whose key contains pattern."""
+        with self._lock, self._conn:
+            cur = self._conn.execute("DELETE FROM entries WHERE instr(key, ?) > 0", (pattern,))
+            return cur.rowcount
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def compact(self) -> int:
+        """
+        Trim least recently accessed entries down to the byte budget and
+        return freed pages to the filesystem.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM entries"
+            ).fetchone()[0]
+
+            removed = 0
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims = []
+                for key, size in self._conn.execute(
+                    "SELECT key, size_bytes FROM entries ORDER BY accessed"
+                ):
+                    victims.append(key)
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self.delete_many(victims)
+                removed = len(victims)
+
+            self._conn.execute("PRAGMA incremental_vacuum")
+            self._stats["compactions"] += 1
+            self._stats["compacted_entries"] += removed
+
+        if removed:
+            logger.info(f"Disk cache compacted: removed {removed} entries")
+        return removed
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get disk tier statistics."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries"
+            ).fetchone()
+            return {
+                "entries": count,
+                "total_bytes": total,
+                "max_bytes": self.max_bytes,
+                "db_path": str(self.db_path),
+                **self._stats
+            }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
 class GracefulCache:
     """
     Cache for graceful degradation when services are unavailable.
 
     Stores successful API responses and serves them when circuit breaker is open.
+    Entries are kept in LRU order, expiry is tracked with a min-heap, and keys
+    are kept in a sorted index, so writes, evictions and prefix
+    invalidation do not scan the whole cache. The key index is charged
+    against max_bytes along with the entries.
+
+    With a DiskCacheTier attached, evicted entries spill to disk, dirty
+    entries are flushed periodically and at shutdown, and memory misses are
+    served from disk.
 
     Example:
-        cache = GracefulCache()
+        cache = GracefulCache(max_entries=1000, max_bytes=64 * 1024 * 1024)
 
         # On successful call
         result = api.search(query)
@@ -381,24 +958,228 @@ class GracefulCache:
 
         # When circuit breaker is open
         if circuit_breaker_open:
-            cached = cache.get(f"search:{query}")
+            cached = cache.get(f"search:{query}", allow_stale=True)
             if cached:
                 return cached  # Stale but better than nothing
     """
 
-    def __init__(self, max_entries: int = 1000, default_ttl: int = 3600):
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        default_ttl: int = 3600,
+        max_bytes: Optional[int] = None,
+        disk_tier: Optional[DiskCacheTier] = None,
+        flush_interval: float = 60.0
+    ):
         """
         Initialize graceful cache.
 
         Args:
             max_entries: Maximum number of cache entries
             default_ttl: Default time-to-live in seconds
+            max_bytes: Optional memory budget in (approximate) bytes
+            disk_tier: Optional on-disk tier for spilled entries
+            flush_interval: Seconds between background flush/compaction
+                of the disk tier (0 disables the background thread)
         """
         self.max_entries = max_entries
         self.default_ttl = default_ttl
-        self.cache: Dict[str, CacheEntry] = {}
+        self.max_bytes = max_bytes
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = threading.Lock()
 
+        self._key_index = _SortedKeyIndex()
+        self._expiry_heap: List[tuple] = []
+        self._stale_keys: set = set()
+        self._seq = 0
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self.disk_tier: Optional[DiskCacheTier] = None
+        self._dirty: set = set()
+        self._pending_spill: Dict[str, CacheEntry] = {}
+        self._io_lock = threading.Lock()
+        self._epoch = 0
+        self.disk_hits = 0
+        self.spills = 0
+        self._maintenance_stop = threading.Event()
+        self._maintenance_thread: Optional[threading.Thread] = None
+
+        if disk_tier is not None:
+            self.attach_disk_tier(disk_tier, flush_interval)
+
+    # -------------------------------------------------------------------------
+    # Internal bookkeeping (caller holds self._lock)
+    # -------------------------------------------------------------------------
+
+    def _insert(self, entry: CacheEntry):
+        """Add an entry, evicting LRU entries to respect capacity limits."""
+        key = entry.key
+        self._pending_spill.pop(key, None)
+        if self._remove(key) is None:
+            # Evict least recently used entries if at capacity
+            while len(self.cache) >= self.max_entries and self.cache:
+                self._evict_oldest()
+
+        if self.max_bytes is not None:
+            needed = entry.size_bytes + KEY_INDEX_SLOT_BYTES
+            while self.cache and self.total_bytes + needed > self.max_bytes:
+                self._evict_oldest()
+
+        self.cache[key] = entry
+        self.total_bytes += entry.size_bytes + KEY_INDEX_SLOT_BYTES
+        self._key_index.add(key)
+
+        self._seq += 1
+        heapq.heappush(self._expiry_heap, (entry.expires_at, self._seq, key, entry))
+        self._compact_heap()
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        """Remove an entry and update indexes."""
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return None
+        self.total_bytes -= entry.size_bytes + KEY_INDEX_SLOT_BYTES
+        self._stale_keys.discard(key)
+        self._dirty.discard(key)
+        self._key_index.remove(key)
+        return entry
+
+    def _advance_expiry(self):
+        """Move entries whose TTL has passed from the heap to the stale set."""
+        now = time.time()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, _, key, entry = heapq.heappop(heap)
+            # Skip heap items for entries that were overwritten or removed
+            if self.cache.get(key) is entry:
+                self._stale_keys.add(key)
+
+    def _compact_heap(self):
+        """Drop dead heap items once they outnumber live entries."""
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._expiry_heap = [
+                item for item in self._expiry_heap
+                if self.cache.get(item[2]) is item[3]
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _is_stale(self, key: str, entry: CacheEntry) -> bool:
+        return key in self._stale_keys or time.time() > entry.expires_at
+
+    def _memory_entry(self, key: str) -> Optional[CacheEntry]:
+        """Get an entry from memory, reclaiming it if it is waiting to spill."""
+        entry = self.cache.get(key)
+        if entry is None and key in self._pending_spill:
+            entry = self._pending_spill.pop(key)
+            self._insert(entry)
+        return entry
+
+    def _promote(self, key: str, loaded: Optional[CacheEntry], epoch: int) -> Optional[CacheEntry]:
+        """
+        Re-check memory after a disk read and insert the loaded entry.
+
+        A concurrent set() wins over the disk copy, and a loaded entry is
+        not inserted if an invalidation ran while the lock was released.
+        """
+        entry = self._memory_entry(key)
+        if entry is not None or loaded is None:
+            return entry
+        self.disk_hits += 1
+        if epoch == self._epoch:
+            self._insert(loaded)
+        return loaded
+
+    def _serve(self, key: str, entry: Optional[CacheEntry], allow_stale: bool) -> Optional[Any]:
+        """Apply staleness rules and hit/miss accounting to a lookup."""
+        if entry is None:
+            self.misses += 1
+            return None
+
+        resident = self.cache.get(key) is entry
+        if self._is_stale(key, entry):
+            if not allow_stale:
+                # The disk copy is kept as a stale fallback
+                if resident:
+                    self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.stale_hits += 1
+
+        if resident:
+            self.cache.move_to_end(key)
+        entry.hit_count += 1
+        self.hits += 1
+        return entry.value
+
+    def _evict_oldest(self):
+        """Evict the least recently used cache entry (queueing it to spill)."""
+        if not self.cache:
+            return
+
+        oldest_key = next(iter(self.cache))
+        entry = self._remove(oldest_key)
+        self.evictions += 1
+
+        if self.disk_tier is not None:
+            self._pending_spill[oldest_key] = entry
+
+    # -------------------------------------------------------------------------
+    # Disk I/O (caller must NOT hold self._lock)
+    # -------------------------------------------------------------------------
+
+    def _read_disk(self, key: str) -> Optional[CacheEntry]:
+        """Read an entry from the disk tier."""
+        disk_tier = self.disk_tier
+        if disk_tier is None:
+            return None
+        with self._io_lock:
+            try:
+                return disk_tier.get(key)
+            except Exception as e:
+                logger.warning(f"Disk cache read failed for {key}: {e}")
+                return None
+
+    def _spill_pending(self):
+        """Write entries evicted since the last spill to the disk tier."""
+        if not self._pending_spill:
+            return
+        with self._io_lock:
+            with self._lock:
+                disk_tier = self.disk_tier
+                entries = list(self._pending_spill.values())
+                self._pending_spill.clear()
+            if disk_tier is None or not entries:
+                return
+            try:
+                written = disk_tier.put_many(entries)
+            except Exception as e:
+                logger.warning(f"Failed to spill {len(entries)} cache entries: {e}")
+                return
+        with self._lock:
+            self.spills += written
+
+    def _delete_from_disk(self, method: str, arg: Any):
+        """Apply a deletion to the disk tier after the memory tier."""
+        disk_tier = self.disk_tier
+        if disk_tier is None:
+            return
+        with self._io_lock:
+            try:
+                getattr(disk_tier, method)(arg)
+            except Exception as e:
+                logger.warning(f"Disk cache {method} failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """
         Store a value in cache.
@@ -409,23 +1190,31 @@ class GracefulCache:
             ttl: Time-to-live in seconds (optional)
         """
         ttl = ttl or self.default_ttl
+        size, blob = _estimate_size(key, value)
+        now = datetime.now()
 
         with self._lock:
-            # Evict oldest entries if at capacity
-            if len(self.cache) >= self.max_entries and key not in self.cache:
-                self._evict_oldest()
-
-            self.cache[key] = CacheEntry(
+            self._insert(CacheEntry(
                 key=key,
                 value=value,
-                timestamp=datetime.now(),
-                ttl_seconds=ttl
-            )
+                timestamp=now,
+                ttl_seconds=ttl,
+                size_bytes=size,
+                expires_at=now.timestamp() + ttl,
+                blob=blob if self.disk_tier is not None else None
+            ))
+            if self.disk_tier is not None:
+                self._dirty.add(key)
+
+        self._spill_pending()
 
     def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
         """
         Retrieve a value from cache.
 
+        Memory hits never wait on the disk tier; a miss reads from disk
+        with the cache lock released.
+
         Args:
             key: Cache key
             allow_stale: If True, return expired entries (for degradation)
@@ -434,82 +1223,245 @@ class GracefulCache:
             Cached value or None if not found
         """
         with self._lock:
-            if key not in self.cache:
-                return None
-
-            entry = self.cache[key]
-
-            if entry.is_expired() and not allow_stale:
-                del self.cache[key]
-                return None
+            entry = self._memory_entry(key)
+            hit = entry is not None or self.disk_tier is None
+            if hit:
+                value = self._serve(key, entry, allow_stale)
+            epoch = self._epoch
+
+        if not hit:
+            loaded = self._read_disk(key)
+            with self._lock:
+                value = self._serve(key, self._promote(key, loaded, epoch), allow_stale)
 
-            entry.hit_count += 1
-            return entry.value
+        self._spill_pending()
+        return value
 
     def get_with_metadata(self, key: str) -> Optional[Dict[str, Any]]:
         """Get cached value with metadata (age, hit count, etc.)."""
         with self._lock:
-            if key not in self.cache:
-                return None
+            entry = self._memory_entry(key)
+            epoch = self._epoch
 
-            entry = self.cache[key]
-            age_seconds = (datetime.now() - entry.timestamp).total_seconds()
+        if entry is None and self.disk_tier is not None:
+            loaded = self._read_disk(key)
+            with self._lock:
+                entry = self._promote(key, loaded, epoch)
+            self._spill_pending()
 
-            return {
-                "value": entry.value,
-                "age_seconds": age_seconds,
-                "hit_count": entry.hit_count,
-                "is_stale": entry.is_expired(),
-                "ttl_remaining": max(0, entry.ttl_seconds - age_seconds)
-            }
+        if entry is None:
+            return None
+
+        age_seconds = (datetime.now() - entry.timestamp).total_seconds()
+
+        return {
+            "value": entry.value,
+            "age_seconds": age_seconds,
+            "hit_count": entry.hit_count,
+            "is_stale": entry.is_expired(),
+            "ttl_remaining": max(0, entry.ttl_seconds - age_seconds),
+            "size_bytes": entry.size_bytes
+        }
 
     def invalidate(self, key: str):
         """Remove a specific entry from cache."""
         with self._lock:
-            self.cache.pop(key, None)
+            self._remove(key)
+            self._pending_spill.pop(key, None)
+            self._epoch += 1
+        self._delete_from_disk("delete", key)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Remove all entries whose key starts with prefix.
 
-    def invalidate_pattern(self, pattern: str):
-        """Remove all entries matching pattern."""
+        Uses the sorted key index, so matching keys are found with a
+        binary search rather than a scan of the whole cache.
+
+        Returns:
+            Number of entries removed from memory
+        """
+        with self._lock:
+            keys_to_remove = self._key_index.keys_with_prefix(prefix)
+            for key in keys_to_remove:
+                self._remove(key)
+            for key in [k for k in self._pending_spill if k.startswith(prefix)]:
+                del self._pending_spill[key]
+            self._epoch += 1
+        self._delete_from_disk("delete_prefix", prefix)
+        return len(keys_to_remove)
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Remove all entries whose key contains pattern.
+
+        Prefer invalidate_prefix() for "service:operation:" style keys;
+        substring matching has to look at every key.
+
+        Returns:
+            Number of entries removed from memory
+        """
         with self._lock:
             keys_to_remove = [k for k in self.cache if pattern in k]
             for key in keys_to_remove:
-                del self.cache[key]
+                self._remove(key)
+            for key in [k for k in self._pending_spill if pattern in k]:
+                del self._pending_spill[key]
+            self._epoch += 1
+        self._delete_from_disk("delete_pattern", pattern)
+        return len(keys_to_remove)
 
     def clear(self):
         """Clear all cache entries."""
         with self._lock:
             self.cache.clear()
-
-    def _evict_oldest(self):
-        """Evict the oldest cache entry."""
-        if not self.cache:
-            return
-
-        oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].timestamp)
-        del self.cache[oldest_key]
+            self._key_index.clear()
+            self._expiry_heap = []
+            self._stale_keys.clear()
+            self._dirty.clear()
+            self._pending_spill.clear()
+            self._epoch += 1
+            self.total_bytes = 0
+            disk_tier = self.disk_tier
+        if disk_tier is not None:
+            with self._io_lock:
+                disk_tier.clear()
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self._lock:
+            self._advance_expiry()
             total = len(self.cache)
-            stale = sum(1 for e in self.cache.values() if e.is_expired())
-            total_hits = sum(e.hit_count for e in self.cache.values())
+            stale = len(self._stale_keys)
+            lookups = self.hits + self.misses
 
-            return {
+            stats = {
                 "total_entries": total,
                 "stale_entries": stale,
                 "valid_entries": total - stale,
-                "total_hits": total_hits,
+                "total_hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) * 100 if lookups else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "total_bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
                 "capacity_percent": (total / self.max_entries) * 100 if self.max_entries else 0
             }
 
+            if self.disk_tier is not None:
+                stats["disk_hits"] = self.disk_hits
+                stats["spills"] = self.spills
+                stats["dirty_entries"] = len(self._dirty)
+                stats["pending_spills"] = len(self._pending_spill)
+
+        if self.disk_tier is not None:
+            try:
+                stats["disk"] = self.disk_tier.get_statistics()
+            except Exception as e:
+                stats["disk"] = {"error": str(e)}
+
+        return stats
+
     def cleanup_expired(self):
         """Remove all expired entries."""
         with self._lock:
-            expired_keys = [k for k, v in self.cache.items() if v.is_expired()]
+            self._advance_expiry()
+            expired_keys = list(self._stale_keys)
             for key in expired_keys:
-                del self.cache[key]
-            return len(expired_keys)
+                self._remove(key)
+            self.expirations += len(expired_keys)
+            self._compact_heap()
+            if expired_keys:
+                self._epoch += 1
+        if expired_keys:
+            self._delete_from_disk("delete_many", expired_keys)
+        return len(expired_keys)
+
+    # -------------------------------------------------------------------------
+    # Disk tier
+    # -------------------------------------------------------------------------
+
+    def attach_disk_tier(self, disk_tier: DiskCacheTier, flush_interval: float = 60.0):
+        """
+        Attach an on-disk tier.
+
+        Entries already in memory are marked dirty so the next flush
+        persists them.
+
+        Args:
+            disk_tier: Disk tier to spill to and load from
+            flush_interval: Seconds between background flush/compaction (0 disables)
+        """
+        with self._lock:
+            self.disk_tier = disk_tier
+            self._dirty.update(self.cache.keys())
+
+        if flush_interval and self._maintenance_thread is None:
+            self._maintenance_stop.clear()
+            self._maintenance_thread = threading.Thread(
+                target=self._maintenance_loop,
+                args=(flush_interval,),
+                name="graceful-cache-maintenance",
+                daemon=True
+            )
+            self._maintenance_thread.start()
+
+    def flush(self) -> int:
+        """
+        Write entries changed since the last flush to the disk tier.
+
+        Entries are collected under the cache lock and written after it is
+        released, so readers and writers are not held up by disk I/O.
+
+        Returns:
+            Number of entries written
+        """
+        self._spill_pending()
+        with self._io_lock:
+            with self._lock:
+                disk_tier = self.disk_tier
+                if disk_tier is None or not self._dirty:
+                    return 0
+                entries = [self.cache[k] for k in self._dirty if k in self.cache]
+                self._dirty.clear()
+            try:
+                return disk_tier.put_many(entries)
+            except Exception as e:
+                logger.warning(f"Failed to flush cache to disk: {e}")
+                with self._lock:
+                    self._dirty.update(
+                        entry.key for entry in entries if self.cache.get(entry.key) is entry
+                    )
+                return 0
+
+    def _maintenance_loop(self, interval: float):
+        """Periodically flush dirty entries and compact the disk tier."""
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.flush()
+                disk_tier = self.disk_tier
+                if disk_tier is not None:
+                    with self._io_lock:
+                        disk_tier.compact()
+            except Exception as e:
+                logger.error(f"Cache maintenance failed: {e}")
+
+    def close(self):
+        """Stop background maintenance, flush, and close the disk tier."""
+        self._maintenance_stop.set()
+        if self._maintenance_thread is not None:
+            self._maintenance_thread.join(timeout=5)
+            self._maintenance_thread = None
+
+        if self.disk_tier is not None:
+            self.flush()
+            with self._io_lock:
+                with self._lock:
+                    disk_tier, self.disk_tier = self.disk_tier, None
+                if disk_tier is not None:
+                    disk_tier.close()
 
 
 # =============================================================================
@@ -756,6 +1708,26 @@ def get_cache() -> GracefulCache:
     return _global_cache
 
 
+def enable_cache_disk_tier(
+    db_path: Optional[str] = None,
+    max_bytes: int = 256 * 1024 * 1024,
+    flush_interval: float = 60.0
+) -> DiskCacheTier:
+    """
+    Attach a persistent disk tier to the global graceful cache.
+
+    Entries are flushed in the background and at interpreter exit, so the
+    next process starts with a warm (lazily loaded) cache.
+    """
+    if _global_cache.disk_tier is not None:
+        return _global_cache.disk_tier
+
+    tier = DiskCacheTier(db_path, max_bytes=max_bytes)
+    _global_cache.attach_disk_tier(tier, flush_interval)
+    atexit.register(_global_cache.flush)
+    return tier
+
+
 def get_alert_manager() -> AlertManager:
     """Get global alert manager."""
     return _global_alerts
@@ -813,6 +1785,16 @@ if __name__ == "__main__":
     print(f"   Cache entries: {cache_stats['total_entries']}")
     print(f"   Total hits: {cache_stats['total_hits']}")
 
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = str(Path(tmpdir) / "cache.db")
+        persistent = GracefulCache(disk_tier=DiskCacheTier(db_path), flush_interval=0)
+        persistent.set("search:policy", {"files": ["doc1.pdf"]})
+        persistent.close()
+
+        restarted = GracefulCache(disk_tier=DiskCacheTier(db_path), flush_interval=0)
+        print(f"   After restart: {restarted.get('search:policy', allow_stale=True)}")
+        restarted.close()
+
     # Example 3: Metrics Persistence
     print("\n3. Metrics Persistence:")
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Skippy System Manager - Persistent Content Search Index
+Version: 1.0.0
+Author: Skippy Development Team
+Created: 2026-10-16
+
+On-disk trigram index used by the MCP search tools so repeated searches
+don't have to re-walk and re-read the whole tree.
+
+Features:
+- SQLite-backed trigram postings (case-insensitive)
+- Incremental refresh driven by file mtime/size
+- Candidate narrowing for substring and regex queries
+- Build/query statistics for monitoring
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from pathlib import Path, PurePath
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import re._parser as sre_parse
+    from re._constants import LITERAL, SUBPATTERN
+except ImportError:  # Python < 3.11
+    import sre_parse
+    from sre_constants import LITERAL, SUBPATTERN
+
+logger = logging.getLogger(__name__)
+
+
+# File status values stored in the index
+STATUS_INDEXED = "indexed"     # Trigrams stored, participates in narrowing
+STATUS_OVERSIZE = "oversize"   # Too large to index, always a candidate
+STATUS_BINARY = "binary"       # Not valid UTF-8 text, never a candidate
+
+# Maximum number of trigrams used to narrow a single query
+MAX_QUERY_TRIGRAMS = 16
+
+
+# =============================================================================
+# QUERY ANALYSIS
+# =============================================================================
+
+def extract_trigrams(text: str) -> Set[str]:
+    """Return the set of lowercase trigrams in text."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _literal_runs(parsed) -> List[str]:
+    """Collect literal runs that every match of a parsed pattern must contain."""
+    runs = []
+    current = []
+
+    for op, arg in parsed:
+        if op is LITERAL:
+            current.append(chr(arg))
+            continue
+
+        if current:
+            runs.append(''.join(current))
+            current = []
+
+        # Groups without alternation are still mandatory sequences
+        if op is SUBPATTERN:
+            runs.extend(_literal_runs(arg[-1]))
+
+    if current:
+        runs.append(''.join(current))
+    return runs
+
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Extract literal substrings that any match of a regex must contain.
+
+    The analysis is conservative: alternations, repeats and character
+    classes break literal runs, so the result never excludes a real match.
+
+    Args:
+        pattern: Regular expression source
+
+    Returns:
+        List of required literal substrings (possibly empty)
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    return [run for run in _literal_runs(parsed) if len(run) >= 3]
+
+
+def query_trigrams(query: str, regex: bool = False) -> Set[str]:
+    """
+    Get the trigrams a file must contain to possibly match a query.
+
+    Args:
+        query: Substring or regular expression
+        regex: Whether query is a regular expression
+
+    Returns:
+        Set of trigrams (empty when the query cannot be narrowed)
+    """
+    literals = required_literals(query) if regex else [query]
+    trigrams: Set[str] = set()
+    for literal in literals:
+        trigrams |= extract_trigrams(literal)
+
+    if len(trigrams) > MAX_QUERY_TRIGRAMS:
+        # Keep a deterministic, evenly spread subset
+        ordered = sorted(trigrams)
+        step = len(ordered) / MAX_QUERY_TRIGRAMS
+        trigrams = {ordered[int(i * step)] for i in range(MAX_QUERY_TRIGRAMS)}
+    return trigrams
+
+
+# =============================================================================
+# CONTENT INDEX
+# =============================================================================
+
+class ContentIndex:
+    """
+    Persistent trigram index over directory trees.
+
+    Files are indexed lazily per search root and refreshed incrementally:
+    only files whose mtime or size changed are re-read. Queries return a
+    candidate list that callers verify with their own matching rules.
+
+    Example:
+        index = ContentIndex("/tmp/search_index.db")
+        for path in index.candidates("/home/dave/skippy/scripts", "backup"):
+            ...  # verify match in path
+
+        print(index.get_statistics())
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_file_size: int = 2 * 1024 * 1024,
+        refresh_interval: float = 30.0
+    ):
+        """
+        Initialize content index.
+
+        Args:
+            db_path: Path to the SQLite index file
+            max_file_size: Files larger than this are not indexed (bytes)
+            refresh_interval: Minimum seconds between automatic refreshes of a root
+        """
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            base_path = os.getenv("SKIPPY_BASE_PATH", "/home/dave/skippy")
+            self.db_path = Path(os.getenv(
+                "SKIPPY_SEARCH_INDEX",
+                str(Path(base_path) / "logs" / "search_index.db")
+            ))
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_file_size = max_file_size
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        self._last_refresh: Dict[Tuple[str, bool], float] = {}
+        self._stats = {
+            "queries": 0,
+            "narrowed_queries": 0,
+            "candidates": 0,
+            "files_in_scope": 0,
+            "verified_matches": 0,
+            "refreshes": 0,
+            "files_indexed": 0,
+            "files_removed": 0,
+            "last_refresh_seconds": 0.0,
+            "total_refresh_seconds": 0.0,
+            "last_refresh": None,
+        }
+
+    def _create_schema(self):
+        """Create index tables if they don't exist."""
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    parent TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    status TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_files_parent ON files(parent);
+                CREATE TABLE IF NOT EXISTS postings (
+                    trigram TEXT NOT NULL,
+                    file_id INTEGER NOT NULL,
+                    PRIMARY KEY (trigram, file_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_postings_file ON postings(file_id);
+            """)
+
+    # -------------------------------------------------------------------------
+    # Scope helpers
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize_root(root) -> str:
+        return os.path.abspath(os.path.expanduser(str(root)))
+
+    @staticmethod
+    def _scope_clause(root: str, recursive: bool) -> Tuple[str, tuple]:
+        """SQL condition selecting files under root."""
+        if recursive:
+            prefix = root.rstrip(os.sep) + os.sep
+            # '0' sorts immediately after '/', bounding the prefix range
+            return "path >= ? AND path < ?", (prefix, prefix[:-1] + chr(ord(os.sep) + 1))
+        return "parent = ?", (root,)
+
+    def _walk(self, root: str, recursive: bool) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (path, stat) for regular files under root."""
+        skip = {str(self.db_path), f"{self.db_path}-wal", f"{self.db_path}-shm"}
+
+        if recursive:
+            for dirpath, _dirnames, filenames in os.walk(root):
+                for name in filenames:
+                    path = os.path.join(dirpath, name)
+                    if path in skip:
+                        continue
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    if os.path.isfile(path):
+                        yield path, st
+        else:
+            try:
+                entries = list(os.scandir(root))
+            except OSError:
+                return
+            for entry in entries:
+                if entry.path in skip:
+                    continue
+                try:
+                    if entry.is_file():
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+    def _read_trigrams(self, path: str, size: int) -> Tuple[str, Set[str]]:
+        """Read a file and compute its trigram set."""
+        if size > self.max_file_size:
+            return STATUS_OVERSIZE, set()
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            text = data.decode('utf-8')
+        except (UnicodeDecodeError, OSError):
+            return STATUS_BINARY, set()
+        if '\x00' in text:
+            return STATUS_BINARY, set()
+        return STATUS_INDEXED, extract_trigrams(text)
+
+    # -------------------------------------------------------------------------
+    # Indexing
+    # -------------------------------------------------------------------------
+
+    def refresh(self, root, recursive: bool = True, force: bool = False) -> Dict[str, Any]:
+        """
+        Bring the index for root up to date.
+
+        Only files whose mtime or size changed since the last refresh are
+        re-read; deleted files are dropped from the index.
+
+        Args:
+            root: Directory to index
+            recursive: Index subdirectories as well
+            force: Refresh even if the root was refreshed recently
+
+        Returns:
+            Dictionary describing the work done
+        """
+        root = self._normalize_root(root)
+        key = (root, recursive)
+
+        with self._lock:
+            last = self._last_refresh.get(key)
+            if not force and last is not None and time.time() - last < self.refresh_interval:
+                return {"root": root, "skipped": True}
+
+            start = time.perf_counter()
+            clause, params = self._scope_clause(root, recursive)
+            known = {
+                path: (file_id, mtime_ns, size)
+                for file_id, path, mtime_ns, size in self._conn.execute(
+                    f"SELECT id, path, mtime_ns, size FROM files WHERE {clause}", params
+                )
+            }
+
+            indexed = 0
+            unchanged = 0
+            seen = set()
+
+            with self._conn:
+                for path, st in self._walk(root, recursive):
+                    seen.add(path)
+                    existing = known.get(path)
+                    if existing and existing[1] == st.st_mtime_ns and existing[2] == st.st_size:
+                        unchanged += 1
+                        continue
+
+                    status, trigrams = self._read_trigrams(path, st.st_size)
+                    if existing:
+                        file_id = existing[0]
+                        self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                        self._conn.execute(
+                            "UPDATE files SET mtime_ns = ?, size = ?, status = ? WHERE id = ?",
+                            (st.st_mtime_ns, st.st_size, status, file_id)
+                        )
+                    else:
+                        cursor = self._conn.execute(
+                            "INSERT INTO files (path, parent, mtime_ns, size, status) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (path, os.path.dirname(path), st.st_mtime_ns, st.st_size, status)
+                        )
+                        file_id = cursor.lastrowid
+
+                    if trigrams:
+                        self._conn.executemany(
+                            "INSERT OR IGNORE INTO postings (trigram, file_id) VALUES (?, ?)",
+                            ((t, file_id) for t in trigrams)
+                        )
+                    indexed += 1
+
+                removed = [entry[0] for path, entry in known.items() if path not in seen]
+                for file_id in removed:
+                    self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                    self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+            elapsed = time.perf_counter() - start
+            self._last_refresh[key] = time.time()
+
+            self._stats["refreshes"] += 1
+            self._stats["files_indexed"] += indexed
+            self._stats["files_removed"] += len(removed)
+            self._stats["last_refresh_seconds"] = elapsed
+            self._stats["total_refresh_seconds"] += elapsed
+            self._stats["last_refresh"] = datetime.now().isoformat()
+
+        if indexed or removed:
+            logger.info(
+                f"Search index refreshed {root}: {indexed} indexed, {unchanged} unchanged, "
+                f"{len(removed)} removed in {elapsed:.2f}s"
+            )
+
+        return {
+            "root": root,
+            "skipped": False,
+            "indexed": indexed,
+            "unchanged": unchanged,
+            "removed": len(removed),
+            "seconds": elapsed,
+        }
+
+    def rebuild(self, root, recursive: bool = True) -> Dict[str, Any]:
+        """Drop everything indexed under root and index it again from scratch."""
+        root = self._normalize_root(root)
+        clause, params = self._scope_clause(root, recursive)
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    f"DELETE FROM postings WHERE file_id IN (SELECT id FROM files WHERE {clause})",
+                    params
+                )
+                self._conn.execute(f"DELETE FROM files WHERE {clause}", params)
+            return self.refresh(root, recursive=recursive, force=True)
+
+    # -------------------------------------------------------------------------
+    # Querying
+    # -------------------------------------------------------------------------
+
+    def candidates(
+        self,
+        root,
+        query: str,
+        regex: bool = False,
+        file_pattern: str = "*",
+        recursive: bool = True
+    ) -> List[Path]:
+        """
+        Get files under root that may contain query.
+
+        The result is a superset of the real matches; callers must verify
+        each candidate. Oversize files are always returned, binary files never.
+
+        Args:
+            root: Directory to search
+            query: Substring or regular expression
+            regex: Whether query is a regular expression
+            file_pattern: Glob pattern applied to file paths (as Path.match)
+            recursive: Include subdirectories
+
+        Returns:
+            Sorted list of candidate file paths
+        """
+        root = self._normalize_root(root)
+        self.refresh(root, recursive=recursive)
+
+        clause, params = self._scope_clause(root, recursive)
+        trigrams = query_trigrams(query, regex=regex)
+
+        with self._lock:
+            in_scope = self._conn.execute(
+                f"SELECT COUNT(*) FROM files WHERE {clause} AND status != ?",
+                params + (STATUS_BINARY,)
+            ).fetchone()[0]
+
+            if trigrams:
+                placeholders = ",".join("?" * len(trigrams))
+                rows = self._conn.execute(
+                    f"""
+                    SELECT path FROM files WHERE {clause} AND (
+                        status = ? OR id IN (
+                            SELECT file_id FROM postings WHERE trigram IN ({placeholders})
+                            GROUP BY file_id HAVING COUNT(*) = ?
+                        )
+                    )
+                    """,
+                    params + (STATUS_OVERSIZE,) + tuple(trigrams) + (len(trigrams),)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT path FROM files WHERE {clause} AND status != ?",
+                    params + (STATUS_BINARY,)
+                ).fetchall()
+
+            paths = sorted(
+                Path(path) for (path,) in rows
+                if file_pattern in ("", "*") or PurePath(path).match(file_pattern)
+            )
+
+            self._stats["queries"] += 1
+            if trigrams:
+                self._stats["narrowed_queries"] += 1
+            self._stats["candidates"] += len(paths)
+            self._stats["files_in_scope"] += in_scope
+
+        return paths
+
+    def record_matches(self, count: int):
+        """Record how many candidates were confirmed as matches by the caller."""
+        with self._lock:
+            self._stats["verified_matches"] += count
+
+    def iter_matching_lines(
+        self,
+        root,
+        query: str,
+        regex: bool = False,
+        ignore_case: bool = False,
+        file_pattern: str = "*",
+        recursive: bool = True
+    ) -> Iterator[Tuple[Path, int, str]]:
+        """
+        Yield (path, line_number, line) for every line matching query.
+
+        Args:
+            root: Directory to search
+            query: Substring or regular expression
+            regex: Whether query is a regular expression
+            ignore_case: Case-insensitive matching
+            file_pattern: Glob pattern for files to search
+            recursive: Include subdirectories
+        """
+        if regex:
+            compiled = re.compile(query, re.IGNORECASE if ignore_case else 0)
+            matches = compiled.search
+        elif ignore_case:
+            needle = query.lower()
+
+            def matches(line):
+                return needle in line.lower()
+        else:
+            def matches(line):
+                return query in line
+
+        matched_files = 0
+        try:
+            for path in self.candidates(root, query, regex=regex,
+                                        file_pattern=file_pattern, recursive=recursive):
+                found = False
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for line_num, line in enumerate(f, 1):
+                            if matches(line):
+                                found = True
+                                yield path, line_num, line
+                except (UnicodeDecodeError, PermissionError, FileNotFoundError):
+                    continue
+                finally:
+                    if found:
+                        matched_files += 1
+        finally:
+            self.record_matches(matched_files)
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get index size and query statistics."""
+        with self._lock:
+            stats = dict(self._stats)
+            status_counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM files GROUP BY status"
+            ).fetchall())
+            postings = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+        try:
+            db_size = self.db_path.stat().st_size
+        except OSError:
+            db_size = 0
+
+        scope = stats["files_in_scope"]
+        candidates = stats["candidates"]
+
+        stats.update({
+            "db_path": str(self.db_path),
+            "db_size_mb": round(db_size / (1024 * 1024), 2),
+            "total_files": sum(status_counts.values()),
+            "indexed_files": status_counts.get(STATUS_INDEXED, 0),
+            "oversize_files": status_counts.get(STATUS_OVERSIZE, 0),
+            "binary_files": status_counts.get(STATUS_BINARY, 0),
+            "postings": postings,
+            "roots": len(self._last_refresh),
+            # Share of in-scope files the index let us skip reading
+            "skip_rate": (1 - candidates / scope) * 100 if scope else 0,
+            # Share of candidates that actually matched
+            "hit_rate": (stats["verified_matches"] / candidates) * 100 if candidates else 0,
+        })
+        return stats
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# =============================================================================
+# GLOBAL INSTANCE
+# =============================================================================
+
+_global_index: Optional[ContentIndex] = None
+_global_index_lock = threading.Lock()
+
+
+def get_search_index() -> ContentIndex:
+    """Get (or lazily create) the global content index."""
+    global _global_index
+    with _global_index_lock:
+        if _global_index is None:
+            _global_index = ContentIndex()
+        return _global_index
+
+
+# =============================================================================
+# EXAMPLE USAGE
+# =============================================================================
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    term = sys.argv[2] if len(sys.argv) > 2 else "import"
+
+    print("=" * 60)
+    print("Skippy Search Index - Example")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = ContentIndex(os.path.join(tmpdir, "index.db"))
+
+        print(f"\nBuilding index for {target}...")
+        result = index.refresh(target, force=True)
+        print(f"   Indexed {result['indexed']} files in {result['seconds']:.2f}s")
+
+        start = time.perf_counter()
+        hits = list(index.iter_matching_lines(target, term))
+        print(f"\nSearch '{term}': {len(hits)} lines in {time.perf_counter() - start:.3f}s")
+
+        stats = index.get_statistics()
+        print(f"   Candidates: {stats['candidates']}/{stats['files_in_scope']} files")
+        print(f"   Skip rate: {stats['skip_rate']:.1f}%")
+        print(f"   Hit rate: {stats['hit_rate']:.1f}%")
+        index.close()
@@ -94,12 +94,12 @@ DERIVATIVES ADVANCED (126-135)
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
-import aiohttp
+from typing import Dict, List, Optional, Any
 import logging
 
+from data.fetch import FetchService, get_fetch_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -143,21 +143,12 @@ class AdvancedOnChainAnalyzer:
     Advanced on-chain and cycle indicators.
     """
 
-    def __init__(self):
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
-        self._cache_ttl = timedelta(minutes=10)
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
-        return self._session
+    async def _get_session(self) -> FetchService:
+        """Shared pooled/caching fetch service (same get() interface as aiohttp)."""
+        return get_fetch_service()
 
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """No-op: the shared fetch service outlives any one analyzer."""
 
     def _unavailable(self, name: str, category: str, subcategory: str = "") -> AdvancedSignalResult:
         return AdvancedSignalResult(
@@ -4,13 +4,14 @@ Crypto Trading Backtester
 Test trading strategies against historical data before deploying capital.
 
 Features:
-- Historical data fetching (CoinGecko, CSV import)
+- Historical data fetching (CoinGecko, CSV import, local OHLCV store)
 - Strategy simulation with realistic execution
 - Performance metrics (Sharpe, Sortino, Max Drawdown, etc.)
 - Comparison across strategies
 - Detailed trade logs and reporting
 """
 
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
@@ -19,6 +20,7 @@ import asyncio
 import aiohttp
 import math
 import statistics
+import time
 
 # Import trading components
 from .trading_agent import (
@@ -27,6 +29,7 @@ from .trading_agent import (
     MeanReversionStrategy, GridStrategy, RebalanceStrategy,
     RiskManager,
 )
+from .ohlcv_store import OHLCVStore
 
 
 # =============================================================================
@@ -127,6 +130,25 @@ class PerformanceMetrics:
     negative_months: int
 
 
+@dataclass
+class SignalFeatures:
+    """
+    Per-bar indicator columns, index-aligned with the candles.
+
+    Built in one pass by SimulatedSignalGenerator.precompute(); scores[i]
+    equals generate_score(candles, i) exactly.
+    """
+    rsi: List[float]
+    ma_diff_pct: List[Optional[float]]
+    momentum_pct: List[Optional[float]]
+    volatility_pct: List[Optional[float]]
+    range_pos: List[Optional[float]]
+    scores: List[float]
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+
 @dataclass
 class BacktestResult:
     """Complete backtest results."""
@@ -178,9 +200,15 @@ class HistoricalDataProvider:
         "LTC": "litecoin",
     }
 
-    def __init__(self):
+    # Minimum spacing between CoinGecko requests (free-tier rate limit)
+    MIN_REQUEST_INTERVAL = 1.5
+
+    def __init__(self, store: Optional[OHLCVStore] = None):
         self._cache: Dict[str, List[OHLCV]] = {}
         self._session: Optional[aiohttp.ClientSession] = None
+        self._last_request = 0.0
+        # When set, get_history() reads candles from disk and only fetches gaps
+        self.store = store
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None:
@@ -192,18 +220,39 @@ class HistoricalDataProvider:
             await self._session.close()
             self._session = None
 
+    async def get_history(self, asset: str, days: int = 365, interval: Optional[str] = None) -> List[OHLCV]:
+        """
+        Candles for the last `days`, from the local store when configured.
+
+        With a store only the missing range is fetched; without one this is
+        fetch_coingecko(). interval ("1h"/"1d") defaults to the resolution
+        fetch_coingecko() picks for `days`: hourly up to 90 days, else daily.
+        """
+        if self.store is None:
+            return await self.fetch_coingecko(asset, days)
+        return await self.store.history(self, asset, days, interval)
+
+    async def _throttle(self):
+        wait = self._last_request + self.MIN_REQUEST_INTERVAL - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_request = time.monotonic()
+
     async def fetch_coingecko(
         self,
         asset: str,
         days: int = 365,
-        vs_currency: str = "usd"
+        vs_currency: str = "usd",
+        interval: Optional[str] = None,
     ) -> List[OHLCV]:
         """
         Fetch historical data from CoinGecko.
 
         Note: Free tier has rate limits. For production, use paid API or local data.
+        interval defaults to "daily" beyond 90 days and "hourly" otherwise.
         """
-        cache_key = f"{asset}_{days}_{vs_currency}"
+        interval = interval or ("daily" if days > 90 else "hourly")
+        cache_key = f"{asset}_{days}_{vs_currency}_{interval}"
         if cache_key in self._cache:
             return self._cache[cache_key]
 
@@ -216,15 +265,16 @@ class HistoricalDataProvider:
         params = {
             "vs_currency": vs_currency,
             "days": days,
-            "interval": "daily" if days > 90 else "hourly",
+            "interval": interval,
         }
 
         try:
+            await self._throttle()
             async with session.get(url, params=params) as response:
                 if response.status == 429:
                     # Rate limited - wait and retry
                     await asyncio.sleep(60)
-                    return await self.fetch_coingecko(asset, days, vs_currency)
+                    return await self.fetch_coingecko(asset, days, vs_currency, interval)
 
                 data = await response.json()
         except Exception as e:
@@ -356,6 +406,17 @@ class SimulatedSignalGenerator:
     what the real 130+ signal system would produce.
     """
 
+    # generate_score() looks back at most this many bars
+    LOOKBACK = 100
+    WARMUP = 50
+    MOMENTUM_BARS = 30
+    VOL_WINDOW = 20
+    RANGE_WINDOW = 50
+
+    # Volatility only matters through these regime thresholds (percent)
+    VOL_HIGH = 5
+    VOL_LOW = 1
+
     def __init__(self):
         self.rsi_period = 14
         self.ma_short = 20
@@ -414,57 +475,180 @@ class SimulatedSignalGenerator:
 
         Returns score from -100 to +100
         """
-        if current_index < 50:
+        if current_index < self.WARMUP:
             return 0.0
 
         # Get recent prices
-        recent = price_history[max(0, current_index-100):current_index+1]
+        recent = price_history[max(0, current_index-self.LOOKBACK):current_index+1]
         closes = [c.close for c in recent]
 
+        rsi = self.calculate_rsi(closes)
+
+        ma_diff_pct = None
+        ma_short = self.calculate_ma(closes, self.ma_short)
+        ma_long = self.calculate_ma(closes, self.ma_long)
+        if ma_short and ma_long:
+            ma_diff_pct = float((ma_short - ma_long) / ma_long) * 100
+
+        momentum = None
+        if len(closes) >= self.MOMENTUM_BARS:
+            momentum = float((closes[-1] - closes[-30]) / closes[-30]) * 100
+
+        volatility = None
+        if len(closes) >= self.VOL_WINDOW:
+            returns = [(float(closes[i]) - float(closes[i-1])) / float(closes[i-1])
+                      for i in range(1, len(closes))]
+            if len(returns) >= self.VOL_WINDOW:
+                volatility = statistics.stdev(returns[-20:]) * 100
+
+        range_pos = None
+        if len(closes) >= self.RANGE_WINDOW:
+            range_pos = self._range_position(closes[-1], max(closes[-50:]), min(closes[-50:]))
+
+        return self.combine_score(rsi, ma_diff_pct, momentum, volatility, range_pos)
+
+    @staticmethod
+    def _range_position(current: Decimal, high_50: Decimal, low_50: Decimal) -> float:
+        return float((current - low_50) / (high_50 - low_50)) if high_50 != low_50 else 0.5
+
+    def combine_score(
+        self,
+        rsi: float,
+        ma_diff_pct: Optional[float],
+        momentum: Optional[float],
+        volatility: Optional[float],
+        range_pos: Optional[float],
+    ) -> float:
+        """Combine indicator values into a score from -100 to +100."""
         score = 0.0
 
         # RSI component (-30 to +30)
-        rsi = self.calculate_rsi(closes)
         if rsi < 30:
             score += (30 - rsi)  # Oversold = bullish
         elif rsi > 70:
             score -= (rsi - 70)  # Overbought = bearish
 
         # MA crossover component (-25 to +25)
-        ma_short = self.calculate_ma(closes, self.ma_short)
-        ma_long = self.calculate_ma(closes, self.ma_long)
-
-        if ma_short and ma_long:
-            ma_diff_pct = float((ma_short - ma_long) / ma_long) * 100
+        if ma_diff_pct is not None:
             score += max(-25, min(25, ma_diff_pct * 5))
 
         # Momentum component (-20 to +20)
-        if len(closes) >= 30:
-            momentum = float((closes[-1] - closes[-30]) / closes[-30]) * 100
+        if momentum is not None:
             score += max(-20, min(20, -momentum))  # Negative = contrarian
 
         # Volatility regime (-15 to +15)
-        if len(closes) >= 20:
-            returns = [(float(closes[i]) - float(closes[i-1])) / float(closes[i-1])
-                      for i in range(1, len(closes))]
-            if len(returns) >= 20:
-                volatility = statistics.stdev(returns[-20:]) * 100
-                if volatility > 5:
-                    score += 10  # High vol often means fear = opportunity
-                elif volatility < 1:
-                    score -= 5   # Low vol complacency
+        if volatility is not None:
+            if volatility > self.VOL_HIGH:
+                score += 10  # High vol often means fear = opportunity
+            elif volatility < self.VOL_LOW:
+                score -= 5   # Low vol complacency
 
         # Distance from recent high/low (-10 to +10)
-        if len(closes) >= 50:
-            high_50 = max(closes[-50:])
-            low_50 = min(closes[-50:])
-            current = closes[-1]
-
-            range_pos = float((current - low_50) / (high_50 - low_50)) if high_50 != low_50 else 0.5
+        if range_pos is not None:
             score += (0.5 - range_pos) * 20  # Lower in range = more bullish
 
         return max(-100, min(100, score))
 
+    def precompute(self, price_history: List[OHLCV]) -> SignalFeatures:
+        """
+        Compute every bar's indicators and score in a single pass.
+
+        Produces the same values as calling generate_score() per bar, but
+        each series is built once over the whole history: price diffs and
+        returns are converted to float once, RSI and moving averages sum
+        fixed-size windows in the same order as the per-bar code (so the
+        results are bit-identical), and the 50-bar high/low use monotonic
+        deques. statistics.stdev only runs when the fast volatility
+        estimate is close to a regime threshold.
+        """
+        n = len(price_history)
+        closes = [c.close for c in price_history]
+        closes_f = [float(c) for c in closes]
+        period = self.rsi_period
+
+        # Per-bar gain/loss and return columns (index k describes k-1 -> k)
+        gains = [0.0] * n
+        losses = [0.0] * n
+        returns = [0.0] * n
+        for k in range(1, n):
+            change = float(closes[k] - closes[k-1])
+            if change > 0:
+                gains[k] = change
+            else:
+                losses[k] = abs(change)
+            returns[k] = (closes_f[k] - closes_f[k-1]) / closes_f[k-1]
+
+        rsi_col = [50.0] * n
+        ma_col: List[Optional[float]] = [None] * n
+        momentum_col: List[Optional[float]] = [None] * n
+        vol_col: List[Optional[float]] = [None] * n
+        range_col: List[Optional[float]] = [None] * n
+        scores = [0.0] * n
+
+        high_q: deque = deque()  # indices with decreasing closes
+        low_q: deque = deque()   # indices with increasing closes
+
+        for i in range(n):
+            # Rolling 50-bar high/low
+            while high_q and closes[high_q[-1]] <= closes[i]:
+                high_q.pop()
+            high_q.append(i)
+            while low_q and closes[low_q[-1]] >= closes[i]:
+                low_q.pop()
+            low_q.append(i)
+            if high_q[0] <= i - self.RANGE_WINDOW:
+                high_q.popleft()
+            if low_q[0] <= i - self.RANGE_WINDOW:
+                low_q.popleft()
+
+            if i < self.WARMUP:
+                continue
+
+            # RSI over the last `period` diffs
+            avg_gain = sum(gains[i-period+1:i+1]) / period
+            avg_loss = sum(losses[i-period+1:i+1]) / period
+            if avg_loss == 0:
+                rsi = 100.0
+            else:
+                rs = avg_gain / avg_loss
+                rsi = 100 - (100 / (1 + rs))
+
+            ma_short = sum(closes[i-self.ma_short+1:i+1]) / self.ma_short
+            ma_long = sum(closes[i-self.ma_long+1:i+1]) / self.ma_long
+            ma_diff_pct = float((ma_short - ma_long) / ma_long) * 100 if ma_short and ma_long else None
+
+            momentum = float((closes[i] - closes[i-29]) / closes[i-29]) * 100
+
+            window = returns[i-self.VOL_WINDOW+1:i+1]
+            volatility = self._fast_stdev(window) * 100
+            if (abs(volatility - self.VOL_HIGH) < 1e-6
+                    or abs(volatility - self.VOL_LOW) < 1e-6):
+                volatility = statistics.stdev(window) * 100
+
+            range_pos = self._range_position(closes[i], closes[high_q[0]], closes[low_q[0]])
+
+            rsi_col[i] = rsi
+            ma_col[i] = ma_diff_pct
+            momentum_col[i] = momentum
+            vol_col[i] = volatility
+            range_col[i] = range_pos
+            scores[i] = self.combine_score(rsi, ma_diff_pct, momentum, volatility, range_pos)
+
+        return SignalFeatures(
+            rsi=rsi_col,
+            ma_diff_pct=ma_col,
+            momentum_pct=momentum_col,
+            volatility_pct=vol_col,
+            range_pos=range_col,
+            scores=scores,
+        )
+
+    @staticmethod
+    def _fast_stdev(values: List[float]) -> float:
+        """Two-pass sample standard deviation in plain floats."""
+        mean = sum(values) / len(values)
+        return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
 
 # =============================================================================
 # BACKTEST ENGINE
@@ -483,12 +667,16 @@ class BacktestEngine:
         initial_capital: Decimal = Decimal("10000"),
         fee_rate: Decimal = Decimal("0.001"),    # 0.1% per trade
         slippage_rate: Decimal = Decimal("0.001"), # 0.1% slippage
+        precompute_signals: bool = True,
+        store: Optional[OHLCVStore] = None,
     ):
         self.initial_capital = initial_capital
         self.fee_rate = fee_rate
         self.slippage_rate = slippage_rate
+        # False scores each bar with generate_score() (slow reference path)
+        self.precompute_signals = precompute_signals
 
-        self.data_provider = HistoricalDataProvider()
+        self.data_provider = HistoricalDataProvider(store=store)
         self.signal_generator = SimulatedSignalGenerator()
 
     async def close(self):
@@ -521,8 +709,7 @@ class BacktestEngine:
             data = {}
             for asset in assets:
                 print(f"Fetching {asset} historical data...")
-                data[asset] = await self.data_provider.fetch_coingecko(asset, days)
-                await asyncio.sleep(1)  # Rate limit
+                data[asset] = await self.data_provider.get_history(asset, days)
 
         # Validate data
         if not all(data.get(a) for a in assets):
@@ -564,6 +751,11 @@ class BacktestEngine:
         print(f"  Initial capital: ${self.initial_capital:,.2f}")
         print()
 
+        # Indicator columns for the whole history, indexed by bar in the loop
+        features = None
+        if self.precompute_signals:
+            features = self.signal_generator.precompute(data[assets[0]])
+
         # Main simulation loop
         for i in range(50, min_len):  # Start at 50 for indicator warmup
             current_time = data[assets[0]][i].timestamp
@@ -590,7 +782,10 @@ class BacktestEngine:
             drawdown_pct = (drawdown / peak_value * 100) if peak_value > 0 else Decimal("0")
 
             # Generate signal score
-            signal_score = self.signal_generator.generate_score(data[assets[0]], i)
+            if features is not None:
+                signal_score = features.scores[i]
+            else:
+                signal_score = self.signal_generator.generate_score(data[assets[0]], i)
             signal_history.append((current_time, signal_score))
 
             # Determine market condition and cycle phase (simplified)
@@ -1142,6 +1337,7 @@ async def run_strategy_backtest(
     initial_capital: float = 10000,
     days: int = 365,
     assets: List[str] = None,
+    store: Optional[OHLCVStore] = None,
 ) -> BacktestResult:
     """Quick function to backtest a strategy."""
 
@@ -1167,7 +1363,7 @@ async def run_strategy_backtest(
 
     strategy = strategy_map[strategy_name](config)
 
-    engine = BacktestEngine(initial_capital=Decimal(str(initial_capital)))
+    engine = BacktestEngine(initial_capital=Decimal(str(initial_capital)), store=store)
 
     try:
         result = await engine.run(strategy, assets=assets, days=days)
@@ -1180,6 +1376,7 @@ async def compare_all_strategies(
     initial_capital: float = 10000,
     days: int = 365,
     assets: List[str] = None,
+    store: Optional[OHLCVStore] = None,
 ) -> str:
     """Run all strategies and return comparison."""
 
@@ -1189,13 +1386,12 @@ async def compare_all_strategies(
     results = []
 
     # Fetch data once
-    provider = HistoricalDataProvider()
+    provider = HistoricalDataProvider(store=store)
     data = {}
 
     for asset in assets:
         print(f"Fetching {asset} data...")
-        data[asset] = await provider.fetch_coingecko(asset, days)
-        await asyncio.sleep(1)
+        data[asset] = await provider.get_history(asset, days)
 
     await provider.close()
 
@@ -93,11 +93,12 @@ CATEGORY 16: SENTIMENT ADVANCED (125-130)
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date, timezone
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Any
 import asyncio
-import aiohttp
 import logging
 
+from data.fetch import FetchService, TTLCache, get_fetch_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -189,30 +190,20 @@ class ExpandedSignalsAnalyzer:
     }
 
     def __init__(self):
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
-        self._cache_ttl = timedelta(minutes=5)
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
-        return self._session
+        self._cache = TTLCache(maxsize=256, ttl=300)
+
+    async def _get_session(self) -> FetchService:
+        """Shared pooled/caching fetch service (same get() interface as aiohttp)."""
+        return get_fetch_service()
 
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """No-op: the shared fetch service outlives any one analyzer."""
 
     def _get_cached(self, key: str) -> Optional[Any]:
-        if key in self._cache:
-            data, ts = self._cache[key]
-            if datetime.now(timezone.utc) - ts < self._cache_ttl:
-                return data
-        return None
+        return self._cache.get(key)
 
     def _set_cached(self, key: str, data: Any):
-        self._cache[key] = (data, datetime.now(timezone.utc))
+        self._cache.set(key, data)
 
     def _unavailable_signal(self, name: str, category: str) -> SignalResult:
         return SignalResult(
@@ -25,7 +25,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any
-import aiohttp
+
+from data.fetch import FetchService, TTLCache, get_fetch_service
 
 logger = logging.getLogger(__name__)
 
@@ -512,28 +513,20 @@ class ExtendedSignalsAnalyzer:
     DERIBIT_URL = "https://www.deribit.com/api/v2/public"
 
     def __init__(self):
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, Tuple[datetime, Any]] = {}
-        self._cache_ttl = 300  # 5 minutes
+        self._cache = TTLCache(maxsize=256, ttl=300)  # 5 minutes
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self._session = aiohttp.ClientSession(timeout=timeout)
-        return self._session
+    async def _get_session(self) -> FetchService:
+        """Shared pooled/caching fetch service (same get() interface as aiohttp)."""
+        return get_fetch_service()
 
     def _is_cached(self, key: str) -> bool:
-        if key in self._cache:
-            cached_time, _ = self._cache[key]
-            if (datetime.now() - cached_time).seconds < self._cache_ttl:
-                return True
-        return False
+        return key in self._cache
 
     def _get_cached(self, key: str) -> Any:
-        return self._cache[key][1] if key in self._cache else None
+        return self._cache.get(key)
 
     def _set_cache(self, key: str, value: Any):
-        self._cache[key] = (datetime.now(), value)
+        self._cache.set(key, value)
 
     # =========================================================================
     # LIQUIDATION DATA
@@ -1409,9 +1402,7 @@ class ExtendedSignalsAnalyzer:
         )
 
     async def close(self):
-        """Close the session."""
-        if self._session:
-            await self._session.close()
+        """No-op: the shared fetch service outlives any one analyzer."""
 
 
 def format_extended_signals(signals: List[Signal], composite_score: float, composite_signal: SignalStrength) -> str:
@@ -18,9 +18,9 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Dict, List, Optional, Tuple
-import aiohttp
 import statistics
 
+from data.fetch import FetchService, get_fetch_service
 from data.prices import PriceService
 
 
@@ -222,13 +222,11 @@ class MarketSignalsAnalyzer:
 
     def __init__(self, price_service: Optional[PriceService] = None):
         self.price_service = price_service or PriceService()
-        self._session: Optional[aiohttp.ClientSession] = None
         self._price_history: Dict[str, List[Tuple[datetime, Decimal]]] = {}
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+    async def _get_session(self) -> FetchService:
+        """Shared pooled/caching fetch service (same get() interface as aiohttp)."""
+        return get_fetch_service()
 
     # =========================================================================
     # TECHNICAL INDICATORS
@@ -570,9 +568,7 @@ class MarketSignalsAnalyzer:
         return scores
 
     async def close(self):
-        """Close the session."""
-        if self._session:
-            await self._session.close()
+        """No-op: the shared fetch service outlives any one analyzer."""
 
 
 def format_opportunity_score(score: OpportunityScore) -> str:
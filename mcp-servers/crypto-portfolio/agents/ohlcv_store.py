@@ -0,0 +1,440 @@
+"""
+Local OHLCV Store
+
+Columnar on-disk candle history for backtesting, keyed by (asset, interval).
+
+Features:
+- One fixed-width binary file per column (int64 ms timestamps, float64 OHLCV)
+- Memory-mapped reads; time-range slices are zero-copy views
+- Append-only writes; a torn append is trimmed on the next write
+- Incremental sync that fetches candles newer than the last stored one, and
+  backfills (by rewriting the series) when a longer history is requested
+- Optional NumPy views (np.frombuffer over the same mapping)
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import csv
+import json
+import shutil
+import math
+import mmap
+import os
+import time
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .backtester import OHLCV, HistoricalDataProvider
+
+
+DEFAULT_STORE_DIR = Path(os.path.expanduser("~/.crypto_portfolio/ohlcv"))
+
+# Interval name -> (milliseconds, CoinGecko market_chart interval)
+INTERVALS: Dict[str, Tuple[int, str]] = {
+    "1d": (86_400_000, "daily"),
+    "1h": (3_600_000, "hourly"),
+}
+
+# CoinGecko only serves hourly points for the last 90 days
+HOURLY_MAX_DAYS = 90
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+COLUMNS = ("timestamp",) + PRICE_COLUMNS
+_FORMATS = {"timestamp": "q", **{c: "d" for c in PRICE_COLUMNS}}
+_ITEMSIZE = 8
+
+
+def default_interval(days: int) -> str:
+    """Store interval matching fetch_coingecko's default resolution for `days`."""
+    return "1h" if days <= HOURLY_MAX_DAYS else "1d"
+
+
+def _to_ms(dt: datetime) -> int:
+    return int(round(dt.timestamp() * 1000))
+
+
+# =============================================================================
+# FRAME
+# =============================================================================
+
+class OHLCVFrame:
+    """
+    Read-only columnar view over a stored series.
+
+    Columns are memoryviews into the mapped files (or slices of them), so
+    slicing never copies. to_candles() materializes OHLCV objects for the
+    BacktestEngine.
+    """
+
+    def __init__(self, columns: Dict[str, memoryview], aware: bool = True, _maps: tuple = ()):
+        self.columns = columns
+        self.aware = aware
+        self._maps = _maps  # Keep the mmaps alive as long as any view is
+
+    @classmethod
+    def empty(cls) -> "OHLCVFrame":
+        return cls({c: memoryview(b"").cast(_FORMATS[c]) for c in COLUMNS})
+
+    def __len__(self) -> int:
+        return len(self.columns["timestamp"])
+
+    @property
+    def timestamps(self) -> memoryview:
+        return self.columns["timestamp"]
+
+    @property
+    def closes(self) -> memoryview:
+        return self.columns["close"]
+
+    def _datetime(self, ms: int) -> datetime:
+        if self.aware:
+            return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+        return datetime.fromtimestamp(ms / 1000)
+
+    @property
+    def start(self) -> Optional[datetime]:
+        return self._datetime(self.timestamps[0]) if len(self) else None
+
+    @property
+    def end(self) -> Optional[datetime]:
+        return self._datetime(self.timestamps[-1]) if len(self) else None
+
+    def iloc(self, start: int = 0, stop: Optional[int] = None) -> "OHLCVFrame":
+        """Rows [start, stop) by position."""
+        return OHLCVFrame({c: v[start:stop] for c, v in self.columns.items()}, self.aware, self._maps)
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> "OHLCVFrame":
+        """Rows with start <= timestamp < end, located by binary search."""
+        ts = self.timestamps
+        lo = bisect_left(ts, _to_ms(start)) if start else 0
+        hi = bisect_left(ts, _to_ms(end)) if end else len(ts)
+        return self.iloc(lo, hi)
+
+    def tail(self, n: int) -> "OHLCVFrame":
+        return self.iloc(max(0, len(self) - n))
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """Zero-copy NumPy arrays over the same memory."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("OHLCVFrame.to_numpy requires numpy")
+        return {c: np.frombuffer(v, dtype=np.int64 if c == "timestamp" else np.float64)
+                for c, v in self.columns.items()}
+
+    def to_candles(self) -> List["OHLCV"]:
+        from .backtester import OHLCV
+
+        dt = self._datetime
+        return [
+            OHLCV(
+                timestamp=dt(ts),
+                open=Decimal(repr(o)),
+                high=Decimal(repr(h)),
+                low=Decimal(repr(lo)),
+                close=Decimal(repr(c)),
+                volume=Decimal(repr(v)),
+            )
+            for ts, o, h, lo, c, v in zip(*(self.columns[c] for c in COLUMNS))
+        ]
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class OHLCVStore:
+    """
+    Append-only candle warehouse under root/<ASSET>/<interval>/.
+
+    Each series has one binary file per column plus meta.json. Row count
+    is the shortest column, so a crash between column writes only loses
+    the incomplete trailing row.
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    def _dir(self, asset: str, interval: str) -> Path:
+        if interval not in INTERVALS:
+            raise ValueError(f"Unsupported interval: {interval} (expected one of {', '.join(INTERVALS)})")
+        directory = self.root / asset.upper() / interval
+        old = directory.with_name(directory.name + ".old")
+        if not directory.exists() and old.exists():
+            os.replace(old, directory)  # Crashed mid-swap in _prepend_rows
+        return directory
+
+    def _meta(self, directory: Path) -> dict:
+        try:
+            return json.loads((directory / "meta.json").read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_meta(self, directory: Path, **updates):
+        meta = self._meta(directory)
+        meta.update(updates)
+        tmp = directory / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, directory / "meta.json")
+
+    def _rows(self, directory: Path) -> int:
+        sizes = []
+        for column in COLUMNS:
+            path = directory / f"{column}.bin"
+            sizes.append(path.stat().st_size // _ITEMSIZE if path.exists() else 0)
+        return min(sizes)
+
+    def series(self) -> List[Tuple[str, str]]:
+        """All stored (asset, interval) keys."""
+        if not self.root.exists():
+            return []
+        return sorted(
+            (asset_dir.name, interval_dir.name)
+            for asset_dir in self.root.iterdir() if asset_dir.is_dir()
+            for interval_dir in asset_dir.iterdir() if (interval_dir / "meta.json").exists()
+        )
+
+    def __len__(self) -> int:
+        return len(self.series())
+
+    def count(self, asset: str, interval: str = "1d") -> int:
+        return self._rows(self._dir(asset, interval))
+
+    def last_timestamp(self, asset: str, interval: str = "1d") -> Optional[int]:
+        """Last stored timestamp in epoch milliseconds."""
+        directory = self._dir(asset, interval)
+        n = self._rows(directory)
+        if n == 0:
+            return None
+        with open(directory / "timestamp.bin", "rb") as f:
+            f.seek((n - 1) * _ITEMSIZE)
+            return memoryview(f.read(_ITEMSIZE)).cast("q")[0]
+
+    def first_timestamp(self, asset: str, interval: str = "1d") -> Optional[int]:
+        """First stored timestamp in epoch milliseconds."""
+        directory = self._dir(asset, interval)
+        if self._rows(directory) == 0:
+            return None
+        with open(directory / "timestamp.bin", "rb") as f:
+            return memoryview(f.read(_ITEMSIZE)).cast("q")[0]
+
+    def read(
+        self,
+        asset: str,
+        interval: str = "1d",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> OHLCVFrame:
+        """Memory-map a series and return the [start, end) slice."""
+        directory = self._dir(asset, interval)
+        n = self._rows(directory)
+        if n == 0:
+            return OHLCVFrame.empty()
+
+        maps = []
+        columns = {}
+        for column in COLUMNS:
+            with open(directory / f"{column}.bin", "rb") as f:
+                mapped = mmap.mmap(f.fileno(), n * _ITEMSIZE, access=mmap.ACCESS_READ)
+            maps.append(mapped)
+            columns[column] = memoryview(mapped).cast(_FORMATS[column])
+
+        frame = OHLCVFrame(columns, aware=self._meta(directory).get("aware", True), _maps=tuple(maps))
+        return frame.between(start, end) if (start or end) else frame
+
+    def append(self, asset: str, interval: str, candles: List["OHLCV"]) -> int:
+        """
+        Append candles newer than the last stored one.
+
+        Older or duplicate timestamps are skipped, never rewritten.
+        Returns the number of rows written.
+        """
+        if not candles:
+            return 0
+        rows = [
+            (_to_ms(c.timestamp), float(c.open), float(c.high), float(c.low), float(c.close), float(c.volume))
+            for c in candles
+        ]
+        return self._append_rows(asset, interval, rows, aware=candles[0].timestamp.tzinfo is not None)
+
+    def _append_rows(self, asset: str, interval: str, rows: List[tuple], aware: bool) -> int:
+        directory = self._dir(asset, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        n = self._rows(directory)
+        last = self.last_timestamp(asset, interval) if n else None
+
+        fresh = []
+        for row in sorted(rows):
+            if last is not None and row[0] <= last:
+                continue
+            fresh.append(row)
+            last = row[0]
+        if not fresh:
+            return 0
+
+        if not self._meta(directory):
+            self._write_meta(directory, asset=asset.upper(), interval=interval, aware=aware)
+
+        for i, column in enumerate(COLUMNS):
+            values = memoryview(bytearray(len(fresh) * _ITEMSIZE)).cast(_FORMATS[column])
+            for j, row in enumerate(fresh):
+                values[j] = row[i]
+            with open(directory / f"{column}.bin", "ab") as f:
+                f.truncate(n * _ITEMSIZE)  # Drop any torn row from an earlier crash
+                f.write(values.tobytes())
+        return len(fresh)
+
+    def _prepend_rows(self, asset: str, interval: str, rows: List[tuple]) -> int:
+        """
+        Insert rows older than the first stored one.
+
+        The only non-append write: the series is rewritten into a sibling
+        directory and swapped in, so readers see either the old or the new
+        series. Returns the number of rows inserted.
+        """
+        directory = self._dir(asset, interval)
+        n = self._rows(directory)
+        first = self.first_timestamp(asset, interval)
+        older = sorted({row[0]: row for row in rows if first is None or row[0] < first}.values())
+        if not older or n == 0:
+            return 0
+
+        staging = directory.with_name(directory.name + ".rewrite")
+        old = directory.with_name(directory.name + ".old")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for i, column in enumerate(COLUMNS):
+            values = memoryview(bytearray(len(older) * _ITEMSIZE)).cast(_FORMATS[column])
+            for j, row in enumerate(older):
+                values[j] = row[i]
+            with open(directory / f"{column}.bin", "rb") as src, open(staging / f"{column}.bin", "wb") as dst:
+                dst.write(values.tobytes())
+                dst.write(src.read(n * _ITEMSIZE))
+        shutil.copy2(directory / "meta.json", staging / "meta.json")
+
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(directory, old)
+        os.replace(staging, directory)
+        shutil.rmtree(old, ignore_errors=True)
+        return len(older)
+
+    def clear(self, asset: str, interval: str = "1d"):
+        """Delete one stored series."""
+        directory = self._dir(asset, interval)
+        for column in COLUMNS:
+            (directory / f"{column}.bin").unlink(missing_ok=True)
+        (directory / "meta.json").unlink(missing_ok=True)
+
+    def import_csv(self, filepath: str, asset: str, interval: str = "1d") -> int:
+        """
+        Append a CSV export (timestamp/date, open, high, low, close, volume).
+
+        Parses floats straight into the columns instead of building
+        Decimals row by row; returns rows written.
+        """
+        rows = []
+        aware = True
+        with open(filepath, "r") as f:
+            for row in csv.DictReader(f):
+                date_str = row.get("timestamp") or row.get("date") or row.get("Date")
+                try:
+                    if "T" in date_str:
+                        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+                    else:
+                        dt = datetime.strptime(date_str, "%Y-%m-%d")
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                aware = dt.tzinfo is not None
+                rows.append((
+                    _to_ms(dt),
+                    float(row.get("open") or row.get("Open", 0)),
+                    float(row.get("high") or row.get("High", 0)),
+                    float(row.get("low") or row.get("Low", 0)),
+                    float(row.get("close") or row.get("Close", 0)),
+                    float(row.get("volume") or row.get("Volume", 0)),
+                ))
+        return self._append_rows(asset, interval, rows, aware=aware)
+
+    async def sync(
+        self,
+        provider: "HistoricalDataProvider",
+        asset: str,
+        interval: str = "1d",
+        days: int = 365,
+    ) -> int:
+        """
+        Fetch only the candles missing from the stored series.
+
+        Normally that is the range after the last stored candle. When
+        `days` reaches further back than anything fetched before, the whole
+        window is fetched and the older candles are backfilled in front of
+        the series. The newest, still-forming candle is never stored, so
+        the series holds closed candles only. Returns rows added (0 when
+        the series was already current and no request was made).
+        """
+        interval_ms, cg_interval = INTERVALS[interval]
+        now_ms = int(time.time() * 1000)
+        if interval == "1h":
+            days = min(days, HOURLY_MAX_DAYS)
+        wanted_start = now_ms - days * 86_400_000
+        last = self.last_timestamp(asset, interval)
+
+        if last is None:
+            fetch_days = days
+        else:
+            directory = self._dir(asset, interval)
+            covered = min(self.first_timestamp(asset, interval),
+                          self._meta(directory).get("coverage_start", now_ms))
+            if covered > wanted_start + interval_ms:
+                fetch_days = days  # Requested range starts before the stored one
+            elif now_ms - last < 2 * interval_ms:
+                return 0  # No closed candle newer than the last one yet
+            else:
+                fetch_days = min(days, math.ceil((now_ms - last) / 86_400_000) + 1)
+
+        candles = await provider.fetch_coingecko(asset, fetch_days, interval=cg_interval)
+        closed = [c for c in candles if _to_ms(c.timestamp) + interval_ms <= now_ms]
+        if not closed:
+            return 0
+
+        rows = [
+            (_to_ms(c.timestamp), float(c.open), float(c.high), float(c.low), float(c.close), float(c.volume))
+            for c in closed
+        ]
+        added = self._prepend_rows(asset, interval, rows)
+        added += self._append_rows(asset, interval, rows, aware=closed[0].timestamp.tzinfo is not None)
+        if fetch_days == days:
+            # Remember how far back the source was asked, so a series that
+            # simply has no older data is not refetched on every run
+            directory = self._dir(asset, interval)
+            previous = self._meta(directory).get("coverage_start", now_ms)
+            self._write_meta(directory, coverage_start=min(previous, wanted_start))
+        return added
+
+    async def history(
+        self,
+        provider: "HistoricalDataProvider",
+        asset: str,
+        days: int = 365,
+        interval: Optional[str] = None,
+    ) -> List["OHLCV"]:
+        """
+        Sync, then return the last `days` of candles from disk.
+
+        interval defaults to default_interval(days): hourly up to 90 days and
+        daily beyond, the resolution fetch_coingecko() would return.
+        """
+        interval = interval or default_interval(days)
+        await self.sync(provider, asset, interval, days)
+        frame = self.read(asset, interval)
+        if not len(frame):
+            return []
+        start = frame.end - timedelta(days=days)
+        return frame.between(start=start).to_candles()
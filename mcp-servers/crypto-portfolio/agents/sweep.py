@@ -0,0 +1,648 @@
+"""
+Parameter Sweep Runner
+
+Tunes TradingStrategy configurations by backtesting many parameter sets
+across a process pool instead of one strategy at a time.
+
+Features:
+- Parameter spaces: full grid, random sampling, Latin hypercube
+- Walk-forward windows (in-sample / out-of-sample slices)
+- OHLCV packed once into a shared float64 block, viewed (not copied) by workers
+- Ranked table (out-of-sample Sharpe, max drawdown, trade count)
+- JSONL checkpoints so an interrupted sweep resumes where it stopped
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from .backtester import OHLCV, BacktestEngine, SimulatedSignalGenerator
+from .trading_agent import (
+    TradingConfig, TradingMode, DCASignalStrategy, SwingStrategy,
+    MeanReversionStrategy, GridStrategy, RebalanceStrategy,
+)
+
+
+STRATEGIES = {
+    "dca": DCASignalStrategy,
+    "swing": SwingStrategy,
+    "mean_reversion": MeanReversionStrategy,
+    "grid": GridStrategy,
+    "rebalance": RebalanceStrategy,
+}
+
+# Parameters that configure the BacktestEngine rather than TradingConfig
+ENGINE_PARAMS = ("fee_rate", "slippage_rate")
+
+
+# =============================================================================
+# PARAMETER SPACES
+# =============================================================================
+
+@dataclass(frozen=True)
+class ParamRange:
+    """Continuous (or integer) range sampled by random/LHS sweeps."""
+    low: float
+    high: float
+    integer: bool = False
+
+    def at(self, u: float) -> Any:
+        """Map u in [0, 1) onto the range."""
+        if self.integer:
+            span = int(self.high) - int(self.low) + 1
+            return int(self.low) + min(int(u * span), span - 1)
+        return self.low + u * (self.high - self.low)
+
+
+def _choose(values: Any, u: float) -> Any:
+    if isinstance(values, ParamRange):
+        return values.at(u)
+    values = list(values)
+    return values[min(int(u * len(values)), len(values) - 1)]
+
+
+def grid(space: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of discrete parameter values."""
+    for name, values in space.items():
+        if isinstance(values, ParamRange):
+            raise ValueError(f"grid() needs explicit values for {name!r}, got a range")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(list(space[n]) for n in names))]
+
+
+def random_samples(space: Dict[str, Any], n: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """n independent uniform draws; lists are choices, ParamRange is continuous."""
+    rng = random.Random(seed)
+    return [{name: _choose(values, rng.random()) for name, values in space.items()} for _ in range(n)]
+
+
+def latin_hypercube(space: Dict[str, Any], n: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    n Latin-hypercube samples.
+
+    Each parameter's [0, 1) axis is cut into n strata and every stratum is
+    used exactly once, so n samples cover each dimension evenly.
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for name in space:
+        strata = [(k + rng.random()) / n for k in range(n)]
+        rng.shuffle(strata)
+        columns[name] = strata
+    return [{name: _choose(space[name], columns[name][i]) for name in space} for i in range(n)]
+
+
+def parse_space(spec: str) -> Dict[str, Any]:
+    """
+    Parse a CLI space spec.
+
+    "name=a,b,c" gives discrete values and "name=low:high" a ParamRange
+    (integer when both bounds are integers); entries are separated by ";".
+        risk_limits.max_position_size_pct=0.05:0.3;dca_frequency_hours=12,24
+    """
+    def _number(text):
+        text = text.strip()
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+
+    space = {}
+    for entry in filter(None, (e.strip() for e in spec.split(";"))):
+        name, sep, values = entry.partition("=")
+        if not sep or not values.strip():
+            raise ValueError(f"Bad parameter spec: {entry!r}")
+        if ":" in values:
+            low, high = (_number(v) for v in values.split(":", 1))
+            space[name.strip()] = ParamRange(low, high, integer=isinstance(low, int) and isinstance(high, int))
+        else:
+            space[name.strip()] = [_number(v) for v in values.split(",")]
+    return space
+
+
+# =============================================================================
+# WALK-FORWARD WINDOWS
+# =============================================================================
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Bar index ranges [start, end) for one walk-forward step."""
+    index: int
+    train: Optional[Tuple[int, int]]
+    test: Tuple[int, int]
+
+
+def walk_forward_windows(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+) -> List[WalkForwardWindow]:
+    """
+    Rolling (or anchored) in-sample/out-of-sample splits.
+
+    Windows advance by `step` bars (default test_bars, i.e. non-overlapping
+    test periods). With anchored=True every train slice starts at bar 0.
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive")
+    step = step or test_bars
+
+    windows = []
+    start = 0
+    while start + train_bars + test_bars <= n_bars:
+        train_start = 0 if anchored else start
+        split = start + train_bars
+        windows.append(WalkForwardWindow(
+            index=len(windows),
+            train=(train_start, split),
+            test=(split, split + test_bars),
+        ))
+        start += step
+    return windows
+
+
+def full_window(n_bars: int) -> List[WalkForwardWindow]:
+    """A single out-of-sample window spanning all bars (no walk-forward)."""
+    return [WalkForwardWindow(index=0, train=None, test=(0, n_bars))]
+
+
+# =============================================================================
+# SHARED OHLCV
+# =============================================================================
+
+# Packed column order: wall-clock microseconds since 1970-01-01, then prices
+_PACKED_FIELDS = ("open", "high", "low", "close", "volume")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _wall_us(ts: datetime) -> int:
+    """Wall-clock microseconds since 1970 (tzinfo is carried separately)."""
+    delta = ts.replace(tzinfo=None) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+class SharedOHLCV:
+    """
+    OHLCV history published once into a shared-memory block.
+
+    Candles are packed into one float64 array of shape (assets, bars, 6):
+    timestamp (wall-clock microseconds) plus open/high/low/close/volume.
+    Workers map the block with np.frombuffer, so there is one copy of the
+    data however many workers run, and OHLCV objects are only built for
+    the bars of the window a task backtests. Prices go through float64,
+    which is exact for the float-derived Decimals every data source here
+    produces.
+    """
+
+    def __init__(self, data: Dict[str, List[OHLCV]]):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("SharedOHLCV requires numpy")
+        self.assets = list(data)
+        lengths = {len(data[a]) for a in self.assets}
+        if len(lengths) > 1:
+            raise ValueError("SharedOHLCV needs the same number of bars for every asset")
+        self.n_bars = lengths.pop() if lengths else 0
+        self.tzinfos = [data[a][0].timestamp.tzinfo if data[a] else None for a in self.assets]
+
+        shape = (len(self.assets), self.n_bars, 1 + len(_PACKED_FIELDS))
+        self._shm = shared_memory.SharedMemory(create=True, size=max(8 * math.prod(shape), 1))
+        packed = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        for i, asset in enumerate(self.assets):
+            if self.n_bars:
+                packed[i] = [
+                    (_wall_us(c.timestamp), float(c.open), float(c.high),
+                     float(c.low), float(c.close), float(c.volume))
+                    for c in data[asset]
+                ]
+        del packed  # Release the buffer export so close() can unmap
+        self.fingerprint = dataset_fingerprint(data)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def spec(self) -> Tuple[str, List[str], int, List[Any]]:
+        """Everything a worker needs to attach (small; pickled per worker)."""
+        return (self.name, self.assets, self.n_bars, self.tzinfos)
+
+    @staticmethod
+    def attach(spec: Tuple[str, List[str], int, List[Any]]) -> "SharedOHLCVView":
+        return SharedOHLCVView(*spec)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedOHLCVView:
+    """Worker-side zero-copy view of a SharedOHLCV block."""
+
+    def __init__(self, name: str, assets: List[str], n_bars: int, tzinfos: List[Any]):
+        self.assets = list(assets)
+        self.n_bars = n_bars
+        self.tzinfos = dict(zip(self.assets, tzinfos))
+        self._shm = shared_memory.SharedMemory(name=name)
+        width = 1 + len(_PACKED_FIELDS)
+        self.array = np.frombuffer(
+            self._shm.buf, dtype=np.float64, count=len(self.assets) * n_bars * width,
+        ).reshape(len(self.assets), n_bars, width)
+
+    def candles(self, asset: str, start: int = 0, end: Optional[int] = None) -> List[OHLCV]:
+        """Build OHLCV objects for bars [start, end) of one asset."""
+        tz = self.tzinfos[asset]
+        rows = self.array[self.assets.index(asset), start:end].tolist()
+        return [
+            OHLCV(
+                timestamp=(_EPOCH + timedelta(microseconds=int(ts))).replace(tzinfo=tz),
+                open=Decimal(repr(o)),
+                high=Decimal(repr(h)),
+                low=Decimal(repr(lo)),
+                close=Decimal(repr(c)),
+                volume=Decimal(repr(v)),
+            )
+            for ts, o, h, lo, c, v in rows
+        ]
+
+    def slice(self, start: int = 0, end: Optional[int] = None) -> Dict[str, List[OHLCV]]:
+        return {asset: self.candles(asset, start, end) for asset in self.assets}
+
+    def close(self):
+        self.array = None
+        self._shm.close()
+
+
+def dataset_fingerprint(data: Dict[str, List[OHLCV]]) -> str:
+    """Stable id for a dataset (hashes every candle) so checkpoints never mix data."""
+    h = hashlib.sha1()
+    for asset in sorted(data):
+        candles = data[asset]
+        h.update(f"{asset}|{len(candles)}\n".encode())
+        for c in candles:
+            h.update(
+                f"{c.timestamp.isoformat()}|{c.open}|{c.high}|{c.low}|{c.close}|{c.volume}\n".encode()
+            )
+    return h.hexdigest()[:16]
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+_worker_data: Optional[Any] = None
+
+
+def _init_worker(spec: Optional[Tuple] = None, data: Optional[Dict[str, List[OHLCV]]] = None):
+    """Attach to the shared block, or keep a private copy when numpy is missing."""
+    global _worker_data
+    _worker_data = SharedOHLCV.attach(spec) if spec is not None else data
+
+
+def _coerce(current: Any, value: Any) -> Any:
+    """Convert a sampled value to the type of the field it replaces."""
+    if isinstance(current, Decimal):
+        return Decimal(str(value))
+    if isinstance(current, bool):
+        return bool(value)
+    if isinstance(current, int):
+        return int(round(value))
+    return value
+
+
+def build_config(params: Dict[str, Any], assets: List[str], initial_capital: float) -> TradingConfig:
+    """TradingConfig for a parameter set; dotted names reach nested dataclasses."""
+    config = TradingConfig(
+        mode=TradingMode.BACKTEST,
+        supported_assets=list(assets),
+        dca_base_amount=Decimal(str(initial_capital / 100)),
+        dca_frequency_hours=24,
+    )
+    for name, value in params.items():
+        if name in ENGINE_PARAMS:
+            continue
+        target = config
+        *path, attr = name.split(".")
+        for part in path:
+            target = getattr(target, part)
+        if not is_dataclass(target) or attr not in {f.name for f in fields(target)}:
+            raise ValueError(f"Unknown strategy parameter: {name}")
+        setattr(target, attr, _coerce(getattr(target, attr), value))
+    return config
+
+
+def _slice(data: Any, bounds: Tuple[int, int]) -> Dict[str, List[OHLCV]]:
+    """Bars [start, end) plus the engine's indicator warmup before start."""
+    start, end = bounds
+    warm_start = max(0, start - SimulatedSignalGenerator.WARMUP)
+    if isinstance(data, SharedOHLCVView):
+        return data.slice(warm_start, end)
+    return {asset: candles[warm_start:end] for asset, candles in data.items()}
+
+
+def _backtest(task: "SweepTask", data: Any, bounds: Tuple[int, int]) -> Dict[str, Any]:
+    config = build_config(task.params, task.assets, task.initial_capital)
+    strategy = STRATEGIES[task.strategy](config)
+    engine_kwargs = {k: Decimal(str(task.params[k])) for k in ENGINE_PARAMS if k in task.params}
+    engine = BacktestEngine(initial_capital=Decimal(str(task.initial_capital)), **engine_kwargs)
+
+    async def _run():
+        try:
+            return await engine.run(strategy, assets=task.assets, data=_slice(data, bounds))
+        finally:
+            await engine.close()
+
+    # The engine narrates every run; keep worker output quiet
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(_run())
+    return asdict(result.metrics)
+
+
+def run_task(task: "SweepTask", data: Optional[Dict[str, List[OHLCV]]] = None) -> Dict[str, Any]:
+    """Backtest one (params, window) pair; errors are recorded, not raised."""
+    data = data if data is not None else _worker_data
+    record = task.to_record()
+    try:
+        if task.window.train is not None:
+            record["train"] = _backtest(task, data, task.window.train)
+        record["test"] = _backtest(task, data, task.window.test)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+# =============================================================================
+# SWEEP RUNNER
+# =============================================================================
+
+@dataclass
+class SweepTask:
+    """One unit of work sent to a worker."""
+    strategy: str
+    params: Dict[str, Any]
+    window: WalkForwardWindow
+    assets: List[str]
+    initial_capital: float
+    dataset: str
+
+    @property
+    def key(self) -> str:
+        return json.dumps(
+            [self.dataset, self.strategy, self.initial_capital, self.window.index, self.params],
+            sort_keys=True, default=str,
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "dataset": self.dataset,
+            "strategy": self.strategy,
+            "params": self.params,
+            "window": asdict(self.window),
+        }
+
+
+@dataclass
+class SweepRow:
+    """Aggregated performance of one parameter set across all windows."""
+    strategy: str
+    params: Dict[str, Any]
+    windows: int
+    sharpe_ratio: float            # Mean out-of-sample Sharpe
+    max_drawdown_pct: float        # Worst out-of-sample drawdown
+    total_trades: int              # Out-of-sample trades across windows
+    total_return_pct: float        # Mean out-of-sample return
+    train_sharpe_ratio: Optional[float] = None
+    errors: int = 0
+
+
+class SweepRunner:
+    """
+    Fans strategy backtests out over a process pool.
+
+    Each (parameter set, walk-forward window) pair is one task. Completed
+    tasks are appended to a JSONL checkpoint as they finish; rerunning the
+    same sweep with the same checkpoint skips them.
+    """
+
+    def __init__(
+        self,
+        data: Dict[str, List[OHLCV]],
+        strategy: str = "swing",
+        assets: List[str] = None,
+        initial_capital: float = 10000,
+        windows: List[WalkForwardWindow] = None,
+        checkpoint_path: Optional[Path] = None,
+        workers: Optional[int] = None,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.assets = assets or list(data)
+        if not all(data.get(a) for a in self.assets):
+            raise ValueError("Missing historical data for some assets")
+
+        # Align once so every window indexes the same bars for all assets
+        n_bars = min(len(data[a]) for a in self.assets)
+        self.data = {a: data[a][-n_bars:] for a in self.assets}
+        self.n_bars = n_bars
+
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.windows = windows or full_window(n_bars)
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.workers = workers or os.cpu_count() or 1
+        self.dataset = dataset_fingerprint(self.data)
+
+    def tasks(self, param_sets: List[Dict[str, Any]]) -> List[SweepTask]:
+        return [
+            SweepTask(
+                strategy=self.strategy,
+                params=dict(params),
+                window=window,
+                assets=self.assets,
+                initial_capital=self.initial_capital,
+                dataset=self.dataset,
+            )
+            for params in param_sets
+            for window in self.windows
+        ]
+
+    def load_checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        """Completed records for this dataset, keyed by task key."""
+        done = {}
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return done
+        with open(self.checkpoint_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line from an interrupted run
+                if record.get("dataset") == self.dataset:
+                    done[record["key"]] = record
+        return done
+
+    def run(
+        self,
+        param_sets: List[Dict[str, Any]],
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run every pending task and return all records (resumed + new).
+
+        Args:
+            param_sets: Parameter dicts from grid(), random_samples(), etc.
+            progress: Optional callback(completed, total)
+        """
+        for params in param_sets:
+            build_config(params, self.assets, self.initial_capital)  # Fail fast on typos
+
+        all_tasks = self.tasks(param_sets)
+        done = self.load_checkpoint()
+        wanted = {t.key for t in all_tasks}
+        records = [r for k, r in done.items() if k in wanted]
+        pending = [t for t in all_tasks if t.key not in done]
+        total = len(all_tasks)
+
+        checkpoint = None
+        if self.checkpoint_path:
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            checkpoint = open(self.checkpoint_path, "a")
+
+        def _record(record):
+            records.append(record)
+            if checkpoint:
+                checkpoint.write(json.dumps(record, default=str) + "\n")
+                checkpoint.flush()
+            if progress:
+                progress(len(records), total)
+
+        try:
+            if self.workers <= 1 or len(pending) <= 1:
+                for task in pending:
+                    _record(run_task(task, self.data))
+            else:
+                with contextlib.ExitStack() as stack:
+                    if NUMPY_AVAILABLE:
+                        shared = stack.enter_context(SharedOHLCV(self.data))
+                        initargs = (shared.spec,)
+                    else:
+                        initargs = (None, self.data)
+                    pool = stack.enter_context(ProcessPoolExecutor(
+                        max_workers=min(self.workers, len(pending)),
+                        initializer=_init_worker,
+                        initargs=initargs,
+                    ))
+                    futures = [pool.submit(run_task, task) for task in pending]
+                    for future in as_completed(futures):
+                        _record(future.result())
+        finally:
+            if checkpoint:
+                checkpoint.close()
+
+        return records
+
+
+# =============================================================================
+# RANKING & REPORTING
+# =============================================================================
+
+def rank_results(records: List[Dict[str, Any]]) -> List[SweepRow]:
+    """
+    Aggregate per-window records by parameter set and rank them.
+
+    Sorted by mean out-of-sample Sharpe (desc), then worst drawdown (asc),
+    then trade count (desc).
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        key = json.dumps([record["strategy"], record["params"]], sort_keys=True, default=str)
+        groups.setdefault(key, []).append(record)
+
+    rows = []
+    for group in groups.values():
+        ok = [r for r in group if "test" in r]
+        errors = len(group) - len(ok)
+        if not ok:
+            continue
+        tests = [r["test"] for r in ok]
+        trains = [r["train"] for r in ok if "train" in r]
+        rows.append(SweepRow(
+            strategy=group[0]["strategy"],
+            params=group[0]["params"],
+            windows=len(ok),
+            sharpe_ratio=statistics.mean(m["sharpe_ratio"] for m in tests),
+            max_drawdown_pct=max(m["max_drawdown_pct"] for m in tests),
+            total_trades=sum(m["total_trades"] for m in tests),
+            total_return_pct=statistics.mean(m["total_return_pct"] for m in tests),
+            train_sharpe_ratio=statistics.mean(m["sharpe_ratio"] for m in trains) if trains else None,
+            errors=errors,
+        ))
+
+    rows.sort(key=lambda r: (
+        -r.sharpe_ratio if math.isfinite(r.sharpe_ratio) else math.inf,
+        r.max_drawdown_pct,
+        -r.total_trades,
+    ))
+    return rows
+
+
+def format_sweep_table(rows: List[SweepRow], top: int = 20) -> str:
+    """Ranked text table of sweep results."""
+    lines = [
+        "",
+        "╔" + "═" * 98 + "╗",
+        "║" + "PARAMETER SWEEP".center(98) + "║",
+        "╚" + "═" * 98 + "╝",
+        "",
+        f"{'#':>3} {'Sharpe':>8} {'IS Sharpe':>10} {'MaxDD':>8} {'Trades':>7} {'Return':>9} {'Win':>4}  Parameters",
+        "-" * 100,
+    ]
+    for rank, row in enumerate(rows[:top], 1):
+        train = f"{row.train_sharpe_ratio:>10.2f}" if row.train_sharpe_ratio is not None else f"{'-':>10}"
+        params = ", ".join(f"{k}={_fmt(v)}" for k, v in sorted(row.params.items()))
+        lines.append(
+            f"{rank:>3} {row.sharpe_ratio:>8.2f} {train} "
+            f"{row.max_drawdown_pct:>7.1f}% {row.total_trades:>7} "
+            f"{row.total_return_pct:>+8.1f}% {row.windows:>4}  {params}"
+        )
+    lines.append("-" * 100)
+    failed = sum(r.errors for r in rows)
+    lines.append(f"{len(rows)} parameter sets ranked" + (f", {failed} failed windows" if failed else ""))
+    return "\n".join(lines)
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
@@ -112,15 +112,16 @@ MACHINE LEARNING DERIVED (216-225)
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any
 import asyncio
-import aiohttp
 import logging
 import math
 import statistics
 
+from data.fetch import FetchService, get_fetch_service
+
 logger = logging.getLogger(__name__)
 
 
@@ -213,22 +214,15 @@ class UltraSignalsAnalyzer:
     }
 
     def __init__(self):
-        self._session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, Tuple[Any, datetime]] = {}
-        self._cache_ttl = timedelta(minutes=5)
         self._price_history: Dict[str, List[Tuple[datetime, float]]] = {}
         self._volume_history: Dict[str, List[Tuple[datetime, float]]] = {}
 
-    async def _get_session(self) -> aiohttp.ClientSession:
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            )
-        return self._session
+    async def _get_session(self) -> FetchService:
+        """Shared pooled/caching fetch service (same get() interface as aiohttp)."""
+        return get_fetch_service()
 
     async def close(self):
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """No-op: the shared fetch service outlives any one analyzer."""
 
     def _unavailable_signal(self, id: int, name: str, category: str,
                            subcategory: str = "") -> UltraSignalResult:
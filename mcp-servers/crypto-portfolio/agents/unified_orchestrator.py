@@ -44,6 +44,8 @@ from enum import Enum
 import asyncio
 import logging
 
+from data.fetch import get_fetch_service
+
 from .extended_signals import ExtendedSignalsAnalyzer, SignalStrength, SignalResult
 from .advanced_onchain import AdvancedOnChainAnalyzer, AdvancedSignalResult
 
@@ -176,6 +178,28 @@ class UnifiedSignalOrchestrator:
         await self._extended_analyzer.close()
         await self._advanced_analyzer.close()
 
+    async def analyze_many(self, assets: List[str]) -> Dict[str, UnifiedAnalysis]:
+        """
+        Analyze several assets concurrently.
+
+        Market-wide endpoints (Fear & Greed, global market cap, ...) are
+        fetched once and shared through the fetch service's cache and
+        in-flight coalescing, so upstream calls grow only with the
+        per-asset endpoints.
+        """
+        results = await asyncio.gather(*(self.analyze(a) for a in assets), return_exceptions=True)
+        analyses = {}
+        for asset, result in zip(assets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Unified analysis failed for {asset}: {result}")
+            else:
+                analyses[asset] = result
+        return analyses
+
+    def fetch_stats(self) -> Dict[str, Any]:
+        """Upstream call / cache hit counters per endpoint."""
+        return get_fetch_service().stats()
+
     async def analyze(self, asset: str = "BTC") -> UnifiedAnalysis:
         """
         Run complete unified analysis with all 135+ signals.
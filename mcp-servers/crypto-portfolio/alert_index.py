@@ -0,0 +1,340 @@
+"""
+Indexed Alert Triggers
+======================
+
+Trigger index and state journal shared by the alert engines
+(alerts.AlertMonitor and multi_alerts.MultiExchangeAlertMonitor).
+
+- Fixed-price triggers (price above/below, stop-loss, take-profit) sit in two
+  sorted books per price stream. A tick pops the prefix of "price >=" books
+  at or below it and the suffix of "price <=" books at or above it, so it
+  only touches alerts whose thresholds it actually crossed
+- Trailing stops sit in cohorts that share a peak. A new high merges every
+  cohort below it into one (min-heap by peak), and a max-heap by stop level
+  pops only the cohorts the price fell through
+- AlertJournal appends one JSON line per change instead of rewriting the
+  whole state file, and folds the journal into the state file once it
+  outgrows the state, so rewrites cost O(1) amortized per change
+
+Usage:
+    index = AlertIndex()
+    index.add_above("BTC", "a1", 100000)
+    index.add_trailing("BTC", "t1", distance=0.10, peak=97000)
+    triggered, raised = index.update("BTC", 101000)   # [("a1", None)], True
+"""
+
+import heapq
+import json
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from itertools import count
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Minimum journal entries before they're folded into the state file
+COMPACT_AFTER = 1000
+
+# (alert key, peak) pairs; peak is set for trailing stops only
+Triggered = List[Tuple[Hashable, Optional[float]]]
+
+
+class _Cohort:
+    """Trailing stops sharing one peak; members is a heap of (distance, seq, key)."""
+
+    __slots__ = ("peak", "members", "version")
+
+    def __init__(self, peak: float):
+        self.peak = peak
+        self.members: List[Tuple[float, int, Hashable]] = []
+        self.version = 0
+
+
+class ThresholdIndex:
+    """Trigger index for one price stream (an asset, or an asset on one exchange)."""
+
+    def __init__(self):
+        # "price >= threshold" and "price <= threshold" books, sorted by threshold
+        self._above_prices: List[float] = []
+        self._above_keys: List[Hashable] = []
+        self._below_prices: List[float] = []
+        self._below_keys: List[Hashable] = []
+        self._fixed: Dict[Hashable, Tuple[str, float]] = {}  # key -> (book, threshold)
+
+        # Trailing stops: min-heap by peak, max-heap by stop level; entries carry
+        # the cohort version they were pushed with and are skipped once stale
+        self._trailing: Dict[Hashable, _Cohort] = {}
+        self._peaks: List[Tuple[float, int, int, _Cohort]] = []
+        self._stops: List[Tuple[float, int, int, _Cohort]] = []
+        self._seq = count()
+
+    def __len__(self) -> int:
+        return len(self._fixed) + len(self._trailing)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._fixed or key in self._trailing
+
+    # ==================== MEMBERSHIP ====================
+
+    def add_above(self, key: Hashable, threshold: float):
+        """Trigger once price >= threshold."""
+        self._insert("above", self._above_prices, self._above_keys, key, threshold)
+
+    def add_below(self, key: Hashable, threshold: float):
+        """Trigger once price <= threshold."""
+        self._insert("below", self._below_prices, self._below_keys, key, threshold)
+
+    def _insert(self, book: str, prices: List[float], keys: List[Hashable], key: Hashable, threshold: float):
+        self.remove(key)
+        i = bisect_right(prices, threshold)
+        prices.insert(i, threshold)
+        keys.insert(i, key)
+        self._fixed[key] = (book, threshold)
+
+    def add_trailing(self, key: Hashable, distance: float, peak: Optional[float] = None):
+        """
+        Trigger once price <= peak * (1 - distance), the peak rising with the price.
+
+        Args:
+            distance: Fraction below the peak (0.10 for 10%)
+            peak: Highest price seen so far; None starts from the next tick
+        """
+        self.remove(key)
+        cohort = _Cohort(peak or 0.0)
+        heapq.heappush(cohort.members, (distance, next(self._seq), key))
+        self._trailing[key] = cohort
+        self._push(cohort)
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop an alert from the index; returns False if it wasn't indexed."""
+        fixed = self._fixed.pop(key, None)
+        if fixed is not None:
+            book, threshold = fixed
+            prices, keys = ((self._above_prices, self._above_keys) if book == "above"
+                            else (self._below_prices, self._below_keys))
+            i = bisect_left(prices, threshold)
+            while keys[i] != key:
+                i += 1
+            del prices[i]
+            del keys[i]
+            return True
+        # Trailing members are dropped lazily when their cohort is next popped
+        return self._trailing.pop(key, None) is not None
+
+    def peak(self, key: Hashable) -> Optional[float]:
+        """Current peak of a trailing stop."""
+        cohort = self._trailing.get(key)
+        return cohort.peak if cohort else None
+
+    def _push(self, cohort: _Cohort):
+        cohort.version += 1
+        seq = next(self._seq)
+        level = cohort.peak * (1 - cohort.members[0][0])
+        heapq.heappush(self._peaks, (cohort.peak, cohort.version, seq, cohort))
+        heapq.heappush(self._stops, (-level, cohort.version, seq, cohort))
+
+    # ==================== TICKS ====================
+
+    def update(self, price: float) -> Tuple[Triggered, bool]:
+        """
+        Apply a price; returns the triggered alerts (now removed from the
+        index) and whether any trailing stop's peak rose.
+        """
+        triggered: Triggered = []
+
+        n = bisect_right(self._above_prices, price)
+        if n:
+            triggered.extend((key, None) for key in self._above_keys[:n])
+            del self._above_prices[:n]
+            del self._above_keys[:n]
+
+        i = bisect_left(self._below_prices, price)
+        if i < len(self._below_prices):
+            triggered.extend((key, None) for key in self._below_keys[i:])
+            del self._below_prices[i:]
+            del self._below_keys[i:]
+
+        for key, _ in triggered:
+            del self._fixed[key]
+
+        raised = self._raise_peaks(price)
+        self._pop_stops(price, triggered)
+        return triggered, raised
+
+    def _raise_peaks(self, price: float) -> bool:
+        """Merge every cohort whose peak is below price into one cohort at price."""
+        merged = None
+        while self._peaks and self._peaks[0][0] < price:
+            _, version, _, cohort = heapq.heappop(self._peaks)
+            if version != cohort.version:
+                continue
+            cohort.version += 1  # Retire its stop-level entry too
+            if merged is None:
+                merged = cohort
+                continue
+            # Smaller into larger keeps merges O(n log^2 n) overall
+            if len(cohort.members) > len(merged.members):
+                merged, cohort = cohort, merged
+            for member in cohort.members:
+                if self._trailing.get(member[2]) is cohort:
+                    self._trailing[member[2]] = merged
+                    heapq.heappush(merged.members, member)
+
+        if merged is None:
+            return False
+        merged.peak = price
+        self._push(merged)
+        return True
+
+    def _pop_stops(self, price: float, triggered: Triggered):
+        """Fire trailing stops whose stop level price fell to or through."""
+        while self._stops and -self._stops[0][0] >= price:
+            _, version, _, cohort = heapq.heappop(self._stops)
+            if version != cohort.version:
+                continue
+            members = cohort.members
+            while members:
+                distance, _, key = members[0]
+                if self._trailing.get(key) is not cohort:
+                    heapq.heappop(members)  # Removed since it was pushed
+                elif cohort.peak * (1 - distance) >= price:
+                    heapq.heappop(members)
+                    del self._trailing[key]
+                    triggered.append((key, cohort.peak))
+                else:
+                    break
+            if members:
+                self._push(cohort)
+            else:
+                cohort.version += 1
+
+
+class AlertIndex:
+    """ThresholdIndex per price stream, with alerts addressed by key alone."""
+
+    def __init__(self):
+        self.books: Dict[Hashable, ThresholdIndex] = {}
+        self._book_of: Dict[Hashable, Hashable] = {}  # alert key -> book
+
+    def __len__(self) -> int:
+        return len(self._book_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._book_of
+
+    def _book(self, book: Hashable, key: Hashable) -> ThresholdIndex:
+        self.remove(key)
+        self._book_of[key] = book
+        index = self.books.get(book)
+        if index is None:
+            index = self.books[book] = ThresholdIndex()
+        return index
+
+    def add_above(self, book: Hashable, key: Hashable, threshold: float):
+        self._book(book, key).add_above(key, threshold)
+
+    def add_below(self, book: Hashable, key: Hashable, threshold: float):
+        self._book(book, key).add_below(key, threshold)
+
+    def add_trailing(self, book: Hashable, key: Hashable, distance: float, peak: Optional[float] = None):
+        self._book(book, key).add_trailing(key, distance, peak)
+
+    def remove(self, key: Hashable) -> bool:
+        book = self._book_of.pop(key, None)
+        if book is None:
+            return False
+        index = self.books[book]
+        index.remove(key)
+        if not len(index):
+            del self.books[book]
+        return True
+
+    def peak(self, key: Hashable) -> Optional[float]:
+        book = self._book_of.get(key)
+        return self.books[book].peak(key) if book is not None else None
+
+    def update(self, book: Hashable, price: float) -> Tuple[Triggered, bool]:
+        """Apply a price to one book; see ThresholdIndex.update."""
+        index = self.books.get(book)
+        if index is None:
+            return [], False
+        triggered, raised = index.update(price)
+        for key, _ in triggered:
+            del self._book_of[key]
+        if not len(index):
+            del self.books[book]
+        return triggered, raised
+
+
+class AlertJournal:
+    """
+    Append-only JSON-lines log of changes to a JSON state file.
+
+    The state file is only rewritten by compact(); every other change is one
+    appended line in "<state file>.journal". Loading is the state file plus
+    read() replayed in order, so entries must be idempotent (whole records,
+    deletes, max-style peaks).
+    """
+
+    def __init__(self, state_path: str, compact_after: int = COMPACT_AFTER):
+        self.state_path = state_path
+        self.path = f"{state_path}.journal"
+        self.compact_after = compact_after
+        self.entries = len(self.read())
+        self._file = None
+
+    def read(self) -> List[dict]:
+        """Journal entries in order; a torn final line from a crash is ignored."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable journal entry in {self.path}")
+        return entries
+
+    def append(self, entry: dict):
+        self.extend([entry])
+
+    def extend(self, entries: Iterable[dict]):
+        if self._file is None:
+            self._file = self._open()
+        lines = [json.dumps(entry, default=str) + "\n" for entry in entries]
+        self._file.write("".join(lines))
+        self._file.flush()
+        self.entries += len(lines)
+
+    def _open(self):
+        """Open for appending, first cutting off a torn final line from a crash."""
+        if os.path.exists(self.path):
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    # Otherwise the next record would be glued onto the torn one
+                    logger.warning(f"Truncating torn final entry in {self.path}")
+                    f.truncate(data.rfind(b"\n") + 1)
+        return open(self.path, "a")
+
+    def should_compact(self, records: int = 0) -> bool:
+        """Due once the journal is longer than the state it would be folded into."""
+        return self.entries >= max(self.compact_after, records)
+
+    def compact(self, state):
+        """Atomically rewrite the state file, then start an empty journal."""
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, default=str)
+        os.replace(tmp_path, self.state_path)
+
+        self.close()
+        open(self.path, "w").close()
+        self.entries = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
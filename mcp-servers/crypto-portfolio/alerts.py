@@ -2,16 +2,22 @@
 Price Alert Monitor
 
 Monitor positions for stop-loss and take-profit triggers.
+
+Armed alerts live in an AlertIndex, so each price only touches the alerts it
+crossed, and changes are appended to alerts_state.json.journal rather than
+rewriting alerts_state.json.
 """
 
 import json
 import time
 import threading
+import uuid
 from datetime import datetime
 from typing import Dict, List, Optional, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+from alert_index import AlertIndex, AlertJournal
 from exchanges import CoinbaseClient
 from trading_engine import TradingEngine, TradeRecord
 from config import TradingConfig
@@ -39,6 +45,42 @@ class Alert:
     enabled: bool = True
     triggered: bool = False
     triggered_at: Optional[datetime] = None
+    alert_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+
+    def to_dict(self) -> dict:
+        return {
+            "alert_id": self.alert_id,
+            "asset": self.asset,
+            "alert_type": self.alert_type.value,
+            "trigger_percent": self.trigger_percent,
+            "trigger_price": self.trigger_price,
+            "reference_price": self.reference_price,
+            "peak_price": self.peak_price,
+            "action": self.action,
+            "sell_percent": self.sell_percent,
+            "enabled": self.enabled,
+            "triggered": self.triggered,
+            "triggered_at": self.triggered_at.isoformat() if self.triggered_at else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Alert':
+        alert = cls(
+            asset=data["asset"],
+            alert_type=AlertType(data["alert_type"]),
+            trigger_percent=data.get("trigger_percent"),
+            trigger_price=data.get("trigger_price"),
+            reference_price=data.get("reference_price"),
+            peak_price=data.get("peak_price"),
+            action=data.get("action", "NOTIFY"),
+            sell_percent=data.get("sell_percent", 100),
+            enabled=data.get("enabled", True),
+            triggered=data.get("triggered", False),
+            triggered_at=datetime.fromisoformat(data["triggered_at"]) if data.get("triggered_at") else None
+        )
+        if data.get("alert_id"):
+            alert.alert_id = data["alert_id"]
+        return alert
 
 
 @dataclass
@@ -80,6 +122,9 @@ class AlertMonitor:
         self.alert_config = self.config.alerts
 
         self.alerts: Dict[str, List[Alert]] = {}  # asset -> list of alerts
+        self.index = AlertIndex()                  # armed alerts by asset
+        self._alerts_by_id: Dict[str, Alert] = {}
+        self.journal = AlertJournal(self.STATE_FILE)
         self.events: List[AlertEvent] = []
         self.running = False
         self._thread: Optional[threading.Thread] = None
@@ -88,8 +133,9 @@ class AlertMonitor:
         # Track cost basis for reference
         self.cost_basis: Dict[str, float] = {}
 
-        self._init_from_config()
+        # Configured stop-loss/take-profit replace the saved ones for the same asset
         self._load_state()
+        self._init_from_config()
 
     def _init_from_config(self):
         """Initialize alerts from config."""
@@ -121,8 +167,7 @@ class AlertMonitor:
             self.alerts[asset] = []
 
         # Remove existing stop-loss for this asset
-        self.alerts[asset] = [a for a in self.alerts[asset]
-                             if a.alert_type != AlertType.STOP_LOSS]
+        self._drop_alerts(asset, AlertType.STOP_LOSS)
 
         # Get current/reference price
         ref_price = self._get_reference_price(asset)
@@ -136,7 +181,7 @@ class AlertMonitor:
             sell_percent=sell_percent
         )
         self.alerts[asset].append(alert)
-        self._save_state()
+        self._put_alert(alert)
 
         trigger_price = ref_price * (1 + percent/100) if ref_price else None
         print(f"🛑 Stop-loss set: {asset} at {percent}% (${trigger_price:.2f if trigger_price else 'N/A'})")
@@ -161,8 +206,7 @@ class AlertMonitor:
             self.alerts[asset] = []
 
         # Remove existing take-profit for this asset
-        self.alerts[asset] = [a for a in self.alerts[asset]
-                             if a.alert_type != AlertType.TAKE_PROFIT]
+        self._drop_alerts(asset, AlertType.TAKE_PROFIT)
 
         ref_price = self._get_reference_price(asset)
 
@@ -175,7 +219,7 @@ class AlertMonitor:
             sell_percent=sell_percent or self.alert_config.take_profit_sell_percent
         )
         self.alerts[asset].append(alert)
-        self._save_state()
+        self._put_alert(alert)
 
         trigger_price = ref_price * (1 + percent/100) if ref_price else None
         print(f"🎯 Take-profit set: {asset} at +{percent}% (${trigger_price:.2f if trigger_price else 'N/A'})")
@@ -200,8 +244,7 @@ class AlertMonitor:
             self.alerts[asset] = []
 
         # Remove existing trailing stop
-        self.alerts[asset] = [a for a in self.alerts[asset]
-                             if a.alert_type != AlertType.TRAILING_STOP]
+        self._drop_alerts(asset, AlertType.TRAILING_STOP)
 
         current_price = self.client.get_spot_price(asset)
 
@@ -215,7 +258,7 @@ class AlertMonitor:
             sell_percent=sell_percent
         )
         self.alerts[asset].append(alert)
-        self._save_state()
+        self._put_alert(alert)
 
         print(f"📈 Trailing stop set: {asset} at {trail_percent}% below peak (current: ${current_price:.2f if current_price else 'N/A'})")
 
@@ -240,7 +283,7 @@ class AlertMonitor:
             action=action
         )
         self.alerts[asset].append(alert)
-        self._save_state()
+        self._put_alert(alert)
 
         print(f"🔔 Price alert set: {asset} {direction} ${price:.2f}")
 
@@ -249,13 +292,10 @@ class AlertMonitor:
         if asset not in self.alerts:
             return
 
-        if alert_type:
-            self.alerts[asset] = [a for a in self.alerts[asset]
-                                 if a.alert_type != alert_type]
-        else:
+        self._drop_alerts(asset, alert_type)
+        if alert_type is None:
             del self.alerts[asset]
 
-        self._save_state()
         print(f"🗑️  Removed alerts for {asset}")
 
     def set_cost_basis(self, asset: str, price: float):
@@ -267,8 +307,10 @@ class AlertMonitor:
             for alert in self.alerts[asset]:
                 if self.alert_config.reference_price == "cost_basis":
                     alert.reference_price = price
+                    # Trailing stops don't use the reference price; keep their live peak in the index
+                    self._put_alert(alert, reindex=alert.alert_type != AlertType.TRAILING_STOP)
 
-        self._save_state()
+        self._journal({"op": "cost_basis", "asset": asset, "price": price})
         print(f"💵 Cost basis set: {asset} at ${price:.2f}")
 
     def _get_reference_price(self, asset: str) -> Optional[float]:
@@ -304,77 +346,51 @@ class AlertMonitor:
         """
         triggered_events = []
 
-        for asset, alerts in self.alerts.items():
+        for asset in list(self.index.books):
             current_price = self.client.get_spot_price(asset)
             if not current_price:
                 continue
-
-            for alert in alerts:
-                if not alert.enabled or alert.triggered:
-                    continue
-
-                event = self._check_single_alert(alert, current_price)
-                if event:
-                    triggered_events.append(event)
-                    self.events.append(event)
-
-                    # Notify callbacks
-                    for callback in self._callbacks:
-                        try:
-                            callback(event)
-                        except Exception as e:
-                            print(f"Callback error: {e}")
-
-        if triggered_events:
-            self._save_state()
+            triggered_events.extend(self.process_price(asset, current_price))
 
         return triggered_events
 
-    def _check_single_alert(self, alert: Alert, current_price: float) -> Optional[AlertEvent]:
-        """Check a single alert and return event if triggered."""
-        triggered = False
-        trigger_value = None
-
-        if alert.alert_type == AlertType.STOP_LOSS:
-            if alert.reference_price and alert.trigger_percent:
-                change = ((current_price - alert.reference_price) / alert.reference_price) * 100
-                if change <= alert.trigger_percent:
-                    triggered = True
-                    trigger_value = alert.trigger_percent
+    def process_price(self, asset: str, current_price: float) -> List[AlertEvent]:
+        """
+        Apply one price tick for an asset (e.g. from a websocket feed).
 
-        elif alert.alert_type == AlertType.TAKE_PROFIT:
-            if alert.reference_price and alert.trigger_percent:
-                change = ((current_price - alert.reference_price) / alert.reference_price) * 100
-                if change >= alert.trigger_percent:
-                    triggered = True
-                    trigger_value = alert.trigger_percent
-
-        elif alert.alert_type == AlertType.TRAILING_STOP:
-            # Update peak if price has risen
-            if current_price > (alert.peak_price or 0):
-                alert.peak_price = current_price
-
-            # Check if price has fallen enough from peak
-            if alert.peak_price and alert.trigger_percent:
-                drop = ((current_price - alert.peak_price) / alert.peak_price) * 100
-                if drop <= alert.trigger_percent:
-                    triggered = True
-                    trigger_value = alert.peak_price
-
-        elif alert.alert_type == AlertType.PRICE_ABOVE:
-            if alert.trigger_price and current_price >= alert.trigger_price:
-                triggered = True
+        Only alerts whose thresholds the price crossed are touched.
+        """
+        triggered, raised = self.index.update(asset, current_price)
+        if raised:
+            self._journal({"op": "peak", "asset": asset, "price": current_price})
+
+        events = []
+        for alert_id, peak in triggered:
+            alert = self._alerts_by_id[alert_id]
+            if alert.alert_type == AlertType.TRAILING_STOP:
+                alert.peak_price = peak
+                trigger_value = peak
+            elif alert.alert_type in (AlertType.PRICE_ABOVE, AlertType.PRICE_BELOW):
                 trigger_value = alert.trigger_price
+            else:
+                trigger_value = alert.trigger_percent
 
-        elif alert.alert_type == AlertType.PRICE_BELOW:
-            if alert.trigger_price and current_price <= alert.trigger_price:
-                triggered = True
-                trigger_value = alert.trigger_price
+            event = self._fire(alert, current_price, trigger_value)
+            self._put_alert(alert)
+            events.append(event)
+            self.events.append(event)
 
-        if not triggered:
-            return None
+            # Notify callbacks
+            for callback in self._callbacks:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Callback error: {e}")
 
-        # Handle the alert
+        return events
+
+    def _fire(self, alert: Alert, current_price: float, trigger_value) -> AlertEvent:
+        """Act on a triggered alert and return its event."""
         print(f"\n🚨 ALERT TRIGGERED: {alert.asset} {alert.alert_type.value}")
         print(f"   Current: ${current_price:.2f}, Trigger: {trigger_value}")
 
@@ -438,6 +454,8 @@ class AlertMonitor:
             print("No alerts configured.")
             return
 
+        self._sync_peaks()
+
         for asset, alerts in self.alerts.items():
             current = self.client.get_spot_price(asset)
             print(f"\n{asset} (Current: ${current:.2f if current else 'N/A'}):")
@@ -492,68 +510,128 @@ class AlertMonitor:
         if self._thread:
             self._thread.join(timeout=5)
             self._thread = None
+        self._save_state()
+
+    # ==================== PERSISTENCE ====================
+
+    def _index_alert(self, alert: Alert):
+        """Place an alert in the trigger index; disabled, triggered or incomplete ones are left out."""
+        self.index.remove(alert.alert_id)
+        if not alert.enabled or alert.triggered:
+            return
+
+        if alert.alert_type == AlertType.PRICE_ABOVE and alert.trigger_price:
+            self.index.add_above(alert.asset, alert.alert_id, alert.trigger_price)
+        elif alert.alert_type == AlertType.PRICE_BELOW and alert.trigger_price:
+            self.index.add_below(alert.asset, alert.alert_id, alert.trigger_price)
+        elif alert.alert_type in (AlertType.STOP_LOSS, AlertType.TAKE_PROFIT):
+            if alert.reference_price and alert.trigger_percent:
+                threshold = alert.reference_price * (1 + alert.trigger_percent / 100)
+                if alert.alert_type == AlertType.STOP_LOSS:
+                    self.index.add_below(alert.asset, alert.alert_id, threshold)
+                else:
+                    self.index.add_above(alert.asset, alert.alert_id, threshold)
+        elif alert.alert_type == AlertType.TRAILING_STOP and alert.trigger_percent:
+            self.index.add_trailing(alert.asset, alert.alert_id, -alert.trigger_percent / 100, alert.peak_price)
+
+    def _put_alert(self, alert: Alert, reindex: bool = True):
+        """Reindex (unless told not to) a new or changed alert and journal its record."""
+        self._alerts_by_id[alert.alert_id] = alert
+        self._sync_peak(alert)
+        if reindex:
+            self._index_alert(alert)
+        self._journal({"op": "put", "alert": alert.to_dict()})
+
+    def _journal(self, entry: dict):
+        """Append a journal entry, folding the journal into the state file once it is due."""
+        self.journal.append(entry)
+        if self.journal.should_compact(len(self._alerts_by_id)):
+            self._save_state()
+
+    def _drop_alerts(self, asset: str, alert_type: AlertType = None):
+        """Remove an asset's alerts (of one type, or all) and journal the removals."""
+        kept = []
+        for alert in self.alerts.get(asset, []):
+            if alert_type is None or alert.alert_type == alert_type:
+                self.index.remove(alert.alert_id)
+                self._alerts_by_id.pop(alert.alert_id, None)
+                self._journal({"op": "del", "alert_id": alert.alert_id})
+            else:
+                kept.append(alert)
+        self.alerts[asset] = kept
+
+    def _sync_peak(self, alert: Alert):
+        """Copy a trailing stop's peak from the index back onto the alert."""
+        if alert.alert_type == AlertType.TRAILING_STOP:
+            peak = self.index.peak(alert.alert_id)
+            if peak and peak > (alert.peak_price or 0):
+                alert.peak_price = peak
+
+    def _sync_peaks(self):
+        """Copy trailing-stop peaks from the index back onto the alerts."""
+        for alert in self._alerts_by_id.values():
+            self._sync_peak(alert)
 
     def _save_state(self):
-        """Save alert state to file."""
+        """Write the full alert state to file and start a fresh journal."""
+        self._sync_peaks()
         state = {
             "cost_basis": self.cost_basis,
-            "alerts": {}
+            "alerts": {
+                asset: [alert.to_dict() for alert in alerts]
+                for asset, alerts in self.alerts.items()
+            }
         }
-
-        for asset, alerts in self.alerts.items():
-            state["alerts"][asset] = []
-            for alert in alerts:
-                state["alerts"][asset].append({
-                    "asset": alert.asset,
-                    "alert_type": alert.alert_type.value,
-                    "trigger_percent": alert.trigger_percent,
-                    "trigger_price": alert.trigger_price,
-                    "reference_price": alert.reference_price,
-                    "peak_price": alert.peak_price,
-                    "action": alert.action,
-                    "sell_percent": alert.sell_percent,
-                    "enabled": alert.enabled,
-                    "triggered": alert.triggered,
-                    "triggered_at": alert.triggered_at.isoformat() if alert.triggered_at else None
-                })
-
-        with open(self.STATE_FILE, "w") as f:
-            json.dump(state, f, indent=2)
+        self.journal.compact(state)
 
     def _load_state(self):
-        """Load alert state from file."""
+        """Load alert state from file, then replay the journal over it."""
+        legacy = False
         try:
             with open(self.STATE_FILE, "r") as f:
                 state = json.load(f)
 
             self.cost_basis = state.get("cost_basis", {})
-
             for asset, alerts_data in state.get("alerts", {}).items():
-                if asset not in self.alerts:
-                    self.alerts[asset] = []
-
                 for data in alerts_data:
-                    alert = Alert(
-                        asset=data["asset"],
-                        alert_type=AlertType(data["alert_type"]),
-                        trigger_percent=data.get("trigger_percent"),
-                        trigger_price=data.get("trigger_price"),
-                        reference_price=data.get("reference_price"),
-                        peak_price=data.get("peak_price"),
-                        action=data.get("action", "NOTIFY"),
-                        sell_percent=data.get("sell_percent", 100),
-                        enabled=data.get("enabled", True),
-                        triggered=data.get("triggered", False),
-                        triggered_at=datetime.fromisoformat(data["triggered_at"]) if data.get("triggered_at") else None
-                    )
-
-                    # Don't duplicate alerts from config
-                    existing = [a for a in self.alerts[asset]
-                               if a.alert_type == alert.alert_type]
-                    if not existing:
-                        self.alerts[asset].append(alert)
+                    legacy = legacy or not data.get("alert_id")
+                    self._restore(Alert.from_dict(data))
 
         except FileNotFoundError:
             pass
         except Exception as e:
             print(f"Warning: Could not load alert state: {e}")
+
+        for entry in self.journal.read():
+            op = entry.get("op")
+            if op == "put":
+                self._restore(Alert.from_dict(entry["alert"]))
+            elif op == "del":
+                alert = self._alerts_by_id.pop(entry["alert_id"], None)
+                if alert:
+                    self.alerts[alert.asset].remove(alert)
+            elif op == "peak":
+                for alert in self.alerts.get(entry["asset"], []):
+                    if (alert.alert_type == AlertType.TRAILING_STOP and not alert.triggered
+                            and (alert.peak_price or 0) < entry["price"]):
+                        alert.peak_price = entry["price"]
+            elif op == "cost_basis":
+                self.cost_basis[entry["asset"]] = entry["price"]
+
+        for alert in self._alerts_by_id.values():
+            self._index_alert(alert)
+
+        # Records saved before alerts had ids get new random ones on every
+        # load; write them back so later journal entries refer to stable ids
+        if legacy:
+            self._save_state()
+
+    def _restore(self, alert: Alert):
+        """Add or replace a loaded alert by id."""
+        previous = self._alerts_by_id.get(alert.alert_id)
+        alerts = self.alerts.setdefault(alert.asset, [])
+        if previous is not None:
+            alerts[alerts.index(previous)] = alert
+        else:
+            alerts.append(alert)
+        self._alerts_by_id[alert.alert_id] = alert
@@ -6,8 +6,13 @@ Usage:
     python arbitrage_detector.py scan BTC ETH SOL
     python arbitrage_detector.py monitor BTC ETH --threshold 1.0
     python arbitrage_detector.py history
+
+Every scan evaluates one PriceMatrix snapshot: all exchanges are polled
+concurrently, and prices older than MAX_PRICE_AGE are left out so a spread
+is never computed between a fresh quote and a stale one.
 """
 
+import asyncio
 import os
 import time
 import json
@@ -19,6 +24,7 @@ from tabulate import tabulate
 
 # Import exchange clients
 from exchanges import CoinbaseClient, KrakenClient, CryptoComClient, GeminiClient
+from price_matrix import PriceMatrix, PriceSnapshot, default_price_feed
 
 
 class ArbitrageDetector:
@@ -47,9 +53,13 @@ class ArbitrageDetector:
         "gemini": 0,         # 10 free/month
     }
 
+    # Seconds before a quote is too old to compare against the others
+    MAX_PRICE_AGE = 10.0
+
     def __init__(self):
         load_dotenv()
         self.clients: Dict[str, object] = {}
+        self.price_matrix = PriceMatrix(self.clients, max_age=self.MAX_PRICE_AGE)
         self.history: List[dict] = []
         self._history_file = "arbitrage_history.json"
         self._load_history()
@@ -106,20 +116,9 @@ class ArbitrageDetector:
 
         return connected
 
-    def get_prices(self, assets: List[str]) -> Dict[str, Dict[str, float]]:
+    async def get_prices(self, assets: List[str]) -> Dict[str, Dict[str, float]]:
         """Get prices for assets across all connected exchanges."""
-        prices = {asset: {} for asset in assets}
-
-        for exchange, client in self.clients.items():
-            for asset in assets:
-                try:
-                    price = client.get_spot_price(asset, "USD")
-                    if price:
-                        prices[asset][exchange] = price
-                except Exception:
-                    pass
-
-        return prices
+        return (await self.price_matrix.refresh(assets)).as_dict()
 
     def calculate_arbitrage(
         self,
@@ -191,12 +190,13 @@ class ArbitrageDetector:
             "all_prices": prices
         }
 
-    def scan(
+    async def scan(
         self,
         assets: List[str],
         min_spread: float = 0.5,
         trade_amount: float = 1000,
-        include_fees: bool = True
+        include_fees: bool = True,
+        snapshot: Optional[PriceSnapshot] = None
     ) -> List[dict]:
         """
         Scan for arbitrage opportunities.
@@ -206,18 +206,20 @@ class ArbitrageDetector:
             min_spread: Minimum spread percentage to report
             trade_amount: USD amount for profit calculation
             include_fees: Whether to account for fees
+            snapshot: Prices to evaluate (default: refresh the price matrix now)
 
         Returns:
             List of opportunities
         """
-        prices = self.get_prices(assets)
+        if snapshot is None:
+            snapshot = await self.price_matrix.refresh(assets)
         opportunities = []
 
         for asset in assets:
-            asset_prices = prices.get(asset, {})
-            opp = self.calculate_arbitrage(asset, asset_prices, trade_amount, include_fees)
+            opp = self.calculate_arbitrage(asset, snapshot.prices(asset), trade_amount, include_fees)
 
             if opp and opp["raw_spread_pct"] >= min_spread:
+                opp["price_age_s"] = snapshot.age(asset)
                 opportunities.append(opp)
                 self.history.append(opp)
 
@@ -273,18 +275,34 @@ class ArbitrageDetector:
         print(f"   Interval: {interval_seconds}s")
         print("   Press Ctrl+C to stop\n")
 
-        scan_count = 0
-        alert_count = 0
+        stats = {"scans": 0, "alerts": 0}
 
         try:
+            asyncio.run(self.price_matrix.closing(
+                self._monitor_loop(assets, min_spread, interval_seconds, alert_callback, stats)
+            ))
+        except KeyboardInterrupt:
+            print("\n\n📊 Monitor stopped.")
+            print(f"   Total scans: {stats['scans']}")
+            print(f"   Alerts triggered: {stats['alerts']}")
+
+    async def _monitor_loop(self, assets, min_spread, interval_seconds, alert_callback, stats):
+        """Scan on a fixed cadence, streaming quotes between polls where feeds exist."""
+        if self.price_matrix.price_feed is None:
+            self.price_matrix.price_feed = default_price_feed(list(self.clients))
+        await self.price_matrix.start_feed(assets)
+
+        try:
+            next_scan = time.monotonic()
             while True:
-                scan_count += 1
+                stats["scans"] += 1
                 timestamp = datetime.now().strftime("%H:%M:%S")
 
-                opportunities = self.scan(assets, min_spread)
+                snapshot = await self.price_matrix.refresh(assets)
+                opportunities = await self.scan(assets, min_spread, snapshot=snapshot)
 
                 if opportunities:
-                    alert_count += len(opportunities)
+                    stats["alerts"] += len(opportunities)
                     print(f"\n🚨 [{timestamp}] ARBITRAGE ALERT!")
                     self.display_scan_results(opportunities)
 
@@ -293,14 +311,12 @@ class ArbitrageDetector:
                             alert_callback(opp)
                 else:
                     # Print status dot
-                    print(f"[{timestamp}] Scan #{scan_count} - No opportunities (threshold: {min_spread}%)", end="\r")
+                    print(f"[{timestamp}] Scan #{stats['scans']} - No opportunities (threshold: {min_spread}%)", end="\r")
 
-                time.sleep(interval_seconds)
-
-        except KeyboardInterrupt:
-            print("\n\n📊 Monitor stopped.")
-            print(f"   Total scans: {scan_count}")
-            print(f"   Alerts triggered: {alert_count}")
+                next_scan = max(next_scan + interval_seconds, time.monotonic())
+                await asyncio.sleep(next_scan - time.monotonic())
+        finally:
+            await self.price_matrix.stop_feed()
 
     def display_history(self, limit: int = 20):
         """Display recent arbitrage opportunity history."""
@@ -399,12 +415,12 @@ def main():
     print(f"✓ Connected to {connected} exchanges")
 
     if args.command == "scan":
-        opportunities = detector.scan(
+        opportunities = asyncio.run(detector.price_matrix.closing(detector.scan(
             args.assets,
             args.min_spread,
             args.amount,
             include_fees=not args.no_fees
-        )
+        )))
         detector.display_scan_results(opportunities, args.verbose)
 
     elif args.command == "monitor":
@@ -9,6 +9,7 @@ Usage:
     python backtest_cli.py run swing --days 730       # 2-year swing backtest
     python backtest_cli.py compare                    # Compare all strategies
     python backtest_cli.py compare --days 365 --capital 50000
+    python backtest_cli.py sweep swing --grid "risk_limits.max_position_size_pct=0.05,0.1,0.2"
 
 Examples:
     python backtest_cli.py run dca --assets BTC,ETH
@@ -17,9 +18,11 @@ Examples:
 
 import asyncio
 import argparse
+import pickle
 import sys
 from decimal import Decimal
 from datetime import datetime
+from pathlib import Path
 
 sys.path.insert(0, '/home/claude/crypto-portfolio-manager')
 
@@ -30,6 +33,18 @@ from agents.backtester import (
     compare_strategies,
     run_strategy_backtest,
 )
+from agents.ohlcv_store import DEFAULT_STORE_DIR, OHLCVStore
+from agents.sweep import (
+    SweepRunner,
+    format_sweep_table,
+    full_window,
+    grid,
+    latin_hypercube,
+    parse_space,
+    random_samples,
+    rank_results,
+    walk_forward_windows,
+)
 from agents.trading_agent import (
     TradingConfig,
     TradingMode,
@@ -57,6 +72,7 @@ async def run_single_backtest(
     capital: float,
     assets: list,
     verbose: bool = False,
+    store: OHLCVStore = None,
 ):
     """Run backtest for a single strategy."""
     print_banner()
@@ -72,6 +88,7 @@ async def run_single_backtest(
             initial_capital=capital,
             days=days,
             assets=assets,
+            store=store,
         )
 
         print(format_backtest_report(result))
@@ -102,6 +119,7 @@ async def run_comparison(
     capital: float,
     assets: list,
     strategies: list = None,
+    store: OHLCVStore = None,
 ):
     """Compare multiple strategies."""
     print_banner()
@@ -114,14 +132,13 @@ async def run_comparison(
 
     # Fetch data once
     print("Fetching historical data...")
-    provider = HistoricalDataProvider()
+    provider = HistoricalDataProvider(store=store)
     data = {}
 
     for asset in assets:
         print(f"  → {asset}...", end=" ", flush=True)
-        data[asset] = await provider.fetch_coingecko(asset, days)
+        data[asset] = await provider.get_history(asset, days)
         print(f"✓ ({len(data[asset])} candles)")
-        await asyncio.sleep(1.5)  # Rate limit
 
     await provider.close()
     print()
@@ -318,6 +335,106 @@ async def run_monte_carlo(
 """)
 
 
+def _bars_per_day(candles: list) -> float:
+    """Bars per day from the median spacing between candle timestamps."""
+    gaps = sorted(
+        (b.timestamp - a.timestamp).total_seconds()
+        for a, b in zip(candles, candles[1:])
+    )
+    gaps = [g for g in gaps if g > 0]
+    if not gaps:
+        return 1.0
+    return 86400 / gaps[len(gaps) // 2]
+
+
+async def run_sweep(
+    strategy: str,
+    days: int,
+    capital: float,
+    assets: list,
+    space_spec: str,
+    sampler: str = "grid",
+    samples: int = 50,
+    train_days: int = 0,
+    test_days: int = 0,
+    workers: int = None,
+    checkpoint: str = None,
+    seed: int = None,
+    top: int = 20,
+    store: OHLCVStore = None,
+):
+    """Parameter sweep across a process pool."""
+    print_banner()
+    space = parse_space(space_spec)
+    if sampler == "grid":
+        param_sets = grid(space)
+    elif sampler == "random":
+        param_sets = random_samples(space, samples, seed=seed)
+    else:
+        param_sets = latin_hypercube(space, samples, seed=seed)
+
+    print(f"🔬 Sweeping {strategy.upper()}: {len(param_sets)} parameter sets ({sampler})")
+    print(f"   Period: {days} days | Capital: ${capital:,.2f} | Assets: {', '.join(assets)}")
+
+    # Fetch data once; workers read it from shared memory. With a checkpoint,
+    # keep the candles beside it so a resumed sweep sees identical data.
+    data_cache = Path(checkpoint).with_suffix(".ohlcv.pkl") if checkpoint else None
+    if data_cache and data_cache.exists():
+        with open(data_cache, "rb") as f:
+            data = pickle.load(f)
+        print(f"   Resuming with cached data from {data_cache}")
+    else:
+        provider = HistoricalDataProvider(store=store)
+        data = {}
+        for asset in assets:
+            data[asset] = await provider.get_history(asset, days)
+        await provider.close()
+        if data_cache and all(data.values()):
+            data_cache.parent.mkdir(parents=True, exist_ok=True)
+            with open(data_cache, "wb") as f:
+                pickle.dump(data, f)
+
+    if not all(data.get(a) for a in assets):
+        print("❌ Missing historical data for some assets")
+        return
+
+    n_bars = min(len(data[a]) for a in assets)
+    if train_days and test_days:
+        per_day = _bars_per_day(data[assets[0]])
+        train_bars = max(1, round(train_days * per_day))
+        test_bars = max(1, round(test_days * per_day))
+        windows = walk_forward_windows(n_bars, train_bars, test_bars)
+        if not windows:
+            print(f"❌ {n_bars} bars is too short for {train_days}/{test_days}-day walk-forward windows")
+            return
+        print(f"   Walk-forward: {len(windows)} windows ({train_days} train / {test_days} test days, "
+              f"{train_bars}/{test_bars} bars)")
+    else:
+        windows = full_window(n_bars)
+
+    runner = SweepRunner(
+        data,
+        strategy=strategy,
+        assets=assets,
+        initial_capital=capital,
+        windows=windows,
+        checkpoint_path=checkpoint,
+        workers=workers,
+    )
+    print(f"   Workers: {runner.workers}" + (f" | Checkpoint: {checkpoint}" if checkpoint else ""))
+    print()
+
+    def progress(done, total):
+        if done % 10 == 0 or done == total:
+            print(f"  Completed {done}/{total} backtests...")
+
+    # Each in-process backtest starts its own event loop; keep them off this one
+    records = await asyncio.to_thread(runner.run, param_sets, progress)
+    rows = rank_results(records)
+    print(format_sweep_table(rows, top=top))
+    return rows
+
+
 def print_help():
     print("""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -329,6 +446,7 @@ COMMANDS:
   run [STRATEGY]       Run backtest for a single strategy
   compare              Compare all strategies
   monte-carlo          Monte Carlo simulation (synthetic data)
+  sweep [STRATEGY]     Parameter sweep across all CPU cores
 
 STRATEGIES:
   dca                  Signal-adjusted Dollar Cost Averaging
@@ -343,6 +461,17 @@ OPTIONS:
   --assets, -a         Comma-separated assets (default: BTC)
   --verbose, -v        Show all trades
   --simulations, -s    Monte Carlo simulation count (default: 100)
+  --grid               Sweep space: "name=a,b,c;name=low:high" (dotted names
+                       reach nested config, e.g. risk_limits.max_position_size_pct)
+  --sampler            grid, random or lhs (default: grid)
+  --samples            Samples for random/lhs (default: 50)
+  --train, --test      Walk-forward window sizes in days (default: whole period)
+  --workers            Worker processes (default: CPU count)
+  --checkpoint         JSONL file; rerunning resumes from it
+  --store              Local OHLCV store (default: ~/.crypto_portfolio/ohlcv);
+                       only candles missing from the store are fetched
+                       (hourly bars up to 90 days, daily beyond)
+  --no-store           Always fetch full history from CoinGecko
 
 EXAMPLES:
 
@@ -361,6 +490,11 @@ EXAMPLES:
   # Monte Carlo simulation
   python backtest_cli.py monte-carlo dca --simulations 200
 
+  # 40 Latin-hypercube samples, 180/90-day walk-forward, resumable
+  python backtest_cli.py sweep swing --days 1095 --sampler lhs --samples 40 \\
+      --grid "risk_limits.max_position_size_pct=0.05:0.3;fee_rate=0.001,0.002" \\
+      --train 180 --test 90 --checkpoint sweep.jsonl
+
 PERFORMANCE METRICS EXPLAINED:
 
   Sharpe Ratio     Risk-adjusted return (>1 good, >2 excellent)
@@ -399,7 +533,7 @@ async def main():
 
     parser.add_argument(
         "command",
-        choices=["run", "compare", "monte-carlo", "help"],
+        choices=["run", "compare", "monte-carlo", "sweep", "help"],
         help="Command to execute"
     )
 
@@ -449,9 +583,29 @@ async def main():
         help="Strategies to compare (comma-separated)"
     )
 
+    parser.add_argument("--grid", default=None, help="Sweep parameter space")
+    parser.add_argument("--sampler", choices=["grid", "random", "lhs"], default="grid")
+    parser.add_argument("--samples", type=int, default=50, help="Samples for random/lhs sweeps")
+    parser.add_argument("--train", type=int, default=0, help="Walk-forward train days")
+    parser.add_argument("--test", type=int, default=0, help="Walk-forward test days")
+    parser.add_argument("--workers", type=int, default=None, help="Sweep worker processes")
+    parser.add_argument("--checkpoint", default=None, help="Sweep checkpoint file (JSONL)")
+    parser.add_argument("--seed", type=int, default=None, help="Sampler seed")
+    parser.add_argument(
+        "--store",
+        default=str(DEFAULT_STORE_DIR),
+        help=f"Local OHLCV store directory (default: {DEFAULT_STORE_DIR})",
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Fetch full history from CoinGecko instead of the local store",
+    )
+
     args = parser.parse_args()
 
     assets = [a.strip().upper() for a in args.assets.split(",")]
+    store = None if args.no_store else OHLCVStore(args.store)
 
     if args.command == "help":
         print_help()
@@ -464,6 +618,7 @@ async def main():
             capital=args.capital,
             assets=assets,
             verbose=args.verbose,
+            store=store,
         )
 
     elif args.command == "compare":
@@ -476,6 +631,7 @@ async def main():
             capital=args.capital,
             assets=assets,
             strategies=strategies,
+            store=store,
         )
 
     elif args.command == "monte-carlo":
@@ -486,6 +642,26 @@ async def main():
             simulations=args.simulations,
         )
 
+    elif args.command == "sweep":
+        if not args.grid:
+            print("❌ sweep needs --grid, e.g. --grid \"risk_limits.max_position_size_pct=0.05,0.1\"")
+            return
+        await run_sweep(
+            strategy=args.strategy,
+            days=args.days,
+            capital=args.capital,
+            assets=assets,
+            space_spec=args.grid,
+            sampler=args.sampler,
+            samples=args.samples,
+            train_days=args.train,
+            test_days=args.test,
+            workers=args.workers,
+            checkpoint=args.checkpoint,
+            seed=args.seed,
+            store=store,
+        )
+
 
 if __name__ == "__main__":
     asyncio.run(main())
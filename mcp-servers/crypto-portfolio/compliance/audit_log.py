@@ -6,25 +6,47 @@ Provides tamper-evident audit logging for cryptocurrency portfolio operations.
 Each entry includes a SHA-256 checksum chained to the previous entry, making
 it possible to detect any modifications to the history.
 
-Storage: JSON file-based (no SQLAlchemy dependency required).
-Default path: /home/dave/skippy/work/crypto/audit_log.json
+Storage: JSON-lines file, one entry per line, only ever appended to.
+- Writes are flushed per entry and fsync'ed in batches
+- Every CHECKPOINT_INTERVAL entries a checkpoint record stores the running
+  hash, signed with HMAC-SHA256 (key from AUDIT_LOG_KEY or a .key file)
+- Checkpoints split the file into segments that verify independently, so
+  verification can resume from the last checkpoint or run in parallel
+- get_entries uses in-memory indexes by table, record and time
+
+Default path: ~/skippy/work/crypto/audit_log.jsonl (a legacy audit_log.json
+array is converted on first use).
 """
 
 import hashlib
+import hmac
 import json
 import logging
 import os
-from dataclasses import asdict, dataclass, field
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_AUDIT_LOG_PATH = os.environ.get(
     "AUDIT_LOG_PATH",
-    os.path.expanduser("~/skippy/work/crypto/audit_log.json")
+    os.path.expanduser("~/skippy/work/crypto/audit_log.jsonl")
 )
 
+# Entries between signed checkpoint records (one verification segment)
+CHECKPOINT_INTERVAL = 1000
+
+# fsync after this many entries or seconds, whichever comes first
+FSYNC_EVERY = 64
+FSYNC_INTERVAL = 1.0
+
+_CHECKPOINT_PREFIX = b'{"checkpoint"'
+_TAIL_CHUNK = 64 * 1024
+
 
 @dataclass
 class AuditEntry:
@@ -46,53 +68,351 @@ class AuditEntry:
     def from_dict(cls, data: Dict[str, Any]) -> "AuditEntry":
         return cls(**data)
 
+    def content(self) -> Dict[str, Any]:
+        """Fields covered by the checksum (everything but the chain links)."""
+        return {
+            "timestamp": self.timestamp,
+            "table_name": self.table_name,
+            "record_id": self.record_id,
+            "action": self.action,
+            "old_values": self.old_values,
+            "new_values": self.new_values,
+            "changed_by": self.changed_by,
+        }
+
+
+def _compute_checksum(entry_data: Dict[str, Any], prev_checksum: str) -> str:
+    """Compute SHA-256 checksum for an entry chained to previous."""
+    # Deterministic serialization: sort keys, use separators
+    payload = json.dumps(entry_data, sort_keys=True, separators=(",", ":"),
+                         default=str)
+    combined = f"{prev_checksum}|{payload}"
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+
+def _verify_segment(
+    path: str,
+    start: int,
+    end: int,
+    prev_checksum: str,
+    first_index: int,
+) -> Tuple[int, str, List[str]]:
+    """
+    Re-hash the entries in bytes [start, end) of the log.
+
+    Module-level so segments can be checked in worker processes.
+    Returns (entries checked, last checksum, errors).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    errors = []
+    count = 0
+    for line in data.splitlines():
+        if not line.strip() or line.startswith(_CHECKPOINT_PREFIX):
+            continue
+        i = first_index + count
+        count += 1
+        try:
+            entry = AuditEntry.from_dict(json.loads(line))
+        except (ValueError, TypeError) as e:
+            errors.append(f"Entry {i}: unreadable record ({e})")
+            prev_checksum = ""
+            continue
+
+        # Verify prev_checksum link
+        if entry.prev_checksum != prev_checksum:
+            errors.append(
+                f"Entry {i}: prev_checksum mismatch "
+                f"(expected {prev_checksum[:12]}..., "
+                f"got {entry.prev_checksum[:12]}...)"
+            )
+
+        # Recompute checksum
+        expected = _compute_checksum(entry.content(), prev_checksum)
+        if entry.checksum != expected:
+            errors.append(
+                f"Entry {i}: checksum mismatch "
+                f"(expected {expected[:12]}..., "
+                f"got {entry.checksum[:12]}...)"
+            )
+
+        prev_checksum = entry.checksum
+
+    return count, prev_checksum, errors
+
+
+def _bisect_positions(positions: List[int], timestamps: List[str], value: str, right: bool) -> int:
+    """bisect over positions ordered by timestamps[position]."""
+    lo, hi = 0, len(positions)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        ts = timestamps[positions[mid]]
+        if ts < value or (right and ts == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
 
 class AuditLog:
     """Append-only hash-chained audit log.
 
     Each entry's checksum is computed from its content plus the previous
     entry's checksum, creating a chain that can be verified for integrity.
+
+    Writing only needs the tail of the file (back to the last checkpoint),
+    so log_change is O(1) in the size of the history. Reads build indexes
+    once and then only parse bytes appended since.
     """
 
-    def __init__(self, path: Optional[str] = None):
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        checkpoint_interval: int = CHECKPOINT_INTERVAL,
+        fsync_every: int = FSYNC_EVERY,
+        fsync_interval: float = FSYNC_INTERVAL,
+        key: Optional[bytes] = None,
+    ):
         self.path = path or DEFAULT_AUDIT_LOG_PATH
+        self.checkpoint_interval = checkpoint_interval
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._key = key
+
+        # Writer state
+        self._fh = None
+        self._size = 0
+        self._seq = 0
+        self._last_checksum = ""
+        self._since_checkpoint = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._migrated = False
+
+        # Read indexes
         self._entries: List[AuditEntry] = []
-        self._loaded = False
+        self._timestamps: List[str] = []
+        self._by_table: Dict[str, List[int]] = {}
+        self._by_record: Dict[str, List[int]] = {}
+        self._by_table_record: Dict[Tuple[str, str], List[int]] = {}
+        self._time_ordered = True
+        self._checkpoints: List[Tuple[int, int, Dict[str, Any]]] = []
+        self._indexed_size = 0
+
+    # ==================== STORAGE ====================
+
+    def _migrate_legacy(self):
+        """Convert a legacy JSON-array log to JSON lines, once."""
+        if self._migrated:
+            return
+        self._migrated = True
+
+        source = self.path
+        if not os.path.exists(source):
+            base, ext = os.path.splitext(self.path)
+            source = base + ".json" if ext == ".jsonl" else None
+            if source is None or not os.path.exists(source):
+                return
+        with open(source, "rb") as f:
+            if f.read(64).lstrip()[:1] != b"[":
+                return
 
-    def _ensure_loaded(self):
-        """Lazy-load entries from disk."""
-        if self._loaded:
+        try:
+            with open(source, "r") as f:
+                entries = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to load legacy audit log: {e}")
+            return
+
+        tmp = self.path + ".tmp"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(tmp, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        if source != self.path:
+            os.replace(source, source + ".migrated")
+        logger.info(f"Converted {len(entries)} legacy audit entries to {self.path}")
+
+    def _signing_key(self) -> bytes:
+        """HMAC key for checkpoints: explicit, AUDIT_LOG_KEY, or a 0600 key file."""
+        if self._key is None:
+            env = os.environ.get("AUDIT_LOG_KEY")
+            if env:
+                self._key = env.encode("utf-8")
+            else:
+                key_path = self.path + ".key"
+                try:
+                    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                    with os.fdopen(fd, "w") as f:
+                        f.write(secrets.token_hex(32))
+                except FileExistsError:
+                    pass
+                with open(key_path, "r") as f:
+                    self._key = f.read().strip().encode("utf-8")
+        return self._key
+
+    def _sign(self, checkpoint: Dict[str, Any]) -> str:
+        message = (
+            f"{checkpoint['checkpoint']}|{checkpoint['offset']}|"
+            f"{checkpoint['running_hash']}|{checkpoint['timestamp']}"
+        )
+        return hmac.new(self._signing_key(), message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _read_tail(self, size: int) -> Tuple[Optional[Tuple[int, int, Dict]], List[bytes]]:
+        """
+        Find the last checkpoint by reading backwards from `size`.
+
+        Returns ((line_start, line_end, record) or None, entry lines after it).
+        """
+        if size == 0:
+            return None, []
+        data = b""
+        with open(self.path, "rb") as f:
+            pos = size
+            while pos > 0:
+                step = min(_TAIL_CHUNK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+                # Unless at the start of the file, the first line may be partial
+                skip = 0 if pos == 0 else data.find(b"\n") + 1
+                if pos and not skip:
+                    continue
+
+                lines = data[skip:].splitlines(keepends=True)
+                start = pos + skip + sum(len(line) for line in lines)
+                for k in range(len(lines) - 1, -1, -1):
+                    start -= len(lines[k])
+                    if lines[k].startswith(_CHECKPOINT_PREFIX):
+                        checkpoint = (start, start + len(lines[k]), json.loads(lines[k]))
+                        return checkpoint, [line for line in lines[k + 1:] if line.strip()]
+        return None, [line for line in data.splitlines() if line.strip()]
+
+    def _open_writer(self):
+        """Load tail state and open the append handle (after any other writer)."""
+        self._migrate_legacy()
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if self._fh is not None and size == self._size:
             return
-        self._loaded = True
 
+        if size:
+            # A crash mid-write leaves a line without its newline: trim it
+            with open(self.path, "rb+") as f:
+                f.seek(max(0, size - _TAIL_CHUNK))
+                chunk = f.read()
+                if not chunk.endswith(b"\n"):
+                    keep = chunk.rfind(b"\n") + 1
+                    size = max(0, size - len(chunk)) + keep
+                    f.truncate(size)
+
+        checkpoint, lines = self._read_tail(size)
+        self._seq = checkpoint[2]["checkpoint"] if checkpoint else 0
+        self._last_checksum = checkpoint[2]["running_hash"] if checkpoint else ""
+        self._since_checkpoint = len(lines)
+        self._seq += len(lines)
+        if lines:
+            self._last_checksum = json.loads(lines[-1])["checksum"]
+
+        if self._fh is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._fh = open(self.path, "ab")
+        self._size = size
+
+    def _append(self, record: Dict[str, Any], sync: bool = False):
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        self._fh.write(line)
+        self._fh.flush()
+        self._size += len(line)
+
+        self._unsynced += 1
+        now = time.monotonic()
+        if sync or self._unsynced >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+            self._last_sync = now
+
+    def _write_checkpoint(self) -> Tuple[int, int, Dict[str, Any]]:
+        start = self._size
+        checkpoint = {
+            "checkpoint": self._seq,
+            "offset": self._size,
+            "running_hash": self._last_checksum,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+        checkpoint["signature"] = self._sign(checkpoint)
+        self._append(checkpoint, sync=True)
+        self._since_checkpoint = 0
+        return start, self._size, checkpoint
+
+    def flush(self):
+        """fsync any batched writes."""
+        if self._fh is not None and self._unsynced:
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+            self._last_sync = time.monotonic()
+
+    def close(self):
+        self.flush()
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "AuditLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ==================== INDEXES ====================
+
+    def _index(self, entry: AuditEntry):
+        position = len(self._entries)
+        if self._timestamps and entry.timestamp < self._timestamps[-1]:
+            self._time_ordered = False
+        self._entries.append(entry)
+        self._timestamps.append(entry.timestamp)
+        self._by_table.setdefault(entry.table_name, []).append(position)
+        self._by_record.setdefault(entry.record_id, []).append(position)
+        self._by_table_record.setdefault((entry.table_name, entry.record_id), []).append(position)
+
+    def _ensure_loaded(self):
+        """Index entries appended since the last load (all of them the first time)."""
+        self._migrate_legacy()
         if not os.path.exists(self.path):
-            self._entries = []
+            return
+        size = os.path.getsize(self.path)
+        if size <= self._indexed_size:
             return
 
-        try:
-            with open(self.path, "r") as f:
-                data = json.load(f)
-            self._entries = [AuditEntry.from_dict(e) for e in data]
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.error(f"Failed to load audit log: {e}")
-            self._entries = []
-
-    def _save(self):
-        """Persist entries to disk."""
-        os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        with open(self.path, "w") as f:
-            json.dump([e.to_dict() for e in self._entries], f, indent=2,
-                      default=str)
-
-    @staticmethod
-    def _compute_checksum(entry_data: Dict[str, Any],
-                          prev_checksum: str) -> str:
-        """Compute SHA-256 checksum for an entry chained to previous."""
-        # Deterministic serialization: sort keys, use separators
-        payload = json.dumps(entry_data, sort_keys=True, separators=(",", ":"),
-                             default=str)
-        combined = f"{prev_checksum}|{payload}"
-        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed_size)
+            data = f.read(size - self._indexed_size)
+
+        offset = self._indexed_size
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Incomplete trailing write
+            start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                logger.error(f"Skipping unreadable audit record at byte {start}: {e}")
+                continue
+            if "checkpoint" in record:
+                self._checkpoints.append((start, offset, record))
+            else:
+                self._index(AuditEntry.from_dict(record))
+        self._indexed_size = offset
+
+    # ==================== WRITING ====================
 
     def log_change(
         self,
@@ -116,9 +436,8 @@ class AuditLog:
         Returns:
             The created AuditEntry.
         """
-        self._ensure_loaded()
-
-        prev_checksum = self._entries[-1].checksum if self._entries else ""
+        self._open_writer()
+        indexed = self._indexed_size == self._size
 
         entry = AuditEntry(
             timestamp=datetime.now(timezone.utc).isoformat() + "Z",
@@ -128,77 +447,148 @@ class AuditLog:
             old_values=old_values,
             new_values=new_values,
             changed_by=changed_by,
-            prev_checksum=prev_checksum,
+            prev_checksum=self._last_checksum,
         )
 
         # Compute checksum from entry content (excluding checksum itself)
-        entry_data = {
-            "timestamp": entry.timestamp,
-            "table_name": entry.table_name,
-            "record_id": entry.record_id,
-            "action": entry.action,
-            "old_values": entry.old_values,
-            "new_values": entry.new_values,
-            "changed_by": entry.changed_by,
-        }
-        entry.checksum = self._compute_checksum(entry_data, prev_checksum)
-
-        self._entries.append(entry)
-        self._save()
+        entry.checksum = _compute_checksum(entry.content(), self._last_checksum)
+
+        self._append(entry.to_dict())
+        self._seq += 1
+        self._since_checkpoint += 1
+        self._last_checksum = entry.checksum
+        if indexed:
+            self._index(entry)
+            self._indexed_size = self._size
+
+        if self._since_checkpoint >= self.checkpoint_interval:
+            checkpoint = self._write_checkpoint()
+            if indexed:
+                self._checkpoints.append(checkpoint)
+                self._indexed_size = self._size
 
         logger.info(
             f"Audit: {action} on {table_name}#{record_id} by {changed_by}"
         )
         return entry
 
-    def verify_chain(self) -> Dict[str, Any]:
-        """Verify the integrity of the entire audit chain.
+    # ==================== VERIFICATION ====================
+
+    def _scan_checkpoints(self, size: int) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Checkpoint lines in the first `size` bytes, found without parsing entries."""
+        checkpoints = []
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                start = offset
+                offset += len(line)
+                if offset > size:
+                    break
+                if line.startswith(_CHECKPOINT_PREFIX):
+                    checkpoints.append((start, offset, json.loads(line)))
+        return checkpoints
+
+    def _check_checkpoint(self, start: int, record: Dict[str, Any], prev_seq: int) -> List[str]:
+        errors = []
+        seq = record.get("checkpoint")
+        if not hmac.compare_digest(str(record.get("signature", "")), self._sign(record)):
+            errors.append(f"Checkpoint {seq}: bad signature")
+        if record.get("offset") != start:
+            errors.append(f"Checkpoint {seq}: recorded offset {record.get('offset')} but found at {start}")
+        if not isinstance(seq, int) or seq < prev_seq:
+            errors.append(f"Checkpoint {seq}: sequence goes backwards (after {prev_seq})")
+        return errors
+
+    def verify_chain(self, full: bool = False, workers: Optional[int] = None) -> Dict[str, Any]:
+        """Verify the integrity of the audit chain.
+
+        By default only the entries after the last checkpoint are re-hashed,
+        starting from that checkpoint's signed running hash. With full=True
+        every segment is re-hashed (in `workers` processes when given) and
+        each checkpoint's signature, offset, entry count and running hash
+        are checked against the segment before it.
 
         Returns:
             Dict with 'valid' (bool), 'entries_checked' (int),
+            'total_entries' (int), 'segments_checked' (int),
+            'trusted_checkpoint' (entry count at the starting checkpoint)
             and 'errors' (list of issues found).
         """
-        self._ensure_loaded()
-
-        errors = []
-        prev_checksum = ""
-
-        for i, entry in enumerate(self._entries):
-            # Verify prev_checksum link
-            if entry.prev_checksum != prev_checksum:
-                errors.append(
-                    f"Entry {i}: prev_checksum mismatch "
-                    f"(expected {prev_checksum[:12]}..., "
-                    f"got {entry.prev_checksum[:12]}...)"
-                )
-
-            # Recompute checksum
-            entry_data = {
-                "timestamp": entry.timestamp,
-                "table_name": entry.table_name,
-                "record_id": entry.record_id,
-                "action": entry.action,
-                "old_values": entry.old_values,
-                "new_values": entry.new_values,
-                "changed_by": entry.changed_by,
-            }
-            expected = self._compute_checksum(entry_data, prev_checksum)
-
-            if entry.checksum != expected:
+        self._migrate_legacy()
+        if not os.path.exists(self.path):
+            return {"valid": True, "entries_checked": 0, "total_entries": 0,
+                    "segments_checked": 0, "trusted_checkpoint": None, "errors": []}
+
+        size = os.path.getsize(self.path)
+        if size and not self._ends_with_newline(size):
+            with open(self.path, "rb") as f:
+                f.seek(max(0, size - _TAIL_CHUNK))
+                chunk = f.read()
+            size -= len(chunk) - (chunk.rfind(b"\n") + 1)  # Ignore an incomplete trailing write
+
+        errors: List[str] = []
+        # (start, end, prev_checksum, first_index, closing checkpoint or None)
+        segments = []
+        trusted = None
+
+        if full:
+            checkpoints = self._scan_checkpoints(size)
+            start, prev, prev_seq = 0, "", 0
+            for line_start, line_end, record in checkpoints:
+                errors.extend(self._check_checkpoint(line_start, record, prev_seq))
+                segments.append((start, line_start, prev, prev_seq, record))
+                start, prev = line_end, record.get("running_hash", "")
+                prev_seq = record.get("checkpoint", prev_seq)
+            segments.append((start, size, prev, prev_seq, None))
+        else:
+            checkpoint, _ = self._read_tail(size)
+            if checkpoint is None:
+                segments.append((0, size, "", 0, None))
+            else:
+                line_start, line_end, record = checkpoint
+                errors.extend(self._check_checkpoint(line_start, record, 0))
+                trusted = record.get("checkpoint")
+                segments.append((line_end, size, record.get("running_hash", ""), trusted, None))
+
+        args = [(self.path, s, e, prev, first) for s, e, prev, first, _ in segments]
+        if workers and workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_verify_segment, *zip(*args)))
+        else:
+            results = [_verify_segment(*a) for a in args]
+
+        checked = 0
+        for (_, _, _, first, closing), (count, last, segment_errors) in zip(segments, results):
+            checked += count
+            errors.extend(segment_errors)
+            if closing is None:
+                total = first + count
+                continue
+            seq = closing.get("checkpoint")
+            if first + count != seq:
+                errors.append(f"Checkpoint {seq}: segment holds {count} entries, expected {seq - first}")
+            if last != closing.get("running_hash"):
                 errors.append(
-                    f"Entry {i}: checksum mismatch "
-                    f"(expected {expected[:12]}..., "
-                    f"got {entry.checksum[:12]}...)"
+                    f"Checkpoint {seq}: running hash mismatch "
+                    f"(chain {last[:12]}..., checkpoint {str(closing.get('running_hash'))[:12]}...)"
                 )
 
-            prev_checksum = entry.checksum
-
         return {
             "valid": len(errors) == 0,
-            "entries_checked": len(self._entries),
+            "entries_checked": checked,
+            "total_entries": total,
+            "segments_checked": len(segments),
+            "trusted_checkpoint": trusted,
             "errors": errors,
         }
 
+    def _ends_with_newline(self, size: int) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(size - 1)
+            return f.read(1) == b"\n"
+
+    # ==================== READING ====================
+
     def get_entries(
         self,
         table_name: Optional[str] = None,
@@ -223,22 +613,44 @@ class AuditLog:
         """
         self._ensure_loaded()
 
-        results = self._entries
-
-        if table_name:
-            results = [e for e in results if e.table_name == table_name]
-        if record_id:
-            results = [e for e in results if e.record_id == str(record_id)]
-        if action:
-            results = [e for e in results
-                       if e.action == action.upper()]
-        if since:
-            results = [e for e in results if e.timestamp >= since]
-        if until:
-            results = [e for e in results if e.timestamp <= until]
-
-        # Return newest first, with limit
-        return list(reversed(results))[:limit]
+        # Start from the most selective index
+        if table_name and record_id:
+            positions = self._by_table_record.get((table_name, str(record_id)), [])
+        elif table_name:
+            positions = self._by_table.get(table_name, [])
+        elif record_id:
+            positions = self._by_record.get(str(record_id), [])
+        else:
+            positions = range(len(self._entries))
+
+        lo, hi = 0, len(positions)
+        if self._time_ordered:
+            if since:
+                lo = _bisect_positions(positions, self._timestamps, since, right=False)
+            if until:
+                hi = _bisect_positions(positions, self._timestamps, until, right=True)
+
+        action = action.upper() if action else None
+        results = []
+        for k in range(hi - 1, lo - 1, -1):
+            entry = self._entries[positions[k]]
+            if table_name and entry.table_name != table_name:
+                continue
+            if record_id and entry.record_id != str(record_id):
+                continue
+            if action and entry.action != action:
+                continue
+            if not self._time_ordered:
+                if since and entry.timestamp < since:
+                    continue
+                if until and entry.timestamp > until:
+                    continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+
+        # Newest first, with limit
+        return results
 
     def format_entries_markdown(self, entries: List[AuditEntry]) -> str:
         """Format audit entries as markdown table."""
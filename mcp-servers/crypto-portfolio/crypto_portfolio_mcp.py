@@ -103,6 +103,9 @@ _aggregator: Optional["PortfolioAggregator"] = None
 # Global transaction history instance (initialized in lifespan)
 _transaction_history: Optional["TransactionHistory"] = None
 
+# Global audit log (created on first use; its index only reads appended entries)
+_audit_log = None
+
 # Infrastructure modules (optional, initialized in lifespan)
 try:
     from cache import CacheManager
@@ -3110,9 +3113,12 @@ async def crypto_audit_log(params: AuditLogInput) -> str:
         str: Audit log entries with chain verification status
     """
     try:
-        from compliance.audit_log import AuditLog
+        global _audit_log
 
-        log = AuditLog()
+        if _audit_log is None:
+            from compliance.audit_log import AuditLog
+            _audit_log = AuditLog()
+        log = _audit_log
 
         # Get filtered entries
         entries = log.get_entries(
@@ -3128,7 +3134,7 @@ async def crypto_audit_log(params: AuditLogInput) -> str:
         if params.response_format == ResponseFormat.JSON:
             return json.dumps({
                 "entries": [e.to_dict() for e in entries],
-                "total_entries": verification["entries_checked"],
+                "total_entries": verification["total_entries"],
                 "chain_valid": verification["valid"],
                 "chain_errors": verification["errors"],
             }, indent=2, default=str)
@@ -3138,7 +3144,10 @@ async def crypto_audit_log(params: AuditLogInput) -> str:
 
         # Chain status
         if verification["valid"]:
-            md += f"**Chain Status:** Valid ({verification['entries_checked']} entries verified)\n\n"
+            md += (
+                f"**Chain Status:** Valid ({verification['total_entries']} entries, "
+                f"{verification['entries_checked']} verified since last checkpoint)\n\n"
+            )
         else:
             md += f"**Chain Status:** INTEGRITY ERROR - {len(verification['errors'])} issue(s) detected\n"
             for err in verification["errors"]:
@@ -3149,7 +3158,7 @@ async def crypto_audit_log(params: AuditLogInput) -> str:
             md += "No audit log entries match the filter criteria."
             return md
 
-        md += f"**Showing:** {len(entries)} of {verification['entries_checked']} entries\n\n"
+        md += f"**Showing:** {len(entries)} of {verification['total_entries']} entries\n\n"
         md += log.format_entries_markdown(entries)
 
         return md
@@ -1,11 +1,15 @@
 """Data storage and price services."""
 
-from .prices import PriceService, PriceCache, get_current_prices
+from .fetch import FetchService, get_fetch_service
+from .prices import PriceService, PriceCache, HistoricalPriceCache, get_current_prices
 from .storage import Database, db
 
 __all__ = [
+    "FetchService",
+    "get_fetch_service",
     "PriceService",
     "PriceCache",
+    "HistoricalPriceCache",
     "get_current_prices",
     "Database",
     "db",
@@ -0,0 +1,349 @@
+"""
+Shared upstream fetch layer.
+
+The signal analyzers (agents/*_signals.py, advanced_onchain.py) run
+concurrently and hit many of the same CoinGecko / Alternative.me /
+DefiLlama / Coinglass endpoints. They share one FetchService with:
+
+- One pooled aiohttp connector (per event loop)
+- Per-host concurrency limits
+- Single-flight: identical in-flight requests share one upstream call
+- Bounded LRU/TTL cache of successful responses, served stale for a
+  grace period while a background refresh runs
+- Per-endpoint latency / hit-rate stats
+
+get() is a drop-in for aiohttp's session.get() in the analyzers:
+
+    session = get_fetch_service()
+    async with session.get(url, params=params) as resp:
+        if resp.status == 200:
+            data = await resp.json()
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300            # seconds a response is fresh
+DEFAULT_STALE_TTL = 600      # further seconds it may be served while refreshing
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_HOST_LIMIT = 4
+
+# Hosts with tighter free-tier rate limits
+HOST_LIMITS = {
+    "api.coingecko.com": 2,
+    "open-api.coinglass.com": 2,
+}
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def peek(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """(value, age in seconds) regardless of TTL, or None."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        self._data.move_to_end(key)
+        return item[0], time.monotonic() - item[1]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self.peek(key)
+        if item is None or item[1] > self.ttl:
+            return default
+        return item[0]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+@dataclass
+class FetchResponse:
+    """A fully-read upstream response (safe to share between callers)."""
+    status: int
+    body: bytes
+    url: str
+    from_cache: bool = False
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(self.body)
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+
+@dataclass
+class EndpointStats:
+    """Counters for one host + path."""
+    requests: int = 0
+    hits: int = 0
+    stale_hits: int = 0
+    coalesced: int = 0
+    upstream: int = 0
+    errors: int = 0
+    latency: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        served_locally = self.hits + self.stale_hits + self.coalesced
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "coalesced": self.coalesced,
+            "upstream": self.upstream,
+            "errors": self.errors,
+            "hit_rate": round(served_locally / self.requests, 4) if self.requests else 0.0,
+            "avg_latency_ms": round(self.latency / self.upstream * 1000, 2) if self.upstream else 0.0,
+        }
+
+
+class _PendingResponse:
+    """Async context manager returned by FetchService.get()."""
+
+    def __init__(self, coro):
+        self._coro = coro
+
+    async def __aenter__(self) -> FetchResponse:
+        return await self._coro
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FetchService:
+    """Pooled, coalescing, caching HTTP GET client shared by the analyzers."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        host_limits: Optional[Dict[str, int]] = None,
+        default_host_limit: int = DEFAULT_HOST_LIMIT,
+        timeout: float = 30,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.host_limits = dict(HOST_LIMITS if host_limits is None else host_limits)
+        self.default_host_limit = default_host_limit
+        self.timeout = timeout
+        self._cache = TTLCache(max_entries, ttl + stale_ttl)
+        self._stats: Dict[str, EndpointStats] = {}
+
+        # Bound to the running event loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    # ==================== CONNECTION POOL ====================
+
+    def _bind_loop(self):
+        """Sessions, semaphores and futures belong to one loop; start over on a new one."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._session = None
+            self._semaphores = {}
+            self._inflight = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=sum(self.host_limits.values()) + 8 * self.default_host_limit,
+                    ttl_dns_cache=300,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(host)
+        if sem is None:
+            sem = self._semaphores[host] = asyncio.Semaphore(
+                self.host_limits.get(host, self.default_host_limit)
+            )
+        return sem
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    # ==================== REQUESTS ====================
+
+    @staticmethod
+    def _key(url: str, params: Optional[Mapping], headers: Optional[Mapping]) -> Hashable:
+        return (
+            url,
+            tuple(sorted((str(k), str(v)) for k, v in dict(params or {}).items())),
+            tuple(sorted((str(k), str(v)) for k, v in dict(headers or {}).items())),
+        )
+
+    def _endpoint_stats(self, url: str) -> EndpointStats:
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats[endpoint] = EndpointStats()
+        return stats
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping] = None,
+        headers: Optional[Mapping] = None,
+        ttl: Optional[float] = None,
+        ssl: Any = None,
+    ) -> _PendingResponse:
+        """`async with service.get(url, params=...) as resp:` like aiohttp."""
+        return _PendingResponse(self.fetch(url, params, headers, ttl, ssl))
+
+    async def fetch(
+        self,
+        url: str,
+        params: Optional[Mapping] = None,
+        headers: Optional[Mapping] = None,
+        ttl: Optional[float] = None,
+        ssl: Any = None,
+    ) -> FetchResponse:
+        """
+        GET a URL through the cache.
+
+        Fresh cached responses return immediately; stale ones (within
+        stale_ttl) return immediately and trigger one background refresh.
+        Otherwise the caller joins the in-flight request for the same key
+        or starts it. Connection errors propagate as with aiohttp. `ssl`
+        is passed to aiohttp for the upstream request (None keeps its
+        default verification).
+        """
+        self._bind_loop()
+        key = self._key(url, params, headers)
+        stats = self._endpoint_stats(url)
+        stats.requests += 1
+        ttl = self.ttl if ttl is None else ttl
+
+        cached = self._cache.peek(key)
+        if cached is not None:
+            response, age = cached
+            if age <= ttl:
+                stats.hits += 1
+                return response
+            if age <= ttl + self.stale_ttl:
+                stats.stale_hits += 1
+                if key not in self._inflight:
+                    self._start(key, url, params, headers, stats, ssl).add_done_callback(self._log_refresh)
+                return response
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats.coalesced += 1
+        else:
+            task = self._start(key, url, params, headers, stats, ssl)
+        # Shielded so one caller's cancellation doesn't cancel the others
+        return await asyncio.shield(task)
+
+    def _start(self, key, url, params, headers, stats: EndpointStats, ssl=None) -> asyncio.Future:
+        task = asyncio.ensure_future(self._upstream(key, url, params, headers, stats, ssl))
+        self._inflight[key] = task
+
+        def _done(t, inflight=self._inflight):
+            if inflight.get(key) is t:
+                del inflight[key]
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _upstream(self, key, url, params, headers, stats: EndpointStats, ssl=None) -> FetchResponse:
+        options = {} if ssl is None else {"ssl": ssl}
+        async with self._semaphore(urlsplit(url).netloc):
+            session = self._get_session()
+            start = time.perf_counter()
+            try:
+                async with session.get(url, params=params, headers=headers, **options) as resp:
+                    response = FetchResponse(resp.status, await resp.read(), str(resp.url))
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.upstream += 1
+                stats.latency += time.perf_counter() - start
+
+        if response.status == 200:
+            self._cache.set(key, FetchResponse(response.status, response.body, response.url, from_cache=True))
+        return response
+
+    @staticmethod
+    def _log_refresh(task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Background refresh failed: {task.exception()}")
+
+    # ==================== STATS ====================
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint counters plus cache occupancy."""
+        endpoints = {name: s.to_dict() for name, s in sorted(self._stats.items())}
+        totals = EndpointStats()
+        for s in self._stats.values():
+            for field in ("requests", "hits", "stale_hits", "coalesced", "upstream", "errors"):
+                setattr(totals, field, getattr(totals, field) + getattr(s, field))
+            totals.latency += s.latency
+        return {
+            "endpoints": endpoints,
+            "total": totals.to_dict(),
+            "cache_entries": len(self._cache),
+            "in_flight": len(self._inflight),
+        }
+
+    def clear(self):
+        """Drop cached responses and stats."""
+        self._cache.clear()
+        self._stats.clear()
+
+
+# Global fetch service instance
+_fetch_service: Optional[FetchService] = None
+
+
+def get_fetch_service() -> FetchService:
+    """Get or create the shared fetch service."""
+    global _fetch_service
+    if _fetch_service is None:
+        _fetch_service = FetchService()
+    return _fetch_service
+
+
+async def close_fetch_service():
+    """Close the shared connection pool (on application shutdown)."""
+    if _fetch_service is not None:
+        await _fetch_service.close()
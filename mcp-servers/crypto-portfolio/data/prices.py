@@ -3,16 +3,27 @@ Price data service.
 
 Fetches cryptocurrency prices from CoinGecko or other sources,
 with caching to minimize API calls.
+
+Historical prices are read through the price_history table: dates it
+cannot answer are grouped into ranges and fetched with one CoinGecko
+market_chart/range call per range, then stored for later lookups.
 """
 
 import asyncio
 import time
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 import aiohttp
 
 from config import COINGECKO_IDS, settings
+from data.storage import Database, db
+
+# A stored price counts for a date if it is at most this much older
+HISTORY_MAX_AGE = timedelta(days=1)
+
+# Missing dates closer together than this are fetched in the same range request
+HISTORY_RANGE_GAP = timedelta(days=90)
 
 
 class PriceCache:
@@ -49,13 +60,86 @@ class PriceCache:
         self._cache.clear()
 
 
+def _naive_utc(dt: datetime) -> datetime:
+    """Stored price history uses naive UTC timestamps."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+RangeFetcher = Callable[[str, datetime, datetime], Awaitable[List[Tuple[datetime, Decimal]]]]
+
+
+class HistoricalPriceCache:
+    """
+    Read-through cache of historical prices backed by price_history.
+
+    get_many() answers every date it can from the database with one as-of
+    query, then fetches the remaining dates as a few contiguous ranges
+    (one fetcher call each), stores the points and answers again. Ranges
+    already fetched in this process are not requested twice, even if the
+    source had no data for them.
+    """
+
+    def __init__(
+        self,
+        fetch_range: RangeFetcher,
+        database: Optional[Database] = None,
+        max_age: timedelta = HISTORY_MAX_AGE,
+        range_gap: timedelta = HISTORY_RANGE_GAP,
+    ):
+        self.fetch_range = fetch_range
+        self.db = database or db
+        self.max_age = max_age
+        self.range_gap = range_gap
+        self._fetched: Dict[str, List[Tuple[datetime, datetime]]] = {}
+        self.requests = 0
+
+    def _was_fetched(self, asset: str, when: datetime) -> bool:
+        return any(start <= when <= end for start, end in self._fetched.get(asset, ()))
+
+    def _missing_ranges(self, dates: List[datetime]) -> List[Tuple[datetime, datetime]]:
+        """Group sorted dates into [start, end] ranges split at large gaps."""
+        ranges = []
+        for when in dates:
+            if ranges and when - ranges[-1][1] <= self.range_gap:
+                ranges[-1][1] = when
+            else:
+                ranges.append([when, when])
+        # Reach back far enough for an as-of point on the first date
+        return [(start - self.max_age, end) for start, end in ranges]
+
+    async def get_many(self, asset: str, dates: Sequence[datetime]) -> List[Optional[Decimal]]:
+        """Prices as of each date (None where no source has one)."""
+        dates = [_naive_utc(d) for d in dates]
+        prices = self.db.get_prices_as_of(asset, dates, max_age=self.max_age)
+
+        missing = sorted({
+            d for d, price in zip(dates, prices)
+            if price is None and not self._was_fetched(asset, d)
+        })
+        if not missing:
+            return prices
+
+        points = []
+        for start, end in self._missing_ranges(missing):
+            self.requests += 1
+            points.extend(await self.fetch_range(asset, start, end))
+            self._fetched.setdefault(asset, []).append((start, end))
+
+        if not self.db.save_prices((asset, price, when) for when, price in points):
+            return prices
+        return self.db.get_prices_as_of(asset, dates, max_age=self.max_age)
+
+
 class PriceService:
     """Service for fetching cryptocurrency prices."""
 
     COINGECKO_URL = "https://api.coingecko.com/api/v3"
 
-    def __init__(self, cache_ttl: int = None):
+    def __init__(self, cache_ttl: int = None, history_db: Optional[Database] = None):
         self.cache = PriceCache(cache_ttl or settings.data.price_cache_duration)
+        self.history = HistoricalPriceCache(self._fetch_price_range, history_db)
         self._session: Optional[aiohttp.ClientSession] = None
         self.api_key = settings.market_data.coingecko_api_key
 
@@ -197,9 +281,28 @@ class PriceService:
         date: datetime,
     ) -> Optional[Decimal]:
         """Get historical price for a specific date."""
+        return (await self.get_historical_prices(asset, [date]))[0]
+
+    async def get_historical_prices(
+        self,
+        asset: str,
+        dates: Sequence[datetime],
+    ) -> List[Optional[Decimal]]:
+        """Get historical prices for many dates, in the order given."""
+        if asset in ("USDC", "USDT", "DAI", "BUSD", "USD"):
+            return [Decimal("1.0")] * len(dates)
+        return await self.history.get_many(asset, dates)
+
+    async def _fetch_price_range(
+        self,
+        asset: str,
+        start: datetime,
+        end: datetime,
+    ) -> List[Tuple[datetime, Decimal]]:
+        """Fetch (timestamp, price) points between two naive UTC times."""
         coingecko_id = self._get_coingecko_id(asset)
         if not coingecko_id:
-            return None
+            return []
 
         session = await self._get_session()
 
@@ -207,27 +310,29 @@ class PriceService:
         if self.api_key:
             headers["x-cg-demo-api-key"] = self.api_key
 
-        # CoinGecko expects dd-mm-yyyy format
-        date_str = date.strftime("%d-%m-%Y")
-
-        url = f"{self.COINGECKO_URL}/coins/{coingecko_id}/history"
+        url = f"{self.COINGECKO_URL}/coins/{coingecko_id}/market_chart/range"
         params = {
-            "date": date_str,
+            "vs_currency": "usd",
+            "from": int(start.replace(tzinfo=timezone.utc).timestamp()),
+            "to": int(end.replace(tzinfo=timezone.utc).timestamp()) + 1,
         }
 
         try:
             async with session.get(url, params=params, headers=headers) as resp:
                 if resp.status != 200:
-                    return None
+                    return []
 
                 data = await resp.json()
 
-                if "market_data" in data and "current_price" in data["market_data"]:
-                    return Decimal(str(data["market_data"]["current_price"]["usd"]))
-
-                return None
+                return [
+                    (
+                        datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).replace(tzinfo=None),
+                        Decimal(str(price)),
+                    )
+                    for timestamp_ms, price in data.get("prices", [])
+                ]
         except Exception:
-            return None
+            return []
 
     async def close(self):
         """Close the session."""
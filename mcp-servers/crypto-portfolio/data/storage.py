@@ -12,10 +12,10 @@ Uses SQLite for local persistence of:
 import sqlite3
 import json
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Generator
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence, Tuple
 
 from config import settings
 
@@ -372,13 +372,21 @@ class Database:
 
     def save_price(self, asset: str, price: Decimal, timestamp: datetime) -> None:
         """Save a price point."""
-        with self._get_conn() as conn:
-            cursor = conn.cursor()
+        self.save_prices([(asset, price, timestamp)])
 
-            cursor.execute("""
+    def save_prices(self, prices: Iterable[Tuple[str, Decimal, datetime]]) -> int:
+        """Save many (asset, price, timestamp) points in one transaction."""
+        rows = [(asset, str(price), timestamp.isoformat()) for asset, price, timestamp in prices]
+        if not rows:
+            return 0
+
+        with self._get_conn() as conn:
+            conn.executemany("""
                 INSERT OR REPLACE INTO price_history (asset, price, timestamp)
                 VALUES (?, ?, ?)
-            """, (asset, str(price), timestamp.isoformat()))
+            """, rows)
+
+        return len(rows)
 
     def get_price_at_time(
         self,
@@ -402,6 +410,55 @@ class Database:
 
             return None
 
+    def get_prices_as_of(
+        self,
+        asset: str,
+        timestamps: Sequence[datetime],
+        max_age: Optional[timedelta] = None,
+    ) -> List[Optional[Decimal]]:
+        """
+        Price at or before each timestamp, in the order given.
+
+        One range query covers every timestamp; the lookups are answered by
+        merging the sorted query times against the sorted price rows. With
+        max_age, a price older than that relative to its query time counts
+        as missing (None).
+        """
+        if not timestamps:
+            return []
+
+        keys = [ts.isoformat() for ts in timestamps]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        first, last = keys[order[0]], keys[order[-1]]
+
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+
+            # Everything from the last point at/before the earliest query time
+            cursor.execute("""
+                SELECT price, timestamp FROM price_history
+                WHERE asset = ? AND timestamp <= ? AND timestamp >= COALESCE(
+                    (SELECT MAX(timestamp) FROM price_history WHERE asset = ? AND timestamp <= ?), ?
+                )
+                ORDER BY timestamp
+            """, (asset, last, asset, first, first))
+            rows = cursor.fetchall()
+
+        results: List[Optional[Decimal]] = [None] * len(keys)
+        i = -1
+        for k in order:
+            while i + 1 < len(rows) and rows[i + 1]["timestamp"] <= keys[k]:
+                i += 1
+            if i < 0:
+                continue
+            if max_age is not None:
+                age = timestamps[k] - datetime.fromisoformat(rows[i]["timestamp"])
+                if age > max_age:
+                    continue
+            results[k] = Decimal(rows[i]["price"])
+
+        return results
+
     # Tax Lots
 
     def add_tax_lot(
@@ -431,16 +488,23 @@ class Database:
 
             return cursor.lastrowid
 
-    def get_open_tax_lots(self, asset: str) -> List[Dict]:
-        """Get open (non-zero remaining) tax lots for an asset."""
+    def get_open_tax_lots(self, asset: str, after_id: Optional[int] = None) -> List[Dict]:
+        """Get open (non-zero remaining) tax lots for an asset.
+
+        With after_id, only lots added since that id are returned.
+        """
         with self._get_conn() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("""
+            query = """
                 SELECT * FROM tax_lots
                 WHERE asset = ? AND CAST(remaining_amount AS REAL) > 0
-                ORDER BY acquisition_date ASC
-            """, (asset,))
+            """
+            params: list = [asset]
+            if after_id is not None:
+                query += " AND id > ?"
+                params.append(after_id)
+            cursor.execute(query + " ORDER BY acquisition_date ASC", params)
 
             return [{
                 "id": row["id"],
@@ -460,26 +524,40 @@ class Database:
         close_date: datetime,
     ) -> None:
         """Close (partially or fully) a tax lot."""
+        self.close_tax_lots([(lot_id, amount_sold, proceeds, close_date)])
+
+    def close_tax_lots(self, closures: List[Tuple[int, Decimal, Decimal, datetime]]) -> None:
+        """Close several tax lots as (lot_id, amount_sold, proceeds, close_date) in one transaction."""
         with self._get_conn() as conn:
             cursor = conn.cursor()
 
-            # Get current remaining amount
-            cursor.execute("SELECT remaining_amount FROM tax_lots WHERE id = ?", (lot_id,))
-            row = cursor.fetchone()
-            if not row:
-                raise ValueError(f"Tax lot {lot_id} not found")
+            ids = list(dict.fromkeys(lot_id for lot_id, _, _, _ in closures))
+            remaining = {}
+            for i in range(0, len(ids), 500):  # Stay under SQLite's bound-parameter limit
+                chunk = ids[i:i + 500]
+                cursor.execute(
+                    f"SELECT id, remaining_amount FROM tax_lots WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                remaining.update((row["id"], Decimal(row["remaining_amount"])) for row in cursor.fetchall())
 
-            remaining = Decimal(row["remaining_amount"])
-            new_remaining = remaining - amount_sold
+            updates = []
+            for lot_id, amount_sold, proceeds, close_date in closures:
+                if lot_id not in remaining:
+                    raise ValueError(f"Tax lot {lot_id} not found")
 
-            if new_remaining < 0:
-                raise ValueError(f"Cannot sell more than remaining amount ({remaining})")
+                new_remaining = remaining[lot_id] - amount_sold
+                if new_remaining < 0:
+                    raise ValueError(f"Cannot sell more than remaining amount ({remaining[lot_id]})")
 
-            cursor.execute("""
+                remaining[lot_id] = new_remaining
+                updates.append((str(new_remaining), close_date.isoformat(), str(proceeds), lot_id))
+
+            cursor.executemany("""
                 UPDATE tax_lots
                 SET remaining_amount = ?, closed_date = ?, proceeds = ?
                 WHERE id = ?
-            """, (str(new_remaining), close_date.isoformat(), str(proceeds), lot_id))
+            """, updates)
 
 
 # Global database instance
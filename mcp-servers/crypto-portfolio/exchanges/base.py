@@ -3,14 +3,23 @@ Base exchange client interface.
 All exchange implementations should inherit from this class.
 """
 
+import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from decimal import Decimal
 
 
+# Seconds a ticker price is reused across callers and clients
+TICKER_CACHE_TTL = 10.0
+
+# Concurrent get_ticker_price calls when an exchange has no batch endpoint
+PRICE_FETCH_CONCURRENCY = 8
+
+
 @dataclass
 class Balance:
     """Represents a balance on an exchange."""
@@ -66,11 +75,61 @@ class OrderResult:
     error: Optional[str] = None
 
 
+class TickerCache:
+    """
+    Short-TTL last-price cache keyed by (exchange, asset).
+
+    Shared by every client, so several accounts on one exchange (or several
+    callers pricing the same holdings) reuse one ticker fetch.
+    """
+
+    def __init__(self, ttl: float = TICKER_CACHE_TTL):
+        self.ttl = ttl
+        self._prices: Dict[Tuple[str, str], Tuple[Decimal, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def get_many(self, exchange: str, assets: Iterable[str]) -> Dict[str, Decimal]:
+        """Fresh cached prices for whichever of assets are cached."""
+        now = time.monotonic()
+        found = {}
+        for asset in assets:
+            entry = self._prices.get((exchange, asset))
+            if entry is not None and now - entry[1] <= self.ttl:
+                found[asset] = entry[0]
+        return found
+
+    def set_many(self, exchange: str, prices: Dict[str, Decimal]):
+        now = time.monotonic()
+        for asset, price in prices.items():
+            self._prices[(exchange, asset)] = (price, now)
+
+    def clear(self):
+        self._prices.clear()
+
+
+# Global ticker cache instance
+_ticker_cache: Optional[TickerCache] = None
+
+
+def get_ticker_cache() -> TickerCache:
+    """Get or create the shared ticker cache."""
+    global _ticker_cache
+    if _ticker_cache is None:
+        _ticker_cache = TickerCache()
+    return _ticker_cache
+
+
 class ExchangeClient(ABC):
     """Abstract base class for exchange clients."""
 
     name: str = "base"
 
+    # Set by clients that implement _fetch_ticker_batch with a multi-symbol endpoint
+    supports_batch_tickers: bool = False
+    price_concurrency: int = PRICE_FETCH_CONCURRENCY
+
     @abstractmethod
     async def get_balances(self) -> Dict[str, Balance]:
         """
@@ -158,8 +217,11 @@ class ExchangeClient(ABC):
         """
         Get prices for multiple assets.
 
-        Default implementation calls get_ticker_price for each.
-        Override for batch API support.
+        Serves what it can from the shared ticker cache, then fetches the
+        rest with the exchange's multi-symbol ticker endpoint when the client
+        supports one (_fetch_ticker_batch), else with get_ticker_price calls
+        bounded by price_concurrency. Assets the exchange can't price are
+        left out.
 
         Args:
             assets: List of asset symbols
@@ -167,14 +229,44 @@ class ExchangeClient(ABC):
         Returns:
             Dict mapping asset to price.
         """
-        prices = {}
-        for asset in assets:
+        cache = get_ticker_cache()
+        prices = cache.get_many(self.name, assets)
+        missing = list(dict.fromkeys(a for a in assets if a not in prices))
+        if not missing:
+            return prices
+
+        fetched = None
+        if self.supports_batch_tickers:
             try:
-                prices[asset] = await self.get_ticker_price(asset)
+                fetched = await self._fetch_ticker_batch(missing)
             except Exception as e:
-                logging.warning(f"Price fetch failed for {asset}: {e}")
+                logging.warning(f"{self.name} batch ticker failed, fetching individually: {e}")
+        if fetched is None:
+            fetched = await self._fetch_tickers_concurrently(missing)
+
+        cache.set_many(self.name, fetched)
+        prices.update(fetched)
         return prices
 
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Optional[Dict[str, Decimal]]:
+        """Prices for assets from one multi-symbol ticker request (None: no such endpoint)."""
+        return None
+
+    async def _fetch_tickers_concurrently(self, assets: List[str]) -> Dict[str, Decimal]:
+        """get_ticker_price for each asset, at most price_concurrency at a time."""
+        semaphore = asyncio.Semaphore(self.price_concurrency)
+
+        async def fetch(asset: str) -> Optional[Decimal]:
+            async with semaphore:
+                try:
+                    return await self.get_ticker_price(asset)
+                except Exception as e:
+                    logging.warning(f"Price fetch failed for {asset}: {e}")
+                    return None
+
+        results = await asyncio.gather(*(fetch(asset) for asset in assets))
+        return {asset: price for asset, price in zip(assets, results) if price is not None}
+
     @abstractmethod
     async def stake(self, asset: str, amount: Decimal) -> bool:
         """
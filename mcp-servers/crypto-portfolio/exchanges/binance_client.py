@@ -24,6 +24,7 @@ class BinanceClient(ExchangeClient):
     """Client for Binance spot trading API."""
 
     name = "binance"
+    supports_batch_tickers = True
     BASE_URL = "https://api.binance.com"
 
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
@@ -343,8 +344,8 @@ class BinanceClient(ExchangeClient):
         )
         return Decimal(data["price"])
 
-    async def get_all_prices(self, assets: List[str]) -> Dict[str, Decimal]:
-        """Get prices for multiple assets (batch)."""
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        """Get prices for multiple assets from the all-symbols ticker."""
         data = await self._request(
             "GET",
             "/api/v3/ticker/price",
@@ -357,7 +358,7 @@ class BinanceClient(ExchangeClient):
         for ticker in data:
             symbol = ticker["symbol"]
             if symbol.endswith("USDT"):
-                base = symbol.replace("USDT", "")
+                base = symbol[:-len("USDT")]
                 if base in asset_set:
                     prices[base] = Decimal(ticker["price"])
 
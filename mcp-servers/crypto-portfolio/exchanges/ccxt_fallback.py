@@ -145,6 +145,31 @@ class CCXTClient(ExchangeClient):
             f"No price available for {asset} on {self.exchange_id}"
         )
 
+    @property
+    def supports_batch_tickers(self) -> bool:
+        return bool(self._exchange.has.get("fetchTickers"))
+
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        """Get prices via one fetch_tickers() call, using each asset's first listed quote."""
+        markets = await self._exchange.load_markets()
+
+        symbols = {}
+        for asset in assets:
+            for quote in QUOTE_CURRENCIES:
+                if f"{asset}/{quote}" in markets:
+                    symbols[f"{asset}/{quote}"] = asset
+                    break
+        if not symbols:
+            return {}
+
+        tickers = await self._exchange.fetch_tickers(list(symbols))
+        prices = {}
+        for symbol, asset in symbols.items():
+            ticker = tickers.get(symbol)
+            if ticker and ticker.get("last"):
+                prices[asset] = Decimal(str(ticker["last"]))
+        return prices
+
     async def get_trade_history(
         self,
         start_date: Optional[datetime] = None,
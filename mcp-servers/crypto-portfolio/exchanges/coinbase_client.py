@@ -32,6 +32,7 @@ class CoinbaseClient(ExchangeClient):
     """
 
     name = "coinbase"
+    supports_batch_tickers = True
     BASE_URL = "https://api.coinbase.com"
 
     def __init__(self, api_key: str, api_secret: str):
@@ -314,6 +315,27 @@ class CoinbaseClient(ExchangeClient):
         data = await self._request("GET", path)
         return Decimal(data["price"])
 
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        """Get prices for multiple assets with one list-products request."""
+        product_ids = [f"{asset}-USD" for asset in assets]
+        if self._sdk_client:
+            result = await asyncio.to_thread(
+                self._sdk_client.get_products, product_ids=product_ids
+            )
+            products = result.get("products", []) if isinstance(result, dict) else result.products
+        else:
+            query = "&".join(f"product_ids={pid}" for pid in product_ids)
+            data = await self._request("GET", f"/api/v3/brokerage/products?{query}")
+            products = data.get("products", [])
+
+        prices = {}
+        for product in products:
+            product_id = product["product_id"] if isinstance(product, dict) else product.product_id
+            price = product["price"] if isinstance(product, dict) else product.price
+            if product_id in product_ids and price:
+                prices[product_id[:-len("-USD")]] = Decimal(str(price))
+        return prices
+
     async def stake(self, asset: str, amount: Decimal) -> bool:
         """
         Stake an asset via Coinbase.
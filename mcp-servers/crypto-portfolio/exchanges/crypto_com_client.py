@@ -28,6 +28,7 @@ class CryptoComClient(ExchangeClient):
     """Async client for Crypto.com Exchange API."""
 
     name = "crypto_com"
+    supports_batch_tickers = True
     BASE_URL = "https://api.crypto.com/exchange/v1"
 
     def __init__(self, api_key: str, api_secret: str):
@@ -309,6 +310,18 @@ class CryptoComClient(ExchangeClient):
 
         raise ValueError(f"Could not get price for {asset}")
 
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        """Get prices for multiple assets from the all-instruments ticker."""
+        data = await self._request("public/get-tickers", public=True)
+
+        wanted = {f"{asset}_USDT": asset for asset in assets}
+        prices = {}
+        for ticker in (data or {}).get("data", []):
+            asset = wanted.get(ticker.get("i"))
+            if asset and ticker.get("a"):
+                prices[asset] = Decimal(str(ticker["a"]))  # Ask price
+        return prices
+
     async def stake(self, asset: str, amount: Decimal) -> bool:
         """
         Stake assets via Crypto.com Earn.
@@ -29,6 +29,7 @@ class GeminiClient(ExchangeClient):
     """Async client for Gemini REST API."""
 
     name = "gemini"
+    supports_batch_tickers = True
     BASE_URL = "https://api.gemini.com"
 
     def __init__(self, api_key: str, api_secret: str, sandbox: bool = False):
@@ -318,6 +319,18 @@ class GeminiClient(ExchangeClient):
 
         raise ValueError(f"Could not get price for {asset}")
 
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        """Get prices for multiple assets from the price feed of all pairs."""
+        data = await self._public_request("/v1/pricefeed")
+
+        wanted = {f"{asset.upper()}USD": asset for asset in assets}
+        prices = {}
+        for item in data or []:
+            asset = wanted.get(item.get("pair"))
+            if asset and item.get("price"):
+                prices[asset] = Decimal(str(item["price"]))
+        return prices
+
     async def stake(self, asset: str, amount: Decimal) -> bool:
         """Deposit to Gemini Earn."""
         params = {
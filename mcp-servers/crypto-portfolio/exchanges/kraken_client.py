@@ -84,12 +84,15 @@ class KrakenClient(ExchangeClient):
     """Client for Kraken API."""
 
     name = "kraken"
+    supports_batch_tickers = True
     BASE_URL = "https://api.kraken.com"
 
     def __init__(self, api_key: str, api_secret: str):
         self.api_key = api_key
         self.api_secret = api_secret
         self._session: Optional[aiohttp.ClientSession] = None
+        # Kraken base symbol -> canonical USD pair name, from AssetPairs
+        self._usd_pairs: Optional[Dict[str, str]] = None
 
     @classmethod
     def from_key_file(cls, key_file: str) -> "KrakenClient":
@@ -358,6 +361,49 @@ class KrakenClient(ExchangeClient):
 
         raise Exception(f"Could not get price for {asset}")
 
+    async def _get_usd_pairs(self) -> Dict[str, str]:
+        """
+        Map Kraken base symbols to their canonical USD pair (XBT -> XXBTZUSD).
+
+        Assets only listed against USDT map to that pair, as get_ticker_price
+        also falls back to USDT.
+        """
+        if self._usd_pairs is None:
+            data = await self._request("GET", "/0/public/AssetPairs")
+            pairs, usdt_pairs = {}, {}
+            for name, info in data.items():
+                base, _, quote = info.get("wsname", "").partition("/")
+                if quote == "USD" and base:
+                    pairs[base] = name
+                elif quote == "USDT" and base:
+                    usdt_pairs[base] = name
+            for base, name in usdt_pairs.items():
+                pairs.setdefault(base, name)
+            self._usd_pairs = pairs
+        return self._usd_pairs
+
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        """Get prices for multiple assets with one comma-separated Ticker request.
+
+        Kraken rejects the whole request if any pair is unknown, so assets
+        without a USD or USDT pair in AssetPairs (USD itself, other fiat,
+        unlisted tokens) are left out of the request and the result.
+        """
+        usd_pairs = await self._get_usd_pairs()
+        wanted = {
+            asset: usd_pairs[to_kraken_symbol(asset)]
+            for asset in assets if to_kraken_symbol(asset) in usd_pairs
+        }
+        if not wanted:
+            return {}
+        data = await self._request("GET", "/0/public/Ticker", {"pair": ",".join(wanted.values())})
+
+        # Results are keyed by the canonical pair name requested
+        return {
+            asset: Decimal(str(data[pair]["c"][0]))
+            for asset, pair in wanted.items() if pair in data
+        }
+
     async def stake(self, asset: str, amount: Decimal) -> bool:
         """Stake an asset on Kraken."""
         params = {
@@ -400,6 +400,7 @@ class BaseMockExchange(ABC):
         self.error_injector = ErrorInjector(seed)
         self.latency_range = latency_ms
         self.random = random.Random(seed)
+        self.request_count = 0
 
         # Initialize balances
         if initial_balances:
@@ -415,7 +416,8 @@ class BaseMockExchange(ABC):
             }
 
     async def _simulate_latency(self):
-        """Simulate network latency."""
+        """Simulate network latency (one API round trip)."""
+        self.request_count += 1
         latency = self.random.randint(*self.latency_range)
         await asyncio.sleep(latency / 1000)
 
@@ -686,6 +688,16 @@ class BaseMockExchange(ABC):
         base = symbol.split("-")[0]
         return self.price_simulator.get_price(base)
 
+    async def get_prices(self, symbols: List[str]) -> Dict[str, Decimal]:
+        """Get current prices for several symbols in one request (batch ticker)."""
+        await self._simulate_latency()
+        self.error_injector.maybe_raise("network_error")
+
+        return {
+            symbol: self.price_simulator.get_price(symbol.split("-")[0])
+            for symbol in symbols
+        }
+
     async def get_order_book(self, symbol: str, depth: int = 10) -> OrderBook:
         """Get order book for a symbol."""
         await self._simulate_latency()
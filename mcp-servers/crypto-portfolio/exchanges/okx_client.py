@@ -30,6 +30,7 @@ class OKXClient(ExchangeClient):
     """Async client for OKX REST API v5."""
 
     name = "okx"
+    supports_batch_tickers = True
     BASE_URL = "https://www.okx.com"
 
     def __init__(
@@ -413,7 +414,7 @@ class OKXClient(ExchangeClient):
 
         raise ValueError(f"Could not get price for {asset}")
 
-    async def get_all_prices(self, assets: List[str]) -> Dict[str, Decimal]:
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
         """Get prices for multiple assets using batch ticker endpoint."""
         prices = {}
 
@@ -0,0 +1,282 @@
+"""
+Lot Ledger
+==========
+
+In-memory index of open tax lots shared by the cost basis trackers
+(cost_basis.py, transaction_history.py, tracking/tax.py).
+
+Features:
+- One book per asset holding the caller's own lot objects (no copies)
+- FIFO/LIFO from a single acquisition-ordered deque (left/right end)
+- HIFO from a max-heap on cost per unit, built on first use
+- Specific identification from a lot_id map
+- Indexes are maintained incrementally; exhausted lots leave the map at
+  once and the deque/heap lazily, so each sale costs O(k log n) for the
+  k lots it touches instead of re-sorting every lot of the asset
+"""
+
+import heapq
+from collections import deque
+from itertools import count
+from operator import attrgetter
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+METHODS = ("fifo", "lifo", "hifo", "specific")
+
+# Indexes are compacted once they hold this many more dead entries than open lots
+_COMPACT_SLACK = 32
+
+
+def normalize_method(method: Any) -> str:
+    """Accept any of the per-module method enums (or their string values)."""
+    name = str(getattr(method, "value", method)).lower()
+    if name == "specific_id":
+        name = "specific"
+    if name not in METHODS:
+        raise ValueError(f"Unsupported cost basis method: {method}")
+    return name
+
+
+class InsufficientLotsError(ValueError):
+    """Raised when open lots cannot cover a sale."""
+
+    def __init__(self, asset: str, requested, available):
+        self.asset = asset
+        self.requested = requested
+        self.available = available
+        super().__init__(
+            f"Insufficient {asset} lots. Need {requested}, have {available}"
+        )
+
+
+class _Entry:
+    """Index entry: the caller's lot plus its immutable sort keys."""
+
+    __slots__ = ("lot", "lot_id", "acquired", "cost", "seq")
+
+    def __init__(self, lot, lot_id, acquired, cost, seq):
+        self.lot = lot
+        self.lot_id = lot_id
+        self.acquired = acquired
+        self.cost = cost
+        self.seq = seq
+
+
+class _Book:
+    """Open lots of a single asset."""
+
+    def __init__(self):
+        self.by_id: Dict[Any, _Entry] = {}
+        self.by_date: Deque[_Entry] = deque()
+        self.by_cost: Optional[List[tuple]] = None  # Built on first HIFO use
+
+
+class LotLedger:
+    """
+    Open lots per asset with per-method priority indexes.
+
+    The ledger does not own lot data: it reads the id, cost per unit and
+    acquisition date once when a lot is added, and reads/writes the
+    remaining quantity attribute in place. Attribute names are configurable
+    so each module keeps its own lot dataclass.
+
+    select() plans a sale without touching any lot; deplete() applies a
+    plan; consume() does both and raises InsufficientLotsError first if the
+    plan falls short, so a failed sale leaves every lot unchanged.
+    """
+
+    def __init__(
+        self,
+        lot_id: str = "lot_id",
+        remaining: str = "remaining",
+        cost_per_unit: str = "cost_per_unit",
+        acquired: str = "acquired",
+    ):
+        self._id = attrgetter(lot_id)
+        self._remaining_attr = remaining
+        self._remaining = attrgetter(remaining)
+        self._cost = attrgetter(cost_per_unit)
+        self._acquired = attrgetter(acquired)
+        self._books: Dict[str, _Book] = {}
+        self._seq = count()
+
+    # ==================== BOOKS ====================
+
+    def __contains__(self, asset: str) -> bool:
+        return asset in self._books
+
+    def assets(self) -> List[str]:
+        return list(self._books)
+
+    def count(self, asset: str) -> int:
+        """Number of open lots for an asset."""
+        book = self._books.get(asset)
+        return len(book.by_id) if book else 0
+
+    def clear(self, asset: Optional[str] = None):
+        """Forget one asset's lots (or every asset's)."""
+        if asset is None:
+            self._books.clear()
+        else:
+            self._books.pop(asset, None)
+
+    def add(self, asset: str, lot) -> None:
+        """Add an open lot. Lots normally arrive in acquisition order (O(1))."""
+        book = self._books.get(asset)
+        if book is None:
+            book = self._books[asset] = _Book()
+        if not self._remaining(lot) > 0:
+            return
+
+        entry = _Entry(lot, self._id(lot), self._acquired(lot), self._cost(lot), next(self._seq))
+        if entry.lot_id in book.by_id:
+            raise ValueError(f"Duplicate lot id {entry.lot_id} for {asset}")
+        book.by_id[entry.lot_id] = entry
+
+        by_date = book.by_date
+        if not by_date or by_date[-1].acquired <= entry.acquired:
+            by_date.append(entry)
+        else:
+            # Back-dated lot: walk in from the newest end
+            i = len(by_date)
+            while i > 0 and by_date[i - 1].acquired > entry.acquired:
+                i -= 1
+            by_date.insert(i, entry)
+
+        if book.by_cost is not None:
+            heapq.heappush(book.by_cost, self._cost_key(entry))
+
+    def extend(self, asset: str, lots: Sequence) -> None:
+        for lot in lots:
+            self.add(asset, lot)
+
+    def get(self, asset: str, lot_id) -> Optional[Any]:
+        book = self._books.get(asset)
+        entry = book.by_id.get(lot_id) if book else None
+        return entry.lot if entry else None
+
+    def open_lots(self, asset: str, method: Any = "fifo", lot_ids: Optional[Sequence] = None) -> List:
+        """Open lots in the order the method would consume them."""
+        return [entry.lot for entry in self._ordered(asset, normalize_method(method), lot_ids)]
+
+    # ==================== SALES ====================
+
+    def select(
+        self,
+        asset: str,
+        quantity,
+        method: Any = "fifo",
+        lot_ids: Optional[Sequence] = None,
+    ) -> List[Tuple[Any, Any]]:
+        """
+        Plan a sale as (lot, amount_from_lot) pairs without changing any lot.
+
+        Walks only as many lots as the sale needs. If the open lots run out
+        the plan covers what is available; the caller decides whether a
+        shortfall is an error.
+        """
+        selected = []
+        needed = quantity
+        for entry in self._ordered(asset, normalize_method(method), lot_ids):
+            if needed <= 0:
+                break
+            take = min(self._remaining(entry.lot), needed)
+            selected.append((entry.lot, take))
+            needed -= take
+        return selected
+
+    def deplete(self, asset: str, selected: Sequence[Tuple[Any, Any]]) -> None:
+        """Subtract a plan from its lots; exhausted lots leave the book."""
+        book = self._books.get(asset)
+        if book is None:
+            return
+        attr = self._remaining_attr
+        for lot, amount in selected:
+            remaining = self._remaining(lot) - amount
+            setattr(lot, attr, remaining)
+            if not remaining > 0:
+                book.by_id.pop(self._id(lot), None)
+        self._prune(book)
+
+    def consume(
+        self,
+        asset: str,
+        quantity,
+        method: Any = "fifo",
+        lot_ids: Optional[Sequence] = None,
+        tolerance=0,
+    ) -> List[Tuple[Any, Any]]:
+        """select() + deplete(); raises InsufficientLotsError before depleting."""
+        selected = self.select(asset, quantity, method, lot_ids)
+        available = sum(amount for _, amount in selected)
+        if quantity - available > tolerance:
+            raise InsufficientLotsError(asset, quantity, available)
+        self.deplete(asset, selected)
+        return selected
+
+    # ==================== INDEXES ====================
+
+    @staticmethod
+    def _cost_key(entry: _Entry) -> tuple:
+        # Highest cost first; ties go to the oldest lot, as a stable sort would
+        return (-entry.cost, entry.acquired, entry.seq, entry)
+
+    def _ordered(self, asset: str, method: str, lot_ids: Optional[Sequence]) -> Iterator[_Entry]:
+        book = self._books.get(asset)
+        if book is None:
+            return iter(())
+        by_id = book.by_id
+        self._prune(book)
+
+        if method == "specific":
+            if not lot_ids:
+                raise ValueError("Specific lots required for SPECIFIC accounting method")
+            chosen = [by_id[i] for i in dict.fromkeys(lot_ids) if i in by_id]
+            chosen.sort(key=lambda e: (e.acquired, e.seq))
+            return iter(chosen)
+
+        if method == "hifo":
+            if book.by_cost is None:
+                book.by_cost = [self._cost_key(e) for e in book.by_date if e.lot_id in by_id]
+                heapq.heapify(book.by_cost)
+            return self._heap_order(book.by_cost, by_id)
+
+        lots = book.by_date if method == "fifo" else reversed(book.by_date)
+        return (e for e in lots if by_id.get(e.lot_id) is e)
+
+    @staticmethod
+    def _heap_order(heap: List[tuple], by_id: Dict[Any, _Entry]) -> Iterator[_Entry]:
+        """Yield heap entries in priority order without popping (O(k log k))."""
+        if not heap:
+            return
+        frontier = [(heap[0], 0)]
+        size = len(heap)
+        while frontier:
+            key, i = heapq.heappop(frontier)
+            entry = key[-1]
+            if by_id.get(entry.lot_id) is entry:
+                yield entry
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size:
+                    heapq.heappush(frontier, (heap[child], child))
+
+    def _prune(self, book: _Book) -> None:
+        """Drop exhausted lots from the index ends; compact when mostly dead."""
+        by_id = book.by_id
+        by_date = book.by_date
+        while by_date and by_id.get(by_date[0].lot_id) is not by_date[0]:
+            by_date.popleft()
+        while by_date and by_id.get(by_date[-1].lot_id) is not by_date[-1]:
+            by_date.pop()
+        if len(by_date) > 2 * len(by_id) + _COMPACT_SLACK:
+            book.by_date = deque(e for e in by_date if by_id.get(e.lot_id) is e)
+
+        heap = book.by_cost
+        if heap is None:
+            return
+        while heap and by_id.get(heap[0][-1].lot_id) is not heap[0][-1]:
+            heapq.heappop(heap)
+        if len(heap) > 2 * len(by_id) + _COMPACT_SLACK:
+            book.by_cost = [k for k in heap if by_id.get(k[-1].lot_id) is k[-1]]
+            heapq.heapify(book.by_cost)
@@ -9,18 +9,31 @@ Features:
 - Trailing stops
 - Cross-exchange monitoring
 - Notifications
+
+Prices come from a shared PriceMatrix: each round fills the asset x exchange
+grid concurrently (and from websocket feeds while monitoring), then every
+alert is evaluated against the same snapshot of bounded-age prices.
+
+Armed alerts are kept in an AlertIndex (one book per asset and exchange
+scope), so a round only touches alerts whose thresholds the price crossed.
+Changes are appended to a journal next to alerts_config.json, which is only
+rewritten when the journal is compacted.
 """
 
+import asyncio
 import os
 import json
 import time
 from datetime import datetime
 from typing import Optional, List, Dict
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from enum import Enum
 from pathlib import Path
 from dotenv import load_dotenv
 
+from alert_index import AlertIndex, AlertJournal
+from price_matrix import DEFAULT_MAX_AGE, PriceMatrix, PriceSnapshot, default_price_feed
+
 
 class AlertType(Enum):
     PRICE_ABOVE = "price_above"
@@ -60,7 +73,8 @@ class PriceAlert:
     highest_price_seen: float = None
 
     def to_dict(self) -> dict:
-        d = asdict(self)
+        # Shallow copy: every field is a scalar, enum or datetime
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
         d["alert_type"] = self.alert_type.value
         d["action"] = self.action.value
         d["triggered_at"] = self.triggered_at.isoformat() if self.triggered_at else None
@@ -100,7 +114,7 @@ class MultiExchangeAlertMonitor:
     CONFIG_FILE = "alerts_config.json"
     HISTORY_FILE = "alerts_history.json"
 
-    def __init__(self, config_dir: str = None, dry_run: bool = False):
+    def __init__(self, config_dir: str = None, dry_run: bool = False, max_price_age: float = DEFAULT_MAX_AGE):
         load_dotenv()
 
         if config_dir is None:
@@ -113,11 +127,16 @@ class MultiExchangeAlertMonitor:
         self.history_path = os.path.join(config_dir, self.HISTORY_FILE)
 
         self.dry_run = dry_run
+        self.journal = AlertJournal(self.config_path)
+        self.index = AlertIndex()
         self.alerts: Dict[str, PriceAlert] = self._load_alerts()
+        for alert in self.alerts.values():
+            self._index_alert(alert)
 
         # Initialize exchange clients
         self.clients = {}
         self._init_clients()
+        self.price_matrix = PriceMatrix(self.clients, max_age=max_price_age)
 
         # Notification manager
         self.notifier = None
@@ -164,40 +183,104 @@ class MultiExchangeAlertMonitor:
             pass
 
     def _load_alerts(self) -> Dict[str, PriceAlert]:
-        """Load alerts from config file."""
+        """Load alerts from the config file, then replay the journal over them."""
+        alerts = {}
         if os.path.exists(self.config_path):
             with open(self.config_path, 'r') as f:
                 data = json.load(f)
-                return {k: PriceAlert.from_dict(v) for k, v in data.items()}
-        return {}
+                alerts = {k: PriceAlert.from_dict(v) for k, v in data.items()}
+
+        for entry in self.journal.read():
+            op = entry.get("op")
+            if op == "put":
+                alert = PriceAlert.from_dict(entry["alert"])
+                alerts[alert.alert_id] = alert
+            elif op == "del":
+                alerts.pop(entry["alert_id"], None)
+            elif op == "peak":
+                asset, scope = entry["book"]
+                for alert in alerts.values():
+                    if (alert.alert_type == AlertType.TRAILING_STOP and alert.asset == asset
+                            and alert.exchange == scope and not alert.triggered
+                            and (alert.highest_price_seen or 0) < entry["price"]):
+                        alert.highest_price_seen = entry["price"]
+        return alerts
 
     def _save_alerts(self):
-        """Save alerts to config file."""
-        with open(self.config_path, 'w') as f:
-            json.dump(
-                {k: v.to_dict() for k, v in self.alerts.items()},
-                f,
-                indent=2
+        """Write every alert to the config file and start a fresh journal."""
+        self._sync_peaks()
+        self.journal.compact({k: v.to_dict() for k, v in self.alerts.items()})
+
+    def _put_alert(self, alert: PriceAlert, reindex: bool = True):
+        """Store a new or changed alert: reindex it (unless told not to) and journal the record."""
+        self.alerts[alert.alert_id] = alert
+        self._sync_peak(alert)
+        if reindex:
+            self._index_alert(alert)
+        self._journal({"op": "put", "alert": alert.to_dict()})
+
+    def _journal(self, entry: dict):
+        """Append a journal entry, folding the journal into the config file once it is due."""
+        self.journal.append(entry)
+        if self.journal.should_compact(len(self.alerts)):
+            self._save_alerts()
+
+    def _index_alert(self, alert: PriceAlert):
+        """Place an alert in the trigger index; disabled, triggered or incomplete ones are left out."""
+        self.index.remove(alert.alert_id)
+        if not alert.enabled or alert.triggered:
+            return
+
+        book = (alert.asset, alert.exchange)
+        if alert.alert_type == AlertType.PRICE_ABOVE and alert.trigger_price is not None:
+            self.index.add_above(book, alert.alert_id, alert.trigger_price)
+        elif alert.alert_type == AlertType.PRICE_BELOW and alert.trigger_price is not None:
+            self.index.add_below(book, alert.alert_id, alert.trigger_price)
+        elif alert.alert_type in (AlertType.STOP_LOSS, AlertType.TAKE_PROFIT):
+            if alert.cost_basis and alert.trigger_percent is not None:
+                threshold = alert.cost_basis * (1 + alert.trigger_percent / 100)
+                if alert.alert_type == AlertType.STOP_LOSS:
+                    self.index.add_below(book, alert.alert_id, threshold)
+                else:
+                    self.index.add_above(book, alert.alert_id, threshold)
+        elif alert.alert_type == AlertType.TRAILING_STOP and alert.trailing_distance_percent is not None:
+            self.index.add_trailing(
+                book, alert.alert_id, alert.trailing_distance_percent / 100, alert.highest_price_seen
             )
 
-    def _save_trigger_event(self, event: AlertTriggerEvent):
-        """Save trigger event to history."""
+    def _sync_peak(self, alert: PriceAlert):
+        """Copy a trailing stop's peak from the index back onto the alert."""
+        if alert.alert_type == AlertType.TRAILING_STOP:
+            peak = self.index.peak(alert.alert_id)
+            if peak and peak > (alert.highest_price_seen or 0):
+                alert.highest_price_seen = peak
+
+    def _sync_peaks(self):
+        """Copy trailing-stop peaks from the index back onto the alerts."""
+        for alert in self.alerts.values():
+            self._sync_peak(alert)
+
+    def _save_trigger_events(self, events: List[AlertTriggerEvent]):
+        """Save trigger events to history."""
+        if not events:
+            return
         history = []
         if os.path.exists(self.history_path):
             with open(self.history_path, 'r') as f:
                 history = json.load(f)
 
-        history.append({
-            "alert_id": event.alert_id,
-            "timestamp": event.timestamp.isoformat(),
-            "asset": event.asset,
-            "alert_type": event.alert_type.value,
-            "trigger_price": event.trigger_price,
-            "current_price": event.current_price,
-            "action_taken": event.action_taken,
-            "exchange": event.exchange,
-            "order_result": event.order_result
-        })
+        for event in events:
+            history.append({
+                "alert_id": event.alert_id,
+                "timestamp": event.timestamp.isoformat(),
+                "asset": event.asset,
+                "alert_type": event.alert_type.value,
+                "trigger_price": event.trigger_price,
+                "current_price": event.current_price,
+                "action_taken": event.action_taken,
+                "exchange": event.exchange,
+                "order_result": event.order_result
+            })
 
         with open(self.history_path, 'w') as f:
             json.dump(history, f, indent=2)
@@ -225,8 +308,7 @@ class MultiExchangeAlertMonitor:
             created_at=datetime.now()
         )
 
-        self.alerts[alert.alert_id] = alert
-        self._save_alerts()
+        self._put_alert(alert)
         return alert
 
     def add_stop_loss(
@@ -253,8 +335,7 @@ class MultiExchangeAlertMonitor:
             created_at=datetime.now()
         )
 
-        self.alerts[alert.alert_id] = alert
-        self._save_alerts()
+        self._put_alert(alert)
         return alert
 
     def add_take_profit(
@@ -281,8 +362,7 @@ class MultiExchangeAlertMonitor:
             created_at=datetime.now()
         )
 
-        self.alerts[alert.alert_id] = alert
-        self._save_alerts()
+        self._put_alert(alert)
         return alert
 
     def add_trailing_stop(
@@ -305,44 +385,38 @@ class MultiExchangeAlertMonitor:
             created_at=datetime.now()
         )
 
-        self.alerts[alert.alert_id] = alert
-        self._save_alerts()
+        self._put_alert(alert)
         return alert
 
     def set_cost_basis(self, asset: str, cost_basis: float):
         """Set cost basis for an asset (affects all alerts for that asset)."""
-        for alert in self.alerts.values():
+        for alert in list(self.alerts.values()):
             if alert.asset == asset.upper():
                 alert.cost_basis = cost_basis
-        self._save_alerts()
+                # Trailing stops don't use the cost basis; keep their live peak in the index
+                self._put_alert(alert, reindex=alert.alert_type != AlertType.TRAILING_STOP)
 
     def remove_alert(self, alert_id: str):
         """Remove an alert."""
         if alert_id in self.alerts:
             del self.alerts[alert_id]
-            self._save_alerts()
+            self.index.remove(alert_id)
+            self._journal({"op": "del", "alert_id": alert_id})
             print(f"✓ Removed alert {alert_id}")
 
-    def get_current_prices(self) -> Dict[str, Dict[str, float]]:
-        """Get current prices from all exchanges."""
-        prices = {}
-
-        # Get unique assets from alerts
-        assets = set(a.asset for a in self.alerts.values() if a.enabled)
+    def _alert_assets(self) -> List[str]:
+        """Unique assets with an armed alert."""
+        return sorted(set(asset for asset, _ in self.index.books))
 
-        for asset in assets:
-            prices[asset] = {}
+    async def refresh_prices(self) -> PriceSnapshot:
+        """Fill the price matrix for all alerted assets and snapshot it."""
+        snapshot = await self.price_matrix.refresh(self._alert_assets())
+        self.last_prices = snapshot.as_dict()
+        return snapshot
 
-            for exchange_name, client in self.clients.items():
-                try:
-                    price = client.get_spot_price(asset, "USD")
-                    if price:
-                        prices[asset][exchange_name] = price
-                except Exception as e:
-                    pass  # Silently skip failed exchanges
-
-        self.last_prices = prices
-        return prices
+    async def get_current_prices(self) -> Dict[str, Dict[str, float]]:
+        """Get current prices from all exchanges."""
+        return (await self.refresh_prices()).as_dict()
 
     def check_alert(self, alert: PriceAlert, prices: Dict[str, float]) -> Optional[float]:
         """
@@ -391,7 +465,7 @@ class MultiExchangeAlertMonitor:
             # Update highest price
             if alert.highest_price_seen is None or current_price > alert.highest_price_seen:
                 alert.highest_price_seen = current_price
-                self._save_alerts()
+                self._put_alert(alert)
 
             # Check if price dropped from high
             if alert.highest_price_seen:
@@ -401,7 +475,12 @@ class MultiExchangeAlertMonitor:
 
         return None
 
-    def execute_action(self, alert: PriceAlert, trigger_price: float) -> AlertTriggerEvent:
+    def execute_action(
+        self,
+        alert: PriceAlert,
+        trigger_price: float,
+        save_history: bool = True
+    ) -> AlertTriggerEvent:
         """Execute the action for a triggered alert."""
         timestamp = datetime.now()
         action_taken = "none"
@@ -477,7 +556,7 @@ class MultiExchangeAlertMonitor:
         # Mark alert as triggered
         alert.triggered = True
         alert.triggered_at = timestamp
-        self._save_alerts()
+        self._put_alert(alert)
 
         # Create event
         event = AlertTriggerEvent(
@@ -492,7 +571,8 @@ class MultiExchangeAlertMonitor:
             order_result=order_result
         )
 
-        self._save_trigger_event(event)
+        if save_history:
+            self._save_trigger_events([event])
 
         # Send notification
         if self.notifier:
@@ -521,27 +601,44 @@ class MultiExchangeAlertMonitor:
 
         return event
 
-    def check_all_alerts(self) -> List[AlertTriggerEvent]:
+    async def check_all_alerts(self) -> List[AlertTriggerEvent]:
         """Check all alerts and execute triggered ones."""
-        prices = self.get_current_prices()
+        return self.evaluate_alerts(await self.refresh_prices())
+
+    def evaluate_alerts(self, snapshot: PriceSnapshot) -> List[AlertTriggerEvent]:
+        """Apply one price snapshot to the trigger index and execute triggered alerts."""
         events = []
 
-        for alert in list(self.alerts.values()):
-            if alert.asset not in prices:
+        for book in list(self.index.books):
+            asset, scope = book
+            prices = snapshot.prices(asset)
+            # Average price for "all" exchanges, or the specific exchange's price
+            if scope == "all":
+                current_price = sum(prices.values()) / len(prices) if prices else None
+            else:
+                current_price = prices.get(scope)
+            if not current_price:
                 continue
 
-            trigger_price = self.check_alert(alert, prices[alert.asset])
+            triggered, raised = self.index.update(book, current_price)
+            if raised:
+                self._journal({"op": "peak", "book": [asset, scope], "price": current_price})
+
+            for alert_id, peak in triggered:
+                alert = self.alerts[alert_id]
+                if peak is not None:
+                    alert.highest_price_seen = peak
 
-            if trigger_price:
                 print(f"\n⚡ ALERT TRIGGERED: {alert.asset}")
                 print(f"   Type: {alert.alert_type.value}")
-                print(f"   Price: ${trigger_price:,.2f}")
+                print(f"   Price: ${current_price:,.2f}")
 
-                event = self.execute_action(alert, trigger_price)
+                event = self.execute_action(alert, current_price, save_history=False)
                 events.append(event)
 
                 print(f"   Action: {event.action_taken}")
 
+        self._save_trigger_events(events)
         return events
 
     def run_monitor(self, check_interval_seconds: int = 60):
@@ -551,18 +648,37 @@ class MultiExchangeAlertMonitor:
         print(f"   Active alerts: {len([a for a in self.alerts.values() if a.enabled])}")
         print("   Press Ctrl+C to stop\n")
 
-        self.running = True
-
         try:
-            while self.running:
-                self.check_all_alerts()
-                time.sleep(check_interval_seconds)
+            asyncio.run(self.price_matrix.closing(self.monitor(check_interval_seconds)))
         except KeyboardInterrupt:
             print("\n\n🛑 Alert Monitor stopped")
             self.running = False
 
+    async def monitor(self, check_interval_seconds: float = 60, use_feeds: bool = True):
+        """
+        Check alerts on a fixed cadence.
+
+        Rounds start every check_interval_seconds regardless of how long the
+        price fetch took; a round that overruns starts the next one immediately.
+        """
+        self.running = True
+        if use_feeds and self.price_matrix.price_feed is None:
+            self.price_matrix.price_feed = default_price_feed(list(self.clients))
+        await self.price_matrix.start_feed(self._alert_assets())
+
+        try:
+            next_check = time.monotonic()
+            while self.running:
+                self.evaluate_alerts(await self.refresh_prices())
+                next_check = max(next_check + check_interval_seconds, time.monotonic())
+                await asyncio.sleep(next_check - time.monotonic())
+        finally:
+            await self.price_matrix.stop_feed()
+            self._save_alerts()
+
     def list_alerts(self) -> List[PriceAlert]:
         """List all alerts."""
+        self._sync_peaks()
         return list(self.alerts.values())
 
 
@@ -700,7 +816,7 @@ def main():
         monitor.run_monitor(check_interval_seconds=args.interval)
 
     elif args.command == "check":
-        events = monitor.check_all_alerts()
+        events = asyncio.run(monitor.price_matrix.closing(monitor.check_all_alerts()))
         if not events:
             print("No alerts triggered.")
 
@@ -7,8 +7,9 @@ import asyncio
 import json
 import logging
 import os
+import time
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -21,6 +22,51 @@ STABLECOIN_ASSETS = frozenset({
 })
 
 
+# Concurrent requests allowed per upstream provider during a fan-out
+PROVIDER_LIMITS = {
+    'evm': 4,          # one tracker, many chains per wallet
+    'solana': 2,       # public mainnet RPC rate-limits aggressively
+    'cosmos': 3,       # per chain LCD
+    'exchange': 4,
+}
+DEFAULT_PROVIDER_LIMIT = 4
+
+# Seconds a single source may take before it is reported as timed out
+SOURCE_TIMEOUTS = {
+    'evm': 20.0,
+    'solana': 15.0,
+    'cosmos': 15.0,
+    'exchange': 30.0,
+    'prices': 15.0,
+}
+DEFAULT_SOURCE_TIMEOUT = 20.0
+
+
+@dataclass
+class SourceTiming:
+    """How long one source took during a fan-out, and how it ended."""
+    kind: str
+    name: str
+    elapsed_ms: float
+    status: str = 'ok'   # ok | error | timeout
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            'source': self.kind,
+            'name': self.name,
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'status': self.status,
+        }
+        if self.error:
+            result['error'] = self.error
+        return result
+
+
+# kind, name, provider, zero-arg coroutine factory
+SourceJob = Tuple[str, str, str, Callable[[], Awaitable[Any]]]
+
+
 @dataclass
 class ExchangeConfig:
     """Configuration for an exchange connection."""
@@ -52,7 +98,10 @@ class PortfolioAggregator:
         "SEI": "sei-network",
     }
 
-    def __init__(self):
+    def __init__(self, provider_limits: Optional[Dict[str, int]] = None,
+                 source_timeouts: Optional[Dict[str, float]] = None):
+        self.provider_limits = {**PROVIDER_LIMITS, **(provider_limits or {})}
+        self.source_timeouts = {**SOURCE_TIMEOUTS, **(source_timeouts or {})}
         self.exchanges = {}
         self.wallets: Dict[str, dict] = {}
         self.manual_holdings: dict = {}
@@ -409,84 +458,135 @@ class PortfolioAggregator:
             return {'source': 'wallet-cosmos', 'label': label, 'address': address,
                     'error': str(e), 'total_value_usd': 0, 'holdings': []}
 
-    async def get_all_wallet_summaries(self) -> Dict[str, Dict[str, Any]]:
-        """Get summaries for all configured on-chain wallets (EVM, Solana, Cosmos).
+    async def _fan_out(self, jobs: List[SourceJob]) -> List[Tuple[Any, SourceTiming]]:
+        """Run source fetches concurrently with per-provider limits and per-source deadlines.
 
-        Fetches all wallet balances first, then makes a single batched price
-        call to avoid CoinGecko rate limiting.
+        Every job yields (result, timing); a failed or timed-out source yields
+        its exception as the result so callers can keep partial results.
+        A source's timeout starts once it holds its provider's semaphore, so
+        sources queued behind a slow sibling are not timed out unstarted.
+        Semaphores are created per call so they always belong to the running loop.
+        """
+        semaphores: Dict[str, asyncio.Semaphore] = {}
 
-        Returns:
-            Dict of label -> wallet summary
+        def semaphore(provider: str) -> asyncio.Semaphore:
+            if provider not in semaphores:
+                kind = provider.split(':')[0]
+                semaphores[provider] = asyncio.Semaphore(
+                    self.provider_limits.get(kind, DEFAULT_PROVIDER_LIMIT))
+            return semaphores[provider]
+
+        async def run(kind: str, name: str, provider: str,
+                      factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, SourceTiming]:
+            timeout = self.source_timeouts.get(kind, DEFAULT_SOURCE_TIMEOUT)
+            start = time.perf_counter()
+
+            try:
+                # The deadline covers the fetch itself, not the wait for a slot
+                async with semaphore(provider):
+                    result = await asyncio.wait_for(factory(), timeout)
+                status, error = 'ok', None
+            except asyncio.TimeoutError:
+                result = TimeoutError(f"timed out after {timeout:g}s")
+                status, error = 'timeout', str(result)
+            except Exception as e:
+                result = e
+                status, error = 'error', str(e)
+            elapsed = (time.perf_counter() - start) * 1000
+            return result, SourceTiming(kind, name, elapsed, status, error)
+
+        return await asyncio.gather(*(run(*job) for job in jobs))
+
+    def _wallet_jobs(self) -> List[Tuple[SourceJob, tuple]]:
+        """Balance fetch jobs for every configured wallet, with (type, address, label, chain)."""
+        jobs = []
+        if self._evm_tracker:
+            for address, info in self.wallets.items():
+                label = info.get('label', address[:10])
+                jobs.append((('evm', label, 'evm',
+                              lambda a=address: self._evm_tracker.get_wallet_summary(a)),
+                             ('evm', address, label, None)))
+        if self._solana_tracker:
+            for address, info in self._solana_wallets.items():
+                label = info.get('label', address[:10])
+                jobs.append((('solana', label, 'solana',
+                              lambda a=address: self._solana_tracker.get_wallet_summary(a)),
+                             ('solana', address, label, None)))
+        if self._cosmos_tracker:
+            for address, info in self._cosmos_wallets.items():
+                label = info.get('label', address[:12])
+                chain = info.get('chain', '')
+                jobs.append((('cosmos', label, f'cosmos:{chain}',
+                              lambda a=address, c=chain: self._cosmos_tracker.get_wallet_summary(a, c)),
+                             ('cosmos', address, label, chain)))
+        return jobs
+
+    async def _collect_wallets(
+        self, extra_symbols: Optional[set] = None,
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, float], List[SourceTiming]]:
+        """Fetch all wallet balances concurrently, then price them with one CoinGecko call.
+
+        extra_symbols (e.g. manual holdings) are folded into the same price
+        call. Returns (label -> wallet summary, prices, timings).
         """
+        jobs = self._wallet_jobs()
+        outcomes = await self._fan_out([job for job, _ in jobs])
+
         # Phase 1: Collect all raw balances (no price fetches)
-        all_symbols: set = set()
-        raw_wallets: list = []
-
-        # EVM wallets
-        for address, info in self.wallets.items():
-            label = info.get('label', address[:10])
-            if self._evm_tracker:
-                try:
-                    summary = await self._evm_tracker.get_wallet_summary(address)
-                    symbols = list(summary.total_by_symbol.keys())
-                    all_symbols.update(symbols)
-                    raw_wallets.append(('evm', address, label, summary))
-                except Exception as e:
-                    logging.warning(f"Failed to fetch wallet {label} ({address[:10]}...): {e}")
-                    raw_wallets.append(('evm', address, label, e))
-
-        # Solana wallets
-        for address, info in self._solana_wallets.items():
-            label = info.get('label', address[:10])
-            if self._solana_tracker:
-                try:
-                    summary = await self._solana_tracker.get_wallet_summary(address)
-                    symbols = list(summary.total_by_symbol.keys())
-                    all_symbols.update(symbols)
-                    raw_wallets.append(('solana', address, label, summary))
-                except Exception as e:
-                    logging.warning(f"Failed to fetch Solana wallet {label} ({address[:10]}...): {e}")
-                    raw_wallets.append(('solana', address, label, e))
-
-        # Cosmos wallets
-        for address, info in self._cosmos_wallets.items():
-            label = info.get('label', address[:12])
-            chain = info.get('chain', '')
-            if self._cosmos_tracker:
-                try:
-                    summary = await self._cosmos_tracker.get_wallet_summary(address, chain)
-                    for sym in summary.total_by_symbol:
-                        all_symbols.add(sym.split("-")[0])
-                    raw_wallets.append(('cosmos', address, label, summary, chain))
-                except Exception as e:
-                    logging.warning(f"Failed to fetch Cosmos wallet {label} ({address[:12]}...): {e}")
-                    raw_wallets.append(('cosmos', address, label, e, chain))
+        all_symbols: set = set(extra_symbols or ())
+        raw_wallets = []
+        timings = []
+        for (_, meta), (data, timing) in zip(jobs, outcomes):
+            wallet_type, address, label, chain = meta
+            timings.append(timing)
+            if isinstance(data, Exception):
+                logging.warning(f"Failed to fetch {wallet_type} wallet {label} ({address[:10]}...): {timing.error}")
+            elif wallet_type == 'cosmos':
+                all_symbols.update(sym.split("-")[0] for sym in data.total_by_symbol)
+            else:
+                all_symbols.update(data.total_by_symbol.keys())
+            raw_wallets.append((meta, data, timing))
 
         # Phase 2: Single batched price fetch for all symbols
-        prices = await self._fetch_coingecko_prices(list(all_symbols)) if all_symbols else {}
+        prices = {}
+        if all_symbols:
+            [(fetched, timing)] = await self._fan_out([
+                ('prices', 'coingecko', 'prices',
+                 lambda: self._fetch_coingecko_prices(list(all_symbols))),
+            ])
+            timings.append(timing)
+            prices = fetched if isinstance(fetched, dict) else {}
 
         # Phase 3: Apply prices to all wallets
         results = {}
-        for entry in raw_wallets:
-            wallet_type = entry[0]
-            address = entry[1]
-            label = entry[2]
-            data = entry[3]
-
+        for (wallet_type, address, label, chain), data, timing in raw_wallets:
             if isinstance(data, Exception):
                 source = 'wallet' if wallet_type == 'evm' else f'wallet-{wallet_type}'
-                results[label] = {'source': source, 'label': label, 'address': address,
-                                  'error': str(data), 'total_value_usd': 0, 'holdings': []}
-                continue
-
-            if wallet_type == 'cosmos':
-                chain = entry[4]
-                results[label] = self._apply_prices_cosmos(data, prices, address, label, chain)
+                result = {'source': source, 'label': label, 'address': address,
+                          'error': timing.error, 'total_value_usd': 0, 'holdings': []}
+            elif wallet_type == 'cosmos':
+                result = self._apply_prices_cosmos(data, prices, address, label, chain)
             elif wallet_type == 'solana':
-                results[label] = self._apply_prices_solana(data, prices, address, label)
+                result = self._apply_prices_solana(data, prices, address, label)
             else:
-                results[label] = self._apply_prices_evm(data, prices, address, label)
+                result = self._apply_prices_evm(data, prices, address, label)
+            result['elapsed_ms'] = round(timing.elapsed_ms, 1)
+            results[label] = result
+
+        return results, prices, timings
+
+    async def get_all_wallet_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Get summaries for all configured on-chain wallets (EVM, Solana, Cosmos).
+
+        Wallets are fetched concurrently (bounded per provider, each under its
+        own deadline), then priced with a single batched CoinGecko call to
+        avoid rate limiting. A wallet that fails or times out is returned
+        with an 'error' and zero value instead of failing the whole call.
 
+        Returns:
+            Dict of label -> wallet summary (each with 'elapsed_ms')
+        """
+        results, _, _ = await self._collect_wallets()
         return results
 
     @staticmethod
@@ -591,26 +691,34 @@ class PortfolioAggregator:
             logging.warning(f"CoinGecko price fetch failed: {e}")
             return {}
 
-    async def get_manual_holdings_summary(self) -> Dict[str, Dict[str, Any]]:
+    def _manual_symbols(self) -> set:
+        """All unique symbols across all manual sources."""
+        return {
+            symbol
+            for source_data in self.manual_holdings.values()
+            for symbol in source_data.get('holdings', {}).keys()
+        }
+
+    async def get_manual_holdings_summary(
+        self, prices: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
         """Get valued summaries for all manual holding sources.
 
         Fetches current prices from CoinGecko, falls back to estimated values
         from the config file if prices unavailable.
 
+        Args:
+            prices: Pre-fetched price map (skips CoinGecko call if provided)
+
         Returns:
             Dict of source_id -> summary with holdings and totals
         """
         if not self.manual_holdings:
             return {}
 
-        # Collect all unique symbols across all manual sources
-        all_symbols = set()
-        for source_data in self.manual_holdings.values():
-            for symbol in source_data.get('holdings', {}).keys():
-                all_symbols.add(symbol)
-
         # Fetch prices in one batch
-        prices = await self._fetch_coingecko_prices(list(all_symbols))
+        if prices is None:
+            prices = await self._fetch_coingecko_prices(list(self._manual_symbols()))
 
         results = {}
         for source_id, source_data in self.manual_holdings.items():
@@ -726,7 +834,14 @@ class PortfolioAggregator:
             }
 
     async def get_combined_portfolio(self) -> Dict[str, Any]:
-        """Get combined portfolio across all exchanges, wallets, and manual holdings."""
+        """Get combined portfolio across all exchanges, wallets, and manual holdings.
+
+        Exchanges and wallets are fetched concurrently, bounded per provider
+        and each under its own deadline; a slow or failing source is reported
+        with an 'error' rather than holding up the rest. 'source_timings'
+        lists each source's elapsed time and status, and 'partial' is True
+        when any of them did not complete.
+        """
         combined = {
             'timestamp': datetime.now().isoformat(),
             'total_value_usd': 0,
@@ -762,18 +877,54 @@ class PortfolioAggregator:
                 'value_usd': holding.get('value_usd', 0),
             })
 
-        # --- 1. Fetch exchange summaries concurrently ---
+        # --- 1. Fan out to exchanges and on-chain wallets at once ---
+        # Wallets and manual holdings share one CoinGecko call, made as soon
+        # as the wallet balances are in (it doesn't wait on the exchanges).
         exchange_ids = list(self.exchanges.keys())
-        results = await asyncio.gather(
-            *(self.get_exchange_summary(ex_id) for ex_id in exchange_ids),
-            return_exceptions=True,
+        has_wallets = bool(
+            (self.wallets and self._evm_tracker)
+            or self._solana_tracker
+            or self._cosmos_tracker
+        )
+        manual_symbols = self._manual_symbols() if self.manual_holdings else set()
+
+        async def wallets_and_prices():
+            if has_wallets:
+                return await self._collect_wallets(extra_symbols=manual_symbols)
+            if manual_symbols:
+                [(prices, timing)] = await self._fan_out([
+                    ('prices', 'coingecko', 'prices',
+                     lambda: self._fetch_coingecko_prices(list(manual_symbols))),
+                ])
+                return {}, prices if isinstance(prices, dict) else {}, [timing]
+            return {}, {}, []
+
+        exchange_outcomes, (wallet_results, prices, timings) = await asyncio.gather(
+            self._fan_out([
+                ('exchange', ex_id, f'exchange:{ex_id}',
+                 lambda ex_id=ex_id: self.get_exchange_summary(ex_id))
+                for ex_id in exchange_ids
+            ]),
+            wallets_and_prices(),
         )
 
-        for exchange_id, result in zip(exchange_ids, results):
-            if isinstance(result, Exception):
-                continue
-            summary = result
+        # --- 2. Exchange summaries ---
+        exchange_timings = []
+        for exchange_id, (summary, timing) in zip(exchange_ids, exchange_outcomes):
+            exchange_timings.append(timing)
+            if isinstance(summary, Exception):
+                summary = {
+                    'exchange': self.exchanges[exchange_id]['name'],
+                    'exchange_id': exchange_id,
+                    'error': timing.error,
+                    'total_value_usd': 0,
+                    'total_staked_usd': 0,
+                    'holdings': [],
+                }
+            elif summary and summary.get('error') and timing.status == 'ok':
+                timing.status, timing.error = 'error', summary['error']
             if summary:
+                summary['elapsed_ms'] = round(timing.elapsed_ms, 1)
                 combined['exchanges'][exchange_id] = summary
                 combined['total_value_usd'] += summary.get('total_value_usd', 0)
                 combined['total_staked_usd'] += summary.get('total_staked_usd', 0)
@@ -781,29 +932,19 @@ class PortfolioAggregator:
                 for holding in summary.get('holdings', []):
                     _merge_holding(holding, summary.get('exchange', exchange_id))
 
-        # --- 2. Fetch on-chain wallet summaries (EVM + Solana + Cosmos) ---
-        has_wallets = (
-            (self.wallets and self._evm_tracker)
-            or self._solana_tracker
-            or self._cosmos_tracker
-        )
-        if has_wallets:
-            try:
-                wallet_results = await self.get_all_wallet_summaries()
-                combined['wallets'] = wallet_results
-                for label, w_summary in wallet_results.items():
-                    w_value = w_summary.get('total_value_usd', 0)
-                    combined['wallets_total_usd'] += w_value
-                    combined['total_value_usd'] += w_value
-                    for holding in w_summary.get('holdings', []):
-                        _merge_holding(holding, label)
-            except Exception as e:
-                logging.warning(f"Wallet fetch failed: {e}")
+        # --- 3. On-chain wallet summaries (EVM + Solana + Cosmos) ---
+        combined['wallets'] = wallet_results
+        for label, w_summary in wallet_results.items():
+            w_value = w_summary.get('total_value_usd', 0)
+            combined['wallets_total_usd'] += w_value
+            combined['total_value_usd'] += w_value
+            for holding in w_summary.get('holdings', []):
+                _merge_holding(holding, label)
 
-        # --- 3. Fetch manual holdings with CoinGecko prices ---
+        # --- 4. Manual holdings, priced from the shared CoinGecko call ---
         if self.manual_holdings:
             try:
-                manual_results = await self.get_manual_holdings_summary()
+                manual_results = await self.get_manual_holdings_summary(prices=prices)
                 combined['manual_sources'] = manual_results
                 for source_id, m_summary in manual_results.items():
                     m_value = m_summary.get('total_value_usd', 0)
@@ -814,6 +955,10 @@ class PortfolioAggregator:
             except Exception as e:
                 logging.warning(f"Manual holdings fetch failed: {e}")
 
+        all_timings = exchange_timings + timings
+        combined['source_timings'] = [t.to_dict() for t in all_timings]
+        combined['partial'] = any(t.status != 'ok' for t in all_timings)
+
         # Sort holdings by value
         combined['all_holdings'].sort(key=lambda x: x.get('value_usd', 0), reverse=True)
 
@@ -836,6 +981,9 @@ class PortfolioAggregator:
         print(f"Timestamp: {portfolio['timestamp']}")
         print(f"Total Value: ${portfolio['total_value_usd']:,.2f}")
         print(f"Total Staked: ${portfolio['total_staked_usd']:,.2f}")
+        if portfolio.get('partial'):
+            failed = [f"{t['name']} ({t['status']})" for t in portfolio['source_timings'] if t['status'] != 'ok']
+            print(f"Incomplete: {', '.join(failed)}")
         print()
 
         print("By Exchange:")
@@ -7,11 +7,24 @@ Implements:
 - Risk-adjusted return optimization (Sharpe ratio)
 - Correlation matrix analysis
 - Target allocation recommendations
+
+With numpy installed, optimization runs on MeanVarianceEngine: a
+deterministic active-set QP over the weight bounds, batched evaluation of
+candidate weights, and equal-risk-contribution risk parity. Without numpy
+the original Monte Carlo search is used.
 """
 
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import math
+import random
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 
 @dataclass
@@ -86,7 +99,15 @@ class CorrelationMatrix:
         if self._matrix is not None:
             return self._matrix
 
-        n = len(self.assets)
+        lengths = {len(self.returns[a]) for a in self.assets}
+        if NUMPY_AVAILABLE and len(lengths) == 1 and lengths.pop() >= 2:
+            values = self.as_array().tolist()
+            self._matrix = {
+                a: dict(zip(self.assets, row))
+                for a, row in zip(self.assets, values)
+            }
+            return self._matrix
+
         matrix = {a: {b: 0.0 for b in self.assets} for a in self.assets}
 
         for i, asset_a in enumerate(self.assets):
@@ -104,6 +125,32 @@ class CorrelationMatrix:
         self._matrix = matrix
         return matrix
 
+    def as_array(self) -> "np.ndarray":
+        """
+        Correlation matrix as an array in self.assets order.
+
+        Equal-length series are correlated in one np.corrcoef call; mixed
+        lengths fall back to the pairwise prefix-truncated calculation.
+        Zero-variance series correlate 0 with everything else.
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("CorrelationMatrix.as_array requires numpy")
+
+        n = len(self.assets)
+        lengths = {len(self.returns[a]) for a in self.assets}
+        if len(lengths) != 1 or min(lengths, default=0) < 2:
+            matrix = self.calculate()
+            return np.array([[matrix[a][b] for b in self.assets] for a in self.assets], dtype=float)
+
+        data = np.array([self.returns[a] for a in self.assets], dtype=float)
+        centered = data - data.mean(axis=1, keepdims=True)
+        norms = np.sqrt(np.einsum("ij,ij->i", centered, centered))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = (centered @ centered.T) / np.outer(norms, norms)
+        corr[~np.isfinite(corr)] = 0.0
+        np.fill_diagonal(corr, 1.0)
+        return corr.reshape(n, n)
+
     def _pearson_correlation(self, x: List[float], y: List[float]) -> float:
         """Calculate Pearson correlation between two series."""
         n = min(len(x), len(y))
@@ -163,6 +210,408 @@ class CorrelationMatrix:
         return self.calculate()
 
 
+class MeanVarianceEngine:
+    """
+    Matrix-based mean-variance optimizer (requires numpy).
+
+    Solves  min  1/2 w'Cw - lam * mu'w   s.t.  sum(w) = 1, 0 <= w <= max_weight
+    with a primal active-set method. Every optimization target reduces to
+    that problem for some lam >= 0:
+
+    - min volatility: lam = 0
+    - target return: the lam whose solution earns the target. Within one
+      active set w(lam) is affine, so the search is a safeguarded secant
+      step and usually converges in a few solves.
+    - max Sharpe: trace w(lam) piece by piece from lam = 0 and take the
+      best breakpoint or closed-form stationary point on any piece
+
+    Assets that end up between 0 and min_weight are dropped and the
+    problem is re-solved without them, matching the "min 2% if included"
+    rule. Results are deterministic.
+    """
+
+    TOL = 1e-10
+
+    def __init__(
+        self,
+        assets: List[str],
+        expected_returns: "np.ndarray",
+        covariance: "np.ndarray",
+        risk_free_rate: float = 0.05,
+        max_weight: float = 0.40,
+        min_weight: float = 0.02,
+    ):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("MeanVarianceEngine requires numpy")
+
+        self.assets = list(assets)
+        self.mu = np.asarray(expected_returns, dtype=float)
+        self.cov = self._repair(np.asarray(covariance, dtype=float))
+        self.risk_free_rate = risk_free_rate
+        self.min_weight = min_weight
+        n = len(self.assets)
+        # Caps that cannot sum to 1 are relaxed to equal weight
+        self.max_weight = max(max_weight, 1.0 / n) if n else max_weight
+
+        scale = float(np.trace(self.cov)) / n if n else 1.0
+        spread = float(np.max(np.abs(self.mu))) if n else 0.0
+        self._lam_scale = scale / spread if spread > 0 else 1.0
+        # Per bound vector: last solution (a feasible warm start) and the
+        # minimum-variance solution; plus the last lam any target search hit
+        self._warm: Dict[bytes, "np.ndarray"] = {}
+        self._min_var: Dict[bytes, "np.ndarray"] = {}
+        self._last_lam = self._lam_scale
+        self._last_w: Optional["np.ndarray"] = None
+
+    @classmethod
+    def from_metrics(
+        cls,
+        asset_metrics: Dict[str, "AssetMetrics"],
+        correlation_matrix: "CorrelationMatrix",
+        **kwargs,
+    ) -> "MeanVarianceEngine":
+        """Build from annualized AssetMetrics and a CorrelationMatrix."""
+        assets = list(asset_metrics.keys())
+        mu = np.array([asset_metrics[a].expected_return for a in assets])
+        vol = np.array([asset_metrics[a].volatility for a in assets])
+
+        if set(assets) <= set(correlation_matrix.assets):
+            corr = correlation_matrix.as_array()
+            order = [correlation_matrix.assets.index(a) for a in assets]
+            corr = corr[np.ix_(order, order)]
+        else:
+            corr = np.array([
+                [correlation_matrix.get_correlation(a, b) if a != b else 1.0 for b in assets]
+                for a in assets
+            ])
+        return cls(assets, mu, corr * np.outer(vol, vol), **kwargs)
+
+    @staticmethod
+    def _repair(cov: "np.ndarray") -> "np.ndarray":
+        """Symmetrize and clip negative eigenvalues (pairwise estimates)."""
+        cov = (cov + cov.T) / 2
+        if cov.size == 0:
+            return cov
+        values, vectors = np.linalg.eigh(cov)
+        floor = max(float(np.trace(cov)), 1.0) * 1e-12
+        if values.min() >= floor:
+            return cov
+        return (vectors * np.maximum(values, floor)) @ vectors.T
+
+    # -------------------------------------------------------------------------
+    # Evaluation
+    # -------------------------------------------------------------------------
+
+    def evaluate(self, weights: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Returns, volatilities and Sharpe ratios for a (k, n) batch of weights.
+        """
+        W = np.atleast_2d(np.asarray(weights, dtype=float))
+        ret = W @ self.mu
+        vol = np.sqrt(np.maximum(np.einsum("ij,jk,ik->i", W, self.cov, W), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(vol > 0, (ret - self.risk_free_rate) / vol, 0.0)
+        return ret, vol, sharpe
+
+    def to_allocation(self, w: "np.ndarray") -> PortfolioAllocation:
+        ret, vol, sharpe = self.evaluate(w)
+        weights = {a: float(x) for a, x in zip(self.assets, w) if x > 1e-9}
+        return PortfolioAllocation(weights, float(ret[0]), float(vol[0]), float(sharpe[0]))
+
+    # -------------------------------------------------------------------------
+    # QP solver
+    # -------------------------------------------------------------------------
+
+    def _start(self, ub: "np.ndarray") -> "np.ndarray":
+        """Feasible point: the last solution moved inside ub, else equal weight."""
+        if self._last_w is not None:
+            w = np.minimum(self._last_w, ub)
+            room = ub - w
+            deficit = 1.0 - w.sum()
+            if deficit >= 0 and room.sum() >= deficit:
+                return w + room * (deficit / room.sum()) if deficit > 0 else w
+        allowed = ub > 0
+        w = np.zeros(len(ub))
+        w[allowed] = 1.0 / allowed.sum()
+        return np.minimum(w, ub)
+
+    def _kkt(self, free, fixed_w, rhs_c, budget: Optional[float] = None):
+        """Solve the equality-constrained subproblem on the free set."""
+        Q = self.cov
+        F = np.flatnonzero(free)
+        k = len(F)
+        K = np.zeros((k + 1, k + 1))
+        K[:k, :k] = Q[np.ix_(F, F)]
+        K[:k, k] = 1.0
+        K[k, :k] = 1.0
+        rhs = np.empty(k + 1)
+        rhs[:k] = -(rhs_c[F] + Q[F] @ fixed_w)
+        rhs[k] = 1.0 - fixed_w.sum() if budget is None else budget
+        sol = np.linalg.solve(K, rhs)
+        return F, sol[:k], sol[k]
+
+    def _solve(self, lam: float, ub: "np.ndarray", w0: Optional["np.ndarray"] = None):
+        """
+        Active-set solve for a given lam; returns (w, at_lower, at_upper).
+        """
+        n = len(ub)
+        if w0 is None:
+            w0 = self._warm.get(ub.tobytes())
+        w = self._start(ub) if w0 is None else w0.copy()
+        tol = 1e-12
+        lower = w <= tol
+        upper = (w >= ub - tol) & ~lower
+        w[lower] = 0.0
+        w[upper] = ub[upper]
+        c = -lam * self.mu
+
+        for _ in range(10 * n + 10):
+            free = ~(lower | upper)
+            fixed_w = np.where(free, 0.0, w)
+            if free.any():
+                F, w_free, nu = self._kkt(free, fixed_w, c)
+                p = w_free - w[F]
+            else:
+                F, p = np.array([], dtype=int), np.array([])
+                nu = -float(np.mean(self.cov @ w + c))
+
+            if p.size == 0 or np.max(np.abs(p)) <= self.TOL:
+                # Optimal on this working set: check bound multipliers
+                g = self.cov @ w + c + nu
+                mult = np.where(lower, g, np.where(upper, -g, np.inf))
+                i = int(np.argmin(mult))
+                if mult[i] >= -1e-12:
+                    self._warm[ub.tobytes()] = self._last_w = w
+                    return w, lower, upper
+                lower[i] = upper[i] = False
+                continue
+
+            # Step toward the subproblem solution until a bound blocks
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratios = np.where(
+                    p < -self.TOL, -w[F] / p,
+                    np.where(p > self.TOL, (ub[F] - w[F]) / p, np.inf),
+                )
+            j = int(np.argmin(ratios))
+            alpha = min(1.0, float(ratios[j]))
+            w[F] += alpha * p
+            if alpha < 1.0:
+                block = F[j]
+                if p[j] > 0:
+                    w[block], upper[block] = ub[block], True
+                else:
+                    w[block], lower[block] = 0.0, True
+
+        return w, lower, upper
+
+    def _solve_min_var(self, ub: "np.ndarray") -> "np.ndarray":
+        key = ub.tobytes()
+        if key not in self._min_var:
+            self._min_var[key] = self._solve(0.0, ub)[0]
+        return self._min_var[key]
+
+    def _solve_target(self, target: float, ub: "np.ndarray"):
+        """Minimum-variance weights earning at least `target`, or None."""
+        w = self._solve_min_var(ub)
+        if self.mu @ w >= target - 1e-12:
+            return w
+        if self._max_return(ub) < target - 1e-9:
+            return None
+
+        tol = 1e-10 * max(1.0, abs(target))
+        lo, hi = 0.0, None
+        lam = self._last_lam
+        w = None
+        for _ in range(200):
+            w, lower, upper = self._solve(lam, ub, w)
+            r = self.mu @ w
+            if abs(r - target) <= tol:
+                break
+            if r < target:
+                lo = lam
+            else:
+                hi = lam
+
+            # Secant step on the current affine piece w(lam) = a + lam * b
+            free = ~(lower | upper)
+            slope = 0.0
+            if free.any():
+                F, b, _ = self._kkt(free, np.zeros(len(ub)), -self.mu, budget=0.0)
+                slope = float(self.mu[F] @ b)
+            step = lam + (target - r) / slope if slope > 1e-15 else None
+            if step is not None and step > lo and (hi is None or step < hi):
+                lam = step
+            elif hi is None:
+                lam *= 4.0
+            else:
+                lam = math.sqrt(lo * hi) if lo > 0 else hi / 4.0
+        self._last_lam = lam
+        if self.mu @ w < target - tol:
+            # Land on the feasible side of the target
+            w = self._solve(hi, ub, w)[0] if hi is not None else w
+        return w
+
+    def _max_return(self, ub: "np.ndarray") -> float:
+        """Highest return under the caps (fill best assets to their cap)."""
+        remaining, total = 1.0, 0.0
+        for i in np.argsort(-self.mu):
+            take = min(ub[i], remaining)
+            total += take * self.mu[i]
+            remaining -= take
+            if remaining <= 0:
+                break
+        return total
+
+    def _with_min_weight(self, solve) -> "np.ndarray":
+        """Re-solve without assets that land strictly below min_weight."""
+        ub = np.full(len(self.assets), self.max_weight)
+        while True:
+            w = solve(ub)
+            if w is None:
+                return None
+            small = (w > 1e-9) & (w < self.min_weight - 1e-9)
+            remaining = int((ub > 0).sum() - small.sum())
+            if not small.any() or remaining * self.max_weight < 1.0 - 1e-9:
+                return w
+            ub = np.where(small, 0.0, ub)
+
+    # -------------------------------------------------------------------------
+    # Targets
+    # -------------------------------------------------------------------------
+
+    def min_volatility(self, target_return: Optional[float] = None) -> Optional["np.ndarray"]:
+        """Minimum-variance weights, optionally with a return floor."""
+        if not self.assets:
+            return np.zeros(0)
+        if target_return is None:
+            return self._with_min_weight(self._solve_min_var)
+        return self._with_min_weight(lambda ub: self._solve_target(target_return, ub))
+
+    def _sharpe_path(self, ub: "np.ndarray") -> "np.ndarray":
+        """
+        Tangency weights by tracing the whole frontier in lam.
+
+        Starting from the minimum-variance active set, w(lam) = a + lam * b
+        is affine until a free weight reaches a bound or a bound multiplier
+        changes sign. On each piece the Sharpe ratio has a single stationary
+        point in closed form, so evaluating it plus every breakpoint finds
+        the global maximum without a line search.
+        """
+        n = len(ub)
+        w, lower, upper = self._solve(0.0, ub)
+        w, lower, upper = w.copy(), lower.copy(), upper.copy()
+        dead = ub <= 0
+        zeros = np.zeros(n)
+        lam = 0.0
+
+        best_w, best = w, float(self.evaluate(w)[2][0])
+        for _ in range(20 * n + 20):
+            free = ~(lower | upper)
+            if not free.any():
+                # Vertex: it stays optimal until a capped asset and an
+                # excluded one with a higher return trade places.
+                h = self.cov @ w
+                step, pair = np.inf, None
+                for i in np.flatnonzero(upper):
+                    for j in np.flatnonzero(lower & ~dead):
+                        if self.mu[j] > self.mu[i]:
+                            at = (h[j] - h[i]) / (self.mu[j] - self.mu[i])
+                            if lam <= at < step:
+                                step, pair = at, (i, j)
+                if pair is None:
+                    break
+                lam = step
+                upper[pair[0]] = lower[pair[1]] = False
+                continue
+
+            fixed_w = np.where(free, 0.0, w)
+            F, a, nu_a = self._kkt(free, fixed_w, zeros)
+            _, b, nu_b = self._kkt(free, zeros, -self.mu, budget=0.0)
+            wa, wb = fixed_w.copy(), zeros.copy()
+            wa[F], wb[F] = a, b
+            ga = self.cov @ wa + nu_a
+            gb = self.cov @ wb - self.mu + nu_b
+
+            # Next breakpoint: a free weight hits a bound, or a bound
+            # multiplier (g at lower, -g at upper) turns negative
+            with np.errstate(divide="ignore", invalid="ignore"):
+                events = np.full(n, np.inf)
+                events[F] = np.where(
+                    b < -self.TOL, -a / b,
+                    np.where(b > self.TOL, (ub[F] - a) / b, np.inf),
+                )
+                release = (lower & ~dead & (gb < -self.TOL)) | (upper & (gb > self.TOL))
+                events[release] = -ga[release] / gb[release]
+            k = int(np.argmin(events))
+            end = max(lam, float(events[k]))
+
+            # Stationary point of (p + q lam) / sqrt(alpha + 2 beta lam + gamma lam^2)
+            p = float(self.mu @ wa) - self.risk_free_rate
+            q = float(self.mu @ wb)
+            alpha, beta, gamma = wa @ self.cov @ wa, wa @ self.cov @ wb, wb @ self.cov @ wb
+            denom = q * beta - p * gamma
+            points = [end] if math.isfinite(end) else []
+            if abs(denom) > 1e-18:
+                star = (p * beta - q * alpha) / denom
+                if lam < star < end:
+                    points.append(star)
+            for t in points:
+                candidate = np.clip(wa + t * wb, 0.0, ub)
+                sharpe = float(self.evaluate(candidate)[2][0])
+                if sharpe > best:
+                    best_w, best = candidate, sharpe
+
+            if not math.isfinite(end):
+                break
+            lam = end
+            w = np.clip(wa + lam * wb, 0.0, ub)
+            if free[k]:
+                if wb[k] > 0:
+                    w[k], upper[k] = ub[k], True
+                else:
+                    w[k], lower[k] = 0.0, True
+            else:
+                lower[k] = upper[k] = False
+
+        return best_w
+
+    def max_sharpe(self) -> "np.ndarray":
+        """Tangency weights: the best point on the exact frontier path."""
+        if not self.assets:
+            return np.zeros(0)
+        return self._with_min_weight(self._sharpe_path)
+
+    def risk_parity(self, tol: float = 1e-12, max_sweeps: int = 500) -> "np.ndarray":
+        """
+        Equal-risk-contribution weights (cyclical coordinate descent).
+
+        Minimizes 1/2 y'Cy - sum(log y) / n; w = y / sum(y) equalizes
+        w_i * (Cw)_i across assets. With a diagonal covariance this is
+        inverse-volatility weighting.
+        """
+        n = len(self.assets)
+        if n == 0:
+            return np.zeros(0)
+        C = self.cov
+        diag = np.diag(C)
+        budget = 1.0 / n
+        y = 1.0 / np.sqrt(np.where(diag > 0, diag, 1.0))
+        y /= y.sum()
+        for _ in range(max_sweeps):
+            previous = y.copy()
+            for i in range(n):
+                off = C[i] @ y - C[i, i] * y[i]
+                if C[i, i] > 0:
+                    y[i] = (-off + math.sqrt(off * off + 4 * C[i, i] * budget)) / (2 * C[i, i])
+            if np.max(np.abs(y - previous)) <= tol * np.max(np.abs(y)):
+                break
+        return y / y.sum()
+
+    def frontier(self, targets: List[float]) -> List["np.ndarray"]:
+        """Minimum-variance weights for each target return (None if infeasible)."""
+        return [self.min_volatility(t) for t in targets]
+
+
 class PortfolioOptimizer:
     """
     Optimizes portfolio allocation using Modern Portfolio Theory.
@@ -260,33 +709,54 @@ class PortfolioOptimizer:
 
         return portfolio_return, portfolio_vol, sharpe
 
+    def engine(
+        self,
+        asset_metrics: Dict[str, AssetMetrics],
+        correlation_matrix: CorrelationMatrix,
+    ) -> MeanVarianceEngine:
+        """MeanVarianceEngine with this optimizer's rate and weight limits."""
+        return MeanVarianceEngine.from_metrics(
+            asset_metrics,
+            correlation_matrix,
+            risk_free_rate=self.risk_free_rate,
+            max_weight=self.max_weight,
+            min_weight=self.min_weight,
+        )
+
     def optimize_sharpe(
         self,
         asset_metrics: Dict[str, AssetMetrics],
         correlation_matrix: CorrelationMatrix,
         iterations: int = 10000,
+        seed: Optional[int] = None,
     ) -> PortfolioAllocation:
         """
         Find allocation that maximizes Sharpe ratio.
 
-        Uses Monte Carlo simulation to explore the solution space.
+        Solved exactly by MeanVarianceEngine when numpy is installed;
+        otherwise uses Monte Carlo simulation to explore the solution space.
 
         Args:
             asset_metrics: Metrics for each asset
             correlation_matrix: Correlation matrix
-            iterations: Number of random portfolios to generate
+            iterations: Number of random portfolios to generate (fallback only)
+            seed: Random seed for the fallback search
 
         Returns:
             Optimal PortfolioAllocation
         """
-        import random
-
         assets = list(asset_metrics.keys())
         n_assets = len(assets)
 
         if n_assets == 0:
             return PortfolioAllocation({}, 0, 0, 0)
 
+        if NUMPY_AVAILABLE:
+            engine = self.engine(asset_metrics, correlation_matrix)
+            return engine.to_allocation(engine.max_sharpe())
+
+        rng = random.Random(seed)
+
         best_sharpe = float("-inf")
         best_weights = {a: 1.0 / n_assets for a in assets}
         best_return = 0.0
@@ -294,7 +764,7 @@ class PortfolioOptimizer:
 
         for _ in range(iterations):
             # Generate random weights
-            raw_weights = [random.random() for _ in range(n_assets)]
+            raw_weights = [rng.random() for _ in range(n_assets)]
             total = sum(raw_weights)
             weights = {
                 assets[i]: raw_weights[i] / total
@@ -328,6 +798,8 @@ class PortfolioOptimizer:
         correlation_matrix: CorrelationMatrix,
         target_return: Optional[float] = None,
         iterations: int = 10000,
+        seed: Optional[int] = None,
+        engine: Optional[MeanVarianceEngine] = None,
     ) -> PortfolioAllocation:
         """
         Find allocation that minimizes volatility.
@@ -336,19 +808,29 @@ class PortfolioOptimizer:
             asset_metrics: Metrics for each asset
             correlation_matrix: Correlation matrix
             target_return: Optional minimum return constraint
-            iterations: Number of random portfolios to generate
+            iterations: Number of random portfolios to generate (fallback only)
+            seed: Random seed for the fallback search
+            engine: Prebuilt MeanVarianceEngine to reuse (numpy only)
 
         Returns:
-            Optimal PortfolioAllocation
+            Optimal PortfolioAllocation (volatility is inf if the target
+            return is unreachable)
         """
-        import random
-
         assets = list(asset_metrics.keys())
         n_assets = len(assets)
 
         if n_assets == 0:
             return PortfolioAllocation({}, 0, 0, 0)
 
+        if NUMPY_AVAILABLE:
+            engine = engine or self.engine(asset_metrics, correlation_matrix)
+            w = engine.min_volatility(target_return)
+            if w is None:
+                return PortfolioAllocation({a: 1.0 / n_assets for a in assets}, 0.0, float("inf"), 0.0)
+            return engine.to_allocation(w)
+
+        rng = random.Random(seed)
+
         best_vol = float("inf")
         best_weights = {a: 1.0 / n_assets for a in assets}
         best_return = 0.0
@@ -356,7 +838,7 @@ class PortfolioOptimizer:
 
         for _ in range(iterations):
             # Generate random weights
-            raw_weights = [random.random() for _ in range(n_assets)]
+            raw_weights = [rng.random() for _ in range(n_assets)]
             total = sum(raw_weights)
             weights = {
                 assets[i]: raw_weights[i] / total
@@ -391,6 +873,7 @@ class PortfolioOptimizer:
     def risk_parity(
         self,
         asset_metrics: Dict[str, AssetMetrics],
+        correlation_matrix: Optional[CorrelationMatrix] = None,
     ) -> PortfolioAllocation:
         """
         Calculate risk parity allocation.
@@ -399,6 +882,9 @@ class PortfolioOptimizer:
 
         Args:
             asset_metrics: Metrics for each asset
+            correlation_matrix: Optional correlations; when given (and numpy
+                is installed) solves true equal risk contribution, otherwise
+                uses inverse-volatility weights
 
         Returns:
             Risk parity PortfolioAllocation
@@ -408,6 +894,12 @@ class PortfolioOptimizer:
         if not assets:
             return PortfolioAllocation({}, 0, 0, 0)
 
+        if NUMPY_AVAILABLE and correlation_matrix is not None:
+            engine = self.engine(asset_metrics, correlation_matrix)
+            w = engine.risk_parity()
+            weights = self._apply_constraints(dict(zip(assets, w.tolist())))
+            return engine.to_allocation(np.array([weights.get(a, 0.0) for a in assets]))
+
         # Inverse volatility weighting (simplified risk parity)
         inv_vols = {}
         total_inv_vol = 0.0
@@ -471,15 +963,18 @@ class PortfolioOptimizer:
         max_return = max(returns) if returns else 0
 
         frontier = []
+        # One engine (covariance + factorization inputs) for every point
+        engine = self.engine(asset_metrics, correlation_matrix) if NUMPY_AVAILABLE and returns else None
 
         for i in range(points):
-            target_return = min_return + (max_return - min_return) * (i / (points - 1))
+            target_return = min_return + (max_return - min_return) * (i / max(points - 1, 1))
 
             allocation = self.optimize_min_volatility(
                 asset_metrics,
                 correlation_matrix,
                 target_return=target_return,
                 iterations=5000,
+                engine=engine,
             )
 
             if allocation.volatility < float("inf"):
@@ -629,7 +1124,7 @@ async def optimize_portfolio(
     elif optimization_target == "min_vol":
         optimal = optimizer.optimize_min_volatility(asset_metrics, correlation_matrix)
     else:
-        optimal = optimizer.risk_parity(asset_metrics)
+        optimal = optimizer.risk_parity(asset_metrics, correlation_matrix)
 
     # Get efficient frontier
     frontier = optimizer.calculate_efficient_frontier(
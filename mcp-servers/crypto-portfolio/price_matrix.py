@@ -0,0 +1,257 @@
+"""
+Multi-Exchange Price Matrix
+===========================
+
+One (asset x exchange) price grid shared by the alert monitor and the
+arbitrage detector.
+
+- Every cell carries its price, when it was observed and where it came from
+- refresh() fills the grid concurrently: one get_all_prices() per exchange
+  (batch ticker endpoint + shared ticker cache), all exchanges at once, each
+  bounded by a deadline so one slow exchange can't hold up the round
+- With a websocket feed attached, streamed ticks keep cells current and
+  refresh() only polls the cells the feed hasn't covered
+- snapshot() freezes the grid at one instant and leaves out cells older
+  than max_age, so a whole round of checks sees the same, bounded-age prices
+
+Usage:
+    matrix = PriceMatrix({"coinbase": coinbase, "kraken": kraken})
+    snapshot = await matrix.refresh(["BTC", "ETH"])
+    snapshot.prices("BTC")   # {"coinbase": 97500.0, "kraken": 97480.0}
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from websocket_feeds import PriceFeedManager
+    WEBSOCKET_FEEDS_AVAILABLE = True
+except ImportError:
+    PriceFeedManager = None
+    WEBSOCKET_FEEDS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Cells older than this (seconds) are left out of snapshots
+DEFAULT_MAX_AGE = 30.0
+
+# Per-exchange deadline for one refresh round
+FETCH_TIMEOUT = 10.0
+
+# Exchanges PriceFeedManager can stream
+FEED_EXCHANGES = ("coinbase", "kraken", "binance")
+
+
+@dataclass(frozen=True)
+class PriceCell:
+    """One exchange's price for one asset."""
+    price: float
+    timestamp: float  # time.time() when observed
+    source: str = "rest"  # "rest" or "feed"
+
+
+@dataclass
+class PriceSnapshot:
+    """Immutable view of the price matrix at one instant."""
+    cells: Dict[str, Dict[str, PriceCell]]  # {asset: {exchange: cell}}, fresh cells only
+    taken_at: float
+    max_age: float
+    stale: List[Tuple[str, str]] = field(default_factory=list)  # (asset, exchange) left out
+
+    def prices(self, asset: str) -> Dict[str, float]:
+        """Fresh prices for an asset by exchange."""
+        return {exchange: cell.price for exchange, cell in self.cells.get(asset, {}).items()}
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """{asset: {exchange: price}} for every asset in the snapshot."""
+        return {asset: self.prices(asset) for asset in self.cells}
+
+    def age(self, asset: str) -> Optional[float]:
+        """Age in seconds of the oldest price used for an asset."""
+        cells = self.cells.get(asset)
+        if not cells:
+            return None
+        return self.taken_at - min(cell.timestamp for cell in cells.values())
+
+
+class PriceMatrix:
+    """
+    Shared (asset x exchange) price grid.
+
+    Clients are anything with an async get_all_prices(assets) (see
+    exchanges.base.ExchangeClient), or a legacy synchronous
+    get_spot_price(asset, quote), which is run in worker threads.
+    """
+
+    def __init__(
+        self,
+        clients: Dict[str, object],
+        max_age: float = DEFAULT_MAX_AGE,
+        fetch_timeout: float = FETCH_TIMEOUT,
+        quote: str = "USD",
+        price_feed=None,
+    ):
+        """
+        Args:
+            clients: {exchange name: client}. Held by reference, so clients
+                connected later are picked up on the next refresh.
+            max_age: Seconds before a cell is considered stale
+            fetch_timeout: Per-exchange deadline for one refresh
+            quote: Quote currency for prices and feed symbols
+            price_feed: Optional streaming source with subscribe(symbol,
+                callback)/start()/stop(), e.g. PriceFeedManager
+        """
+        self.clients = clients
+        self.max_age = max_age
+        self.fetch_timeout = fetch_timeout
+        self.quote = quote
+        self.price_feed = price_feed
+        self._cells: Dict[str, Dict[str, PriceCell]] = {}
+        self._feed_task: Optional[asyncio.Task] = None
+        self._feed_symbols: Dict[str, str] = {}  # feed symbol -> asset
+        self.stats = {"refreshes": 0, "fetches": 0, "feed_ticks": 0, "errors": 0, "timeouts": 0}
+
+    # ==================== CELLS ====================
+
+    def update(self, asset: str, exchange: str, price: float,
+               timestamp: Optional[float] = None, source: str = "rest"):
+        """Record a price for one cell."""
+        self._cells.setdefault(asset, {})[exchange] = PriceCell(
+            price=float(price),
+            timestamp=time.time() if timestamp is None else timestamp,
+            source=source,
+        )
+
+    def snapshot(self, assets: Optional[List[str]] = None, now: Optional[float] = None) -> PriceSnapshot:
+        """Freeze the current grid, leaving out cells older than max_age."""
+        now = time.time() if now is None else now
+        cells: Dict[str, Dict[str, PriceCell]] = {}
+        stale = []
+        for asset in (assets if assets is not None else list(self._cells)):
+            fresh = {}
+            for exchange, cell in self._cells.get(asset, {}).items():
+                if now - cell.timestamp <= self.max_age:
+                    fresh[exchange] = cell
+                else:
+                    stale.append((asset, exchange))
+            cells[asset] = fresh
+        return PriceSnapshot(cells=cells, taken_at=now, max_age=self.max_age, stale=stale)
+
+    def _needs_poll(self, asset: str, exchange: str, now: float) -> bool:
+        # Streamed cells stay current on their own; polled cells are re-polled every round
+        cell = self._cells.get(asset, {}).get(exchange)
+        return cell is None or cell.source != "feed" or now - cell.timestamp > self.max_age
+
+    # ==================== POLLING ====================
+
+    async def refresh(self, assets: List[str]) -> PriceSnapshot:
+        """Poll every exchange concurrently for the cells that need it, then snapshot."""
+        now = time.time()
+        jobs = []
+        for exchange, client in list(self.clients.items()):
+            wanted = [a for a in assets if self._needs_poll(a, exchange, now)]
+            if wanted:
+                jobs.append(self._poll_exchange(exchange, client, wanted))
+
+        self.stats["refreshes"] += 1
+        await asyncio.gather(*jobs)
+        return self.snapshot(assets)
+
+    async def _poll_exchange(self, exchange: str, client, assets: List[str]):
+        self.stats["fetches"] += 1
+        try:
+            prices = await asyncio.wait_for(self._fetch_prices(client, assets), timeout=self.fetch_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            logger.warning(f"{exchange}: price fetch timed out after {self.fetch_timeout}s")
+            return
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"{exchange}: price fetch failed: {e}")
+            return
+
+        observed = time.time()
+        for asset, price in prices.items():
+            if price:
+                self.update(asset, exchange, price, timestamp=observed)
+
+    async def _fetch_prices(self, client, assets: List[str]) -> Dict[str, float]:
+        if hasattr(client, "get_all_prices"):
+            return await client.get_all_prices(assets)
+
+        # Legacy synchronous clients: one worker thread per lookup
+        results = await asyncio.gather(
+            *(asyncio.to_thread(client.get_spot_price, asset, self.quote) for asset in assets),
+            return_exceptions=True,
+        )
+        return {
+            asset: price for asset, price in zip(assets, results)
+            if price and not isinstance(price, BaseException)
+        }
+
+    # ==================== LIFECYCLE ====================
+
+    async def close(self):
+        """Stop the feed and close client sessions."""
+        await self.stop_feed()
+        for exchange, client in list(self.clients.items()):
+            close = getattr(client, "close", None)
+            if close is None or not asyncio.iscoroutinefunction(close):
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.debug(f"{exchange}: close failed: {e}")
+
+    async def closing(self, coro):
+        """
+        Await coro, then close() the matrix.
+
+        Client sessions belong to the event loop that opened them, so a
+        synchronous entry point should run one asyncio.run(matrix.closing(...))
+        per command rather than reuse clients across event loops.
+        """
+        try:
+            return await coro
+        finally:
+            await self.close()
+
+    # ==================== STREAMING ====================
+
+    async def start_feed(self, assets: List[str]):
+        """Subscribe the price feed (if any) to the assets and run it in the background."""
+        if self.price_feed is None or self._feed_task is not None:
+            return
+        for asset in assets:
+            symbol = f"{asset}-{self.quote}"
+            self._feed_symbols[symbol] = asset
+            self.price_feed.subscribe(symbol, self._on_feed_price)
+        # PriceFeedManager.start() runs its feeds until stopped
+        self._feed_task = asyncio.create_task(self.price_feed.start())
+
+    async def stop_feed(self):
+        """Stop the price feed."""
+        if self._feed_task is None:
+            return
+        await self.price_feed.stop()
+        self._feed_task.cancel()
+        self._feed_task = None
+
+    def _on_feed_price(self, update):
+        """Record a websocket_feeds.PriceUpdate for an exchange we have a client for."""
+        if update.exchange not in self.clients:
+            return
+        self.stats["feed_ticks"] += 1
+        asset = self._feed_symbols.get(update.symbol) or update.symbol.split("-")[0]
+        self.update(asset, update.exchange, update.price, source="feed")
+
+
+def default_price_feed(exchanges: List[str]):
+    """PriceFeedManager for the exchanges that can stream, or None."""
+    streamable = [e for e in exchanges if e in FEED_EXCHANGES]
+    if not WEBSOCKET_FEEDS_AVAILABLE or not streamable:
+        return None
+    return PriceFeedManager(exchanges=streamable)
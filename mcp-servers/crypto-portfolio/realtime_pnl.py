@@ -3,17 +3,44 @@ Real-time PnL Streaming via WebSocket.
 
 Provides live portfolio value updates, PnL tracking,
 and real-time alerts to connected clients.
+
+Pipeline:
+- Ticks from websocket_feeds.PriceFeedManager (or the simulated
+  PriceStreamer when websockets is unavailable) are conflated per asset:
+  only the latest tick per asset is applied each round
+- PnLTracker keeps per-position values and running portfolio totals, so a
+  tick updates one position and the totals in O(1)
+- Each event is serialized once and the same JSON string is offered to
+  every subscribed client
+- Every client has a bounded queue keyed by (event type, asset) with
+  drop-to-latest semantics and its own writer task, so a slow client only
+  falls behind itself
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Callable, Set, Any
+from itertools import count
+from typing import Dict, Hashable, List, Optional, Callable, Set, Any
 from enum import Enum
 import asyncio
 import json
+import logging
 import uuid
 
+try:
+    from websocket_feeds import PriceFeedManager
+    WEBSOCKET_FEEDS_AVAILABLE = True
+except ImportError:
+    PriceFeedManager = None
+    WEBSOCKET_FEEDS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Events a client may have queued before the oldest are dropped
+DEFAULT_MAX_PENDING = 256
+
 
 class StreamEventType(Enum):
     """Types of streaming events."""
@@ -99,13 +126,17 @@ class StreamEvent:
     event_type: StreamEventType
     data: Dict
     timestamp: datetime = field(default_factory=datetime.now)
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def to_json(self) -> str:
-        return json.dumps({
-            "type": self.event_type.value,
-            "data": self.data,
-            "timestamp": self.timestamp.isoformat(),
-        })
+        """Serialize once; every client gets the same string."""
+        if self._json is None:
+            self._json = json.dumps({
+                "type": self.event_type.value,
+                "data": self.data,
+                "timestamp": self.timestamp.isoformat(),
+            })
+        return self._json
 
 
 class PriceStreamer:
@@ -232,7 +263,9 @@ class PnLTracker:
     """
     Tracks real-time PnL for portfolio and individual positions.
 
-    Updates PnL as prices change and broadcasts updates.
+    Updates PnL as prices change and broadcasts updates. Position values
+    and portfolio totals are kept as running sums: a price tick adjusts
+    one position and the totals by its change in value.
     """
 
     def __init__(self):
@@ -242,6 +275,11 @@ class PnLTracker:
         self.realized_pnl_today: Decimal = Decimal("0")
         self._last_snapshot: Optional[PortfolioSnapshot] = None
 
+        # asset -> [amount, cost_basis, current_value]
+        self._positions: Dict[str, List[Decimal]] = {}
+        self._total_value = Decimal("0")
+        self._total_cost_basis = Decimal("0")
+
     def subscribe(self, callback: Callable[[PnLUpdate], None]):
         """Subscribe to PnL updates."""
         self.subscribers.add(callback)
@@ -258,38 +296,49 @@ class PnLTracker:
             holdings: Dict of asset -> {amount: Decimal, cost_basis: Decimal}
         """
         self.holdings = holdings
+        self._positions = {}
+        self._total_value = Decimal("0")
+        self._total_cost_basis = Decimal("0")
 
-    def update_price(self, asset: str, price: Decimal):
-        """Update price for an asset and recalculate PnL."""
+        for asset, holding in holdings.items():
+            amount = Decimal(str(holding.get("amount", 0)))
+            cost_basis = Decimal(str(holding.get("cost_basis", 0)))
+            current_value = amount * self.prices.get(asset, Decimal("0"))
+            self._positions[asset] = [amount, cost_basis, current_value]
+            self._total_value += current_value
+            self._total_cost_basis += cost_basis
+
+    def update_price(self, asset: str, price: Decimal) -> Optional[PnLUpdate]:
+        """Update price for an asset and recalculate its PnL (None if not held)."""
         self.prices[asset] = price
-        self._recalculate_and_notify(asset)
+        return self._recalculate_and_notify(asset)
 
     def record_realized_pnl(self, pnl: Decimal):
         """Record realized PnL from a trade."""
         self.realized_pnl_today += pnl
 
-    def _recalculate_and_notify(self, updated_asset: str):
-        """Recalculate PnL and notify subscribers."""
-        if updated_asset not in self.holdings:
-            return
+    @staticmethod
+    def _pct(pnl: Decimal, cost_basis: Decimal) -> float:
+        return float((pnl / cost_basis * 100) if cost_basis > 0 else 0)
 
-        holding = self.holdings[updated_asset]
-        amount = Decimal(str(holding.get("amount", 0)))
-        cost_basis = Decimal(str(holding.get("cost_basis", 0)))
-        price = self.prices.get(updated_asset, Decimal("0"))
+    def _recalculate_and_notify(self, updated_asset: str) -> Optional[PnLUpdate]:
+        """Recalculate PnL for one position, adjust totals and notify subscribers."""
+        position = self._positions.get(updated_asset)
+        if position is None:
+            return None
 
-        current_value = amount * price
-        unrealized_pnl = current_value - cost_basis
-        unrealized_pnl_pct = float(
-            (unrealized_pnl / cost_basis * 100) if cost_basis > 0 else 0
-        )
+        amount, cost_basis, previous_value = position
+        current_value = amount * self.prices.get(updated_asset, Decimal("0"))
+        position[2] = current_value
+        self._total_value += current_value - previous_value
 
+        unrealized_pnl = current_value - cost_basis
         update = PnLUpdate(
             asset=updated_asset,
             current_value=current_value,
             cost_basis=cost_basis,
             unrealized_pnl=unrealized_pnl,
-            unrealized_pnl_pct=unrealized_pnl_pct,
+            unrealized_pnl_pct=self._pct(unrealized_pnl, cost_basis),
             realized_pnl_today=self.realized_pnl_today,
         )
 
@@ -303,46 +352,41 @@ class PnLTracker:
             except Exception as e:
                 print(f"PnL subscriber error: {e}")
 
+        return update
+
+    def get_totals(self) -> PnLUpdate:
+        """Portfolio-level PnL from the running totals (O(1))."""
+        unrealized_pnl = self._total_value - self._total_cost_basis
+        return PnLUpdate(
+            asset=None,
+            current_value=self._total_value,
+            cost_basis=self._total_cost_basis,
+            unrealized_pnl=unrealized_pnl,
+            unrealized_pnl_pct=self._pct(unrealized_pnl, self._total_cost_basis),
+            realized_pnl_today=self.realized_pnl_today,
+        )
+
     def get_portfolio_snapshot(self) -> PortfolioSnapshot:
         """Get current portfolio snapshot with all holdings."""
-        total_value = Decimal("0")
-        total_cost_basis = Decimal("0")
         holdings_data = {}
 
-        for asset, holding in self.holdings.items():
-            amount = Decimal(str(holding.get("amount", 0)))
-            cost_basis = Decimal(str(holding.get("cost_basis", 0)))
-            price = self.prices.get(asset, Decimal("0"))
-
-            current_value = amount * price
+        for asset, (amount, cost_basis, current_value) in self._positions.items():
             unrealized_pnl = current_value - cost_basis
-            unrealized_pnl_pct = float(
-                (unrealized_pnl / cost_basis * 100) if cost_basis > 0 else 0
-            )
-
-            total_value += current_value
-            total_cost_basis += cost_basis
-
             holdings_data[asset] = {
                 "amount": str(amount),
-                "price": str(price),
+                "price": str(self.prices.get(asset, Decimal("0"))),
                 "current_value": str(current_value),
                 "cost_basis": str(cost_basis),
                 "unrealized_pnl": str(unrealized_pnl),
-                "unrealized_pnl_pct": unrealized_pnl_pct,
+                "unrealized_pnl_pct": self._pct(unrealized_pnl, cost_basis),
             }
 
-        total_unrealized_pnl = total_value - total_cost_basis
-        total_unrealized_pnl_pct = float(
-            (total_unrealized_pnl / total_cost_basis * 100)
-            if total_cost_basis > 0 else 0
-        )
-
+        totals = self.get_totals()
         snapshot = PortfolioSnapshot(
-            total_value=total_value,
-            total_cost_basis=total_cost_basis,
-            total_unrealized_pnl=total_unrealized_pnl,
-            total_unrealized_pnl_pct=total_unrealized_pnl_pct,
+            total_value=totals.current_value,
+            total_cost_basis=totals.cost_basis,
+            total_unrealized_pnl=totals.unrealized_pnl,
+            total_unrealized_pnl_pct=totals.unrealized_pnl_pct,
             total_realized_pnl_today=self.realized_pnl_today,
             holdings=holdings_data,
         )
@@ -351,27 +395,129 @@ class PnLTracker:
         return snapshot
 
 
+class ClientChannel:
+    """
+    One connected client: a bounded outbox and a writer task.
+
+    The outbox is keyed by conflation key, e.g. ("price_update", "BTC"):
+    a newer event for the same key replaces the queued one, so a client
+    that falls behind receives the latest state rather than a backlog.
+    Events without a key (alerts, trades) are always queued. Past
+    max_pending the oldest queued event is dropped.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        websocket: Any,
+        subscriptions: Set[str],
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.subscriptions = subscriptions
+        self.max_pending = max_pending
+        self.connected_at = datetime.now()
+        self.outbox: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.sent = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._seq = count()
+
+    def wants(self, event_type: str) -> bool:
+        return "all" in self.subscriptions or event_type in self.subscriptions
+
+    def offer(self, payload: str, key: Optional[Hashable] = None):
+        """Queue a serialized event without waiting on the client."""
+        if key is None:
+            key = next(self._seq)
+        elif key in self.outbox:
+            self.conflated += 1
+            del self.outbox[key]
+        self.outbox[key] = payload
+
+        if len(self.outbox) > self.max_pending:
+            self.outbox.popitem(last=False)
+            self.dropped += 1
+        if self._ready is not None:
+            self._ready.set()
+
+    async def _send(self, payload: str):
+        ws = self.websocket
+        if hasattr(ws, 'send'):
+            await ws.send(payload)
+        elif hasattr(ws, 'send_text'):
+            await ws.send_text(payload)
+
+    async def run(self):
+        """Drain the outbox to the websocket until cancelled or a send fails."""
+        self._ready = asyncio.Event()
+        if self.outbox:
+            self._ready.set()
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.outbox:
+                _, payload = self.outbox.popitem(last=False)
+                await self._send(payload)
+                self.sent += 1
+
+
 class RealtimeStreamManager:
     """
     Manages all real-time streaming for the portfolio.
 
     Coordinates price streaming, PnL tracking, and client connections.
+    Ticks are conflated per asset and applied in rounds by a pump task;
+    events are serialized once and fanned out to per-client outboxes
+    (see ClientChannel), so no client's send ever blocks the pump.
     """
 
-    def __init__(self, portfolio_manager=None):
+    def __init__(
+        self,
+        portfolio_manager=None,
+        price_feed=None,
+        quote: str = "USD",
+        max_pending: int = DEFAULT_MAX_PENDING,
+        snapshot_interval: float = 1.0,
+    ):
         """
         Initialize stream manager.
 
         Args:
             portfolio_manager: Optional portfolio manager for data sync
+            price_feed: Source of ticks. Defaults to websocket_feeds.PriceFeedManager,
+                or the simulated PriceStreamer if websockets is not installed.
+                Anything with subscribe(symbol, callback)/start()/stop() works.
+            quote: Quote currency used to build feed symbols ("BTC-USD")
+            max_pending: Per-client outbox bound
+            snapshot_interval: Seconds of quiet before a full portfolio snapshot is sent
         """
         self.portfolio_manager = portfolio_manager
-        self.price_streamer = PriceStreamer()
+        if price_feed is None:
+            price_feed = PriceFeedManager() if WEBSOCKET_FEEDS_AVAILABLE else PriceStreamer()
+        self.price_feed = price_feed
+        self.quote = quote
+        self.max_pending = max_pending
+        self.snapshot_interval = snapshot_interval
         self.pnl_tracker = PnLTracker()
-        self.clients: Dict[str, Dict] = {}  # client_id -> {websocket, subscriptions}
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        self.clients: Dict[str, ClientChannel] = {}
         self.running = False
-        self._broadcast_task: Optional[asyncio.Task] = None
+
+        # Latest unapplied tick per asset; swapped out by the pump each round
+        self._pending: Dict[str, PriceUpdate] = {}
+        self._dirty: Optional[asyncio.Event] = None
+        self._symbols: Dict[str, str] = {}       # feed symbol -> asset
+        self._pump_task: Optional[asyncio.Task] = None
+        self._feed_task: Optional[asyncio.Task] = None
+        self._stats = {"ticks": 0, "rounds": 0, "events": 0}
+
+    @property
+    def price_streamer(self):
+        """Backwards-compatible name for the price source."""
+        return self.price_feed
 
     async def start(self, assets: List[str]):
         """
@@ -381,30 +527,43 @@ class RealtimeStreamManager:
             assets: List of assets to track
         """
         self.running = True
+        self._dirty = asyncio.Event()
 
-        # Connect price updates to PnL tracker
-        self.price_streamer.subscribe(self._on_price_update)
-
-        # Start price streaming
-        await self.price_streamer.start(assets)
+        if isinstance(self.price_feed, PriceStreamer):
+            self.price_feed.subscribe(self.ingest)
+            await self.price_feed.start(assets)
+        else:
+            for asset in assets:
+                symbol = f"{asset}-{self.quote}"
+                self._symbols[symbol] = asset
+                self.price_feed.subscribe(symbol, self._on_feed_price)
+            # PriceFeedManager.start() runs its feeds until stopped
+            self._feed_task = asyncio.create_task(self.price_feed.start())
 
-        # Start event broadcast loop
-        self._broadcast_task = asyncio.create_task(self._broadcast_loop())
+        self._pump_task = asyncio.create_task(self._pump_loop())
+        for channel in self.clients.values():
+            self._start_writer(channel)
 
     async def stop(self):
         """Stop streaming."""
         self.running = False
-        await self.price_streamer.stop()
+        await self.price_feed.stop()
+
+        for task in (self._feed_task, self._pump_task):
+            if task:
+                task.cancel()
+        for channel in self.clients.values():
+            if channel.task:
+                channel.task.cancel()
 
-        if self._broadcast_task:
-            self._broadcast_task.cancel()
+    # ==================== CLIENTS ====================
 
     def register_client(
         self,
         client_id: str,
         websocket: Any,
         subscriptions: List[str] = None,
-    ):
+    ) -> ClientChannel:
         """
         Register a new client connection.
 
@@ -413,68 +572,122 @@ class RealtimeStreamManager:
             websocket: WebSocket connection object
             subscriptions: List of event types to subscribe to
         """
-        self.clients[client_id] = {
-            "websocket": websocket,
-            "subscriptions": set(subscriptions or ["all"]),
-            "connected_at": datetime.now(),
-        }
+        channel = ClientChannel(
+            client_id,
+            websocket,
+            set(subscriptions or ["all"]),
+            max_pending=self.max_pending,
+        )
+        self.clients[client_id] = channel
+        if self.running:
+            self._start_writer(channel)
+        return channel
 
     def unregister_client(self, client_id: str):
         """Unregister a client."""
-        if client_id in self.clients:
-            del self.clients[client_id]
-
-    async def _on_price_update(self, update: PriceUpdate):
-        """Handle price update from streamer."""
-        # Update PnL tracker
-        self.pnl_tracker.update_price(update.asset, update.price)
-
-        # Queue event for broadcast
-        event = StreamEvent(
-            event_type=StreamEventType.PRICE_UPDATE,
-            data=update.to_dict(),
-        )
-        await self.event_queue.put(event)
+        channel = self.clients.pop(client_id, None)
+        if channel and channel.task and channel.task is not asyncio.current_task():
+            channel.task.cancel()
+
+    def _start_writer(self, channel: ClientChannel):
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(self._writer(channel))
+
+    async def _writer(self, channel: ClientChannel):
+        try:
+            await channel.run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Failed to send to client {channel.client_id}: {e}")
+            if self.clients.get(channel.client_id) is channel:
+                self.unregister_client(channel.client_id)
+
+    # ==================== PRICE INGEST ====================
+
+    def ingest(self, update: PriceUpdate):
+        """Record a tick; only the latest per asset is applied on the next round."""
+        self._stats["ticks"] += 1
+        self._pending[update.asset] = update
+        if self._dirty is not None:
+            self._dirty.set()
+
+    def _on_feed_price(self, feed_update):
+        """
+        Convert a websocket_feeds.PriceUpdate ("BTC-USD") into a local PriceUpdate.
 
-    async def _broadcast_loop(self):
-        """Continuously broadcast events to clients."""
+        Feed ticks carry no 24h statistics, so the 24h change is left at zero.
+        """
+        asset = self._symbols.get(feed_update.symbol) or feed_update.symbol.split("-")[0]
+        self.ingest(PriceUpdate(
+            asset=asset,
+            price=Decimal(str(feed_update.price)),
+            change_24h=Decimal("0"),
+            change_24h_pct=0.0,
+            volume_24h=feed_update.volume_24h or Decimal("0"),
+        ))
+
+    async def _pump_loop(self):
+        """Apply conflated ticks in rounds; send a snapshot when the feed is quiet."""
         while self.running:
             try:
-                # Get event from queue with timeout
-                event = await asyncio.wait_for(
-                    self.event_queue.get(),
-                    timeout=1.0
+                try:
+                    await asyncio.wait_for(self._dirty.wait(), timeout=self.snapshot_interval)
+                except asyncio.TimeoutError:
+                    self._send_portfolio_update()
+                    continue
+                self._dirty.clear()
+                self.apply_pending()
+            except Exception as e:
+                logger.error(f"Broadcast error: {e}")
+
+    def apply_pending(self):
+        """Apply the latest tick of each asset, then publish the new portfolio totals."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        self._stats["rounds"] += 1
+
+        held = False
+        for asset, update in pending.items():
+            self.publish(
+                StreamEvent(StreamEventType.PRICE_UPDATE, update.to_dict()),
+                key=(StreamEventType.PRICE_UPDATE, asset),
+            )
+            pnl = self.pnl_tracker.update_price(asset, update.price)
+            if pnl is not None:
+                held = True
+                self.publish(
+                    StreamEvent(StreamEventType.PNL_UPDATE, pnl.to_dict()),
+                    key=(StreamEventType.PNL_UPDATE, asset),
                 )
 
-                # Broadcast to subscribed clients
-                await self._broadcast_event(event)
+        if held:
+            self.publish(
+                StreamEvent(StreamEventType.PNL_UPDATE, self.pnl_tracker.get_totals().to_dict()),
+                key=(StreamEventType.PNL_UPDATE, None),
+            )
 
-            except asyncio.TimeoutError:
-                # Send heartbeat/portfolio update periodically
-                await self._send_portfolio_update()
-            except Exception as e:
-                print(f"Broadcast error: {e}")
+    # ==================== FAN-OUT ====================
 
-    async def _broadcast_event(self, event: StreamEvent):
-        """Broadcast event to all subscribed clients."""
+    def publish(self, event: StreamEvent, key: Optional[Hashable] = None):
+        """
+        Serialize an event once and queue it for every subscribed client.
+
+        Events with the same key replace each other in a client's outbox.
+        """
+        self._stats["events"] += 1
         event_json = event.to_json()
+        event_type = event.event_type.value
+        for channel in self.clients.values():
+            if channel.wants(event_type):
+                channel.offer(event_json, key)
 
-        for client_id, client in list(self.clients.items()):
-            subs = client["subscriptions"]
+    async def _broadcast_event(self, event: StreamEvent):
+        """Broadcast event to all subscribed clients."""
+        self.publish(event)
 
-            # Check if client is subscribed to this event type
-            if "all" in subs or event.event_type.value in subs:
-                try:
-                    ws = client["websocket"]
-                    if hasattr(ws, 'send'):
-                        await ws.send(event_json)
-                    elif hasattr(ws, 'send_text'):
-                        await ws.send_text(event_json)
-                except Exception as e:
-                    print(f"Failed to send to client {client_id}: {e}")
-                    self.unregister_client(client_id)
-
-    async def _send_portfolio_update(self):
+    def _send_portfolio_update(self):
         """Send periodic portfolio snapshot."""
         snapshot = self.pnl_tracker.get_portfolio_snapshot()
 
@@ -482,7 +695,19 @@ class RealtimeStreamManager:
             event_type=StreamEventType.PORTFOLIO_UPDATE,
             data=snapshot.to_dict(),
         )
-        await self._broadcast_event(event)
+        self.publish(event, key=StreamEventType.PORTFOLIO_UPDATE)
+
+    def stats(self) -> Dict[str, int]:
+        """Ingest, fan-out and per-client delivery counters."""
+        channels = list(self.clients.values())
+        return {
+            **self._stats,
+            "clients": len(channels),
+            "queued": sum(len(c.outbox) for c in channels),
+            "sent": sum(c.sent for c in channels),
+            "conflated": sum(c.conflated for c in channels),
+            "dropped": sum(c.dropped for c in channels),
+        }
 
     def set_holdings(self, holdings: Dict[str, Dict]):
         """Update holdings in PnL tracker."""
@@ -498,7 +723,7 @@ class RealtimeStreamManager:
                 "data": data or {},
             },
         )
-        asyncio.create_task(self._broadcast_event(event))
+        self.publish(event)
 
     def notify_trade(self, trade_data: Dict):
         """Notify clients of a trade execution."""
@@ -506,7 +731,7 @@ class RealtimeStreamManager:
             event_type=StreamEventType.TRADE_EXECUTED,
             data=trade_data,
         )
-        asyncio.create_task(self._broadcast_event(event))
+        self.publish(event)
 
 
 # FastAPI/Starlette WebSocket endpoint example
@@ -535,12 +760,10 @@ async def websocket_endpoint(websocket, stream_manager: RealtimeStreamManager):
         if hasattr(websocket, 'accept'):
             await websocket.accept()
 
-        # Register client
-        stream_manager.register_client(client_id, websocket)
-
-        # Send initial snapshot
+        # Register client; the initial snapshot goes out ahead of any updates
+        channel = stream_manager.register_client(client_id, websocket)
         snapshot = stream_manager.pnl_tracker.get_portfolio_snapshot()
-        await websocket.send_text(json.dumps({
+        channel.offer(json.dumps({
             "type": "initial_snapshot",
             "data": snapshot.to_dict(),
         }))
@@ -554,10 +777,10 @@ async def websocket_endpoint(websocket, stream_manager: RealtimeStreamManager):
                 # Handle subscription changes
                 if message.get("action") == "subscribe":
                     events = message.get("events", [])
-                    stream_manager.clients[client_id]["subscriptions"].update(events)
+                    stream_manager.clients[client_id].subscriptions.update(events)
                 elif message.get("action") == "unsubscribe":
                     events = message.get("events", [])
-                    stream_manager.clients[client_id]["subscriptions"].difference_update(events)
+                    stream_manager.clients[client_id].subscriptions.difference_update(events)
 
             except Exception:
                 break
@@ -18,6 +18,13 @@ from typing import Any, Dict, List, Optional
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, ConfigDict, Field
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
 
 # =============================================================================
 # INPUT MODEL
@@ -59,8 +66,8 @@ class RiskAnalysisInput(BaseModel):
     monte_carlo_sims: int = Field(
         default=10000,
         ge=1000,
-        le=100000,
-        description="Number of Monte Carlo simulations for MC VaR",
+        le=1_000_000,
+        description="Number of Monte Carlo simulations for MC VaR (runs in bounded-memory chunks)",
     )
     response_format: str = Field(
         default="markdown",
@@ -157,21 +164,17 @@ def _portfolio_daily_vol(weights: Dict[str, float]) -> float:
     Estimate portfolio daily volatility using asset vols and a uniform
     pairwise correlation assumption.
     """
-    assets = list(weights.keys())
-    n = len(assets)
-    if n == 0:
+    if not weights:
         return 0.0
 
-    vols = [_get_asset_stats(a)["daily_vol"] for a in assets]
-    w = [weights[a] for a in assets]
-
-    # variance = sum_i sum_j w_i * w_j * vol_i * vol_j * corr_ij
-    variance = 0.0
-    for i in range(n):
-        for j in range(n):
-            corr = 1.0 if i == j else DEFAULT_CORRELATION
-            variance += w[i] * w[j] * vols[i] * vols[j] * corr
-
+    # With a uniform correlation rho the double sum
+    #   sum_i sum_j w_i * w_j * vol_i * vol_j * corr_ij
+    # collapses to (1 - rho) * sum (w_i vol_i)^2 + rho * (sum w_i vol_i)^2
+    scaled = [weights[a] * _get_asset_stats(a)["daily_vol"] for a in weights]
+    variance = (
+        (1.0 - DEFAULT_CORRELATION) * sum(x * x for x in scaled)
+        + DEFAULT_CORRELATION * sum(scaled) ** 2
+    )
     return math.sqrt(max(variance, 0.0))
 
 
@@ -216,56 +219,222 @@ def compute_parametric_var(
     return max(z * horizon_vol - horizon_mean, 0.0)
 
 
+# =============================================================================
+# VECTORIZED SIMULATION ENGINE
+# =============================================================================
+
+
+# Upper bound on float64 values generated per simulation chunk (~32 MB).
+# Simulations are processed in chunks of this size, so 1M+ sims run in
+# bounded memory.
+MAX_CHUNK_ELEMENTS = 4_000_000
+
+
+def _tail_index(confidence: float, num_sims: int) -> int:
+    """Index of the VaR observation in the ascending return distribution."""
+    index = int((1.0 - confidence) * num_sims)
+    return max(0, min(index, num_sims - 1))
+
+
+def _var_from_tail(tail: List[float], var_index: int) -> Dict[str, float]:
+    """VaR/CVaR from the var_index + 1 worst returns (sorted ascending)."""
+    var_value = -tail[var_index]
+    cvar_value = -sum(tail) / len(tail) if tail else var_value
+    return {"var": max(var_value, 0.0), "cvar": max(cvar_value, 0.0)}
+
+
+class RiskSimulationEngine:
+    """
+    NumPy-backed Monte Carlo / historical-simulation VaR engine.
+
+    Daily asset shocks follow the same factor model as the original
+    loops: a market factor drawn once per simulated path (loading
+    market_factor_i) plus a daily residual, so
+        r_{p,d} = mu + vol * (a * f_p + sqrt(1 - a^2) * (L_R @ e_{p,d}))
+    where L_R is the Cholesky factor of the residual correlation matrix.
+    A whole batch of paths is one matrix product. Multi-day paths are
+    compounded with a product along the horizon axis, and VaR/CVaR use a
+    partial sort that keeps only the loss tail, merged across chunks.
+
+    Requires numpy (see NUMPY_AVAILABLE).
+    """
+
+    def __init__(
+        self,
+        weights: Dict[str, float],
+        correlation: Optional[Any] = None,
+        market_factor: Optional[Any] = None,
+        seed: Optional[int] = None,
+        max_chunk_elements: int = MAX_CHUNK_ELEMENTS,
+    ):
+        """
+        Args:
+            weights: Portfolio weights as {asset: weight}
+            correlation: Optional n x n correlation matrix of the daily
+                residual shocks in weights order; defaults to independent
+                residuals
+            market_factor: Optional loading (in [-1, 1]) of each asset on the
+                path-level market factor; defaults to sqrt(DEFAULT_CORRELATION)
+                when correlation is omitted and to 0 when it is given, so a
+                custom matrix alone describes i.i.d. daily co-movement
+            seed: Seed for reproducible draws
+            max_chunk_elements: Memory bound per simulation chunk
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("RiskSimulationEngine requires numpy")
+
+        self.assets = list(weights.keys())
+        stats = [_get_asset_stats(a) for a in self.assets]
+        n = len(self.assets)
+
+        self.weights = np.array([weights[a] for a in self.assets], dtype=float)
+        self.mu = np.array([s["daily_return"] for s in stats], dtype=float)
+        self.vol = np.array([s["daily_vol"] for s in stats], dtype=float)
+
+        if correlation is None:
+            corr = np.eye(n)
+            default_loading = math.sqrt(DEFAULT_CORRELATION)
+        else:
+            corr = np.asarray(correlation, dtype=float)
+            if corr.shape != (n, n):
+                raise ValueError(f"correlation must be {n}x{n}, got {corr.shape}")
+            default_loading = 0.0
+
+        if market_factor is None:
+            loading = np.full(n, default_loading)
+        else:
+            loading = np.asarray(market_factor, dtype=float).reshape(-1)
+            if loading.shape != (n,):
+                raise ValueError(f"market_factor must have {n} loadings, got {loading.shape}")
+            loading = np.clip(loading, -1.0, 1.0)
+
+        # Scale by vol after factoring: stays valid for zero-vol assets,
+        # whose covariance rows are all zero
+        self.factor = self.vol * loading
+        self.cholesky = (self.vol * np.sqrt(1.0 - loading ** 2))[:, None] * self._cholesky(corr)
+        # One-day covariance: persistent factor part plus daily residual part
+        self.covariance = np.outer(self.factor, self.factor) + self.cholesky @ self.cholesky.T
+        self.max_chunk_elements = max_chunk_elements
+        self.rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def _cholesky(corr):
+        """Cholesky factor, repairing a matrix that is not positive definite."""
+        try:
+            return np.linalg.cholesky(corr)
+        except np.linalg.LinAlgError:
+            # Clip negative eigenvalues and re-normalize to unit diagonal
+            values, vectors = np.linalg.eigh((corr + corr.T) / 2)
+            repaired = vectors @ np.diag(np.clip(values, 1e-10, None)) @ vectors.T
+            d = np.sqrt(np.diag(repaired))
+            return np.linalg.cholesky(repaired / np.outer(d, d))
+
+    def _daily_returns(self, paths: int, horizon_days: Optional[int] = None):
+        """
+        Correlated daily asset returns.
+
+        Returns shape (paths, n_assets), or (paths, horizon_days, n_assets)
+        when horizon_days is given; the market factor is shared by every
+        day of a path.
+        """
+        n = len(self.assets)
+        days = 1 if horizon_days is None else horizon_days
+        # One row of draws per path (factor first), so chunking does not
+        # change which numbers a path receives
+        draws = self.rng.standard_normal((paths, 1 + days * n))
+        common = draws[:, :1, None]
+        z = draws[:, 1:].reshape(paths, days, n)
+        daily = self.mu + common * self.factor + z @ self.cholesky.T
+        return daily[:, 0, :] if horizon_days is None else daily
+
+    def _chunk_sizes(self, total: int, elements_per_sim: int):
+        chunk = max(1, self.max_chunk_elements // max(elements_per_sim, 1))
+        for start in range(0, total, chunk):
+            yield min(chunk, total - start)
+
+    def _tail_var(self, chunks, confidence: float, num_sims: int) -> Dict[str, float]:
+        """Reduce chunks of portfolio returns to VaR/CVaR via partial sorts."""
+        var_index = _tail_index(confidence, num_sims)
+        keep = var_index + 1
+        tail = np.empty(0)
+
+        for returns in chunks:
+            merged = np.concatenate((tail, returns))
+            if len(merged) > keep:
+                merged = np.partition(merged, keep - 1)[:keep]
+            tail = merged
+
+        return _var_from_tail(np.sort(tail).tolist(), var_index)
+
+    def monte_carlo(self, confidence: float, horizon_days: int, num_sims: int = 10000) -> Dict[str, float]:
+        """Monte Carlo VaR/CVaR over horizon_days of correlated GBM paths."""
+        n = len(self.assets)
+
+        def chunks():
+            for size in self._chunk_sizes(num_sims, horizon_days * n + 1):
+                daily = self._daily_returns(size, horizon_days)
+                growth = np.prod(1.0 + daily, axis=1)  # compound along the horizon axis
+                yield (growth - 1.0) @ self.weights
+
+        return self._tail_var(chunks(), confidence, num_sims)
+
+    def historical(self, confidence: float, horizon_days: int, num_scenarios: int = 1000) -> Dict[str, float]:
+        """Scenario VaR/CVaR: one daily portfolio return compounded over the horizon."""
+        def chunks():
+            for size in self._chunk_sizes(num_scenarios, len(self.assets) + 1):
+                period = self._daily_returns(size) @ self.weights
+                yield (1.0 + period) ** horizon_days - 1.0
+
+        return self._tail_var(chunks(), confidence, num_scenarios)
+
+
+def _correlated_daily_returns(
+    stats: List[Dict[str, float]],
+    rng: random.Random,
+    common_factor: float,
+) -> List[float]:
+    """One day of asset returns from a single-factor model (pure Python)."""
+    return [
+        s["daily_return"] + s["daily_vol"] * (
+            math.sqrt(DEFAULT_CORRELATION) * common_factor
+            + math.sqrt(1.0 - DEFAULT_CORRELATION) * rng.gauss(0, 1)
+        )
+        for s in stats
+    ]
+
+
 def compute_historical_var(
     weights: Dict[str, float],
     confidence: float,
     horizon_days: int,
     num_scenarios: int = 1000,
+    seed: Optional[int] = None,
 ) -> Dict[str, float]:
     """
     Historical simulation VaR using synthetic returns based on asset statistics.
     Returns VaR and CVaR as positive percentages.
+
+    Uses RiskSimulationEngine when numpy is installed, otherwise a
+    pure-Python loop with the same distribution.
     """
-    assets = list(weights.keys())
-    w = [weights[a] for a in assets]
-    stats = [_get_asset_stats(a) for a in assets]
+    if NUMPY_AVAILABLE:
+        engine = RiskSimulationEngine(weights, seed=seed)
+        return engine.historical(confidence, horizon_days, num_scenarios)
+
+    rng = random.Random(seed)
+    w = [weights[a] for a in weights]
+    stats = [_get_asset_stats(a) for a in weights]
 
-    # Generate correlated returns using a simple factor model
     portfolio_returns = []
     for _ in range(num_scenarios):
-        common_factor = random.gauss(0, 1)
-        daily_returns = []
-        for s in stats:
-            # Correlated return: sqrt(corr)*common + sqrt(1-corr)*idiosyncratic
-            idio = random.gauss(0, 1)
-            r = s["daily_return"] + s["daily_vol"] * (
-                math.sqrt(DEFAULT_CORRELATION) * common_factor
-                + math.sqrt(1.0 - DEFAULT_CORRELATION) * idio
-            )
-            daily_returns.append(r)
-
+        daily_returns = _correlated_daily_returns(stats, rng, rng.gauss(0, 1))
+        period_return = sum(wi * r for wi, r in zip(w, daily_returns))
         # Compound over horizon
-        port_return = 0.0
-        for _ in range(horizon_days):
-            period_return = sum(
-                w[i] * daily_returns[i] for i in range(len(assets))
-            )
-            port_return = (1.0 + port_return) * (1.0 + period_return) - 1.0
-
-        portfolio_returns.append(port_return)
+        portfolio_returns.append((1.0 + period_return) ** horizon_days - 1.0)
 
     portfolio_returns.sort()
-
-    # VaR at the confidence percentile
-    var_index = int((1.0 - confidence) * num_scenarios)
-    var_index = max(0, min(var_index, num_scenarios - 1))
-    var_value = -portfolio_returns[var_index]
-
-    # CVaR = average of losses beyond VaR
-    tail = portfolio_returns[: var_index + 1]
-    cvar_value = -sum(tail) / len(tail) if tail else var_value
-
-    return {"var": max(var_value, 0.0), "cvar": max(cvar_value, 0.0)}
+    var_index = _tail_index(confidence, num_scenarios)
+    return _var_from_tail(portfolio_returns[: var_index + 1], var_index)
 
 
 def compute_monte_carlo_var(
@@ -273,46 +442,39 @@ def compute_monte_carlo_var(
     confidence: float,
     horizon_days: int,
     num_sims: int = 10000,
+    seed: Optional[int] = None,
 ) -> Dict[str, float]:
     """
     Monte Carlo VaR using geometric Brownian motion.
     Returns VaR and CVaR as positive percentages.
+
+    Uses RiskSimulationEngine (chunked, so large num_sims stay within
+    bounded memory) when numpy is installed, otherwise a pure-Python loop
+    with the same distribution.
     """
-    assets = list(weights.keys())
-    w = [weights[a] for a in assets]
-    stats = [_get_asset_stats(a) for a in assets]
+    if NUMPY_AVAILABLE:
+        engine = RiskSimulationEngine(weights, seed=seed)
+        return engine.monte_carlo(confidence, horizon_days, num_sims)
+
+    rng = random.Random(seed)
+    w = [weights[a] for a in weights]
+    stats = [_get_asset_stats(a) for a in weights]
 
     portfolio_returns = []
     for _ in range(num_sims):
-        # Simulate each asset's path over the horizon
-        asset_returns = []
-        common_factor = random.gauss(0, 1)
-
-        for s in stats:
-            cumulative = 1.0
-            for _ in range(horizon_days):
-                idio = random.gauss(0, 1)
-                z = (
-                    math.sqrt(DEFAULT_CORRELATION) * common_factor
-                    + math.sqrt(1.0 - DEFAULT_CORRELATION) * idio
-                )
-                daily_r = s["daily_return"] + s["daily_vol"] * z
-                cumulative *= 1.0 + daily_r
-            asset_returns.append(cumulative - 1.0)
-
-        port_return = sum(w[i] * asset_returns[i] for i in range(len(assets)))
-        portfolio_returns.append(port_return)
-
-    portfolio_returns.sort()
+        # Simulate each asset's path over the horizon; the market factor
+        # is drawn once per path
+        common_factor = rng.gauss(0, 1)
+        cumulative = [1.0] * len(stats)
+        for _ in range(horizon_days):
+            daily_returns = _correlated_daily_returns(stats, rng, common_factor)
+            cumulative = [c * (1.0 + r) for c, r in zip(cumulative, daily_returns)]
 
-    var_index = int((1.0 - confidence) * num_sims)
-    var_index = max(0, min(var_index, num_sims - 1))
-    var_value = -portfolio_returns[var_index]
+        portfolio_returns.append(sum(wi * (c - 1.0) for wi, c in zip(w, cumulative)))
 
-    tail = portfolio_returns[: var_index + 1]
-    cvar_value = -sum(tail) / len(tail) if tail else var_value
-
-    return {"var": max(var_value, 0.0), "cvar": max(cvar_value, 0.0)}
+    portfolio_returns.sort()
+    var_index = _tail_index(confidence, num_sims)
+    return _var_from_tail(portfolio_returns[: var_index + 1], var_index)
 
 
 def compute_stress_tests(
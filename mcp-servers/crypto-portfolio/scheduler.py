@@ -122,9 +122,11 @@ class PortfolioScheduler:
             )
 
             # Save current prices
-            for asset, position in snapshot.positions.items():
-                if position.price > 0:
-                    db.save_price(asset, position.price, snapshot.timestamp)
+            db.save_prices(
+                (asset, position.price, snapshot.timestamp)
+                for asset, position in snapshot.positions.items()
+                if position.price > 0
+            )
 
         except Exception as e:
             logger.error(f"Portfolio sync failed: {e}")
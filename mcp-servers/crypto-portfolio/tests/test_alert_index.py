@@ -0,0 +1,359 @@
+"""
+Alert Index Tests
+=================
+
+Validates the indexed trigger path against the full scan it replaces:
+- Sorted books fire exactly the crossed price/stop/take-profit thresholds
+- Trailing-stop cohorts match per-alert peak tracking over random walks
+- The journal replays in order, skips a torn tail and compacts atomically
+- MultiExchangeAlertMonitor journals triggers instead of rewriting its config
+- Ticks per second with 10k alerts: index vs full scan
+"""
+
+import json
+import os
+import random
+import time
+
+import pytest
+
+from alert_index import AlertIndex, AlertJournal, ThresholdIndex
+from multi_alerts import AlertType, MultiExchangeAlertMonitor, PriceAlert
+from price_matrix import PriceSnapshot, PriceCell
+
+
+class ScanAlerts:
+    """Reference: check every alert on every tick, as the engines used to."""
+
+    def __init__(self):
+        self.alerts = {}  # key -> [kind, threshold or distance, peak]
+
+    def add(self, key, kind, value, peak=None):
+        self.alerts[key] = [kind, value, peak or 0.0]
+
+    def update(self, price):
+        fired = []
+        for key, alert in self.alerts.items():
+            kind, value, peak = alert
+            if kind == "above" and price >= value:
+                fired.append(key)
+            elif kind == "below" and price <= value:
+                fired.append(key)
+            elif kind == "trailing":
+                if price > peak:
+                    alert[2] = peak = price
+                if peak * (1 - value) >= price:
+                    fired.append(key)
+        for key in fired:
+            del self.alerts[key]
+        return fired
+
+
+def _random_alerts(rng, count, price=100.0):
+    alerts = []
+    for i in range(count):
+        kind = rng.choice(["above", "below", "trailing"])
+        if kind == "trailing":
+            alerts.append((f"a{i}", kind, rng.uniform(0.01, 0.2), price * rng.uniform(0.9, 1.1)))
+        else:
+            alerts.append((f"a{i}", kind, price * rng.uniform(0.5, 1.5), None))
+    return alerts
+
+
+def _load(index, scan, alerts):
+    for key, kind, value, peak in alerts:
+        scan.add(key, kind, value, peak)
+        if kind == "above":
+            index.add_above(key, value)
+        elif kind == "below":
+            index.add_below(key, value)
+        else:
+            index.add_trailing(key, value, peak)
+
+
+def _snapshot(prices):
+    now = time.time()
+    return PriceSnapshot(
+        cells={asset: {ex: PriceCell(p, now) for ex, p in by_ex.items()} for asset, by_ex in prices.items()},
+        taken_at=now,
+        max_age=30,
+    )
+
+
+@pytest.mark.unit
+class TestThresholdIndex:
+
+    def test_books_fire_only_crossed_thresholds(self):
+        index = ThresholdIndex()
+        for i, threshold in enumerate([105, 110, 110, 120]):
+            index.add_above(f"up{i}", threshold)
+        for i, threshold in enumerate([95, 90, 80]):
+            index.add_below(f"down{i}", threshold)
+
+        assert index.update(100) == ([], False)
+        assert index.update(110) == ([("up0", None), ("up1", None), ("up2", None)], False)
+        assert index.update(90) == ([("down1", None), ("down0", None)], False)
+        assert len(index) == 2
+
+        assert index.remove("up3")
+        assert not index.remove("up3")
+        assert index.update(200) == ([], False)
+
+    def test_trailing_stop_follows_peak(self):
+        index = ThresholdIndex()
+        index.add_trailing("t10", 0.10, peak=100)
+        index.add_trailing("t20", 0.20)            # Peak from the next tick
+
+        assert index.update(120) == ([], True)
+        assert index.peak("t10") == index.peak("t20") == 120
+        assert index.update(110) == ([], False)
+        assert index.update(108) == ([("t10", 120)], False)
+        assert index.update(96) == ([("t20", 120)], False)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_full_scan_on_random_walk(self, seed):
+        rng = random.Random(seed)
+        index, scan = ThresholdIndex(), ScanAlerts()
+        _load(index, scan, _random_alerts(rng, 500))
+
+        price = 100.0
+        for tick in range(2000):
+            price *= 1 + rng.gauss(0, 0.01)
+            if tick % 50 == 0:                     # Churn: new and removed alerts mid-stream
+                key = f"late{tick}"
+                _load(index, scan, [(key, "trailing", rng.uniform(0.01, 0.1), price)])
+                victim = rng.choice(list(scan.alerts))
+                del scan.alerts[victim]
+                index.remove(victim)
+
+            fired, _ = index.update(price)
+            assert sorted(k for k, _ in fired) == sorted(scan.update(price))
+            assert len(index) == len(scan.alerts)
+
+        for key, (kind, _, peak) in scan.alerts.items():
+            if kind == "trailing":
+                assert index.peak(key) == peak
+
+    def test_alert_index_books(self):
+        index = AlertIndex()
+        index.add_above(("BTC", "all"), "a", 100)
+        index.add_below(("BTC", "kraken"), "b", 90)
+        index.add_above(("BTC", "all"), "b", 95)    # Re-adding moves it
+
+        assert set(index.books) == {("BTC", "all")}
+        assert index.update(("BTC", "all"), 99) == ([("b", None)], False)
+        assert index.update(("ETH", "all"), 99) == ([], False)
+        assert "a" in index and "b" not in index
+
+
+@pytest.mark.unit
+class TestAlertJournal:
+
+    def test_replay_torn_tail_and_compact(self, tmp_path):
+        state_path = str(tmp_path / "state.json")
+        journal = AlertJournal(state_path, compact_after=3)
+        journal.append({"op": "put", "id": 1})
+        journal.extend([{"op": "put", "id": 2}, {"op": "del", "id": 1}])
+        journal.close()
+        with open(journal.path, "a") as f:
+            f.write('{"op": "put", "id"')          # Crash mid-write
+
+        reopened = AlertJournal(state_path, compact_after=3)
+        assert [e["id"] for e in reopened.read()] == [1, 2, 1]
+        assert reopened.should_compact()
+        assert not reopened.should_compact(records=10)     # Not yet longer than the state
+
+        reopened.compact({"alerts": [2]})
+        assert reopened.read() == [] and reopened.entries == 0
+        with open(state_path) as f:
+            assert json.load(f) == {"alerts": [2]}
+        assert not os.path.exists(state_path + ".tmp")
+
+
+    def test_append_after_torn_tail_is_readable(self, tmp_path):
+        state_path = str(tmp_path / "state.json")
+        journal = AlertJournal(state_path)
+        journal.append({"op": "put", "id": 1})
+        journal.close()
+        with open(journal.path, "a") as f:
+            f.write('{"op": "put", "id"')          # Crash mid-write
+
+        reopened = AlertJournal(state_path)
+        reopened.append({"op": "put", "id": 2})
+        reopened.close()
+        assert [e["id"] for e in AlertJournal(state_path).read()] == [1, 2]
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    for name in ("COINBASE", "KRAKEN", "CRYPTOCOM", "GEMINI"):
+        monkeypatch.delenv(f"{name}_API_KEY", raising=False)
+    monitor = MultiExchangeAlertMonitor(config_dir=str(tmp_path), dry_run=True)
+    monitor.notifier = None
+    return monitor
+
+
+@pytest.mark.unit
+class TestMultiExchangeIndexing:
+
+    def test_rounds_match_full_scan(self, monitor, tmp_path):
+        rng = random.Random(3)
+        for i in range(60):
+            asset = rng.choice(["BTC", "ETH"])
+            kind = i % 5
+            if kind == 0:
+                monitor.add_price_alert(asset, "above", rng.uniform(100, 130), exchange=rng.choice(["all", "kraken"]))
+            elif kind == 1:
+                monitor.add_price_alert(asset, "below", rng.uniform(70, 100))
+            elif kind == 2:
+                monitor.add_stop_loss(asset, -rng.uniform(5, 25), cost_basis=100)
+            elif kind == 3:
+                monitor.add_take_profit(asset, rng.uniform(5, 25), cost_basis=100)
+            else:
+                monitor.add_trailing_stop(asset, rng.uniform(3, 15))
+
+        # Reference monitor running the old per-alert scan on copies of the same alerts
+        reference = MultiExchangeAlertMonitor(config_dir=str(tmp_path / "reference"), dry_run=True)
+        reference.alerts = {k: PriceAlert.from_dict(a.to_dict()) for k, a in monitor.alerts.items()}
+
+        prices = {"BTC": 100.0, "ETH": 100.0}
+        for _ in range(300):
+            for asset in prices:
+                prices[asset] *= 1 + rng.gauss(0, 0.01)
+            by_exchange = {a: {"coinbase": p, "kraken": p * 1.01} for a, p in prices.items()}
+
+            expected = set()
+            for alert in reference.alerts.values():
+                if reference.check_alert(alert, by_exchange[alert.asset]):
+                    alert.triggered = True
+                    expected.add(alert.alert_id)
+
+            fired = {e.alert_id for e in monitor.evaluate_alerts(_snapshot(by_exchange))}
+            assert fired == expected
+
+    def test_triggers_journaled_and_replayed(self, monitor, tmp_path):
+        above = monitor.add_price_alert("BTC", "above", 110)
+        trailing = monitor.add_trailing_stop("ETH", 10)
+        monitor._save_alerts()
+        with open(monitor.config_path) as f:
+            compacted = f.read()
+
+        monitor.evaluate_alerts(_snapshot({"BTC": {"coinbase": 111}, "ETH": {"coinbase": 3000}}))
+        monitor.evaluate_alerts(_snapshot({"ETH": {"coinbase": 3200}}))
+
+        with open(monitor.config_path) as f:
+            assert f.read() == compacted            # Config untouched; changes are in the journal
+        ops = [e["op"] for e in monitor.journal.read()]
+        assert sorted(ops) == ["peak", "peak", "put"]
+
+        reloaded = MultiExchangeAlertMonitor(config_dir=str(tmp_path), dry_run=True)
+        assert reloaded.alerts[above.alert_id].triggered
+        assert reloaded.alerts[trailing.alert_id].highest_price_seen == 3200
+        assert reloaded.index.peak(trailing.alert_id) == 3200
+        events = reloaded.evaluate_alerts(_snapshot({"ETH": {"coinbase": 2880}}))
+        assert [e.alert_id for e in events] == [trailing.alert_id]
+
+    def test_cost_basis_keeps_trailing_peak(self, monitor, tmp_path):
+        trailing = monitor.add_trailing_stop("ETH", 10)
+        monitor.evaluate_alerts(_snapshot({"ETH": {"coinbase": 3000}}))
+
+        monitor.set_cost_basis("ETH", 2500)
+        assert monitor.index.peak(trailing.alert_id) == 3000
+        assert monitor.alerts[trailing.alert_id].highest_price_seen == 3000
+
+        # The journaled record carries the peak, so a reload doesn't reset it either
+        reloaded = MultiExchangeAlertMonitor(config_dir=str(tmp_path), dry_run=True)
+        assert reloaded.index.peak(trailing.alert_id) == 3000
+        events = reloaded.evaluate_alerts(_snapshot({"ETH": {"coinbase": 2690}}))
+        assert [e.alert_id for e in events] == [trailing.alert_id]
+
+    def test_journal_compacts(self, monitor):
+        monitor.journal.compact_after = 10
+        for i in range(25):
+            monitor.add_price_alert("BTC", "above", 100 + i)
+        # Folded at 10 entries; the next fold waits until the journal outgrows the 10+ alerts
+        assert monitor.journal.entries == 15
+        with open(monitor.config_path) as f:
+            assert len(json.load(f)) == 10
+
+        reloaded = MultiExchangeAlertMonitor(config_dir=monitor.config_dir, dry_run=True)
+        assert set(reloaded.alerts) == set(monitor.alerts)
+        assert all(a.alert_type == AlertType.PRICE_ABOVE for a in reloaded.alerts.values())
+
+    def test_peaks_and_deletes_compact(self, monitor):
+        monitor.journal.compact_after = 5
+        trailing = monitor.add_trailing_stop("ETH", 10)
+        for i in range(20):
+            monitor.evaluate_alerts(_snapshot({"ETH": {"coinbase": 3000 + i}}))
+        assert monitor.journal.entries < 5
+        with open(monitor.config_path) as f:
+            assert json.load(f)[trailing.alert_id]["highest_price_seen"] >= 3015
+
+        for i in range(6):
+            monitor.remove_alert(monitor.add_price_alert("BTC", "above", 100 + i).alert_id)
+        assert monitor.journal.entries < 5
+
+        reloaded = MultiExchangeAlertMonitor(config_dir=monitor.config_dir, dry_run=True)
+        assert set(reloaded.alerts) == {trailing.alert_id}
+        assert reloaded.index.peak(trailing.alert_id) == 3019
+
+
+@pytest.mark.stress
+class TestAlertIndexThroughput:
+
+    def test_ticks_per_second_10k_alerts(self):
+        """10,000 alerts on one asset, random-walk ticks: index vs full scan."""
+        rng = random.Random(11)
+        alerts = _random_alerts(rng, 10_000)
+        # Thresholds far from the start price so most alerts stay armed throughout
+        alerts = [(k, kind, v * 3 if kind == "above" else (v / 3 if kind == "below" else v + 0.3), p)
+                  for k, kind, v, p in alerts]
+        walk, price = [], 100.0
+        for _ in range(2000):
+            price *= 1 + rng.gauss(0, 0.002)
+            walk.append(price)
+
+        def run(engine, ticks):
+            fired = 0
+            start = time.perf_counter()
+            for p in ticks:
+                result = engine.update(p)
+                fired += len(result[0] if isinstance(result, tuple) else result)
+            return fired, len(ticks) / (time.perf_counter() - start)
+
+        index, scan = ThresholdIndex(), ScanAlerts()
+        _load(index, scan, alerts)
+        scan_fired, scan_rate = run(scan, walk[:200])
+        index_fired, _ = run(index, walk[:200])
+        assert index_fired == scan_fired
+        _, index_rate = run(index, walk[200:])
+
+        print(f"\n[PERF] 10k alerts: index {index_rate:,.0f} ticks/s vs full scan {scan_rate:,.0f} ticks/s "
+              f"({index_rate / scan_rate:.0f}x)")
+        assert index_rate > 20 * scan_rate
+
+    def test_monitor_round_10k_alerts(self, monitor):
+        """End to end: 10k alerts over 20 assets, one snapshot per round."""
+        rng = random.Random(5)
+        assets = [f"A{i}" for i in range(20)]
+        for i in range(10_000):
+            asset = assets[i % 20]
+            if i % 3 == 0:
+                monitor.add_trailing_stop(asset, rng.uniform(20, 40))
+            else:
+                monitor.add_price_alert(asset, rng.choice(["above", "below"]),
+                                        rng.choice([rng.uniform(150, 300), rng.uniform(10, 60)]))
+        monitor._save_alerts()
+
+        prices = {a: 100.0 for a in assets}
+        rounds = 500
+        start = time.perf_counter()
+        fired = 0
+        for _ in range(rounds):
+            for a in assets:
+                prices[a] *= 1 + rng.gauss(0, 0.002)
+            fired += len(monitor.evaluate_alerts(_snapshot({a: {"coinbase": p} for a, p in prices.items()})))
+        rate = rounds * len(assets) / (time.perf_counter() - start)
+
+        print(f"\n[PERF] MultiExchangeAlertMonitor, 10k alerts: {rate:,.0f} asset ticks/s, "
+              f"{fired} fired, {monitor.journal.entries} journal entries")
+        assert rate > 10_000
@@ -0,0 +1,289 @@
+"""
+Audit Log Tests
+===============
+
+Validates the append-only audit trail:
+- Appends never rewrite earlier bytes; a reopened log continues the chain
+- Signed checkpoints every N entries; incremental and full verification
+- Tampering with entries, checkpoints or signatures is detected
+- Indexed get_entries matches a linear filter
+- Legacy JSON-array logs are converted
+- Append and verification throughput for 50k entries
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from compliance.audit_log import AuditEntry, AuditLog, _compute_checksum
+
+KEY = b"test-key"
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "audit_log.jsonl")
+
+
+def _fill(log, n, tables=("trades", "lots", "wallets")):
+    for i in range(n):
+        log.log_change(tables[i % len(tables)], str(i % 7), "insert" if i % 2 else "update",
+                       new_values={"i": i})
+
+
+def _checksum(entry, prev):
+    return _compute_checksum(entry.content(), prev)
+
+
+def _lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def _rewrite(path, records):
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.mark.unit
+class TestAppend:
+
+    def test_appends_and_checkpoints(self, path):
+        with AuditLog(path, checkpoint_interval=10, key=KEY) as log:
+            _fill(log, 25)
+            before = open(path, "rb").read()
+            log.log_change("trades", "99", "DELETE")
+        assert open(path, "rb").read().startswith(before)
+
+        records = _lines(path)
+        checkpoints = [r for r in records if "checkpoint" in r]
+        assert [c["checkpoint"] for c in checkpoints] == [10, 20]
+        assert len(records) == 28
+        entries = [r for r in records if "checkpoint" not in r]
+        assert checkpoints[1]["running_hash"] == entries[19]["checksum"]
+
+    def test_reopen_continues_chain(self, path):
+        with AuditLog(path, checkpoint_interval=10, key=KEY) as log:
+            _fill(log, 15)
+        with AuditLog(path, checkpoint_interval=10, key=KEY) as log:
+            entry = log.log_change("trades", "1", "UPDATE")
+            _fill(log, 4)
+        entries = [r for r in _lines(path) if "checkpoint" not in r]
+        assert entry.prev_checksum == entries[14]["checksum"]
+        assert [r["checkpoint"] for r in _lines(path) if "checkpoint" in r] == [10, 20]
+
+        result = AuditLog(path, key=KEY).verify_chain(full=True)
+        assert result["valid"], result["errors"]
+        assert result["total_entries"] == 20
+
+    def test_torn_write_is_discarded(self, path):
+        with AuditLog(path, key=KEY) as log:
+            _fill(log, 3)
+        with open(path, "a") as f:
+            f.write('{"timestamp": "2026-')
+
+        log = AuditLog(path, key=KEY)
+        assert len(log.get_entries()) == 3
+        assert log.verify_chain()["valid"]
+        log.log_change("trades", "4", "INSERT")
+        log.close()
+        assert AuditLog(path, key=KEY).verify_chain(full=True)["total_entries"] == 4
+
+    def test_two_writers_share_the_chain(self, path):
+        a = AuditLog(path, key=KEY)
+        b = AuditLog(path, key=KEY)
+        a.log_change("trades", "1", "INSERT")
+        b.log_change("trades", "2", "INSERT")
+        a.log_change("trades", "3", "INSERT")
+        a.close()
+        b.close()
+        assert AuditLog(path, key=KEY).verify_chain(full=True)["valid"]
+
+    def test_key_file_is_created_private(self, path, monkeypatch):
+        monkeypatch.delenv("AUDIT_LOG_KEY", raising=False)
+        with AuditLog(path, checkpoint_interval=2) as log:
+            _fill(log, 2)
+        assert os.stat(path + ".key").st_mode & 0o777 == 0o600
+        assert AuditLog(path).verify_chain()["valid"]
+
+
+@pytest.mark.unit
+class TestVerification:
+
+    @pytest.fixture
+    def filled(self, path):
+        with AuditLog(path, checkpoint_interval=10, key=KEY) as log:
+            _fill(log, 35)
+        return path
+
+    def test_incremental_starts_at_last_checkpoint(self, filled):
+        result = AuditLog(filled, key=KEY).verify_chain()
+        assert result["valid"]
+        assert result["trusted_checkpoint"] == 30
+        assert result["entries_checked"] == 5
+        assert result["total_entries"] == 35
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_full_checks_every_segment(self, filled, workers):
+        result = AuditLog(filled, key=KEY).verify_chain(full=True, workers=workers)
+        assert result["valid"], result["errors"]
+        assert result["entries_checked"] == 35
+        assert result["segments_checked"] == 4
+
+    def test_edited_entry_is_detected(self, filled):
+        records = _lines(filled)
+        records[3]["new_values"] = {"i": 9}  # Same length: offsets still line up
+        _rewrite(filled, records)
+
+        assert AuditLog(filled, key=KEY).verify_chain()["valid"]  # Before the trusted checkpoint
+        result = AuditLog(filled, key=KEY).verify_chain(full=True, workers=2)
+        assert not result["valid"]
+        assert any("Entry 3: checksum mismatch" in e for e in result["errors"])
+
+    def test_rewritten_chain_fails_checkpoint(self, filled):
+        """Re-hashing an edited segment still breaks the signed running hash."""
+        records = _lines(filled)
+        records[0]["new_values"] = {"i": 9}
+        prev = ""
+        for record in records[:10]:
+            entry = AuditEntry.from_dict(record)
+            record["prev_checksum"] = prev
+            record["checksum"] = prev = _checksum(entry, prev)
+        _rewrite(filled, records)
+
+        errors = AuditLog(filled, key=KEY).verify_chain(full=True)["errors"]
+        assert errors == [errors[0]] and "Checkpoint 10: running hash mismatch" in errors[0]
+
+    def test_forged_checkpoint_is_detected(self, filled):
+        records = _lines(filled)
+        records[-6]["running_hash"] = records[-8]["checksum"]
+        _rewrite(filled, records)
+        result = AuditLog(filled, key=KEY).verify_chain()
+        assert "Checkpoint 30: bad signature" in result["errors"]
+        assert not AuditLog(filled, key=b"other").verify_chain(full=True)["valid"]
+
+    def test_deleted_entry_is_detected(self, filled):
+        records = _lines(filled)
+        del records[12]
+        _rewrite(filled, records)
+        errors = AuditLog(filled, key=KEY).verify_chain(full=True)["errors"]
+        assert any("prev_checksum mismatch" in e for e in errors)
+        assert any("Checkpoint 20: segment holds 9 entries" in e for e in errors)
+
+
+@pytest.mark.unit
+class TestGetEntries:
+
+    @staticmethod
+    def _linear(entries, table_name=None, record_id=None, action=None, since=None, until=None, limit=50):
+        matches = [
+            e for e in reversed(entries)
+            if (not table_name or e.table_name == table_name)
+            and (not record_id or e.record_id == record_id)
+            and (not action or e.action == action.upper())
+            and (not since or e.timestamp >= since)
+            and (not until or e.timestamp <= until)
+        ]
+        return matches[:limit]
+
+    def test_indexes_match_linear_filter(self, path):
+        log = AuditLog(path, checkpoint_interval=50, key=KEY)
+        _fill(log, 300)
+        log.close()
+        everything = AuditLog(path, key=KEY).get_entries(limit=10_000)[::-1]
+        since, until = everything[40].timestamp, everything[250].timestamp
+
+        reader = AuditLog(path, key=KEY)
+        for kwargs in [
+            {},
+            {"table_name": "lots"},
+            {"record_id": "3"},
+            {"table_name": "trades", "record_id": "3", "action": "update"},
+            {"since": since, "limit": 500},
+            {"table_name": "wallets", "since": since, "until": until, "limit": 500},
+            {"record_id": "5", "until": until, "limit": 3},
+        ]:
+            assert reader.get_entries(**kwargs) == self._linear(everything, **kwargs), kwargs
+
+    def test_reader_sees_new_appends(self, path):
+        writer = AuditLog(path, key=KEY)
+        reader = AuditLog(path, key=KEY)
+        writer.log_change("trades", "1", "INSERT")
+        assert len(reader.get_entries()) == 1
+        writer.log_change("trades", "2", "INSERT")
+        writer.flush()
+        assert [e.record_id for e in reader.get_entries()] == ["2", "1"]
+        writer.close()
+
+    def test_out_of_order_timestamps_fall_back_to_scan(self, path):
+        with AuditLog(path, key=KEY) as log:
+            _fill(log, 5)
+        records = _lines(path)
+        records[1]["timestamp"] = "2000-01-01T00:00:00+00:00Z"
+        _rewrite(path, records)
+        entries = AuditLog(path, key=KEY).get_entries(since="2001-01-01")
+        assert len(entries) == 4
+
+
+@pytest.mark.unit
+class TestLegacyMigration:
+
+    def test_json_array_is_converted(self, tmp_path):
+        legacy = tmp_path / "audit_log.json"
+        entries = []
+        prev = ""
+        for i in range(3):
+            entry = AuditEntry("2025-01-0%dT00:00:00Z" % (i + 1), "trades", str(i), "INSERT", prev_checksum=prev)
+            entry.checksum = prev = _checksum(entry, prev)
+            entries.append(entry.to_dict())
+        legacy.write_text(json.dumps(entries, indent=2))
+
+        # Sibling .json next to the new default .jsonl path
+        log = AuditLog(str(tmp_path / "audit_log.jsonl"), key=KEY)
+        assert [e.record_id for e in log.get_entries()] == ["2", "1", "0"]
+        assert (tmp_path / "audit_log.json.migrated").exists()
+        log.log_change("trades", "3", "INSERT")
+        assert log.verify_chain(full=True)["valid"]
+
+        # An array at the log path itself is converted in place
+        legacy.write_text(json.dumps(entries))
+        in_place = AuditLog(str(legacy), key=KEY)
+        assert in_place.verify_chain()["total_entries"] == 3
+        assert legacy.read_text().startswith("{")
+
+
+@pytest.mark.stress
+class TestAuditThroughput:
+
+    def test_50k_entries(self, path):
+        log = AuditLog(path, key=KEY)
+        start = time.perf_counter()
+        _fill(log, 50_000)
+        log.close()
+        duration = time.perf_counter() - start
+        print(f"\n[PERF] 50k audit appends: {duration:.3f}s ({50_000 / duration:,.0f}/s)")
+
+        start = time.perf_counter()
+        result = AuditLog(path, key=KEY).verify_chain()
+        print(f"[PERF] incremental verify: {time.perf_counter() - start:.3f}s, "
+              f"{result['entries_checked']} entries re-hashed")
+        assert result["valid"]
+
+        start = time.perf_counter()
+        result = AuditLog(path, key=KEY).verify_chain(full=True, workers=2)
+        print(f"[PERF] full verify ({result['segments_checked']} segments): "
+              f"{time.perf_counter() - start:.3f}s")
+        assert result["valid"] and result["entries_checked"] == 50_000
+
+        reader = AuditLog(path, key=KEY)
+        start = time.perf_counter()
+        reader.get_entries(limit=1)
+        print(f"[PERF] index build: {time.perf_counter() - start:.3f}s")
+        start = time.perf_counter()
+        for i in range(1000):
+            reader.get_entries(table_name="lots", record_id=str(i % 7), limit=10)
+        print(f"[PERF] 1000 indexed lookups: {time.perf_counter() - start:.3f}s")
+        assert duration < 30.0
@@ -0,0 +1,246 @@
+"""
+Parameter Sweep Tests
+=====================
+
+Validates the process-pool sweep runner:
+- Grid, random and Latin-hypercube parameter spaces
+- Walk-forward window layout and indicator warmup
+- Pool results identical to in-process results
+- Checkpoint resume skips completed tasks
+- Ranking by Sharpe, drawdown and trade count
+"""
+
+import asyncio
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from agents.backtester import BacktestEngine, HistoricalDataProvider, SimulatedSignalGenerator
+from agents.sweep import (
+    ParamRange,
+    SharedOHLCV,
+    SweepRunner,
+    build_config,
+    dataset_fingerprint,
+    format_sweep_table,
+    grid,
+    latin_hypercube,
+    parse_space,
+    random_samples,
+    rank_results,
+    run_task,
+    walk_forward_windows,
+)
+from agents.trading_agent import SwingStrategy
+
+
+@pytest.fixture(scope="module")
+def btc_data():
+    random.seed(21)
+    candles = HistoricalDataProvider().generate_synthetic(
+        "BTC", Decimal("40000"), days=420, volatility=0.04,
+    )
+    return {"BTC": candles}
+
+
+def _strip(records):
+    return sorted((r["key"], r.get("train"), r.get("test"), r.get("error")) for r in records)
+
+
+@pytest.mark.unit
+class TestParameterSpaces:
+
+    def test_grid_is_cartesian_product(self):
+        params = grid({"a": [1, 2, 3], "b": [0.1, 0.2]})
+        assert len(params) == 6
+        assert {"a": 3, "b": 0.2} in params
+
+    def test_grid_rejects_ranges(self):
+        with pytest.raises(ValueError):
+            grid({"a": ParamRange(0, 1)})
+
+    def test_latin_hypercube_covers_every_stratum(self):
+        """Each of the n strata per dimension is hit exactly once."""
+        n = 25
+        samples = latin_hypercube({"x": ParamRange(0.0, 1.0), "y": ParamRange(10.0, 20.0)}, n, seed=3)
+        assert sorted(int(s["x"] * n) for s in samples) == list(range(n))
+        assert sorted(int((s["y"] - 10.0) / 10.0 * n) for s in samples) == list(range(n))
+
+    def test_samplers_are_seeded(self):
+        space = {"x": ParamRange(0, 10, integer=True), "y": [1, 2, 3]}
+        assert random_samples(space, 10, seed=1) == random_samples(space, 10, seed=1)
+        assert latin_hypercube(space, 10, seed=1) == latin_hypercube(space, 10, seed=1)
+        assert all(isinstance(s["x"], int) and 0 <= s["x"] <= 10 for s in random_samples(space, 50, seed=2))
+
+    def test_parse_space(self):
+        space = parse_space("risk_limits.max_position_size_pct=0.05:0.3; dca_frequency_hours=12,24")
+        assert space["risk_limits.max_position_size_pct"] == ParamRange(0.05, 0.3)
+        assert space["dca_frequency_hours"] == [12, 24]
+        assert parse_space("n=1:5")["n"].integer
+        with pytest.raises(ValueError):
+            parse_space("missing_values=")
+
+    def test_build_config_coerces_types(self):
+        config = build_config(
+            {"risk_limits.max_position_size_pct": 0.25, "dca_frequency_hours": 12.0, "fee_rate": 0.002},
+            ["BTC"], 10000,
+        )
+        assert config.risk_limits.max_position_size_pct == Decimal("0.25")
+        assert config.dca_frequency_hours == 12
+        with pytest.raises(ValueError):
+            build_config({"risk_limits.no_such_limit": 1}, ["BTC"], 10000)
+
+
+@pytest.mark.unit
+class TestWalkForward:
+
+    def test_rolling_windows(self):
+        windows = walk_forward_windows(1000, train_bars=300, test_bars=100)
+        assert [w.test for w in windows][:2] == [(300, 400), (400, 500)]
+        assert windows[-1].test[1] <= 1000
+        assert all(w.train[1] == w.test[0] for w in windows)
+
+    def test_anchored_windows(self):
+        windows = walk_forward_windows(1000, train_bars=300, test_bars=100, anchored=True)
+        assert all(w.train[0] == 0 for w in windows)
+
+    def test_test_slice_trades_only_its_bars(self, btc_data):
+        """The warmup prefix is indicator history only; trading starts at the split."""
+        window = walk_forward_windows(420, train_bars=200, test_bars=100)[0]
+        runner = SweepRunner(btc_data, windows=[window], workers=1)
+        task = runner.tasks([{}])[0]
+        record = run_task(task, runner.data)
+
+        engine = BacktestEngine()
+        start = window.test[0] - SimulatedSignalGenerator.WARMUP
+        result = asyncio.run(engine.run(
+            SwingStrategy(build_config({}, ["BTC"], 10000)),
+            assets=["BTC"],
+            data={"BTC": btc_data["BTC"][start:window.test[1]]},
+        ))
+        asyncio.run(engine.close())
+        assert record["test"]["sharpe_ratio"] == result.metrics.sharpe_ratio
+        assert record["test"]["total_trades"] == result.metrics.total_trades
+
+
+@pytest.mark.unit
+class TestSweepRunner:
+
+    SPACE = {"risk_limits.max_position_size_pct": [0.05, 0.2], "fee_rate": [0.001, 0.003]}
+
+    def test_shared_memory_roundtrip(self, btc_data):
+        pytest.importorskip("numpy")
+        with SharedOHLCV(btc_data) as shared:
+            view = SharedOHLCV.attach(shared.spec)
+            try:
+                assert view.slice() == btc_data
+                assert view.candles("BTC", 100, 103) == btc_data["BTC"][100:103]
+            finally:
+                view.close()
+
+    def test_shared_memory_view_is_not_a_copy(self, btc_data):
+        np = pytest.importorskip("numpy")
+        with SharedOHLCV(btc_data) as shared:
+            view = SharedOHLCV.attach(shared.spec)
+            try:
+                assert not view.array.flags.owndata
+                # A write through the parent's mapping is visible in the view
+                parent = np.ndarray(view.array.shape, dtype=np.float64, buffer=shared._shm.buf)
+                parent[0, 0, 4] = 123.5
+                del parent
+                assert view.array[0, 0, 4] == 123.5
+            finally:
+                view.close()
+
+    def test_fingerprint_covers_every_candle(self, btc_data):
+        candles = list(btc_data["BTC"])
+        middle = candles[200]
+        candles[200] = type(middle)(
+            timestamp=middle.timestamp, open=middle.open, high=middle.high,
+            low=middle.low, close=middle.close + 1, volume=middle.volume,
+        )
+        assert dataset_fingerprint({"BTC": candles}) != dataset_fingerprint(btc_data)
+
+    def test_pool_matches_in_process(self, btc_data):
+        windows = walk_forward_windows(420, train_bars=200, test_bars=100)
+        params = grid(self.SPACE)
+        serial = SweepRunner(btc_data, windows=windows, workers=1).run(params)
+        pooled = SweepRunner(btc_data, windows=windows, workers=2).run(params)
+
+        assert len(serial) == len(params) * len(windows)
+        assert _strip(serial) == _strip(pooled)
+
+    def test_checkpoint_resume(self, btc_data, tmp_path):
+        """A rerun only executes tasks missing from the checkpoint."""
+        checkpoint = tmp_path / "sweep.jsonl"
+        params = grid(self.SPACE)
+
+        first = SweepRunner(btc_data, checkpoint_path=checkpoint, workers=1).run(params[:2])
+        assert len(first) == 2
+
+        # Simulate a crash mid-write
+        with open(checkpoint, "a") as f:
+            f.write('{"key": "trunc')
+
+        calls = []
+        resumed = SweepRunner(btc_data, checkpoint_path=checkpoint, workers=1).run(
+            params, progress=lambda done, total: calls.append(done),
+        )
+        assert len(resumed) == len(params)
+        assert calls == [3, 4]
+        assert _strip(resumed[:2]) == _strip(first)
+
+    def test_checkpoint_ignores_other_datasets(self, btc_data, tmp_path):
+        checkpoint = tmp_path / "sweep.jsonl"
+        SweepRunner(btc_data, checkpoint_path=checkpoint, workers=1).run([{}])
+        shorter = {"BTC": btc_data["BTC"][:-10]}
+        assert SweepRunner(shorter, checkpoint_path=checkpoint, workers=1).load_checkpoint() == {}
+
+    def test_unknown_parameter_fails_fast(self, btc_data):
+        with pytest.raises(ValueError):
+            SweepRunner(btc_data, workers=1).run([{"not_a_field": 1}])
+
+
+@pytest.mark.unit
+class TestRanking:
+
+    @staticmethod
+    def _record(params, window, sharpe, dd, trades, train=None):
+        record = {
+            "strategy": "swing",
+            "params": params,
+            "window": {"index": window},
+            "test": {"sharpe_ratio": sharpe, "max_drawdown_pct": dd,
+                     "total_trades": trades, "total_return_pct": 1.0},
+        }
+        if train is not None:
+            record["train"] = {"sharpe_ratio": train}
+        return record
+
+    def test_rank_order_and_aggregation(self):
+        records = [
+            self._record({"a": 1}, 0, 1.0, 10.0, 5, train=2.0),
+            self._record({"a": 1}, 1, 0.0, 20.0, 3, train=1.0),
+            self._record({"a": 2}, 0, 0.5, 5.0, 4),
+            self._record({"a": 2}, 1, 0.5, 6.0, 4),
+            self._record({"a": 3}, 0, 0.5, 8.0, 9),
+            self._record({"a": 3}, 1, 0.5, 8.0, 9),
+            {"strategy": "swing", "params": {"a": 4}, "window": {"index": 0}, "error": "boom"},
+        ]
+        rows = rank_results(records)
+
+        # Ties on Sharpe break on drawdown, then on trade count
+        assert [r.params["a"] for r in rows] == [2, 3, 1]
+        assert rows[2].max_drawdown_pct == 20.0
+        assert rows[2].total_trades == 8
+        assert rows[2].train_sharpe_ratio == 1.5
+        assert "3 parameter sets ranked" in format_sweep_table(rows)
+
+    def test_checkpoint_records_are_json(self, btc_data, tmp_path):
+        checkpoint = tmp_path / "sweep.jsonl"
+        SweepRunner(btc_data, checkpoint_path=checkpoint, workers=1).run([{"fee_rate": 0.002}])
+        record = json.loads(checkpoint.read_text().splitlines()[0])
+        assert record["params"] == {"fee_rate": 0.002}
+        assert "sharpe_ratio" in record["test"]
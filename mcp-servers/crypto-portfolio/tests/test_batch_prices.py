@@ -0,0 +1,197 @@
+"""
+Batch Ticker Pricing Tests
+==========================
+
+Validates ExchangeClient.get_all_prices against the mock exchanges:
+- Clients with a batch ticker endpoint price everything in one round trip
+- Clients without one fan out with bounded concurrency
+- A failing batch falls back to per-asset fetches
+- Prices are shared across clients through the (exchange, asset) cache
+- Round trips and wall time: serial vs fan-out vs batch vs cached
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, List
+
+import pytest
+
+from exchanges.base import ExchangeClient, TickerCache, get_ticker_cache
+from exchanges.kraken_client import KrakenClient
+from exchanges.mock import MockExchangeFactory
+
+ASSETS = ["BTC", "ETH", "SOL", "AVAX", "MATIC", "LINK", "UNI", "AAVE",
+          "ATOM", "DOT", "ADA", "XRP", "DOGE", "SHIB", "FIL", "NEAR",
+          "ALGO", "HBAR", "ICP", "APT", "ARB", "OP", "INJ", "TIA"]
+
+
+class MockTickerClient(ExchangeClient):
+    """ExchangeClient pricing from a mock exchange; only the market data path is used."""
+
+    def __init__(self, exchange="coinbase", batch=True, fail_batch=False, latency_ms=(20, 20)):
+        self.mock = MockExchangeFactory.create(exchange, latency_ms=latency_ms, seed=1)
+        self.name = f"mock_{exchange}"
+        self.supports_batch_tickers = batch
+        self.fail_batch = fail_batch
+        self.active = 0
+        self.peak = 0
+
+    async def get_ticker_price(self, asset: str) -> Decimal:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if asset == "UNLISTED":
+                raise ValueError("Could not get price for UNLISTED")
+            return await self.mock.get_price(f"{asset}-USD")
+        finally:
+            self.active -= 1
+
+    async def _fetch_ticker_batch(self, assets: List[str]) -> Dict[str, Decimal]:
+        if self.fail_batch:
+            raise ConnectionError("batch endpoint down")
+        prices = await self.mock.get_prices([f"{a}-USD" for a in assets if a != "UNLISTED"])
+        return {symbol.split("-")[0]: price for symbol, price in prices.items()}
+
+    async def get_balances(self):
+        return {}
+
+    async def get_staking_rewards(self, start_date=None, end_date=None):
+        return []
+
+    async def get_trade_history(self, start_date=None, end_date=None, asset=None):
+        return []
+
+    async def place_market_order(self, asset, side, amount=None, quote_amount=None):
+        raise NotImplementedError
+
+    async def stake(self, asset, amount):
+        return False
+
+    async def unstake(self, asset, amount):
+        return False
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    get_ticker_cache().clear()
+    yield
+    get_ticker_cache().clear()
+
+
+@pytest.mark.unit
+class TestBatchPrices:
+
+    async def test_batch_endpoint_single_round_trip(self):
+        client = MockTickerClient()
+        prices = await client.get_all_prices(ASSETS)
+        assert set(prices) == set(ASSETS)
+        assert client.mock.request_count == 1
+
+    async def test_fan_out_is_bounded(self):
+        client = MockTickerClient(batch=False)
+        client.price_concurrency = 4
+        prices = await client.get_all_prices(ASSETS + ["UNLISTED"])
+        assert set(prices) == set(ASSETS)          # Unpriceable asset left out
+        assert client.mock.request_count == len(ASSETS)
+        assert client.peak == 4
+
+    async def test_failed_batch_falls_back(self):
+        client = MockTickerClient(fail_batch=True)
+        prices = await client.get_all_prices(ASSETS[:5])
+        assert set(prices) == set(ASSETS[:5])
+        assert client.mock.request_count == 5
+
+    async def test_client_without_batch_endpoint_falls_back(self):
+        client = MockTickerClient()
+        client._fetch_ticker_batch = ExchangeClient._fetch_ticker_batch.__get__(client)
+        prices = await client.get_all_prices(ASSETS[:5])
+        assert set(prices) == set(ASSETS[:5])
+        assert client.mock.request_count == 5
+
+    async def test_cache_shared_by_exchange_and_asset(self):
+        first, second = MockTickerClient(), MockTickerClient()
+        other = MockTickerClient(exchange="kraken")
+
+        prices = await first.get_all_prices(ASSETS[:6])
+        assert await second.get_all_prices(ASSETS[:3]) == {a: prices[a] for a in ASSETS[:3]}
+        assert second.mock.request_count == 0      # Same exchange: served from cache
+
+        await second.get_all_prices(ASSETS[:8])     # Only the 2 new assets are fetched
+        assert second.mock.request_count == 1
+        await other.get_all_prices(ASSETS[:6])      # Different exchange: own prices
+        assert other.mock.request_count == 1
+
+    async def test_kraken_batch_skips_pairs_missing_from_asset_pairs(self):
+        asset_pairs = {
+            "XXBTZUSD": {"wsname": "XBT/USD"},
+            "XETHZUSD": {"wsname": "ETH/USD"},
+            "XETHZEUR": {"wsname": "ETH/EUR"},
+            "XETHUSDT": {"wsname": "ETH/USDT"},
+            "TRXUSDT": {"wsname": "TRX/USDT"},
+        }
+        requests = []
+
+        async def fake_request(method, path, data=None, private=False):
+            requests.append((path, data))
+            if path.endswith("AssetPairs"):
+                return asset_pairs
+            pairs = data["pair"].split(",")
+            assert set(pairs) <= set(asset_pairs)   # Kraken rejects unknown pairs
+            return {pair: {"c": ["100.5", "1"]} for pair in pairs}
+
+        client = KrakenClient("key", "c2VjcmV0")
+        client._request = fake_request
+        prices = await client.get_all_prices(["BTC", "ETH", "TRX", "USD", "EUR", "UNLISTED"])
+
+        # USD pairs are preferred; USDT-only assets use their USDT pair
+        assert prices == {"BTC": Decimal("100.5"), "ETH": Decimal("100.5"), "TRX": Decimal("100.5")}
+        assert requests[-1] == ("/0/public/Ticker", {"pair": "XXBTZUSD,XETHZUSD,TRXUSDT"})
+
+        get_ticker_cache().clear()
+        await client.get_all_prices(["BTC"])
+        assert sum(path.endswith("AssetPairs") for path, _ in requests) == 1
+
+    def test_cache_expires(self):
+        cache = TickerCache(ttl=0)
+        cache.set_many("x", {"BTC": Decimal("1")})
+        time.sleep(0.001)
+        assert cache.get_many("x", ["BTC"]) == {}
+
+
+@pytest.mark.stress
+class TestBatchPriceBenchmark:
+
+    async def test_round_trips_and_wall_time(self):
+        """24 assets on each of the 4 mock exchanges, 20ms per round trip."""
+        exchanges = list(MockExchangeFactory.EXCHANGES)
+
+        async def measure(label, batch, fetch):
+            get_ticker_cache().clear()
+            clients = [MockTickerClient(name, batch=batch) for name in exchanges]
+            start = time.perf_counter()
+            results = await asyncio.gather(*(fetch(c) for c in clients))
+            elapsed = time.perf_counter() - start
+            trips = sum(c.mock.request_count for c in clients)
+            print(f"[PERF] {label:<10} {trips:>4} round trips  {elapsed * 1000:7.1f}ms")
+            assert all(set(r) == set(ASSETS) for r in results)
+            return clients, trips, elapsed
+
+        async def serial(client):
+            # Previous default: one awaited get_ticker_price per asset
+            return {a: await client.get_ticker_price(a) for a in ASSETS}
+
+        print()
+        _, serial_trips, serial_time = await measure("serial", False, serial)
+        _, fan_trips, fan_time = await measure("fan-out", False, lambda c: c.get_all_prices(ASSETS))
+        clients, batch_trips, batch_time = await measure("batch", True, lambda c: c.get_all_prices(ASSETS))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(c.get_all_prices(ASSETS) for c in clients))
+        cached_time = time.perf_counter() - start
+        print(f"[PERF] {'cached':<10} {0:>4} round trips  {cached_time * 1000:7.1f}ms")
+
+        assert serial_trips == fan_trips == len(exchanges) * len(ASSETS)
+        assert batch_trips == len(exchanges)
+        assert batch_time < fan_time < serial_time
+        assert sum(c.mock.request_count for c in clients) == batch_trips
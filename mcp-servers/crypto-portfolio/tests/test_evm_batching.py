@@ -0,0 +1,291 @@
+"""
+EVM RPC Batching Tests
+======================
+
+Runs EVMWalletTracker against a local mock JSON-RPC server:
+- aggregate3 calldata round-trips through an independent decoder
+- One wallet costs one HTTP request per chain (native + Multicall3 batched)
+- Many wallets share the same per-chain batches
+- Endpoints that reject batches fall back to single calls
+- A failing call doesn't fail the rest of its batch
+- Discovered token metadata is cached on disk
+- Request count and latency vs one request per call
+"""
+
+import asyncio
+import dataclasses
+import time
+from decimal import Decimal
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from wallets.evm_wallet import (
+    CHAINS,
+    MULTICALL3_ADDRESS,
+    TRACKED_TOKENS,
+    EVMWalletTracker,
+    TokenMetadataCache,
+    balance_of_data,
+    decode_aggregate3,
+    encode_aggregate3,
+)
+
+TEST_CHAINS = ["ethereum", "polygon", "base"]
+
+
+def _words(raw: bytes, pos: int) -> int:
+    return int.from_bytes(raw[pos:pos + 32], "big")
+
+
+def parse_aggregate3(data: str):
+    """Independent decoder for aggregate3 calldata -> [(target, calldata bytes)]."""
+    raw = bytes.fromhex(data[10:])
+    array = _words(raw, 0)
+    count = _words(raw, array)
+    start = array + 32
+    calls = []
+    for i in range(count):
+        item = start + _words(raw, start + 32 * i)
+        target = "0x" + raw[item + 12:item + 32].hex()
+        data_at = item + _words(raw, item + 64)
+        length = _words(raw, data_at)
+        calls.append((target, raw[data_at + 32:data_at + 32 + length]))
+    return calls
+
+
+def build_aggregate3_result(results):
+    """Encode [(success, bytes)] as aggregate3's return value."""
+    heads, tails, offset = [], [], 32 * len(results)
+    for success, returned in results:
+        padded = returned + b"\0" * (-len(returned) % 32)
+        item = (int(success).to_bytes(32, "big") + (64).to_bytes(32, "big")
+                + len(returned).to_bytes(32, "big") + padded)
+        heads.append(offset.to_bytes(32, "big"))
+        tails.append(item)
+        offset += len(item)
+    body = (32).to_bytes(32, "big") + len(results).to_bytes(32, "big") + b"".join(heads) + b"".join(tails)
+    return "0x" + body.hex()
+
+
+class MockRPC:
+    """JSON-RPC node for several chains, one URL path per chain."""
+
+    def __init__(self, delay=0.0, batch=True):
+        self.delay = delay
+        self.batch = batch
+        self.requests = 0
+        self.calls = 0
+        self.native = {}        # (chain, address) -> wei
+        self.tokens = {}        # (chain, token, holder) -> raw units
+        self.failing_tokens = set()
+        self.discovered = {}    # (chain, holder) -> {contract: raw}
+        self.metadata = {}      # contract -> {symbol, decimals}
+        self.metadata_calls = 0
+
+    def answer(self, chain, request):
+        self.calls += 1
+        method, params = request["method"], request["params"]
+        reply = {"jsonrpc": "2.0", "id": request.get("id")}
+        if method == "eth_getBalance":
+            reply["result"] = hex(self.native.get((chain, params[0].lower()), 0))
+        elif method == "eth_call" and params[0]["to"].lower() == MULTICALL3_ADDRESS.lower():
+            results = []
+            for target, calldata in parse_aggregate3(params[0]["data"]):
+                holder = "0x" + calldata[16:36].hex()
+                if target in self.failing_tokens:
+                    results.append((False, b""))
+                else:
+                    amount = self.tokens.get((chain, target, holder), 0)
+                    results.append((True, amount.to_bytes(32, "big")))
+            reply["result"] = build_aggregate3_result(results)
+        elif method == "eth_call":
+            target = params[0]["to"].lower()
+            holder = "0x" + params[0]["data"][-40:]
+            if target in self.failing_tokens:
+                reply["error"] = {"code": -32000, "message": "execution reverted"}
+            else:
+                reply["result"] = hex(self.tokens.get((chain, target, holder), 0))
+        elif method == "alchemy_getTokenBalances":
+            found = self.discovered.get((chain, params[0].lower()), {})
+            reply["result"] = {"tokenBalances": [
+                {"contractAddress": c, "tokenBalance": hex(raw)} for c, raw in found.items()
+            ]}
+        elif method == "alchemy_getTokenMetadata":
+            self.metadata_calls += 1
+            reply["result"] = self.metadata.get(params[0], {})
+        else:
+            reply["error"] = {"code": -32601, "message": "method not found"}
+        return reply
+
+    async def handler(self, request):
+        self.requests += 1
+        body = await request.json()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        chain = request.match_info["chain"]
+        if isinstance(body, list):
+            if not self.batch:
+                return web.json_response({"jsonrpc": "2.0", "id": None,
+                                          "error": {"code": -32600, "message": "batch not supported"}})
+            return web.json_response([self.answer(chain, r) for r in body])
+        return web.json_response(self.answer(chain, body))
+
+
+@pytest.fixture
+async def rpc():
+    node = MockRPC()
+    app = web.Application()
+    app.router.add_post("/{chain}", node.handler)
+    server = TestServer(app)
+    await server.start_server()
+    node.urls = {chain: str(server.make_url(f"/{chain}")) for chain in CHAINS}
+    yield node
+    await server.close()
+
+
+def _address(i):
+    return f"0x{i + 1:040x}"
+
+
+def _fund(rpc, address, chains=TEST_CHAINS):
+    for chain in chains:
+        rpc.native[(chain, address)] = 2 * 10 ** 18
+        for token, (symbol, decimals) in list(TRACKED_TOKENS.get(chain, {}).items())[:2]:
+            rpc.tokens[(chain, token.lower(), address)] = 150 * 10 ** decimals
+
+
+def _tracker(rpc, addresses, tmp_path, chains=TEST_CHAINS, **kwargs):
+    return EVMWalletTracker(
+        addresses, chains=chains, rpc_urls=rpc.urls,
+        token_metadata_path=str(tmp_path / "token_metadata.json"), **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestAggregate3Encoding:
+
+    def test_round_trip(self):
+        calls = [(token, balance_of_data(_address(0))) for token in TRACKED_TOKENS["ethereum"]]
+        parsed = parse_aggregate3(encode_aggregate3(calls))
+        assert [t for t, _ in parsed] == [t.lower() for t, _ in calls]
+        assert all("0x" + data.hex() == c for (_, data), (_, c) in zip(parsed, calls))
+
+        results = [(True, (7).to_bytes(32, "big")), (False, b""), (True, b"\x01" * 40)]
+        assert decode_aggregate3(build_aggregate3_result(results)) == results
+
+
+@pytest.mark.unit
+class TestEVMBatching:
+
+    async def test_one_request_per_chain(self, rpc, tmp_path):
+        address = _address(0)
+        _fund(rpc, address)
+        tracker = _tracker(rpc, [address], tmp_path)
+
+        summary = await tracker.get_wallet_summary(address)
+        await tracker.close()
+
+        assert rpc.requests == len(TEST_CHAINS)
+        assert tracker.rpc_stats == {"http_requests": 3, "rpc_calls": 6}
+        assert summary.get_balance("ETH", "ethereum") == Decimal("2")
+        assert summary.get_balance("USDC", "ethereum") == Decimal("150")
+        assert summary.get_balance("MATIC") == Decimal("2")
+        assert len(summary.balances) == 3 * 3
+
+    async def test_wallets_share_batches(self, rpc, tmp_path):
+        addresses = [_address(i) for i in range(12)]
+        for address in addresses:
+            _fund(rpc, address)
+        tracker = _tracker(rpc, addresses, tmp_path)
+
+        summaries = await tracker.get_all_wallets_summary()
+        await tracker.close()
+
+        assert rpc.requests == len(TEST_CHAINS)
+        assert rpc.calls == 12 * 2 * len(TEST_CHAINS)
+        assert all(s.get_balance("ETH") == Decimal("4") for s in summaries.values())
+
+    async def test_batch_rejected_falls_back_to_single_calls(self, rpc, tmp_path):
+        rpc.batch = False
+        address = _address(0)
+        _fund(rpc, address)
+        tracker = _tracker(rpc, [address], tmp_path, chains=["ethereum"])
+
+        first = await tracker.get_wallet_summary(address)
+        requests_after_first = rpc.requests
+        await tracker.get_wallet_summary(address)
+        await tracker.close()
+
+        assert first.get_balance("USDC") == Decimal("150")
+        assert requests_after_first == 1 + 2         # rejected batch, then two singles
+        assert rpc.requests - requests_after_first == 2
+
+    async def test_failed_call_isolated(self, rpc, tmp_path, monkeypatch):
+        address = _address(0)
+        _fund(rpc, address)
+        failing = list(TRACKED_TOKENS["ethereum"])[0]
+        rpc.failing_tokens.add(failing.lower())
+        tracker = _tracker(rpc, [address], tmp_path, chains=["ethereum"])
+
+        summary = await tracker.get_wallet_summary(address)
+        assert summary.get_balance("USDC") == Decimal("0")
+        assert summary.get_balance("USDT") == Decimal("150")
+        assert summary.get_balance("ETH") == Decimal("2")
+
+        # Without Multicall3 the same token fails on its own eth_call
+        monkeypatch.setitem(CHAINS, "ethereum", dataclasses.replace(CHAINS["ethereum"], multicall_address=None))
+        summary = await tracker.get_wallet_summary(address)
+        await tracker.close()
+        assert summary.get_balance("USDT") == Decimal("150")
+        assert summary.get_balance("USDC") == Decimal("0")
+
+    async def test_token_metadata_cached_on_disk(self, rpc, tmp_path):
+        address = _address(0)
+        contract = "0x" + "ab" * 20
+        rpc.discovered[("ethereum", address)] = {contract: 5 * 10 ** 9}
+        rpc.metadata[contract] = {"symbol": "NEW", "decimals": 9}
+
+        for _ in range(2):
+            tracker = _tracker(rpc, [address], tmp_path, chains=["ethereum"], alchemy_api_key="key")
+            summary = await tracker.get_wallet_summary(address)
+            await tracker.close()
+            assert summary.get_balance("NEW") == Decimal("5")
+
+        assert rpc.metadata_calls == 1
+        assert TokenMetadataCache(str(tmp_path / "token_metadata.json")).get("ethereum", contract) == ("NEW", 9)
+
+
+@pytest.mark.stress
+class TestBatchingBenchmark:
+
+    async def test_request_count_and_latency(self, rpc, tmp_path, monkeypatch):
+        """12 wallets over every chain, 10ms per HTTP round trip."""
+        rpc.delay = 0.01
+        chains = list(CHAINS)
+        addresses = [_address(i) for i in range(12)]
+        for address in addresses:
+            _fund(rpc, address, chains)
+
+        async def run(**kwargs):
+            rpc.requests = 0
+            tracker = _tracker(rpc, addresses, tmp_path, chains=chains, **kwargs)
+            start = time.perf_counter()
+            summaries = await tracker.get_all_wallets_summary()
+            elapsed = time.perf_counter() - start
+            await tracker.close()
+            return summaries, rpc.requests, elapsed
+
+        batched, batched_requests, batched_time = await run()
+
+        # Previous behaviour: one POST per call, one eth_call per token
+        for chain in chains:
+            monkeypatch.setitem(CHAINS, chain, dataclasses.replace(CHAINS[chain], multicall_address=None))
+        single, single_requests, single_time = await run(max_batch_size=1, batch_window=0)
+
+        print(f"\n[PERF] 12 wallets x {len(chains)} chains: batched {batched_requests} requests "
+              f"in {batched_time * 1000:.0f}ms vs {single_requests} requests in {single_time * 1000:.0f}ms")
+        assert batched_requests == len(chains)
+        assert single_requests == 12 * sum(1 + len(TRACKED_TOKENS.get(c, {})) for c in chains)
+        assert {a: s.total_by_symbol for a, s in batched.items()} == {a: s.total_by_symbol for a, s in single.items()}
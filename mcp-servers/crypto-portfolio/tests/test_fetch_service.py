@@ -0,0 +1,201 @@
+"""
+Fetch Service Tests
+===================
+
+Validates the shared upstream fetch layer against a local HTTP server:
+- Identical concurrent requests collapse into one upstream call
+- Fresh responses come from cache; stale ones are served while refreshing
+- Per-host concurrency limit is respected
+- Errors and non-200 responses are not cached
+- Analyzers share one service
+- Upstream calls for a many-asset fan-out
+"""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from agents.expanded_signals import ExpandedSignalsAnalyzer
+from agents.extended_signals import ExtendedSignalsAnalyzer
+from agents.market_signals import MarketSignalsAnalyzer
+from agents.ultra_signals import UltraSignalsAnalyzer
+from data.fetch import FetchService, TTLCache, get_fetch_service
+
+
+class Upstream:
+    """Local server recording hits and peak concurrency."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.hits = {}
+        self.active = 0
+        self.peak = 0
+        self.version = 0
+
+    async def handler(self, request):
+        key = request.path_qs
+        self.hits[key] = self.hits.get(key, 0) + 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if request.path == "/missing":
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response({"path": request.path, "query": dict(request.query), "version": self.version})
+
+    @property
+    def total(self):
+        return sum(self.hits.values())
+
+
+@pytest.fixture
+async def upstream():
+    state = Upstream()
+    app = web.Application()
+    app.router.add_route("GET", "/{tail:.*}", state.handler)
+    server = TestServer(app)
+    await server.start_server()
+    state.url = lambda path: str(server.make_url(path))
+    yield state
+    await server.close()
+
+
+@pytest.fixture
+async def service():
+    service = FetchService(ttl=60, stale_ttl=60)
+    yield service
+    await service.close()
+
+
+@pytest.mark.unit
+class TestFetchService:
+
+    async def test_concurrent_requests_coalesce(self, upstream, service):
+        url = upstream.url("/fng/")
+
+        async def call():
+            async with service.get(url, params={"limit": 7}) as resp:
+                return resp.status, await resp.json()
+
+        results = await asyncio.gather(*(call() for _ in range(20)))
+        assert upstream.total == 1
+        assert all(r == results[0] for r in results)
+        assert results[0] == (200, {"path": "/fng/", "query": {"limit": "7"}, "version": 0})
+
+        stats = service.stats()["endpoints"][url.split("//")[1]]
+        assert stats["requests"] == 20 and stats["upstream"] == 1 and stats["coalesced"] == 19
+
+    async def test_cache_hits_and_keys(self, upstream, service):
+        url = upstream.url("/global")
+        await service.fetch(url)
+        await service.fetch(url)
+        await service.fetch(url, params={"a": 1})
+        await service.fetch(url, params={"a": "1"})
+        assert upstream.hits == {"/global": 1, "/global?a=1": 1}
+        assert service.stats()["total"]["hit_rate"] == 0.5
+
+    async def test_stale_while_revalidate(self, upstream):
+        service = FetchService(ttl=0.05, stale_ttl=60)
+        url = upstream.url("/global")
+        assert (await (await service.fetch(url)).json())["version"] == 0
+
+        upstream.version = 1
+        await asyncio.sleep(0.06)
+        stale = await service.fetch(url)
+        assert (await stale.json())["version"] == 0        # Served immediately
+        await asyncio.sleep(upstream.delay * 3)             # Background refresh lands
+        assert (await (await service.fetch(url)).json())["version"] == 1
+        assert upstream.total == 2
+        assert service.stats()["total"]["stale_hits"] == 1
+        await service.close()
+
+    async def test_per_host_limit(self, upstream):
+        host = upstream.url("/").split("//")[1].rstrip("/")
+        service = FetchService(host_limits={host: 2})
+        await asyncio.gather(*(service.fetch(upstream.url(f"/coin/{i}")) for i in range(10)))
+        assert upstream.peak == 2
+        assert upstream.total == 10
+        await service.close()
+
+    async def test_failures_are_not_cached(self, upstream, service):
+        url = upstream.url("/missing")
+        for _ in range(2):
+            async with service.get(url) as resp:
+                assert resp.status == 404
+        assert upstream.total == 2
+
+        with pytest.raises(Exception):
+            await service.fetch("http://127.0.0.1:9/unreachable")
+        assert service.stats()["total"]["errors"] == 1
+
+    def test_ttl_cache_is_bounded(self):
+        cache = TTLCache(maxsize=3, ttl=60)
+        for i in range(5):
+            cache.set(i, i)
+        assert len(cache) == 3 and 0 not in cache and cache.get(4) == 4
+
+        expiring = TTLCache(ttl=0)
+        expiring.set("k", 1)
+        time.sleep(0.001)
+        assert expiring.get("k") is None and expiring.peek("k")[0] == 1
+
+    async def test_analyzers_share_one_service(self):
+        sessions = [
+            await ExtendedSignalsAnalyzer()._get_session(),
+            await UltraSignalsAnalyzer()._get_session(),
+            await MarketSignalsAnalyzer()._get_session(),
+        ]
+        assert all(s is get_fetch_service() for s in sessions)
+
+    async def test_per_request_ssl_reaches_upstream(self, upstream, service, monkeypatch):
+        """An analyzer's ssl override goes through the service to aiohttp."""
+        session = service._get_session()
+        real_get = session.get
+        seen = []
+
+        def redirect(url, **kwargs):
+            seen.append(kwargs.get("ssl"))
+            return real_get(upstream.url("/altcoin-season-index"), **kwargs)
+
+        monkeypatch.setattr(session, "get", redirect)
+        monkeypatch.setattr(service, "_get_session", lambda: session)
+        analyzer = ExpandedSignalsAnalyzer()
+        monkeypatch.setattr(analyzer, "_get_session", lambda: _resolved(service))
+
+        result = await analyzer._get_altcoin_season_index()
+        assert result.details == {"altcoin_index": 50}
+        assert seen[0] is not None
+        # Without an override aiohttp keeps its default
+        await service.fetch(upstream.url("/global"))
+        assert seen[1] is None
+
+
+async def _resolved(value):
+    return value
+
+
+@pytest.mark.stress
+class TestFetchFanOut:
+
+    async def test_many_asset_fan_out(self, upstream, service):
+        """50 assets x (3 market-wide + 2 per-asset endpoints) from 3 analyzers each."""
+        assets = [f"A{i}" for i in range(50)]
+
+        async def analyzer(asset):
+            paths = ["/fng/", "/global", "/stablecoins", f"/coins/{asset}/market_chart", f"/oi/{asset}"]
+            for response in await asyncio.gather(*(service.fetch(upstream.url(p)) for p in paths)):
+                assert response.status == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(analyzer(a) for a in assets for _ in range(3)))
+        duration = time.perf_counter() - start
+
+        total = service.stats()["total"]
+        print(f"\n[PERF] fan-out over 50 assets: {total['requests']} requests, "
+              f"{total['upstream']} upstream, hit rate {total['hit_rate']:.0%}, {duration:.3f}s")
+        assert upstream.total == 3 + 2 * len(assets)
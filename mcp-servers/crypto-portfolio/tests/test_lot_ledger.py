@@ -0,0 +1,306 @@
+"""
+Lot Ledger Tests
+================
+
+Validates the shared lot ledger and the trackers built on it:
+- FIFO/LIFO/HIFO/specific-ID order matches a full re-sort per sale
+- Failed sales leave every lot untouched
+- Exhausted lots leave the indexes; back-dated lots slot in by date
+- CostBasisTracker, TransactionHistory and TaxCalculator share it
+- Replay of 100k synthetic trades
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from cost_basis import AccountingMethod, CostBasisTracker
+from data.storage import Database
+from lot_ledger import InsufficientLotsError, LotLedger
+from tracking import tax
+from tracking.tax import CostBasisMethod as TaxMethod, TaxCalculator
+from transaction_history import CostBasisMethod, Transaction, TransactionHistory
+
+START = datetime(2020, 1, 1)
+
+
+@dataclass
+class Lot:
+    lot_id: int
+    cost_per_unit: float
+    acquired: datetime
+    remaining: float
+
+
+def _reference(lots, quantity, method, lot_ids=None):
+    """The old approach: re-sort every lot of the asset for each sale."""
+    if method == "fifo":
+        ordered = sorted(lots, key=lambda x: x.acquired)
+    elif method == "lifo":
+        ordered = sorted(lots, key=lambda x: x.acquired, reverse=True)
+    elif method == "hifo":
+        ordered = sorted(sorted(lots, key=lambda x: x.acquired), key=lambda x: x.cost_per_unit, reverse=True)
+    else:
+        ordered = [lot for lot in sorted(lots, key=lambda x: x.acquired) if lot.lot_id in lot_ids]
+
+    selected = []
+    for lot in ordered:
+        if quantity <= 0:
+            break
+        if lot.remaining <= 0:
+            continue
+        take = min(lot.remaining, quantity)
+        selected.append((lot.lot_id, take))
+        quantity -= take
+    return selected
+
+
+def _trades(n, seed=0, buy_ratio=0.6):
+    """Synthetic DCA-style stream: mostly buys, sells of a few lots' worth."""
+    rng = random.Random(seed)
+    trades = []
+    for i in range(n):
+        when = START + timedelta(hours=i)
+        if rng.random() < buy_ratio:
+            trades.append(("buy", when, round(rng.uniform(0.1, 2.0), 4), round(rng.uniform(100, 200), 2)))
+        else:
+            trades.append(("sell", when, round(rng.uniform(0.1, 3.0), 4), round(rng.uniform(100, 200), 2)))
+    return trades
+
+
+def _new_ledger():
+    return LotLedger(lot_id="lot_id", remaining="remaining", cost_per_unit="cost_per_unit", acquired="acquired")
+
+
+@pytest.mark.unit
+class TestLotLedger:
+
+    @pytest.mark.parametrize("method", ["fifo", "lifo", "hifo"])
+    def test_matches_full_resort(self, method):
+        ledger = _new_ledger()
+        reference = []
+        for i, (side, when, qty, price) in enumerate(_trades(3000, seed=1)):
+            if side == "buy":
+                # Round costs so HIFO has ties to break
+                ledger.add("BTC", Lot(i, round(price, -1), when, qty))
+                reference.append(Lot(i, round(price, -1), when, qty))
+                continue
+
+            expected = _reference(reference, qty, method)
+            selected = ledger.select("BTC", qty, method)
+            assert [(lot.lot_id, amount) for lot, amount in selected] == expected
+            ledger.deplete("BTC", selected)
+
+            by_id = {lot.lot_id: lot for lot in reference}
+            for lot_id, amount in expected:
+                by_id[lot_id].remaining -= amount
+
+        assert ledger.count("BTC") == sum(1 for lot in reference if lot.remaining > 0)
+
+    def test_methods_share_one_book(self):
+        ledger = _new_ledger()
+        for i, cost in enumerate([10.0, 30.0, 20.0, 40.0]):
+            ledger.add("ETH", Lot(i, cost, START + timedelta(days=i), 1.0))
+
+        ledger.consume("ETH", 1.0, "hifo")    # Lot 3
+        ledger.consume("ETH", 1.5, "fifo")    # Lot 0 and half of lot 1
+        ledger.consume("ETH", 0.5, "lifo")    # Lot 2, skipping exhausted lot 3
+        assert [(lot.lot_id, lot.remaining) for lot in ledger.open_lots("ETH")] == [(1, 0.5), (2, 0.5)]
+        assert ledger.open_lots("ETH", "hifo")[0].lot_id == 1
+
+    def test_specific_id(self):
+        ledger = _new_ledger()
+        for i in range(5):
+            ledger.add("SOL", Lot(i, 100.0 + i, START + timedelta(days=i), 2.0))
+
+        selected = ledger.consume("SOL", 3.0, "specific", lot_ids=[4, 1])
+        assert [(lot.lot_id, amount) for lot, amount in selected] == [(1, 2.0), (4, 1.0)]
+        assert ledger.get("SOL", 1) is None
+        with pytest.raises(ValueError):
+            ledger.select("SOL", 1.0, "specific")
+
+    def test_shortfall_leaves_lots_untouched(self):
+        ledger = _new_ledger()
+        lots = [Lot(i, 50.0, START + timedelta(days=i), 1.0) for i in range(3)]
+        ledger.extend("ADA", lots)
+
+        with pytest.raises(InsufficientLotsError) as exc:
+            ledger.consume("ADA", 3.5, "fifo")
+        assert exc.value.available == 3.0
+        assert [lot.remaining for lot in lots] == [1.0, 1.0, 1.0]
+
+    def test_back_dated_lot_and_compaction(self):
+        ledger = _new_ledger()
+        for i in range(1, 200):
+            ledger.add("DOT", Lot(i, 5.0, START + timedelta(days=i), 1.0))
+        ledger.add("DOT", Lot(0, 5.0, START, 1.0))
+        assert ledger.open_lots("DOT")[0].lot_id == 0
+
+        # Exhaust every other lot via specific ID, then the rest via HIFO
+        ledger.consume("DOT", 100.0, "specific", lot_ids=list(range(0, 200, 2)))
+        ledger.consume("DOT", 90.0, "hifo")
+        assert ledger.count("DOT") == 10
+        book = ledger._books["DOT"]
+        assert len(book.by_date) <= 2 * 10 + 32
+        assert len(book.by_cost) <= 2 * 10 + 32
+
+    def test_decimal_quantities_and_enums(self):
+        ledger = LotLedger(lot_id="id", remaining="remaining_amount",
+                           cost_per_unit="cost_per_unit", acquired="acquisition_date")
+        lot = tax.TaxLot(1, "BTC", Decimal("1"), Decimal("30000"), START, "dca", Decimal("1"))
+        ledger.add("BTC", lot)
+        ledger.consume("BTC", Decimal("0.4"), TaxMethod.FIFO)
+        assert lot.remaining_amount == Decimal("0.6")
+        assert ledger.open_lots("BTC", AccountingMethod.HIFO) == [lot]
+
+
+@pytest.mark.unit
+class TestCostBasisTracker:
+
+    @pytest.fixture
+    def tracker(self, tmp_path):
+        tracker = CostBasisTracker(str(tmp_path / "cost_basis.db"))
+        yield tracker
+        tracker.close()
+
+    def test_sales_deplete_database_and_ledger(self, tracker):
+        for i, price in enumerate([100.0, 300.0, 200.0]):
+            tracker.add_purchase("btc", 1.0, price, START + timedelta(days=i), "coinbase")
+
+        tracker.set_accounting_method(AccountingMethod.HIFO)
+        sale = tracker.record_sale("BTC", 1.5, 250.0, START + timedelta(days=400), "coinbase")
+        assert [lot["cost_per_unit"] for lot in sale.lots_used] == [300.0, 200.0]
+        assert sale.total_cost_basis == pytest.approx(400.0)
+        assert sale.is_long_term
+
+        # A purchase after the ledger is loaded joins it directly
+        tracker.add_purchase("BTC", 1.0, 500.0, START + timedelta(days=401), "coinbase")
+        tracker.set_accounting_method(AccountingMethod.FIFO)
+        tracker.record_sale("BTC", 1.0, 250.0, START + timedelta(days=402), "coinbase")
+
+        assert tracker.get_current_holdings()["BTC"]["quantity"] == pytest.approx(1.5)
+        assert tracker.get_current_holdings()["BTC"]["total_cost_basis"] == pytest.approx(600.0)
+
+        # A fresh tracker reloads the same state from SQLite
+        reopened = CostBasisTracker(tracker.db_path)
+        sale = reopened.record_sale("BTC", 1.5, 250.0, START + timedelta(days=403), "coinbase")
+        assert sale.total_cost_basis == pytest.approx(600.0)
+        reopened.close()
+
+    def test_insufficient_lots_raise_before_writing(self, tracker):
+        tracker.add_purchase("ETH", 1.0, 2000.0, START, "kraken")
+        with pytest.raises(ValueError, match="Insufficient cost basis lots"):
+            tracker.record_sale("ETH", 2.0, 2500.0, START + timedelta(days=1), "kraken")
+        with pytest.raises(ValueError, match="No cost basis lots"):
+            tracker.record_sale("DOGE", 1.0, 0.1, START, "kraken")
+
+        assert tracker.get_realized_gains()["num_transactions"] == 0
+        assert tracker.get_current_holdings()["ETH"]["quantity"] == 1.0
+
+    def test_export_reads_lot_dates(self, tracker, tmp_path):
+        tracker.add_purchase("ETH", 1.0, 2000.0, START, "kraken")
+        tracker.record_sale("ETH", 1.0, 2500.0, START + timedelta(days=30), "kraken")
+        path = tmp_path / "gains.csv"
+        tracker.export_to_csv(str(path))
+        assert "2020-01-01" in path.read_text()
+
+
+@pytest.mark.unit
+class TestTransactionHistory:
+
+    @staticmethod
+    def _history(tmp_path, trades, method):
+        history = TransactionHistory(data_dir=str(tmp_path))
+        history.cost_basis_method = method
+        for i, (side, when, qty, price) in enumerate(trades):
+            history.transactions.append(Transaction(
+                id=f"T{i}", exchange="kraken", timestamp=when, type=side, asset="BTC",
+                amount=qty, price_usd=price, total_usd=qty * price, fee_usd=0.0,
+                fee_asset="USD", related_asset="USD", related_amount=qty * price,
+            ))
+        history.build_tax_lots()
+        history.calculate_realized_gains()
+        return history
+
+    def test_sale_only_uses_lots_acquired_before_it(self, tmp_path):
+        trades = [
+            ("buy", START, 1.0, 100.0),
+            ("sell", START + timedelta(days=1), 1.0, 150.0),
+            ("buy", START + timedelta(days=2), 1.0, 500.0),
+        ]
+        history = self._history(tmp_path, trades, CostBasisMethod.LIFO)
+        assert [g.cost_basis_usd for g in history.realized_gains] == [100.0]
+
+    def test_rerun_is_idempotent(self, tmp_path):
+        history = self._history(tmp_path, _trades(500, seed=3), CostBasisMethod.HIFO)
+        first = [(g.tax_lot_id, g.sell_amount) for g in history.realized_gains]
+        history.calculate_realized_gains()
+        assert [(g.tax_lot_id, g.sell_amount) for g in history.realized_gains] == first
+
+
+@pytest.mark.unit
+class TestTaxCalculator:
+
+    @pytest.fixture
+    def database(self, tmp_path, monkeypatch):
+        database = Database(str(tmp_path / "portfolio.db"))
+        monkeypatch.setattr(tax, "db", database)
+        return database
+
+    def test_gain_closes_lots_in_one_batch(self, database):
+        for i, cost in enumerate(["30000", "60000", "45000"]):
+            database.add_tax_lot("BTC", Decimal("1"), Decimal(cost), START + timedelta(days=i), "dca")
+
+        calculator = TaxCalculator(TaxMethod.HIFO)
+        gains = calculator.calculate_gain("BTC", Decimal("1.5"), Decimal("75000"), START + timedelta(days=10))
+        assert [g.cost_basis for g in gains] == [Decimal("60000"), Decimal("22500.0")]
+
+        # Lots added after the first sync are picked up incrementally
+        database.add_tax_lot("BTC", Decimal("2"), Decimal("20000"), START + timedelta(days=11), "dca")
+        lots = calculator.get_tax_lots("BTC")
+        assert [lot.remaining_amount for lot in lots] == [Decimal("1"), Decimal("0.5"), Decimal("2")]
+        assert [lot["remaining_amount"] for lot in database.get_open_tax_lots("BTC")] == [
+            Decimal("1"), Decimal("0.5"), Decimal("2"),
+        ]
+
+    def test_selection_does_not_modify_lots(self, database):
+        database.add_tax_lot("ETH", Decimal("2"), Decimal("4000"), START, "purchase")
+        calculator = TaxCalculator()
+        calculator.select_lots_for_sale("ETH", Decimal("1"))
+        assert calculator.get_tax_lots("ETH")[0].remaining_amount == Decimal("2")
+
+        with pytest.raises(ValueError, match="Insufficient ETH"):
+            calculator.select_lots_for_sale("ETH", Decimal("3"))
+
+
+@pytest.mark.stress
+class TestLedgerReplay:
+
+    def test_replay_100k_trades(self, tmp_path):
+        """100k DCA-style fills through the ledger and TransactionHistory."""
+        trades = _trades(100_000, seed=42, buy_ratio=0.7)
+
+        for method in ("fifo", "lifo", "hifo"):
+            ledger = _new_ledger()
+            start = time.perf_counter()
+            for i, (side, when, qty, price) in enumerate(trades):
+                if side == "buy":
+                    ledger.add("BTC", Lot(i, price, when, qty))
+                else:
+                    ledger.deplete("BTC", ledger.select("BTC", qty, method))
+            duration = time.perf_counter() - start
+            print(f"\n[PERF] {method} ledger replay of 100k trades: {duration:.3f}s, "
+                  f"{ledger.count('BTC')} open lots")
+            assert duration < 5.0
+
+        start = time.perf_counter()
+        history = TestTransactionHistory._history(tmp_path, trades, CostBasisMethod.HIFO)
+        duration = time.perf_counter() - start
+        print(f"[PERF] TransactionHistory HIFO replay of 100k trades: {duration:.3f}s, "
+              f"{len(history.realized_gains)} gains")
+        assert history.realized_gains
+        assert duration < 10.0
@@ -0,0 +1,225 @@
+"""
+OHLCV Store Tests
+=================
+
+Validates the local columnar candle store:
+- Round trip of candles through the column files
+- Append-only semantics and torn-write recovery
+- Zero-copy time-range slicing
+- Incremental sync fetches only missing ranges
+- BacktestEngine reads from the store without the network
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from agents.backtester import OHLCV, BacktestEngine, HistoricalDataProvider
+from agents.ohlcv_store import NUMPY_AVAILABLE, OHLCVStore
+from agents.trading_agent import SwingStrategy, TradingConfig
+
+DAY = timedelta(days=1)
+
+
+def _candles(start, count, step=DAY, price=100.0):
+    candles = []
+    for i in range(count):
+        close = price + i * 0.5
+        candles.append(OHLCV(
+            timestamp=start + step * i,
+            open=Decimal(str(close - 0.25)),
+            high=Decimal(str(close + 1)),
+            low=Decimal(str(close - 1)),
+            close=Decimal(str(close)),
+            volume=Decimal("12345.5"),
+        ))
+    return candles
+
+
+class FakeProvider:
+    """Serves daily candles ending yesterday and records each request."""
+
+    def __init__(self, days_available=400):
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        # Last point is the still-forming "now" price, like CoinGecko
+        self.history = _candles(today - DAY * days_available, days_available)
+        self.history.append(_candles(datetime.now(timezone.utc), 1, price=999.0)[0])
+        self.requests = []
+
+    async def fetch_coingecko(self, asset, days=365, vs_currency="usd", interval=None):
+        self.requests.append((asset, days, interval))
+        cutoff = datetime.now(timezone.utc) - DAY * days
+        return [c for c in self.history if c.timestamp >= cutoff]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(tmp_path / "ohlcv")
+
+
+@pytest.mark.unit
+class TestOHLCVStore:
+
+    def test_round_trip(self, store):
+        candles = _candles(datetime(2023, 1, 1, tzinfo=timezone.utc), 30)
+        assert store.append("btc", "1d", candles) == 30
+
+        frame = store.read("BTC", "1d")
+        assert len(frame) == 30
+        assert frame.to_candles() == candles
+        assert frame.start == candles[0].timestamp
+        assert store.series() == [("BTC", "1d")]
+
+    def test_naive_timestamps_round_trip(self, store):
+        candles = _candles(datetime(2023, 1, 1), 5)
+        store.append("ETH", "1d", candles)
+        assert [c.timestamp for c in store.read("ETH").to_candles()] == [c.timestamp for c in candles]
+
+    def test_append_only_skips_old_and_duplicate_rows(self, store):
+        candles = _candles(datetime(2023, 1, 1, tzinfo=timezone.utc), 20)
+        store.append("BTC", "1d", candles[:15])
+        assert store.append("BTC", "1d", candles[10:]) == 5
+        assert store.append("BTC", "1d", candles[:5]) == 0
+        assert store.read("BTC").to_candles() == candles
+
+    def test_torn_append_is_trimmed(self, store):
+        candles = _candles(datetime(2023, 1, 1, tzinfo=timezone.utc), 10)
+        store.append("BTC", "1d", candles[:8])
+
+        # Crash after writing only the timestamp column of the next row
+        with open(store.root / "BTC" / "1d" / "timestamp.bin", "ab") as f:
+            f.write(b"\x00" * 8)
+        assert store.count("BTC") == 8
+
+        store.append("BTC", "1d", candles[8:])
+        assert store.read("BTC").to_candles() == candles
+
+    def test_time_slice_is_zero_copy(self, store):
+        start = datetime(2022, 1, 1, tzinfo=timezone.utc)
+        store.append("BTC", "1d", _candles(start, 365))
+
+        frame = store.read("BTC")
+        window = frame.between(start + DAY * 100, start + DAY * 130)
+        assert len(window) == 30
+        assert window.start == start + DAY * 100
+        assert window.closes.obj is frame.closes.obj  # Same underlying mapping
+        assert len(store.read("BTC", start=start + DAY * 360)) == 5
+        assert len(frame.tail(7)) == 7
+
+    @pytest.mark.skipif(not NUMPY_AVAILABLE, reason="numpy not installed")
+    def test_numpy_views(self, store):
+        store.append("BTC", "1d", _candles(datetime(2022, 1, 1, tzinfo=timezone.utc), 50))
+        arrays = store.read("BTC").iloc(10, 20).to_numpy()
+        assert arrays["close"].tolist() == [105.0 + 0.5 * i for i in range(10)]
+        assert not arrays["close"].flags.writeable
+
+    def test_empty_series(self, store):
+        assert len(store.read("BTC")) == 0
+        assert store.last_timestamp("BTC") is None
+
+    def test_unknown_interval(self, store):
+        with pytest.raises(ValueError):
+            store.read("BTC", "5m")
+
+    def test_import_csv(self, store, tmp_path):
+        path = tmp_path / "btc.csv"
+        path.write_text(
+            "date,open,high,low,close,volume\n"
+            "2023-01-02,101,102,100,101.5,10\n"
+            "2023-01-01,100,101,99,100.5,10\n"
+            "garbage,1,1,1,1,1\n"
+        )
+        assert store.import_csv(str(path), "BTC") == 2
+        frame = store.read("BTC")
+        assert list(frame.closes) == [100.5, 101.5]
+
+
+@pytest.mark.unit
+class TestIncrementalSync:
+
+    async def test_sync_fetches_only_missing_range(self, store):
+        provider = FakeProvider()
+        assert await store.sync(provider, "BTC", "1d", days=365) > 300
+        assert provider.requests[-1] == ("BTC", 365, "daily")
+
+        # The forming candle is never stored
+        assert store.read("BTC").closes[-1] != 999.0
+
+        # Current store: no request at all
+        assert await store.sync(provider, "BTC", "1d", days=365) == 0
+        assert len(provider.requests) == 1
+
+    async def test_sync_after_gap(self, store):
+        provider = FakeProvider()
+        store.append("BTC", "1d", provider.history[:-11])
+
+        added = await store.sync(provider, "BTC", "1d", days=365)
+        assert added == 10
+        assert provider.requests[-1][1] <= 13  # Gap plus one day of overlap
+
+    async def test_longer_request_backfills_head(self, store):
+        provider = FakeProvider()
+        await store.sync(provider, "BTC", "1d", days=100)
+        short = store.count("BTC")
+
+        added = await store.sync(provider, "BTC", "1d", days=300)
+        assert added >= 199
+        assert provider.requests[-1] == ("BTC", 300, "daily")
+        frame = store.read("BTC")
+        assert store.count("BTC") == short + added
+        assert list(frame.timestamps) == sorted(set(frame.timestamps))
+        assert frame.start <= datetime.now(timezone.utc) - DAY * 299
+
+        # Covered now: no further request
+        assert await store.sync(provider, "BTC", "1d", days=300) == 0
+        assert len(provider.requests) == 2
+
+    async def test_short_source_history_is_not_refetched(self, store):
+        provider = FakeProvider(days_available=150)
+        await store.sync(provider, "BTC", "1d", days=300)
+        assert await store.sync(provider, "BTC", "1d", days=300) == 0
+        assert len(provider.requests) == 1
+
+    async def test_interval_follows_requested_days(self, store):
+        provider = FakeProvider()
+        await store.history(provider, "BTC", days=30)
+        await store.history(provider, "BTC", days=200)
+        assert [r[2] for r in provider.requests] == ["hourly", "daily"]
+        assert store.count("BTC", "1h") > 0
+
+    async def test_history_reads_from_disk(self, store):
+        provider = FakeProvider()
+        candles = await store.history(provider, "BTC", days=100)
+        assert 99 <= len(candles) <= 101
+        assert candles == (await store.history(provider, "BTC", days=100))
+        assert len(provider.requests) == 1
+
+
+@pytest.mark.unit
+class TestBacktestFromStore:
+
+    async def test_engine_runs_offline(self, store):
+        random.seed(5)
+        candles = HistoricalDataProvider().generate_synthetic("BTC", Decimal("40000"), days=300)
+        # Shift so the newest candle is closed (yesterday) and no sync is needed
+        shift = datetime.now(timezone.utc) - DAY - candles[-1].timestamp
+        for c in candles:
+            c.timestamp += shift
+        store.append("BTC", "1d", candles)
+
+        engine = BacktestEngine(store=store)
+
+        async def offline(*args, **kwargs):
+            raise AssertionError("network fetch attempted")
+
+        engine.data_provider.fetch_coingecko = offline
+        start = time.perf_counter()
+        result = await engine.run(SwingStrategy(TradingConfig()), assets=["BTC"], days=250)
+        await engine.close()
+
+        assert result.start_date >= candles[0].timestamp
+        assert len(result.signal_history) > 150
+        print(f"\n[PERF] store-backed backtest: {time.perf_counter() - start:.3f}s")
@@ -0,0 +1,208 @@
+"""
+Portfolio Aggregator Tests
+==========================
+
+Validates the concurrent source fan-out:
+- Wallets are fetched concurrently, bounded per provider
+- A source past its deadline is reported, the rest still returned
+- Wallets and manual holdings share one CoinGecko call
+- Failing exchanges are reported with their timing
+- Wall time for many wallets vs the serial sum
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List
+
+import pytest
+
+from portfolio_aggregator import PortfolioAggregator
+
+
+@dataclass
+class Balance:
+    symbol: str
+    amount: Decimal
+    chain: str = "ethereum"
+
+
+@dataclass
+class Summary:
+    balances: List[Balance]
+    total_by_symbol: Dict[str, Decimal] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for bal in self.balances:
+            self.total_by_symbol[bal.symbol] = self.total_by_symbol.get(bal.symbol, 0) + bal.amount
+
+
+class FakeTracker:
+    """Wallet tracker with a per-call delay, recording peak concurrency."""
+
+    def __init__(self, delay=0.05, symbol="ETH", hang=()):
+        self.delay = delay
+        self.symbol = symbol
+        self.hang = set(hang)
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def get_wallet_summary(self, address, chain=None):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(3600 if address in self.hang else self.delay)
+        finally:
+            self.active -= 1
+        return Summary([Balance(self.symbol, Decimal("2"))])
+
+
+class FakeExchangeClient:
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def get_balances(self):
+        if self.fail:
+            raise ConnectionError("exchange down")
+        return {}
+
+
+@pytest.fixture
+def aggregator(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("CCXT_EXCHANGES", raising=False)
+    aggregator = PortfolioAggregator()
+    aggregator.price_calls = []
+
+    async def fake_prices(symbols):
+        aggregator.price_calls.append(sorted(symbols))
+        return {"ETH": 2000.0, "SOL": 100.0, "ATOM": 10.0, "XRP": 0.5}
+
+    aggregator._fetch_coingecko_prices = fake_prices
+    return aggregator
+
+
+def _evm_wallets(aggregator, count, **tracker_kwargs):
+    aggregator._evm_tracker = FakeTracker(**tracker_kwargs)
+    aggregator.wallets = {f"0x{i:040x}": {"label": f"evm-{i}"} for i in range(count)}
+    return aggregator._evm_tracker
+
+
+@pytest.mark.unit
+class TestWalletFanOut:
+
+    async def test_wallets_fetched_concurrently_within_provider_limit(self, aggregator):
+        aggregator.provider_limits["evm"] = 3
+        tracker = _evm_wallets(aggregator, 9, delay=0.1)
+
+        start = time.perf_counter()
+        results = await aggregator.get_all_wallet_summaries()
+        elapsed = time.perf_counter() - start
+
+        assert tracker.peak == 3
+        assert elapsed < 0.6                     # 3 waves of 0.1s, not 9
+        assert len(results) == 9
+        assert results["evm-0"]["total_value_usd"] == 4000.0
+        assert all(r["elapsed_ms"] > 0 for r in results.values())
+        assert aggregator.price_calls == [["ETH"]]
+
+    async def test_slow_source_times_out_without_blocking_others(self, aggregator):
+        aggregator.source_timeouts["solana"] = 0.1
+        _evm_wallets(aggregator, 2)
+        aggregator._solana_tracker = FakeTracker(symbol="SOL", hang={"slow"})
+        aggregator._solana_wallets = {"slow": {"label": "sol-slow"}, "fast": {"label": "sol-fast"}}
+
+        start = time.perf_counter()
+        results = await aggregator.get_all_wallet_summaries()
+        assert time.perf_counter() - start < 1.0
+
+        assert "timed out" in results["sol-slow"]["error"]
+        assert results["sol-slow"]["total_value_usd"] == 0
+        assert results["sol-fast"]["total_value_usd"] == 200.0
+        assert results["evm-1"]["total_value_usd"] == 4000.0
+
+
+    async def test_queued_sources_are_not_timed_out_waiting_for_a_slot(self, aggregator):
+        # Each fetch fits its deadline; the queue as a whole does not
+        aggregator.provider_limits["evm"] = 1
+        aggregator.source_timeouts["evm"] = 0.15
+        _evm_wallets(aggregator, 4, delay=0.1)
+
+        results = await aggregator.get_all_wallet_summaries()
+        assert all("error" not in r for r in results.values())
+        assert all(r["total_value_usd"] == 4000.0 for r in results.values())
+
+@pytest.mark.unit
+class TestCombinedPortfolio:
+
+    async def test_single_price_call_and_source_timings(self, aggregator):
+        _evm_wallets(aggregator, 2)
+        aggregator._cosmos_tracker = FakeTracker(symbol="ATOM-staked")
+        aggregator._cosmos_wallets = {"cosmos1": {"label": "hub", "chain": "cosmoshub"}}
+        aggregator.manual_holdings = {"ledger": {"label": "Ledger", "holdings": {"XRP": {"amount": 100}}}}
+        aggregator.exchanges = {
+            "good": {"name": "Good", "client": FakeExchangeClient(), "enabled": True},
+            "down": {"name": "Down", "client": FakeExchangeClient(fail=True), "enabled": True},
+        }
+
+        combined = await aggregator.get_combined_portfolio()
+
+        assert aggregator.price_calls == [["ATOM", "ETH", "XRP"]]
+        assert combined["wallets_total_usd"] == 2 * 4000.0 + 20.0
+        assert combined["manual_total_usd"] == 50.0
+        assert combined["exchanges"]["down"]["error"] == "exchange down"
+        assert combined["partial"] is True
+
+        statuses = {(t["source"], t["name"]): t["status"] for t in combined["source_timings"]}
+        assert statuses == {
+            ("exchange", "good"): "ok",
+            ("exchange", "down"): "error",
+            ("evm", "evm-0"): "ok",
+            ("evm", "evm-1"): "ok",
+            ("cosmos", "hub"): "ok",
+            ("prices", "coingecko"): "ok",
+        }
+
+    async def test_hung_exchange_reported_as_timeout(self, aggregator):
+        aggregator.source_timeouts["exchange"] = 0.05
+
+        class HungClient:
+            async def get_balances(self):
+                await asyncio.sleep(3600)
+
+        aggregator.exchanges = {"hung": {"name": "Hung", "client": HungClient(), "enabled": True}}
+        combined = await aggregator.get_combined_portfolio()
+
+        assert combined["exchanges"]["hung"]["error"].startswith("timed out")
+        assert combined["source_timings"][0]["status"] == "timeout"
+        assert combined["partial"] is True
+
+
+@pytest.mark.stress
+class TestFanOutLatency:
+
+    async def test_many_wallets_wall_time(self, aggregator):
+        """40 EVM + 10 Solana + 10 Cosmos wallets at 50ms each."""
+        evm = _evm_wallets(aggregator, 40, delay=0.05)
+        aggregator._solana_tracker = FakeTracker(delay=0.05, symbol="SOL")
+        aggregator._solana_wallets = {f"sol{i}": {"label": f"sol-{i}"} for i in range(10)}
+        aggregator._cosmos_tracker = FakeTracker(delay=0.05, symbol="ATOM")
+        aggregator._cosmos_wallets = {
+            f"cosmos{i}": {"label": f"cosmos-{i}", "chain": ["cosmoshub", "osmosis"][i % 2]}
+            for i in range(10)
+        }
+
+        start = time.perf_counter()
+        combined = await aggregator.get_combined_portfolio()
+        elapsed = time.perf_counter() - start
+
+        slowest = max(t["elapsed_ms"] for t in combined["source_timings"])
+        print(f"\n[PERF] 60 wallets: {elapsed:.3f}s wall vs {0.05 * 60:.3f}s serial, "
+              f"slowest source {slowest:.0f}ms, peak evm concurrency {evm.peak}")
+        assert len(combined["wallets"]) == 60
+        assert not combined["partial"]
+        assert elapsed < 0.05 * 60 / 2
@@ -0,0 +1,218 @@
+"""
+Portfolio Optimization Tests
+============================
+
+Validates the matrix-based mean-variance engine:
+- Vectorized correlation matches the pairwise Pearson loop
+- Closed-form two-asset minimum variance
+- Solver beats the Monte Carlo search and respects weight limits
+- Equal risk contributions for risk parity
+- Deterministic, fast efficient frontier
+"""
+
+import math
+import time
+
+import pytest
+
+import portfolio_optimization
+from portfolio_optimization import (
+    AssetMetrics,
+    CorrelationMatrix,
+    MeanVarianceEngine,
+    PortfolioOptimizer,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _universe(n_assets, days=365, seed=0):
+    """Correlated daily returns with a common market factor."""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0, 0.02, (days, 1))
+    scale = rng.uniform(0.5, 1.5, n_assets)
+    returns = 0.6 * market + rng.normal(0.001, 0.03, (days, n_assets)) * scale
+    returns_data = {f"A{i}": returns[:, i].tolist() for i in range(n_assets)}
+
+    optimizer = PortfolioOptimizer()
+    metrics = {}
+    for asset, series in returns_data.items():
+        ann_return, ann_vol = optimizer.calculate_metrics(series)
+        metrics[asset] = AssetMetrics(asset, ann_return, ann_vol, 0.0, 0.3)
+    return metrics, CorrelationMatrix(returns_data)
+
+
+@pytest.mark.unit
+class TestCorrelationMatrix:
+
+    def test_vectorized_matches_pairwise(self):
+        _, corr = _universe(8)
+        matrix = corr.calculate()
+        for a in corr.assets:
+            for b in corr.assets:
+                if a != b:
+                    expected = corr._pearson_correlation(corr.returns[a], corr.returns[b])
+                    assert matrix[a][b] == pytest.approx(expected, abs=1e-12)
+            assert matrix[a][a] == 1.0
+
+    def test_constant_series_and_mixed_lengths(self):
+        corr = CorrelationMatrix({"A": [0.01] * 10, "B": [0.01 * i for i in range(10)]})
+        assert corr.calculate()["A"]["B"] == pytest.approx(0.0, abs=1e-12)
+
+        mixed = CorrelationMatrix({"A": [1.0, 2.0, 3.0, 4.0], "B": [2.0, 4.0, 6.5]})
+        assert mixed.as_array()[0, 1] == pytest.approx(mixed._pearson_correlation([1.0, 2.0, 3.0], [2.0, 4.0, 6.5]))
+
+
+@pytest.mark.unit
+class TestMeanVarianceEngine:
+
+    def test_two_asset_min_variance(self):
+        """Unconstrained two-asset minimum variance matches the closed form."""
+        s1, s2, rho = 0.6, 0.9, 0.3
+        cov = np.array([[s1 * s1, rho * s1 * s2], [rho * s1 * s2, s2 * s2]])
+        engine = MeanVarianceEngine(["A", "B"], [0.3, 0.5], cov, max_weight=1.0, min_weight=0.0)
+
+        w = engine.min_volatility()
+        expected = (s2 ** 2 - rho * s1 * s2) / (s1 ** 2 + s2 ** 2 - 2 * rho * s1 * s2)
+        assert w[0] == pytest.approx(expected, abs=1e-10)
+
+    def test_target_return_is_met_with_minimum_variance(self):
+        cov = np.diag([0.04, 0.09, 0.16])
+        engine = MeanVarianceEngine(["A", "B", "C"], [0.05, 0.10, 0.20], cov, max_weight=1.0, min_weight=0.0)
+
+        w = engine.min_volatility(target_return=0.12)
+        assert engine.mu @ w == pytest.approx(0.12, abs=1e-9)
+        # Unreachable targets report infeasibility
+        assert engine.min_volatility(target_return=0.25) is None
+
+    def test_batch_evaluation(self):
+        metrics, corr = _universe(5)
+        optimizer = PortfolioOptimizer()
+        engine = optimizer.engine(metrics, corr)
+
+        W = np.random.default_rng(1).dirichlet(np.ones(5), size=64)
+        rets, vols, sharpes = engine.evaluate(W)
+        for k in (0, 17, 63):
+            weights = dict(zip(engine.assets, W[k]))
+            ret, vol, sharpe = optimizer.calculate_portfolio_metrics(weights, metrics, corr)
+            assert rets[k] == pytest.approx(ret)
+            assert vols[k] == pytest.approx(vol)
+            assert sharpes[k] == pytest.approx(sharpe)
+
+    def test_risk_parity_equalizes_contributions(self):
+        metrics, corr = _universe(10)
+        engine = PortfolioOptimizer().engine(metrics, corr)
+        w = engine.risk_parity()
+        contributions = w * (engine.cov @ w)
+        assert contributions.max() / contributions.min() == pytest.approx(1.0, abs=1e-8)
+        assert w.sum() == pytest.approx(1.0)
+
+    def test_risk_parity_diagonal_is_inverse_vol(self):
+        vols = np.array([0.2, 0.5, 0.8])
+        engine = MeanVarianceEngine(["A", "B", "C"], [0.1, 0.1, 0.1], np.diag(vols ** 2))
+        w = engine.risk_parity()
+        assert w == pytest.approx((1 / vols) / (1 / vols).sum())
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_max_sharpe_dominates_dense_frontier(self, seed):
+        """No point on a fine lam grid beats the traced tangency portfolio."""
+        metrics, corr = _universe(8, seed=seed)
+        engine = PortfolioOptimizer().engine(metrics, corr)
+        ub = np.full(8, engine.max_weight)
+
+        w = engine._sharpe_path(ub)
+        grid = [engine._solve(lam * engine._lam_scale, ub)[0] for lam in np.logspace(-6, 6, 400)]
+        assert engine.evaluate(w)[2][0] >= engine.evaluate(np.array(grid))[2].max() - 1e-12
+        assert w.sum() == pytest.approx(1.0)
+        assert w.max() <= engine.max_weight + 1e-12
+
+    def test_max_sharpe_matches_closed_form_tangency(self):
+        """Without binding caps the tangency is proportional to C^-1 (mu - rf)."""
+        mu = np.array([0.05, 0.08, 0.12, 0.30])
+        cov = np.diag([0.01, 0.02, 0.04, 0.09])
+        engine = MeanVarianceEngine(
+            ["A", "B", "C", "D"], mu, cov, risk_free_rate=0.02, max_weight=1.0, min_weight=0.0,
+        )
+        raw = (mu - 0.02) / np.diag(cov)
+        assert engine.max_sharpe() == pytest.approx(raw / raw.sum(), abs=1e-10)
+
+    def test_indefinite_correlation_is_repaired(self):
+        corr = np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+        engine = MeanVarianceEngine(["A", "B", "C"], [0.1, 0.2, 0.3], corr * 0.25)
+        assert np.linalg.eigvalsh(engine.cov).min() > 0
+        assert engine.max_sharpe().sum() == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+class TestPortfolioOptimizer:
+
+    @pytest.fixture
+    def universe(self):
+        return _universe(12, seed=3)
+
+    def _check_limits(self, allocation, optimizer):
+        weights = list(allocation.weights.values())
+        assert sum(weights) == pytest.approx(1.0)
+        assert max(weights) <= optimizer.max_weight + 1e-9
+        assert min(weights) >= optimizer.min_weight - 1e-9
+
+    def test_beats_monte_carlo(self, universe, monkeypatch):
+        metrics, corr = universe
+        optimizer = PortfolioOptimizer()
+
+        sharpe = optimizer.optimize_sharpe(metrics, corr)
+        min_vol = optimizer.optimize_min_volatility(metrics, corr)
+        self._check_limits(sharpe, optimizer)
+        self._check_limits(min_vol, optimizer)
+
+        monkeypatch.setattr(portfolio_optimization, "NUMPY_AVAILABLE", False)
+        mc_sharpe = optimizer.optimize_sharpe(metrics, corr, iterations=3000, seed=1)
+        mc_vol = optimizer.optimize_min_volatility(metrics, corr, iterations=3000, seed=1)
+
+        assert sharpe.sharpe_ratio >= mc_sharpe.sharpe_ratio
+        assert min_vol.volatility <= mc_vol.volatility
+
+    def test_deterministic(self, universe):
+        metrics, corr = universe
+        optimizer = PortfolioOptimizer()
+        assert optimizer.optimize_sharpe(metrics, corr) == optimizer.optimize_sharpe(metrics, corr)
+
+    def test_fallback_seed_is_reproducible(self, universe, monkeypatch):
+        metrics, corr = universe
+        monkeypatch.setattr(portfolio_optimization, "NUMPY_AVAILABLE", False)
+        optimizer = PortfolioOptimizer()
+        a = optimizer.optimize_sharpe(metrics, corr, iterations=200, seed=4)
+        b = optimizer.optimize_sharpe(metrics, corr, iterations=200, seed=4)
+        assert a == b
+
+    def test_frontier_is_monotone(self, universe):
+        metrics, corr = universe
+        frontier = PortfolioOptimizer().calculate_efficient_frontier(metrics, corr, points=25)
+        assert len(frontier) > 5
+        points = sorted((p.expected_return, p.volatility) for p in frontier)
+        # Past the minimum-variance point, more return costs more risk
+        start = min(range(len(points)), key=lambda i: points[i][1])
+        tail = points[start:]
+        assert all(b[1] >= a[1] - 1e-9 for a, b in zip(tail, tail[1:]))
+
+    def test_risk_parity_uses_correlations(self, universe):
+        metrics, corr = universe
+        optimizer = PortfolioOptimizer()
+        with_corr = optimizer.risk_parity(metrics, corr)
+        naive = optimizer.risk_parity(metrics)
+        self._check_limits(with_corr, optimizer)
+        assert with_corr.weights != naive.weights
+
+    @pytest.mark.stress
+    def test_frontier_speed_50_assets(self):
+        metrics, corr = _universe(50, seed=7)
+        optimizer = PortfolioOptimizer()
+
+        start = time.perf_counter()
+        frontier = optimizer.calculate_efficient_frontier(metrics, corr, points=50)
+        duration = time.perf_counter() - start
+
+        print(f"\n[PERF] 50-asset frontier: {duration:.3f}s, {len(frontier)} points")
+        assert frontier
+        assert all(math.isfinite(p.volatility) for p in frontier)
+        assert duration < 1.0
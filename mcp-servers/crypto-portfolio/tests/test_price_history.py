@@ -0,0 +1,145 @@
+"""
+Price History Tests
+===================
+
+Validates batched price storage and the historical price cache:
+- save_prices writes many points in one transaction
+- get_prices_as_of matches per-timestamp get_price_at_time lookups
+- max_age treats stale points as missing
+- Missing dates are fetched as a few range requests, then served locally
+- Throughput of 10k as-of lookups
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from data.prices import HistoricalPriceCache, PriceService
+from data.storage import Database
+
+START = datetime(2022, 1, 1)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return Database(str(tmp_path / "portfolio.db"))
+
+
+def _daily(days, asset="BTC", start=START):
+    return [(asset, Decimal(str(20000 + i)), start + timedelta(days=i)) for i in range(days)]
+
+
+class FakeRange:
+    """Daily closes for any range, counting calls."""
+
+    def __init__(self, listed=START):
+        self.calls = []
+        self.listed = listed
+
+    async def __call__(self, asset, start, end):
+        self.calls.append((asset, start, end))
+        day = max(self.listed, start.replace(hour=0, minute=0, second=0, microsecond=0))
+        points = []
+        while day <= end:
+            points.append((day, Decimal(str((day - START).days + 100))))
+            day += timedelta(days=1)
+        return points
+
+
+@pytest.mark.unit
+class TestPriceStorage:
+
+    def test_as_of_matches_single_lookups(self, database):
+        assert database.save_prices(_daily(60)) == 60
+        database.save_prices(_daily(10, asset="ETH"))
+
+        rng = random.Random(0)
+        queries = [START + timedelta(hours=rng.randint(-48, 24 * 70)) for _ in range(200)]
+        expected = [database.get_price_at_time("BTC", ts) for ts in queries]
+        assert database.get_prices_as_of("BTC", queries) == expected
+        assert database.get_prices_as_of("BTC", []) == []
+
+    def test_duplicates_replace(self, database):
+        database.save_prices(_daily(3))
+        database.save_prices([("BTC", Decimal("1"), START)])
+        database.save_price("BTC", Decimal("2"), START + timedelta(days=1))
+        assert database.get_prices_as_of("BTC", [START, START + timedelta(days=1, hours=1)]) == [
+            Decimal("1"), Decimal("2"),
+        ]
+
+    def test_max_age(self, database):
+        database.save_prices([("SOL", Decimal("10"), START)])
+        prices = database.get_prices_as_of(
+            "SOL", [START + timedelta(hours=12), START + timedelta(days=3)], max_age=timedelta(days=1),
+        )
+        assert prices == [Decimal("10"), None]
+
+
+@pytest.mark.unit
+class TestHistoricalPriceCache:
+
+    async def test_missing_dates_fetched_as_ranges(self, database):
+        fetch = FakeRange()
+        cache = HistoricalPriceCache(fetch, database)
+        database.save_prices(_daily(30, start=START + timedelta(days=20)))  # Days 20-49 already stored
+
+        # Two clusters of missing days a year apart, plus days already stored
+        dates = [START + timedelta(days=d, hours=6) for d in list(range(0, 15)) + list(range(25, 40)) + [400, 410]]
+        prices = await cache.get_many("BTC", dates)
+
+        assert len(fetch.calls) == 2
+        assert prices[0] == Decimal("100")
+        assert prices[20] == Decimal("20010")     # Day 30, already stored
+        assert prices[-1] == Decimal("510")
+
+        # Everything is now local
+        assert await cache.get_many("BTC", dates) == prices
+        assert len(fetch.calls) == 2
+
+    async def test_ranges_without_data_are_not_refetched(self, database):
+        fetch = FakeRange(listed=START + timedelta(days=100))
+        cache = HistoricalPriceCache(fetch, database)
+        dates = [START + timedelta(days=d) for d in range(5)]
+
+        assert await cache.get_many("NEW", dates) == [None] * 5
+        assert await cache.get_many("NEW", dates) == [None] * 5
+        assert len(fetch.calls) == 1
+
+    async def test_price_service_uses_history(self, database):
+        service = PriceService(history_db=database)
+        fetch = FakeRange()
+        service.history.fetch_range = fetch
+
+        aware = datetime(2022, 1, 3, 12, tzinfo=timezone.utc)
+        assert await service.get_historical_price("BTC", aware) == Decimal("102")
+        assert await service.get_historical_prices("USDC", [aware, aware]) == [Decimal("1.0")] * 2
+        assert len(fetch.calls) == 1
+
+
+@pytest.mark.stress
+class TestPriceHistoryThroughput:
+
+    def test_10k_as_of_lookups(self, database):
+        start = time.perf_counter()
+        database.save_prices(
+            ("BTC", Decimal(str(20000 + i % 5000)), START + timedelta(hours=i)) for i in range(5 * 365 * 24)
+        )
+        print(f"\n[PERF] save_prices 43,800 hourly points: {time.perf_counter() - start:.3f}s")
+
+        rng = random.Random(1)
+        queries = [START + timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60)) for _ in range(10_000)]
+
+        start = time.perf_counter()
+        prices = database.get_prices_as_of("BTC", queries)
+        batched = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single = [database.get_price_at_time("BTC", ts) for ts in queries[:500]]
+        per_lookup = (time.perf_counter() - start) / 500
+
+        print(f"[PERF] 10k as-of lookups: {batched:.3f}s batched vs ~{per_lookup * 10_000:.3f}s one query each")
+        assert prices[:500] == single
+        assert batched < per_lookup * 10_000
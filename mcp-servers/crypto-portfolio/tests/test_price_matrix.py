@@ -0,0 +1,255 @@
+"""
+Price Matrix Tests
+==================
+
+Validates the shared (asset x exchange) price grid:
+- Exchanges are polled concurrently, one batch call each
+- A hung or failing exchange is cut off without losing the others
+- Cells older than max_age are left out of snapshots
+- Streamed cells are not re-polled; legacy sync clients still work
+- Alerts and arbitrage scans evaluate one snapshot
+- Each synchronous entry point closes client sessions with its event loop
+- Wall time and round trips vs the per-cell serial loop
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from arbitrage_detector import ArbitrageDetector
+from exchanges.base import get_ticker_cache
+from exchanges.kraken_client import KrakenClient
+from multi_alerts import MultiExchangeAlertMonitor
+from price_matrix import PriceMatrix
+
+ASSETS = ["BTC", "ETH", "SOL", "AVAX", "LINK", "DOT", "ADA", "XRP", "DOGE", "ATOM",
+          "NEAR", "UNI", "AAVE", "LTC", "FIL", "ALGO", "HBAR", "ARB", "OP", "SUI"]
+
+
+class FakeExchange:
+    """Async exchange client: batch get_all_prices plus per-asset get_ticker_price."""
+
+    def __init__(self, offset=0.0, delay=0.02, hang=False, fail=False):
+        self.offset = offset
+        self.delay = delay
+        self.hang = hang
+        self.fail = fail
+        self.calls = 0
+        self.requested = []
+
+    def _price(self, asset):
+        return Decimal(str(100 + ASSETS.index(asset) + self.offset))
+
+    async def get_ticker_price(self, asset):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self._price(asset)
+
+    async def get_all_prices(self, assets):
+        self.calls += 1
+        self.requested.append(list(assets))
+        if self.fail:
+            raise ConnectionError("exchange down")
+        await asyncio.sleep(3600 if self.hang else self.delay)
+        return {asset: self._price(asset) for asset in assets}
+
+
+class LegacyExchange:
+    """Synchronous client with only get_spot_price."""
+
+    def get_spot_price(self, asset, quote="USD"):
+        time.sleep(0.01)
+        return None if asset == "DOGE" else 50.0
+
+
+class FakeFeed:
+
+    def __init__(self):
+        self.callbacks = {}
+        self._stopped = asyncio.Event()
+
+    def subscribe(self, symbol, callback):
+        self.callbacks.setdefault(symbol, []).append(callback)
+
+    async def start(self):
+        await self._stopped.wait()
+
+    async def stop(self):
+        self._stopped.set()
+
+    def emit(self, exchange, symbol, price):
+        for callback in self.callbacks.get(symbol, []):
+            callback(SimpleNamespace(exchange=exchange, symbol=symbol, price=Decimal(str(price))))
+
+
+@pytest.mark.unit
+class TestPriceMatrix:
+
+    async def test_exchanges_polled_concurrently(self):
+        clients = {f"ex{i}": FakeExchange(offset=i, delay=0.1) for i in range(5)}
+        matrix = PriceMatrix(clients)
+
+        start = time.perf_counter()
+        snapshot = await matrix.refresh(ASSETS)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.3
+        assert all(c.calls == 1 for c in clients.values())
+        assert snapshot.prices("ETH") == {f"ex{i}": 101.0 + i for i in range(5)}
+        assert snapshot.age("ETH") < 1.0
+
+    async def test_hung_and_failing_exchanges_cut_off(self):
+        clients = {"ok": FakeExchange(), "hung": FakeExchange(hang=True), "down": FakeExchange(fail=True)}
+        matrix = PriceMatrix(clients, fetch_timeout=0.1)
+
+        start = time.perf_counter()
+        snapshot = await matrix.refresh(["BTC"])
+        assert time.perf_counter() - start < 1.0
+
+        assert snapshot.prices("BTC") == {"ok": 100.0}
+        assert matrix.stats["timeouts"] == 1
+        assert matrix.stats["errors"] == 1
+
+    def test_stale_cells_left_out(self):
+        matrix = PriceMatrix({}, max_age=30)
+        now = time.time()
+        matrix.update("BTC", "coinbase", 97000, timestamp=now - 5)
+        matrix.update("BTC", "kraken", 90000, timestamp=now - 120)
+
+        snapshot = matrix.snapshot(["BTC", "ETH"], now=now)
+        assert snapshot.prices("BTC") == {"coinbase": 97000.0}
+        assert snapshot.stale == [("BTC", "kraken")]
+        assert snapshot.age("BTC") == pytest.approx(5)
+        assert snapshot.as_dict() == {"BTC": {"coinbase": 97000.0}, "ETH": {}}
+
+        # Later updates don't change a snapshot already taken
+        matrix.update("BTC", "coinbase", 1)
+        assert snapshot.prices("BTC") == {"coinbase": 97000.0}
+
+    async def test_streamed_cells_not_polled(self):
+        feed = FakeFeed()
+        clients = {"coinbase": FakeExchange(), "kraken": FakeExchange()}
+        matrix = PriceMatrix(clients, price_feed=feed)
+        await matrix.start_feed(["BTC", "ETH"])
+
+        feed.emit("coinbase", "BTC-USD", 97000)
+        feed.emit("binance", "BTC-USD", 96000)   # No client for it: ignored
+        snapshot = await matrix.refresh(["BTC", "ETH"])
+        await matrix.stop_feed()
+
+        assert clients["coinbase"].requested == [["ETH"]]
+        assert clients["kraken"].requested == [["BTC", "ETH"]]
+        assert snapshot.cells["BTC"]["coinbase"].source == "feed"
+        assert snapshot.prices("BTC") == {"coinbase": 97000.0, "kraken": 100.0}
+
+    async def test_legacy_sync_client(self):
+        matrix = PriceMatrix({"legacy": LegacyExchange()})
+        snapshot = await matrix.refresh(["BTC", "ETH", "DOGE"])
+        assert snapshot.as_dict() == {"BTC": {"legacy": 50.0}, "ETH": {"legacy": 50.0}, "DOGE": {}}
+
+
+@pytest.fixture
+def no_exchange_env(monkeypatch, tmp_path):
+    for name in ("COINBASE", "KRAKEN", "CRYPTOCOM", "GEMINI"):
+        monkeypatch.delenv(f"{name}_API_KEY", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.mark.unit
+class TestConsumers:
+
+    async def test_alerts_evaluate_one_snapshot(self, no_exchange_env, tmp_path):
+        monitor = MultiExchangeAlertMonitor(config_dir=str(tmp_path), dry_run=True)
+        monitor.notifier = None
+        monitor.clients.update({"coinbase": FakeExchange(), "kraken": FakeExchange(offset=2)})
+        monitor.add_price_alert("ETH", "above", 101.5)
+        monitor.add_price_alert("SOL", "below", 50)
+        monitor.add_price_alert("ETH", "above", 101.5, exchange="coinbase")
+
+        snapshot = await monitor.refresh_prices()
+        events = monitor.evaluate_alerts(snapshot)
+
+        assert [e.current_price for e in events] == [102.0]     # average of 101 and 103
+        assert monitor.last_prices["ETH"] == {"coinbase": 101.0, "kraken": 103.0}
+        assert all(c.calls == 1 for c in monitor.clients.values())
+
+    async def test_monitor_keeps_cadence(self, no_exchange_env, tmp_path):
+        monitor = MultiExchangeAlertMonitor(config_dir=str(tmp_path), dry_run=True)
+        slow = FakeExchange(delay=0.05)
+        monitor.clients["coinbase"] = slow
+        monitor.add_price_alert("BTC", "above", 1e9)
+
+        task = asyncio.create_task(monitor.monitor(check_interval_seconds=0.1, use_feeds=False))
+        await asyncio.sleep(0.45)
+        monitor.running = False
+        await task
+        assert slow.calls == 5                     # Rounds at 0, 0.1 .. 0.4s: fetch time not added to the interval
+
+    async def test_arbitrage_skips_stale_quotes(self, no_exchange_env):
+        detector = ArbitrageDetector()
+        detector.clients.update({"coinbase": FakeExchange(), "kraken": FakeExchange()})
+        matrix = detector.price_matrix
+        now = time.time()
+        matrix.update("BTC", "coinbase", 100, timestamp=now - 1)
+        matrix.update("BTC", "kraken", 110, timestamp=now - 2)
+        matrix.update("BTC", "gemini", 150, timestamp=now - 60)   # Stale: would be a 50% spread
+
+        opportunities = await detector.scan(["BTC"], min_spread=0.5, snapshot=matrix.snapshot(["BTC"], now=now))
+
+        assert len(opportunities) == 1
+        assert opportunities[0]["sell_exchange"] == "kraken"
+        assert opportunities[0]["price_age_s"] == pytest.approx(2)
+
+
+    def test_repeated_runs_do_not_reuse_a_closed_loop(self, no_exchange_env):
+        detector = ArbitrageDetector()
+        kraken = KrakenClient("key", "c2VjcmV0")
+        detector.clients["kraken"] = kraken
+
+        async def fake_request(method, path, data=None, private=False):
+            session = await kraken._get_session()
+            assert session._loop is asyncio.get_running_loop()
+            if path.endswith("AssetPairs"):
+                return {"XXBTZUSD": {"wsname": "XBT/USD"}}
+            return {"XXBTZUSD": {"c": ["100.0", "1"]}}
+
+        kraken._request = fake_request
+        for _ in range(2):
+            get_ticker_cache().clear()
+            prices = asyncio.run(detector.price_matrix.closing(detector.get_prices(["BTC"])))
+            assert prices == {"BTC": {"kraken": 100.0}}
+            assert kraken._session.closed
+
+@pytest.mark.stress
+class TestPriceMatrixBenchmark:
+
+    async def test_matrix_vs_serial_loop(self):
+        """20 assets x 5 exchanges, 10ms per round trip."""
+        clients = {f"ex{i}": FakeExchange(offset=i, delay=0.01) for i in range(5)}
+
+        # Previous behaviour: one blocking lookup per (asset, exchange) cell
+        start = time.perf_counter()
+        serial = {}
+        for asset in ASSETS:
+            for name, client in clients.items():
+                serial.setdefault(asset, {})[name] = float(await client.get_ticker_price(asset))
+        serial_time = time.perf_counter() - start
+        serial_trips = sum(c.calls for c in clients.values())
+
+        for client in clients.values():
+            client.calls = 0
+        matrix = PriceMatrix(clients)
+        start = time.perf_counter()
+        snapshot = await matrix.refresh(ASSETS)
+        matrix_time = time.perf_counter() - start
+        matrix_trips = sum(c.calls for c in clients.values())
+
+        print(f"\n[PERF] 20 assets x 5 exchanges: serial {serial_trips} round trips in "
+              f"{serial_time * 1000:.0f}ms vs matrix {matrix_trips} in {matrix_time * 1000:.0f}ms, "
+              f"oldest cell {max(snapshot.age(a) for a in ASSETS) * 1000:.1f}ms")
+        assert snapshot.as_dict() == serial
+        assert matrix_trips == len(clients)
+        assert matrix_time < serial_time / 10
@@ -0,0 +1,265 @@
+"""
+Realtime PnL Streaming Tests
+============================
+
+Validates the streaming pipeline:
+- Incremental portfolio totals match a full recompute
+- Events are serialized once and shared across clients
+- Per-client outboxes conflate by key and drop oldest when full
+- A stalled client does not delay the others; a failing one is dropped
+- Feed ticks are conflated per asset
+- End-to-end latency with 1,000 simulated clients
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from decimal import Decimal
+
+import pytest
+
+from realtime_pnl import (
+    ClientChannel,
+    PnLTracker,
+    PriceFeedManager,
+    RealtimeStreamManager,
+    StreamEvent,
+    StreamEventType,
+    WEBSOCKET_FEEDS_AVAILABLE,
+)
+from websocket_feeds import PriceUpdate as FeedPriceUpdate
+
+
+class FakeFeed:
+    """Stands in for PriceFeedManager: same subscribe/start/stop surface."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self._stopped = asyncio.Event()
+
+    def subscribe(self, symbol, callback):
+        self.callbacks.setdefault(symbol, []).append(callback)
+
+    async def start(self):
+        await self._stopped.wait()
+
+    async def stop(self):
+        self._stopped.set()
+
+    def emit(self, symbol, price):
+        update = FeedPriceUpdate(symbol=symbol, price=Decimal(str(price)), exchange="fake")
+        for callback in self.callbacks.get(symbol, []):
+            callback(update)
+
+
+class FakeClient:
+    """Records what it receives; optionally slow, stalled or broken."""
+
+    def __init__(self, delay=0.0, stall=False, fail=False):
+        self.delay = delay
+        self.stall = stall
+        self.fail = fail
+        self.received = []
+
+    async def send(self, payload):
+        if self.fail:
+            raise ConnectionError("client went away")
+        if self.stall:
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append((time.perf_counter(), payload))
+
+    def messages(self):
+        return [json.loads(payload) for _, payload in self.received]
+
+
+HOLDINGS = {
+    "BTC": {"amount": "0.5", "cost_basis": "20000"},
+    "ETH": {"amount": "4", "cost_basis": "8000"},
+    "SOL": {"amount": "100", "cost_basis": "9000"},
+}
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.unit
+class TestPnLTracker:
+
+    def test_incremental_totals_match_full_recompute(self):
+        tracker = PnLTracker()
+        tracker.update_price("BTC", Decimal("40000"))
+        tracker.set_holdings(HOLDINGS)
+
+        rng = random.Random(7)
+        for _ in range(500):
+            asset = rng.choice(["BTC", "ETH", "SOL", "DOGE"])
+            tracker.update_price(asset, Decimal(str(round(rng.uniform(1, 50000), 2))))
+
+        expected_value = sum(
+            Decimal(h["amount"]) * tracker.prices.get(asset, Decimal("0"))
+            for asset, h in HOLDINGS.items()
+        )
+        expected_cost = sum(Decimal(h["cost_basis"]) for h in HOLDINGS.values())
+
+        totals = tracker.get_totals()
+        assert totals.asset is None
+        assert totals.current_value == expected_value
+        assert totals.unrealized_pnl == expected_value - expected_cost
+
+        snapshot = tracker.get_portfolio_snapshot()
+        assert snapshot.total_value == expected_value
+        assert set(snapshot.holdings) == set(HOLDINGS)
+
+    def test_unheld_asset_yields_no_update(self):
+        tracker = PnLTracker()
+        tracker.set_holdings(HOLDINGS)
+        assert tracker.update_price("DOGE", Decimal("0.1")) is None
+        update = tracker.update_price("ETH", Decimal("2500"))
+        assert update.current_value == Decimal("10000")
+        assert update.unrealized_pnl_pct == 25.0
+
+
+@pytest.mark.unit
+class TestClientChannel:
+
+    def test_event_serialized_once(self):
+        event = StreamEvent(StreamEventType.ALERT, {"message": "hi"})
+        assert event.to_json() is event.to_json()
+
+    def test_conflates_by_key_and_bounds_outbox(self):
+        channel = ClientChannel("c1", FakeClient(), {"all"}, max_pending=3)
+        for price in range(10):
+            channel.offer(f"btc {price}", key=("price", "BTC"))
+        assert list(channel.outbox.values()) == ["btc 9"]
+        assert channel.conflated == 9
+
+        for i in range(4):
+            channel.offer(f"alert {i}")
+        assert list(channel.outbox.values()) == ["alert 1", "alert 2", "alert 3"]
+        assert channel.dropped == 2
+
+
+@pytest.mark.unit
+class TestRealtimeStreamManager:
+
+    def test_default_source_is_websocket_feed(self):
+        manager = RealtimeStreamManager()
+        if WEBSOCKET_FEEDS_AVAILABLE:
+            assert isinstance(manager.price_feed, PriceFeedManager)
+
+    async def test_ticks_conflated_per_asset(self):
+        feed = FakeFeed()
+        manager = RealtimeStreamManager(price_feed=feed, snapshot_interval=60)
+        manager.set_holdings(HOLDINGS)
+        client = FakeClient()
+        manager.register_client("c1", client, ["price_update", "pnl_update"])
+        await manager.start(["BTC", "ETH"])
+
+        for price in range(40000, 40100):
+            feed.emit("BTC-USD", price)
+        feed.emit("ETH-USD", 2500)
+        await drain()
+        await manager.stop()
+
+        assert manager.stats()["ticks"] == 101
+        assert manager.stats()["rounds"] == 1
+        prices = [m["data"] for m in client.messages() if m["type"] == "price_update"]
+        assert {p["asset"]: p["price"] for p in prices} == {"BTC": "40099", "ETH": "2500"}
+        # Feed ticks have no 24h stats; no change is invented from the first tick
+        assert {(p["change_24h"], p["change_24h_pct"]) for p in prices} == {("0", 0.0)}
+        totals = [m["data"] for m in client.messages() if m["type"] == "pnl_update" and m["data"]["asset"] is None]
+        assert totals[-1]["current_value"] == str(Decimal("0.5") * 40099 + 4 * 2500)
+
+    async def test_stalled_client_does_not_block_others(self):
+        manager = RealtimeStreamManager(price_feed=FakeFeed(), snapshot_interval=60, max_pending=8)
+        stalled, fast, broken = FakeClient(stall=True), FakeClient(), FakeClient(fail=True)
+        manager.register_client("stalled", stalled)
+        manager.register_client("fast", fast)
+        manager.register_client("broken", broken)
+        await manager.start([])
+
+        for i in range(20):
+            manager.send_alert("test", f"alert {i}")
+            await drain()
+        await manager.stop()
+
+        assert len(fast.received) == 20
+        assert "broken" not in manager.clients
+        assert manager.clients["stalled"].dropped > 0
+        assert len(manager.clients["stalled"].outbox) == 8
+
+
+@pytest.mark.stress
+class TestStreamingLoad:
+
+    async def test_thousand_clients_latency(self):
+        """1,000 clients (5% slow, 1% stalled) receiving 5 assets ticking at ~100 Hz combined."""
+        feed = FakeFeed()
+        manager = RealtimeStreamManager(price_feed=feed, snapshot_interval=60)
+        manager.set_holdings({**HOLDINGS, "AVAX": {"amount": "10", "cost_basis": "300"},
+                              "MATIC": {"amount": "1000", "cost_basis": "800"}})
+        assets = ["BTC", "ETH", "SOL", "AVAX", "MATIC"]
+
+        clients = []
+        for i in range(1000):
+            if i % 100 == 0:
+                client = FakeClient(stall=True)
+            elif i % 20 == 0:
+                client = FakeClient(delay=0.05)
+            else:
+                client = FakeClient()
+            clients.append(client)
+            manager.register_client(f"c{i}", client, ["price_update", "pnl_update"])
+        await manager.start(assets)
+
+        emitted = {}
+        start = time.perf_counter()
+        for tick in range(300):
+            asset = assets[tick % len(assets)]
+            price = f"{1000 + tick}"
+            emitted[(asset, price)] = time.perf_counter()
+            feed.emit(f"{asset}-USD", price)
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        duration = time.perf_counter() - start
+        stats = manager.stats()
+        await manager.stop()
+
+        # Payloads are shared strings: parse each distinct one once
+        parsed = {}
+        latencies = []
+        for client in clients:
+            if client.stall or client.delay:
+                continue
+            for received_at, payload in client.received:
+                message = parsed.get(payload)
+                if message is None:
+                    message = parsed[payload] = json.loads(payload)
+                data = message["data"]
+                if message["type"] == "price_update":
+                    latencies.append(received_at - emitted[(data["asset"], data["price"])])
+
+        latencies.sort()
+        q = statistics.quantiles(latencies, n=100)
+        print(f"\n[PERF] 1,000 clients, {stats['ticks']} ticks in {duration:.2f}s: "
+              f"{stats['rounds']} rounds, {stats['sent']} sends, {stats['conflated']} conflated, "
+              f"{stats['dropped']} dropped; latency p50={q[49] * 1000:.1f}ms "
+              f"p95={q[94] * 1000:.1f}ms p99={q[98] * 1000:.1f}ms max={latencies[-1] * 1000:.1f}ms")
+
+        fast = [c for c in clients if not c.stall and not c.delay]
+        assert all(c.received for c in fast)
+        # Every fast client ends with the final price of each asset
+        last = {a: max(p for (asset, p) in emitted if asset == a) for a in assets}
+        final = {}
+        for _, payload in fast[0].received:
+            message = parsed[payload]
+            if message["type"] == "price_update":
+                final[message["data"]["asset"]] = message["data"]["price"]
+        assert final == last
+        assert q[49] < 1.0
@@ -0,0 +1,173 @@
+"""
+Risk Analytics Tests
+====================
+
+Validates the VaR engines:
+- NumPy engine and pure-Python fallback vs the original loop (same distribution)
+- Seeded reproducibility and exact chunking
+- Closed-form portfolio volatility
+- Correlation matrix handling
+"""
+
+import math
+import random
+
+import pytest
+
+import risk_analytics
+from risk_analytics import (
+    DEFAULT_CORRELATION,
+    RiskSimulationEngine,
+    _get_asset_stats,
+    _portfolio_daily_vol,
+    compute_historical_var,
+    compute_monte_carlo_var,
+)
+
+np = pytest.importorskip("numpy")
+
+WEIGHTS = {"BTC": 0.45, "ETH": 0.30, "SOL": 0.15, "USDC": 0.10}
+
+
+def _reference_monte_carlo_var(weights, confidence, horizon_days, num_sims, seed):
+    """The original pure-Python Monte Carlo loop (market factor drawn per path)."""
+    rng = random.Random(seed)
+    stats = [_get_asset_stats(a) for a in weights]
+    w = list(weights.values())
+
+    portfolio_returns = []
+    for _ in range(num_sims):
+        asset_returns = []
+        common_factor = rng.gauss(0, 1)
+        for s in stats:
+            cumulative = 1.0
+            for _ in range(horizon_days):
+                z = (
+                    math.sqrt(DEFAULT_CORRELATION) * common_factor
+                    + math.sqrt(1.0 - DEFAULT_CORRELATION) * rng.gauss(0, 1)
+                )
+                cumulative *= 1.0 + s["daily_return"] + s["daily_vol"] * z
+            asset_returns.append(cumulative - 1.0)
+        portfolio_returns.append(sum(wi * r for wi, r in zip(w, asset_returns)))
+
+    portfolio_returns.sort()
+    var_index = max(0, min(int((1.0 - confidence) * num_sims), num_sims - 1))
+    tail = portfolio_returns[: var_index + 1]
+    return {"var": -portfolio_returns[var_index], "cvar": -sum(tail) / len(tail)}
+
+
+@pytest.fixture
+def pure_python(monkeypatch):
+    """Force the pure-Python fallback paths."""
+    monkeypatch.setattr(risk_analytics, "NUMPY_AVAILABLE", False)
+
+
+@pytest.mark.unit
+class TestPortfolioVol:
+
+    def test_matches_double_loop(self):
+        """Closed-form uniform-correlation variance equals the pairwise sum."""
+        assets = list(WEIGHTS)
+        vols = [_get_asset_stats(a)["daily_vol"] for a in assets]
+        w = [WEIGHTS[a] for a in assets]
+        variance = sum(
+            w[i] * w[j] * vols[i] * vols[j] * (1.0 if i == j else DEFAULT_CORRELATION)
+            for i in range(len(assets))
+            for j in range(len(assets))
+        )
+        assert _portfolio_daily_vol(WEIGHTS) == pytest.approx(math.sqrt(variance))
+
+    def test_empty_portfolio(self):
+        assert _portfolio_daily_vol({}) == 0.0
+
+
+@pytest.mark.unit
+class TestRiskSimulationEngine:
+
+    def test_seed_is_reproducible(self):
+        """Same seed gives identical results; different seeds differ."""
+        a = compute_monte_carlo_var(WEIGHTS, 0.95, 7, num_sims=5000, seed=11)
+        b = compute_monte_carlo_var(WEIGHTS, 0.95, 7, num_sims=5000, seed=11)
+        c = compute_monte_carlo_var(WEIGHTS, 0.95, 7, num_sims=5000, seed=12)
+        assert a == b
+        assert a != c
+
+    def test_chunking_is_exact(self):
+        """Tiny chunks produce exactly the same VaR as one large batch."""
+        whole = RiskSimulationEngine(WEIGHTS, seed=5).monte_carlo(0.95, 5, 4000)
+        chunked = RiskSimulationEngine(WEIGHTS, seed=5, max_chunk_elements=5 * 4 * 37)
+        assert chunked.monte_carlo(0.95, 5, 4000) == pytest.approx(whole)
+
+    def test_covariance_matrix(self):
+        """Market factor plus residual factor reproduce the one-day covariance."""
+        engine = RiskSimulationEngine(WEIGHTS)
+        L, f = engine.cholesky, engine.factor
+        assert np.allclose(np.outer(f, f) + L @ L.T, engine.covariance)
+        assert engine.covariance[0, 0] == pytest.approx(_get_asset_stats("BTC")["daily_vol"] ** 2)
+        btc_vol = _get_asset_stats("BTC")["daily_vol"]
+        eth_vol = _get_asset_stats("ETH")["daily_vol"]
+        assert engine.covariance[0, 1] == pytest.approx(DEFAULT_CORRELATION * btc_vol * eth_vol)
+
+    def test_custom_correlation(self):
+        """Independent assets carry less tail risk than correlated ones."""
+        identity = np.eye(len(WEIGHTS))
+        independent = RiskSimulationEngine(WEIGHTS, correlation=identity, seed=1)
+        correlated = RiskSimulationEngine(WEIGHTS, seed=1)
+        assert independent.monte_carlo(0.95, 1, 20000)["var"] < correlated.monte_carlo(0.95, 1, 20000)["var"]
+
+    def test_non_positive_definite_correlation_is_repaired(self):
+        """An inconsistent correlation matrix still yields a usable factor."""
+        corr = np.array([[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]])
+        engine = RiskSimulationEngine({"BTC": 0.4, "ETH": 0.3, "SOL": 0.3}, correlation=corr, seed=2)
+        result = engine.monte_carlo(0.95, 1, 2000)
+        assert result["var"] > 0
+        assert result["cvar"] >= result["var"]
+
+    def test_bad_correlation_shape(self):
+        with pytest.raises(ValueError):
+            RiskSimulationEngine(WEIGHTS, correlation=np.eye(2))
+
+
+@pytest.mark.unit
+class TestDistributionMatchesReference:
+
+    @pytest.mark.parametrize("horizon", [1, 10, 30])
+    @pytest.mark.parametrize("numpy_engine", [True, False])
+    def test_monte_carlo_matches_original_loop(self, horizon, numpy_engine, monkeypatch):
+        """Multi-horizon VaR/CVaR match the original per-path factor model."""
+        monkeypatch.setattr(risk_analytics, "NUMPY_AVAILABLE", numpy_engine)
+        sims = 20000 if numpy_engine else 8000
+        result = compute_monte_carlo_var(WEIGHTS, 0.95, horizon, num_sims=sims, seed=21)
+        reference = _reference_monte_carlo_var(WEIGHTS, 0.95, horizon, 8000, seed=22)
+
+        assert result["var"] == pytest.approx(reference["var"], rel=0.1)
+        assert result["cvar"] == pytest.approx(reference["cvar"], rel=0.1)
+
+
+@pytest.mark.unit
+class TestDistributionMatchesFallback:
+
+    @pytest.mark.parametrize("horizon", [1, 7])
+    def test_monte_carlo(self, horizon, monkeypatch):
+        """NumPy and pure-Python Monte Carlo agree in distribution."""
+        fast = compute_monte_carlo_var(WEIGHTS, 0.95, horizon, num_sims=20000, seed=3)
+        monkeypatch.setattr(risk_analytics, "NUMPY_AVAILABLE", False)
+        slow = compute_monte_carlo_var(WEIGHTS, 0.95, horizon, num_sims=20000, seed=3)
+
+        assert fast["var"] == pytest.approx(slow["var"], rel=0.08)
+        assert fast["cvar"] == pytest.approx(slow["cvar"], rel=0.08)
+
+    @pytest.mark.parametrize("horizon", [1, 30])
+    def test_historical(self, horizon, monkeypatch):
+        """NumPy and pure-Python historical simulation agree in distribution."""
+        fast = compute_historical_var(WEIGHTS, 0.95, horizon, num_scenarios=20000, seed=4)
+        monkeypatch.setattr(risk_analytics, "NUMPY_AVAILABLE", False)
+        slow = compute_historical_var(WEIGHTS, 0.95, horizon, num_scenarios=20000, seed=4)
+
+        assert fast["var"] == pytest.approx(slow["var"], rel=0.08)
+        assert fast["cvar"] == pytest.approx(slow["cvar"], rel=0.08)
+
+    def test_fallback_seed_is_reproducible(self, pure_python):
+        a = compute_monte_carlo_var(WEIGHTS, 0.95, 2, num_sims=1000, seed=9)
+        b = compute_monte_carlo_var(WEIGHTS, 0.95, 2, num_sims=1000, seed=9)
+        assert a == b
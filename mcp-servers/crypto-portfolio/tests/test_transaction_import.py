@@ -0,0 +1,213 @@
+"""
+Transaction Import Pipeline Tests
+=================================
+
+Validates the streaming bulk import:
+- Parallel parsing matches serial parsing
+- Merged stream is time-ordered and deduplicated across files
+- Batched CostBasisTracker import matches row-by-row recording
+- Re-imports only write new rows
+- Per-stage throughput for a 100k-row import
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from cost_basis import CostBasisTracker
+from transaction_import import ImportPipeline, deduplicate, import_all, import_file
+
+START = datetime(2021, 1, 1)
+HEADER = (
+    "Transactions\n"
+    "User,Test User,abc123\n"
+    "ID,Timestamp,Transaction Type,Asset,Quantity Transacted,Price Currency,"
+    "Price at Transaction,Subtotal,Total (inclusive of fees and/or spread),"
+    "Fees and/or Spread,Notes\n"
+)
+
+
+def _rows(n, seed=0, offset=0, assets=("BTC", "ETH")):
+    """Coinbase rows: DCA buys with occasional sells, one per minute."""
+    rng = random.Random(seed)
+    holdings = dict.fromkeys(assets, 0.0)
+    rows = []
+    for i in range(n):
+        asset = rng.choice(assets)
+        when = START + timedelta(minutes=offset + i)
+        price = round(rng.uniform(100, 200), 2)
+        if holdings[asset] > 1 and rng.random() < 0.3:
+            side, qty = "Sell", round(holdings[asset] * 0.5, 6)
+            holdings[asset] -= qty
+        else:
+            side, qty = "Buy", round(rng.uniform(0.1, 1.0), 6)
+            holdings[asset] += qty
+        subtotal = qty * price
+        rows.append(
+            f"{asset}-{offset + i},{when:%Y-%m-%d %H:%M:%S} UTC,{side},{asset},{qty},USD,"
+            f"${price},${subtotal:.2f},${subtotal:.2f},$0.00,\n"
+        )
+    return rows
+
+
+def _write(path, rows, shuffle_seed=None):
+    rows = list(rows)
+    if shuffle_seed is not None:
+        random.Random(shuffle_seed).shuffle(rows)
+    path.write_text(HEADER + "".join(rows))
+    return str(path)
+
+
+@pytest.fixture
+def export_files(tmp_path):
+    rows = _rows(400, seed=1)
+    # Overlapping exports, written out of order
+    return [
+        _write(tmp_path / "coinbase_a.csv", rows[:250], shuffle_seed=1),
+        _write(tmp_path / "coinbase_b.csv", rows[200:], shuffle_seed=2),
+        _write(tmp_path / "coinbase_c.csv", rows[100:150]),
+    ]
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = CostBasisTracker(str(tmp_path / "cost_basis.db"))
+    yield tracker
+    tracker.close()
+
+
+def _snapshot(tracker):
+    holdings = {a: round(h["quantity"], 8) for a, h in tracker.get_current_holdings().items()}
+    gains = tracker.get_realized_gains()
+    return holdings, gains["num_transactions"], round(gains["total_gain"], 6)
+
+
+@pytest.mark.unit
+class TestImportPipeline:
+
+    def test_parallel_matches_serial(self, export_files):
+        serial, serial_summary = import_all(export_files, workers=1)
+        parallel, parallel_summary = import_all(export_files, workers=3)
+
+        assert [t.id for t in serial] == [t.id for t in parallel]
+        assert serial_summary["total_deduped"] == parallel_summary["total_deduped"] == 400
+        assert serial_summary["total_raw"] == 500
+
+    def test_stream_is_ordered_and_deduplicated(self, export_files):
+        merged = list(ImportPipeline(export_files, workers=1))
+        raw = [t for path in export_files for t in import_file(path)]
+
+        expected = sorted(deduplicate(raw), key=lambda t: t.timestamp)
+        assert [t.id for t in merged] == [t.id for t in expected]
+        assert all(a.timestamp <= b.timestamp for a, b in zip(merged, merged[1:]))
+
+    def test_stats_report_stages(self, export_files, tmp_path):
+        missing = str(tmp_path / "coinbase_missing.csv")
+        pipeline = ImportPipeline(export_files + [missing], workers=2)
+        list(pipeline)
+        stats = pipeline.stats()
+
+        assert set(stats["stages"]) == {"parse", "merge"}
+        assert stats["stages"]["parse"]["rows"] == 500
+        assert stats["files_failed"][0]["file"] == missing
+        assert stats["date_range"]["earliest"] == START.isoformat()
+
+
+@pytest.mark.unit
+class TestBulkCostBasisImport:
+
+    def test_batched_import_matches_row_by_row(self, export_files, tmp_path):
+        bulk = CostBasisTracker(str(tmp_path / "bulk.db"))
+        summary = bulk.import_files(export_files, workers=2, batch_size=64)
+        assert summary["purchases"] + summary["sales"] == 400
+        assert set(summary["stages"]) == {"parse", "merge", "write"}
+
+        transactions, _ = import_all(export_files, workers=1)
+        single = CostBasisTracker(str(tmp_path / "single.db"))
+        for txn in transactions:
+            if txn.type == "buy":
+                single.add_purchase(txn.asset, txn.amount, txn.price_usd, txn.timestamp, txn.exchange)
+            else:
+                single.record_sale(txn.asset, txn.amount, txn.price_usd, txn.timestamp, txn.exchange)
+
+        assert _snapshot(bulk) == _snapshot(single)
+        bulk.close()
+        single.close()
+
+    def test_reimport_only_writes_new_rows(self, tracker, tmp_path):
+        rows = _rows(300, seed=4)
+        first = _write(tmp_path / "coinbase_2021.csv", rows[:200])
+        tracker.import_files([first])
+        before = _snapshot(tracker)
+
+        again = tracker.import_files([first])
+        assert again["duplicates"] == 200
+        assert again["purchases"] == again["sales"] == 0
+        assert _snapshot(tracker) == before
+
+        # A later export overlapping the first adds only its tail
+        later = _write(tmp_path / "coinbase_2021_full.csv", rows)
+        result = tracker.import_files([later])
+        assert result["duplicates"] == 200
+        assert result["purchases"] + result["sales"] == 100
+
+    def test_import_from_exchange_is_idempotent(self, tracker):
+        txs = [
+            {"type": "buy", "asset": "sol", "quantity": 2.0, "price": 20.0, "date": "2021-01-01T00:00:00"},
+            {"type": "sell", "asset": "SOL", "quantity": 1.0, "price": 30.0, "date": "2021-02-01T00:00:00"},
+            {"type": "sell", "asset": "SOL", "quantity": 5.0, "price": 30.0, "date": "2021-03-01T00:00:00"},
+        ]
+        assert tracker.import_from_exchange("kraken", txs) == (1, 1)
+        assert tracker.import_from_exchange("kraken", txs) == (0, 0)
+        assert tracker.get_current_holdings()["SOL"]["quantity"] == 1.0
+
+    def test_same_second_fills_with_distinct_ids_are_kept(self, tracker):
+        fill = {"type": "buy", "asset": "BTC", "quantity": 0.1, "price": 30000.0,
+                "date": "2021-01-01T00:00:00"}
+        txs = [dict(fill, transaction_id="T1"), dict(fill, transaction_id="T2")]
+        assert tracker.import_from_exchange("kraken", txs) == (2, 0)
+        assert tracker.import_from_exchange("kraken", txs) == (0, 0)
+        assert tracker.get_current_holdings()["BTC"]["quantity"] == pytest.approx(0.2)
+
+        # Without IDs the composite key still collapses them
+        assert tracker.import_from_exchange("gemini", [fill, fill]) == (1, 0)
+
+    def test_same_second_file_fills_with_distinct_ids_are_kept(self, tracker, tmp_path):
+        fill = "{id},2021-01-01 00:00:00 UTC,Buy,BTC,0.1,USD,$30000,$3000.00,$3000.00,$0.00,\n"
+        rows = [fill.format(id="T1"), fill.format(id="T2")]
+        files = [_write(tmp_path / "a.csv", rows), _write(tmp_path / "b.csv", rows)]
+
+        assert tracker.import_files(files)["purchases"] == 2
+        assert tracker.import_files(files)["purchases"] == 0
+        assert tracker.get_current_holdings()["BTC"]["quantity"] == pytest.approx(0.2)
+
+    def test_wal_mode(self, tracker):
+        assert tracker.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@pytest.mark.stress
+class TestImportThroughput:
+
+    def test_100k_row_import(self, tmp_path):
+        files = [
+            _write(tmp_path / f"coinbase_{i}.csv", _rows(25_000, seed=i, offset=i * 25_000, assets=(f"A{i}",)))
+            for i in range(4)
+        ]
+        tracker = CostBasisTracker(str(tmp_path / "cost_basis.db"))
+
+        start = time.perf_counter()
+        summary = tracker.import_files(files)
+        duration = time.perf_counter() - start
+
+        print(f"\n[PERF] 100k-row import: {duration:.3f}s")
+        for stage, data in summary["stages"].items():
+            print(f"  {stage:<6} {data['rows']:>7} rows  {data['seconds']:.3f}s  {data['rows_per_sec']} rows/s")
+        assert summary["purchases"] + summary["sales"] == 100_000
+
+        start = time.perf_counter()
+        again = tracker.import_files(files)
+        print(f"[PERF] re-import: {time.perf_counter() - start:.3f}s")
+        assert again["duplicates"] == 100_000
+        tracker.close()
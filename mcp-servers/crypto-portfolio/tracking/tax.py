@@ -16,6 +16,7 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 from data.storage import db
+from lot_ledger import LotLedger
 
 
 class CostBasisMethod(Enum):
@@ -116,12 +117,20 @@ class TaxCalculator:
 
     def __init__(self, method: CostBasisMethod = CostBasisMethod.FIFO):
         self.method = method
-
-    def get_tax_lots(self, asset: str) -> List[TaxLot]:
-        """Get all open tax lots for an asset."""
-        lots_data = db.get_open_tax_lots(asset)
-        return [
-            TaxLot(
+        # Open lots per asset, synced incrementally from the database
+        self.ledger = LotLedger(
+            lot_id="id",
+            remaining="remaining_amount",
+            cost_per_unit="cost_per_unit",
+            acquired="acquisition_date",
+        )
+        self._last_lot_id: Dict[str, int] = {}
+
+    def _sync_lots(self, asset: str) -> None:
+        """Load lots added to the database since the last sync."""
+        lots_data = db.get_open_tax_lots(asset, after_id=self._last_lot_id.get(asset))
+        for lot in lots_data:
+            self.ledger.add(asset, TaxLot(
                 id=lot["id"],
                 asset=lot["asset"],
                 amount=lot["amount"],
@@ -129,53 +138,50 @@ class TaxCalculator:
                 acquisition_date=lot["acquisition_date"],
                 source=lot["source"],
                 remaining_amount=lot["remaining_amount"],
-            )
-            for lot in lots_data
-        ]
+            ))
+        last = max((lot["id"] for lot in lots_data), default=0)
+        self._last_lot_id[asset] = max(last, self._last_lot_id.get(asset, 0))
+
+    def get_tax_lots(self, asset: str) -> List[TaxLot]:
+        """Get all open tax lots for an asset."""
+        self._sync_lots(asset)
+        return self.ledger.open_lots(asset)
 
     def select_lots_for_sale(
         self,
         asset: str,
         amount_to_sell: Decimal,
         method: Optional[CostBasisMethod] = None,
+        lot_ids: Optional[List[int]] = None,
     ) -> List[Tuple[TaxLot, Decimal]]:
         """
         Select which tax lots to use for a sale.
 
+        Lots are not modified; calculate_gain() applies the selection.
+
+        Args:
+            lot_ids: Lots to sell from with SPECIFIC_ID (acquisition order)
+
         Returns:
             List of (lot, amount_from_lot) tuples
         """
         method = method or self.method
-        lots = self.get_tax_lots(asset)
+        self._sync_lots(asset)
 
-        if not lots:
+        if not self.ledger.count(asset):
             raise ValueError(f"No tax lots available for {asset}")
 
-        # Sort lots based on method
-        if method == CostBasisMethod.FIFO:
-            lots.sort(key=lambda x: x.acquisition_date)
-        elif method == CostBasisMethod.LIFO:
-            lots.sort(key=lambda x: x.acquisition_date, reverse=True)
-        elif method == CostBasisMethod.HIFO:
-            lots.sort(key=lambda x: x.cost_per_unit, reverse=True)
-        # SPECIFIC_ID would require manual selection
-
-        selected = []
-        remaining_to_sell = amount_to_sell
+        if method == CostBasisMethod.SPECIFIC_ID and not lot_ids:
+            # Without a manual selection, fall back to acquisition order
+            method = CostBasisMethod.FIFO
 
-        for lot in lots:
-            if remaining_to_sell <= 0:
-                break
+        selected = self.ledger.select(asset, amount_to_sell, method, lot_ids)
+        available = sum((amount for _, amount in selected), Decimal("0"))
 
-            amount_from_lot = min(lot.remaining_amount, remaining_to_sell)
-            if amount_from_lot > 0:
-                selected.append((lot, amount_from_lot))
-                remaining_to_sell -= amount_from_lot
-
-        if remaining_to_sell > 0:
+        if amount_to_sell - available > 0:
             raise ValueError(
                 f"Insufficient {asset} in tax lots. "
-                f"Tried to sell {amount_to_sell}, only {amount_to_sell - remaining_to_sell} available."
+                f"Tried to sell {amount_to_sell}, only {available} available."
             )
 
         return selected
@@ -187,14 +193,16 @@ class TaxCalculator:
         proceeds: Decimal,
         sale_date: datetime,
         method: Optional[CostBasisMethod] = None,
+        lot_ids: Optional[List[int]] = None,
     ) -> List[CapitalGain]:
         """
         Calculate capital gain/loss for a sale.
 
         This also updates the tax lots in the database.
         """
-        selected_lots = self.select_lots_for_sale(asset, amount_sold, method)
+        selected_lots = self.select_lots_for_sale(asset, amount_sold, method, lot_ids)
         gains = []
+        closures = []
 
         for lot, amount_from_lot in selected_lots:
             # Calculate proportional proceeds and cost basis
@@ -215,14 +223,11 @@ class TaxCalculator:
                 is_long_term=is_long_term,
                 amount_sold=amount_from_lot,
             ))
+            closures.append((lot.id, amount_from_lot, lot_proceeds, sale_date))
 
-            # Update the tax lot in database
-            db.close_tax_lot(
-                lot_id=lot.id,
-                amount_sold=amount_from_lot,
-                proceeds=lot_proceeds,
-                close_date=sale_date,
-            )
+        # Update the tax lots in one database transaction, then in memory
+        db.close_tax_lots(closures)
+        self.ledger.deplete(asset, selected_lots)
 
         return gains
 
@@ -19,6 +19,8 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 from dotenv import load_dotenv
 
+from lot_ledger import LotLedger
+
 # Import exchange clients
 from exchanges import CoinbaseClient, KrakenClient, CryptoComClient, GeminiClient
 
@@ -390,10 +392,24 @@ class TransactionHistory:
         print(f"  Created {lot_counter} tax lots across {len(self.tax_lots)} assets")
 
     def calculate_realized_gains(self):
-        """Calculate realized gains/losses from sales using selected cost basis method."""
+        """Calculate realized gains/losses from sales using selected cost basis method.
+
+        Replays the transactions in order against a lot ledger, so each sale
+        only sees lots acquired up to its own timestamp.
+        """
         print(f"\n📈 Calculating realized gains ({self.cost_basis_method.value})...")
 
         self.realized_gains = []
+        ledger = self._new_ledger()
+        method = self._ledger_method()
+
+        # Lots are rebuilt from scratch on every run
+        pending = {}
+        for asset, lots in self.tax_lots.items():
+            for lot in lots:
+                lot.remaining_amount = lot.amount
+            pending[asset] = sorted(lots, key=lambda x: x.acquired_date)
+        next_lot = dict.fromkeys(pending, 0)
 
         for txn in self.transactions:
             if txn.type != "sell" or txn.amount <= 0:
@@ -404,25 +420,22 @@ class TransactionHistory:
                 print(f"  Warning: Selling {asset} with no tax lots (possible transfer in)")
                 continue
 
-            amount_to_sell = txn.amount
-            proceeds = txn.total_usd - txn.fee_usd
-
-            # Get lots based on cost basis method
-            lots = self._get_lots_for_sale(asset)
+            # Open every lot acquired up to this sale
+            lots, i = pending[asset], next_lot[asset]
+            while i < len(lots) and lots[i].acquired_date <= txn.timestamp:
+                ledger.add(asset, lots[i])
+                i += 1
+            next_lot[asset] = i
 
-            for lot in lots:
-                if amount_to_sell <= 0:
-                    break
-
-                if lot.remaining_amount <= 0:
-                    continue
+            proceeds = txn.total_usd - txn.fee_usd
 
-                # Calculate how much to take from this lot
-                amount_from_lot = min(amount_to_sell, lot.remaining_amount)
+            # Lots in cost basis method order; a shortfall is left unmatched
+            selected = ledger.select(asset, txn.amount, method)
+            for lot, amount_from_lot in selected:
                 cost_basis = amount_from_lot * lot.cost_basis_per_unit
                 lot_proceeds = (amount_from_lot / txn.amount) * proceeds
 
-                gain = RealizedGain(
+                self.realized_gains.append(RealizedGain(
                     asset=asset,
                     sell_date=txn.timestamp,
                     sell_amount=amount_from_lot,
@@ -432,12 +445,8 @@ class TransactionHistory:
                     is_long_term=lot.is_long_term,
                     tax_lot_id=lot.id,
                     sell_transaction_id=txn.id
-                )
-                self.realized_gains.append(gain)
-
-                # Update lot
-                lot.remaining_amount -= amount_from_lot
-                amount_to_sell -= amount_from_lot
+                ))
+            ledger.deplete(asset, selected)
 
         total_gains = sum(g.gain_loss_usd for g in self.realized_gains)
         long_term = sum(g.gain_loss_usd for g in self.realized_gains if g.is_long_term)
@@ -447,21 +456,21 @@ class TransactionHistory:
         print(f"  Long-term: ${long_term:,.2f}")
         print(f"  Short-term: ${short_term:,.2f}")
 
-    def _get_lots_for_sale(self, asset: str) -> List[TaxLot]:
-        """Get tax lots ordered by cost basis method."""
-        lots = self.tax_lots.get(asset, [])
-
-        if self.cost_basis_method == CostBasisMethod.FIFO:
-            return sorted(lots, key=lambda x: x.acquired_date)
-        elif self.cost_basis_method == CostBasisMethod.LIFO:
-            return sorted(lots, key=lambda x: x.acquired_date, reverse=True)
-        elif self.cost_basis_method == CostBasisMethod.HIFO:
-            return sorted(lots, key=lambda x: x.cost_basis_per_unit, reverse=True)
-        elif self.cost_basis_method == CostBasisMethod.AVERAGE:
-            # For average cost, we recalculate cost basis as weighted average
-            return lots
-
-        return lots
+    @staticmethod
+    def _new_ledger() -> LotLedger:
+        return LotLedger(
+            lot_id="id",
+            remaining="remaining_amount",
+            cost_per_unit="cost_basis_per_unit",
+            acquired="acquired_date",
+        )
+
+    def _ledger_method(self) -> str:
+        """Ledger ordering for the cost basis method."""
+        if self.cost_basis_method == CostBasisMethod.AVERAGE:
+            # Per-lot basis in acquisition order
+            return "fifo"
+        return self.cost_basis_method.value
 
     def get_unrealized_gains(self, current_prices: Dict[str, float]) -> Dict[str, dict]:
         """Calculate unrealized gains for current holdings."""
@@ -565,31 +574,16 @@ class TransactionHistory:
         Returns:
             Summary dict with import statistics
         """
-        from transaction_import import import_all
+        from transaction_import import dedup_key, import_all
 
         new_transactions, summary = import_all(file_paths, exchange_override)
 
         # Merge with existing transactions
-        existing_keys = set()
-        for txn in self.transactions:
-            key = (
-                txn.exchange,
-                txn.timestamp.strftime("%Y%m%d%H%M%S"),
-                txn.asset,
-                f"{txn.amount:.8f}",
-                txn.type,
-            )
-            existing_keys.add(key)
+        existing_keys = {dedup_key(txn) for txn in self.transactions}
 
         added = 0
         for txn in new_transactions:
-            key = (
-                txn.exchange,
-                txn.timestamp.strftime("%Y%m%d%H%M%S"),
-                txn.asset,
-                f"{txn.amount:.8f}",
-                txn.type,
-            )
+            key = dedup_key(txn)
             if key not in existing_keys:
                 self.transactions.append(txn)
                 existing_keys.add(key)
@@ -11,15 +11,21 @@ Supported formats:
 - Gemini trade XLSX (wide format with per-asset columns)
 - Gemini staking XLSX (interest credits)
 - Crypto.com CSV (Transaction Kind based)
+
+Files are parsed in parallel worker processes and merged into one
+time-ordered, deduplicated stream (ImportPipeline).
 """
 
 import csv
+import heapq
 import logging
 import os
 import re
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -1031,19 +1037,33 @@ def import_file(filepath: str, exchange_override: Optional[str] = None) -> List[
     return parser(filepath)
 
 
+def dedup_key(txn: Transaction) -> Tuple[str, ...]:
+    """
+    Identity of a transaction across exports.
+
+    (exchange, "id", id) when the export carries a transaction ID, so
+    distinct fills in the same second with the same size stay distinct (as
+    in cost_basis._import_key). Otherwise (exchange, second, asset, amount,
+    type).
+    """
+    if txn.id:
+        return (txn.exchange, "id", txn.id)
+    return (
+        txn.exchange,
+        txn.timestamp.strftime("%Y%m%d%H%M%S"),
+        txn.asset,
+        f"{txn.amount:.8f}",
+        txn.type,
+    )
+
+
 def deduplicate(transactions: List[Transaction]) -> List[Transaction]:
-    """Remove duplicate transactions based on (exchange, timestamp, asset, amount, type)."""
+    """Remove duplicate transactions (same dedup_key)."""
     seen = set()
     unique = []
 
     for txn in transactions:
-        key = (
-            txn.exchange,
-            txn.timestamp.strftime("%Y%m%d%H%M%S"),
-            txn.asset,
-            f"{txn.amount:.8f}",
-            txn.type,
-        )
+        key = dedup_key(txn)
         if key not in seen:
             seen.add(key)
             unique.append(txn)
@@ -1051,57 +1071,141 @@ def deduplicate(transactions: List[Transaction]) -> List[Transaction]:
     return unique
 
 
-def import_all(file_paths: List[str], exchange_override: Optional[str] = None) -> Tuple[List[Transaction], dict]:
-    """Import and merge transactions from multiple files.
-
-    Args:
-        file_paths: List of CSV/XLSX file paths to import
-        exchange_override: Force parser for all files
+# =============================================================================
+# Streaming pipeline
+# =============================================================================
 
-    Returns:
-        Tuple of (deduplicated transactions sorted by timestamp, summary dict)
-    """
-    all_transactions = []
-    summary = {
-        "files_processed": 0,
-        "files_failed": [],
-        "per_file": {},
-        "per_exchange": defaultdict(int),
-        "per_type": defaultdict(int),
-        "total_raw": 0,
-        "total_deduped": 0,
-        "date_range": {"earliest": None, "latest": None},
-    }
+def _parse_file(filepath: str, exchange_override: Optional[str]) -> Tuple[str, List[Transaction], Optional[str]]:
+    """Pool worker: parse one file into a time-sorted list (errors are returned, not raised)."""
+    try:
+        txns = import_file(filepath, exchange_override)
+    except Exception as e:
+        return filepath, [], str(e)
+    txns.sort(key=lambda x: x.timestamp)
+    return filepath, txns, None
 
-    for filepath in file_paths:
-        try:
-            txns = import_file(filepath, exchange_override)
-            basename = os.path.basename(filepath)
-            summary["files_processed"] += 1
-            summary["per_file"][basename] = len(txns)
-            summary["total_raw"] += len(txns)
 
-            for txn in txns:
-                summary["per_exchange"][txn.exchange] += 1
-                summary["per_type"][txn.type] += 1
+def _stage(rows: int, seconds: float) -> dict:
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else None,
+    }
 
-            all_transactions.extend(txns)
 
-        except Exception as e:
-            summary["files_failed"].append({"file": filepath, "error": str(e)})
+class ImportPipeline:
+    """
+    Parallel parse -> time-ordered merge -> streaming dedupe.
 
-    # Deduplicate and sort
-    all_transactions = deduplicate(all_transactions)
-    all_transactions.sort(key=lambda x: x.timestamp)
+    Each file is parsed in a worker process and sorted by timestamp; the
+    per-file lists are k-way merged into one ordered stream. Duplicates
+    share a timestamp second, so the dedupe only remembers keys for the
+    current second. Iterate the pipeline to consume the stream; stats()
+    reports rows per second for each stage once it has been drained.
+    """
 
-    summary["total_deduped"] = len(all_transactions)
+    def __init__(
+        self,
+        file_paths: List[str],
+        exchange_override: Optional[str] = None,
+        workers: Optional[int] = None,
+    ):
+        self.file_paths = list(file_paths)
+        self.exchange_override = exchange_override
+        self.workers = workers or min(len(self.file_paths), os.cpu_count() or 1) or 1
+        self.summary = {
+            "files_processed": 0,
+            "files_failed": [],
+            "per_file": {},
+            "per_exchange": defaultdict(int),
+            "per_type": defaultdict(int),
+            "total_raw": 0,
+            "total_deduped": 0,
+            "date_range": {"earliest": None, "latest": None},
+        }
+        self.timings = {}
+
+    def _parsed(self) -> List[List[Transaction]]:
+        """Parse every file, in a process pool when there is more than one."""
+        start = time.perf_counter()
+        args = [(path, self.exchange_override) for path in self.file_paths]
+        if self.workers > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_parse_file, *zip(*args)))
+        else:
+            results = [_parse_file(*a) for a in args]
 
-    if all_transactions:
-        summary["date_range"]["earliest"] = all_transactions[0].timestamp.isoformat()
-        summary["date_range"]["latest"] = all_transactions[-1].timestamp.isoformat()
+        per_file = []
+        for filepath, txns, error in results:
+            if error is not None:
+                self.summary["files_failed"].append({"file": filepath, "error": error})
+                continue
+            self.summary["files_processed"] += 1
+            self.summary["per_file"][os.path.basename(filepath)] = len(txns)
+            self.summary["total_raw"] += len(txns)
+            for txn in txns:
+                self.summary["per_exchange"][txn.exchange] += 1
+                self.summary["per_type"][txn.type] += 1
+            per_file.append(txns)
+
+        self.timings["parse"] = _stage(self.summary["total_raw"], time.perf_counter() - start)
+        return per_file
+
+    def __iter__(self) -> Iterator[Transaction]:
+        per_file = self._parsed()
+
+        start = time.perf_counter()
+        paused = 0.0  # Time spent in the consumer between yields
+        second = None
+        keys = set()
+        count = 0
+        for txn in heapq.merge(*per_file, key=lambda x: x.timestamp):
+            key = dedup_key(txn)
+            # Copies of a transaction share its timestamp: only keep one second of keys
+            when = txn.timestamp.replace(microsecond=0)
+            if when != second:
+                second = when
+                keys.clear()
+            elif key in keys:
+                continue
+            keys.add(key)
+
+            count += 1
+            if count == 1:
+                self.summary["date_range"]["earliest"] = txn.timestamp.isoformat()
+            self.summary["date_range"]["latest"] = txn.timestamp.isoformat()
+
+            resumed = time.perf_counter()
+            yield txn
+            paused += time.perf_counter() - resumed
+
+        self.summary["total_deduped"] = count
+        self.timings["merge"] = _stage(self.summary["total_raw"], time.perf_counter() - start - paused)
+
+    def stats(self) -> dict:
+        """Import summary (JSON-serializable) with per-stage throughput."""
+        summary = dict(self.summary)
+        summary["per_exchange"] = dict(summary["per_exchange"])
+        summary["per_type"] = dict(summary["per_type"])
+        summary["stages"] = dict(self.timings)
+        return summary
+
+
+def import_all(
+    file_paths: List[str],
+    exchange_override: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> Tuple[List[Transaction], dict]:
+    """Import and merge transactions from multiple files.
 
-    # Convert defaultdicts for JSON serialization
-    summary["per_exchange"] = dict(summary["per_exchange"])
-    summary["per_type"] = dict(summary["per_type"])
+    Args:
+        file_paths: List of CSV/XLSX file paths to import
+        exchange_override: Force parser for all files
+        workers: Parser processes (None = one per file, up to the CPU count)
 
-    return all_transactions, summary
+    Returns:
+        Tuple of (deduplicated transactions sorted by timestamp, summary dict)
+    """
+    pipeline = ImportPipeline(file_paths, exchange_override, workers)
+    transactions = list(pipeline)
+    return transactions, pipeline.stats()
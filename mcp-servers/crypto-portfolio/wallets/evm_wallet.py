@@ -3,15 +3,36 @@ EVM Wallet tracking for Coinbase Wallet and other EVM-compatible wallets.
 
 Supports Ethereum, Polygon, Arbitrum, Base, Optimism, and other EVM chains.
 Uses Alchemy or direct RPC for balance queries.
+
+RPC calls made close together to the same endpoint are sent as one
+JSON-RPC batch, and ERC-20 balanceOf reads for tracked tokens are folded
+into a single Multicall3 aggregate3 eth_call per chain, so a refresh costs
+roughly one HTTP request per chain instead of one per token.
 """
 
 import asyncio
+import json
+import logging
+import os
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import aiohttp
 
 
+# Multicall3 is deployed at the same address on all supported chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = "82ad56cb"   # aggregate3((address,bool,bytes)[])
+BALANCE_OF_SELECTOR = "70a08231"   # balanceOf(address)
+
+# Calls per JSON-RPC batch (public endpoints commonly cap at 100)
+MAX_BATCH_SIZE = 100
+# Seconds to wait for more calls before a batch is sent
+BATCH_WINDOW = 0.005
+
+DEFAULT_TOKEN_METADATA_PATH = os.path.expanduser("~/.crypto_portfolio/token_metadata.json")
+
+
 @dataclass
 class ChainConfig:
     """Configuration for an EVM chain."""
@@ -22,6 +43,7 @@ class ChainConfig:
     native_decimals: int = 18
     explorer_url: str = ""
     alchemy_network: str = ""  # For Alchemy API
+    multicall_address: Optional[str] = MULTICALL3_ADDRESS
 
 
 # Supported chains with free RPC endpoints
@@ -132,6 +154,86 @@ TRACKED_TOKENS: Dict[str, Dict[str, tuple]] = {
 }
 
 
+def _word(value: int) -> str:
+    return f"{value:064x}"
+
+
+def balance_of_data(address: str) -> str:
+    """Calldata for ERC-20 balanceOf(address)."""
+    return f"0x{BALANCE_OF_SELECTOR}{address[2:].lower():0>64}"
+
+
+def encode_aggregate3(calls: List[Tuple[str, str]], allow_failure: bool = True) -> str:
+    """ABI-encode Multicall3 aggregate3 calldata for (target, calldata) pairs."""
+    heads, tails = [], []
+    offset = 32 * len(calls)
+    for target, data in calls:
+        payload = bytes.fromhex(data[2:])
+        padded = payload.hex() + "00" * (-len(payload) % 32)
+        # (address target, bool allowFailure, bytes callData)
+        item = _word(int(target, 16)) + _word(int(allow_failure)) + _word(96) + _word(len(payload)) + padded
+        heads.append(_word(offset))
+        tails.append(item)
+        offset += len(item) // 2
+    return "0x" + AGGREGATE3_SELECTOR + _word(32) + _word(len(calls)) + "".join(heads) + "".join(tails)
+
+
+def decode_aggregate3(result: str) -> List[Tuple[bool, bytes]]:
+    """Decode aggregate3's (bool success, bytes returnData)[] return value."""
+    raw = bytes.fromhex(result[2:])
+
+    def word(pos: int) -> int:
+        return int.from_bytes(raw[pos:pos + 32], "big")
+
+    array = word(0)
+    count = word(array)
+    start = array + 32
+    decoded = []
+    for i in range(count):
+        item = start + word(start + 32 * i)
+        data_at = item + word(item + 32)
+        length = word(data_at)
+        decoded.append((bool(word(item)), raw[data_at + 32:data_at + 32 + length]))
+    return decoded
+
+
+class TokenMetadataCache:
+    """Persistent (chain, contract) -> (symbol, decimals) map for discovered tokens."""
+
+    def __init__(self, path: Optional[str] = DEFAULT_TOKEN_METADATA_PATH):
+        self.path = path
+        self._data: Dict[str, Dict[str, list]] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable token metadata cache {path}: {e}")
+
+    def __len__(self) -> int:
+        return sum(len(tokens) for tokens in self._data.values())
+
+    def get(self, chain: str, contract: str) -> Optional[Tuple[str, int]]:
+        entry = self._data.get(chain, {}).get(contract.lower())
+        return (entry[0], entry[1]) if entry else None
+
+    def set(self, chain: str, contract: str, symbol: str, decimals: int):
+        self._data.setdefault(chain, {})[contract.lower()] = [symbol, decimals]
+        self._dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed."""
+        if not self._dirty or not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
 @dataclass
 class TokenBalance:
     """Balance of a token on a specific chain."""
@@ -171,48 +273,107 @@ class EVMWalletTracker:
         addresses: List[str],
         chains: Optional[List[str]] = None,
         alchemy_api_key: Optional[str] = None,
+        rpc_urls: Optional[Dict[str, str]] = None,
+        token_metadata_path: Optional[str] = DEFAULT_TOKEN_METADATA_PATH,
+        batch_window: float = BATCH_WINDOW,
+        max_batch_size: int = MAX_BATCH_SIZE,
     ):
         self.addresses = [addr.lower() for addr in addresses]
         self.chains = chains or list(CHAINS.keys())
         self.alchemy_api_key = alchemy_api_key
+        self.rpc_urls = rpc_urls or {}  # chain -> RPC URL overriding CHAINS
+        self.token_metadata = TokenMetadataCache(token_metadata_path)
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.rpc_stats = {"http_requests": 0, "rpc_calls": 0}
         self._session: Optional[aiohttp.ClientSession] = None
+        self._pending: Dict[str, List[tuple]] = {}  # url -> [(method, params, future)]
+        self._no_batch: set = set()  # URLs that rejected batch requests
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
         return self._session
 
-    async def _rpc_call(
-        self,
-        chain: str,
-        method: str,
-        params: List[Any],
-    ) -> Any:
-        """Make an RPC call to a chain."""
+    def _rpc_url(self, chain: str) -> str:
         config = CHAINS.get(chain)
         if not config:
             raise ValueError(f"Unknown chain: {chain}")
 
+        if chain in self.rpc_urls:
+            return self.rpc_urls[chain]
         # Use Alchemy if available and chain is supported
         if self.alchemy_api_key and config.alchemy_network:
-            url = f"https://{config.alchemy_network}.g.alchemy.com/v2/{self.alchemy_api_key}"
-        else:
-            url = config.rpc_url
-
-        session = await self._get_session()
+            return f"https://{config.alchemy_network}.g.alchemy.com/v2/{self.alchemy_api_key}"
+        return config.rpc_url
 
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": method,
-            "params": params,
-        }
+    async def _rpc_call(
+        self,
+        chain: str,
+        method: str,
+        params: List[Any],
+    ) -> Any:
+        """Make an RPC call to a chain.
 
-        async with session.post(url, json=payload) as resp:
-            data = await resp.json()
-            if "error" in data:
-                raise Exception(f"RPC error: {data['error']}")
-            return data.get("result")
+        The call is queued for batch_window seconds; everything queued for
+        the same endpoint in that window goes out as one JSON-RPC batch.
+        """
+        url = self._rpc_url(chain)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.get(url)
+        if pending is None:
+            pending = self._pending[url] = []
+            loop.call_later(self.batch_window, lambda: asyncio.ensure_future(self._flush(url)))
+        pending.append((method, params, future))
+        return await future
+
+    async def _flush(self, url: str):
+        calls = self._pending.pop(url, [])
+        size = 1 if url in self._no_batch else self.max_batch_size
+        await asyncio.gather(*(
+            self._send_batch(url, calls[i:i + size])
+            for i in range(0, len(calls), size)
+        ))
+
+    async def _send_batch(self, url: str, calls: List[tuple]):
+        """POST calls as one request and resolve each caller's future."""
+        requests = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params, _) in enumerate(calls)
+        ]
+        try:
+            session = await self._get_session()
+            self.rpc_stats["http_requests"] += 1
+            self.rpc_stats["rpc_calls"] += len(calls)
+            payload = requests if len(requests) > 1 else requests[0]
+            async with session.post(url, json=payload) as resp:
+                data = await resp.json(content_type=None)
+
+            if len(calls) > 1 and not isinstance(data, list):
+                # Endpoint doesn't accept batches: send one at a time from now on
+                logging.info(f"RPC endpoint rejected batch, falling back to single calls: {url}")
+                self._no_batch.add(url)
+                await asyncio.gather(*(self._send_batch(url, [call]) for call in calls))
+                return
+
+            responses = {r.get("id"): r for r in (data if isinstance(data, list) else [data])
+                         if isinstance(r, dict)}
+            for i, (method, _, future) in enumerate(calls):
+                if future.done():
+                    continue
+                response = responses.get(i)
+                if response is None:
+                    future.set_exception(Exception(f"RPC error: no response to {method}"))
+                elif "error" in response:
+                    future.set_exception(Exception(f"RPC error: {response['error']}"))
+                else:
+                    future.set_result(response.get("result"))
+        except Exception as e:
+            for _, _, future in calls:
+                if not future.done():
+                    future.set_exception(e)
 
     async def get_native_balance(self, address: str, chain: str) -> Decimal:
         """Get native token balance for an address on a chain."""
@@ -234,13 +395,10 @@ class EVMWalletTracker:
         decimals: int,
     ) -> Decimal:
         """Get ERC-20 token balance."""
-        # balanceOf(address) function selector
-        data = f"0x70a08231000000000000000000000000{address[2:]}"
-
         result = await self._rpc_call(
             chain,
             "eth_call",
-            [{"to": token_address, "data": data}, "latest"]
+            [{"to": token_address, "data": balance_of_data(address)}, "latest"]
         )
 
         if result is None or result == "0x":
@@ -249,31 +407,51 @@ class EVMWalletTracker:
         balance = int(result, 16)
         return Decimal(balance) / Decimal(10 ** decimals)
 
+    async def get_token_balances(
+        self,
+        address: str,
+        chain: str,
+        tokens: Dict[str, tuple],
+    ) -> Dict[str, Decimal]:
+        """Get several ERC-20 balances with one Multicall3 aggregate3 call.
+
+        Args:
+            tokens: token address -> (symbol, decimals)
+
+        Returns:
+            token address -> balance, for tokens whose balanceOf succeeded
+        """
+        items = list(tokens.items())
+        multicall = CHAINS[chain].multicall_address
+        if not multicall:
+            amounts = await asyncio.gather(
+                *(self.get_token_balance(address, chain, token, decimals)
+                  for token, (_, decimals) in items),
+                return_exceptions=True,
+            )
+            return {token: amount for (token, _), amount in zip(items, amounts)
+                    if not isinstance(amount, Exception)}
+
+        data = encode_aggregate3([(token, balance_of_data(address)) for token, _ in items])
+        result = await self._rpc_call(chain, "eth_call", [{"to": multicall, "data": data}, "latest"])
+
+        balances = {}
+        for (token, (_, decimals)), (success, returned) in zip(items, decode_aggregate3(result)):
+            if success and len(returned) >= 32:
+                balances[token] = Decimal(int.from_bytes(returned[:32], "big")) / Decimal(10 ** decimals)
+        return balances
+
     async def _get_alchemy_token_balances(self, address: str, chain: str) -> List[TokenBalance]:
         """Use Alchemy's getTokenBalances to discover all ERC-20 tokens for an address."""
         config = CHAINS.get(chain)
         if not config or not self.alchemy_api_key or not config.alchemy_network:
             return []
 
-        url = f"https://{config.alchemy_network}.g.alchemy.com/v2/{self.alchemy_api_key}"
-        session = await self._get_session()
-
-        # Get all token balances (DEFAULT_TOKENS returns top ~100 tokens)
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "alchemy_getTokenBalances",
-            "params": [address, "DEFAULT_TOKENS"],
-        }
-
         try:
-            async with session.post(url, json=payload) as resp:
-                data = await resp.json()
-
-            if "error" in data:
-                return []
+            # Get all token balances (DEFAULT_TOKENS returns top ~100 tokens)
+            result = await self._rpc_call(chain, "alchemy_getTokenBalances", [address, "DEFAULT_TOKENS"])
 
-            token_balances = data.get("result", {}).get("tokenBalances", [])
+            token_balances = (result or {}).get("tokenBalances", [])
             non_zero = [
                 tb for tb in token_balances
                 if tb.get("tokenBalance") and tb["tokenBalance"] != "0x0"
@@ -283,41 +461,44 @@ class EVMWalletTracker:
             if not non_zero:
                 return []
 
-            # Get metadata for discovered tokens
+            # Metadata for tokens not seen before, in one batch; then cached on disk
+            missing = [
+                tb["contractAddress"] for tb in non_zero
+                if self.token_metadata.get(chain, tb["contractAddress"]) is None
+            ]
+            metadata = await asyncio.gather(
+                *(self._rpc_call(chain, "alchemy_getTokenMetadata", [contract]) for contract in missing),
+                return_exceptions=True,
+            )
+            for contract, meta in zip(missing, metadata):
+                if isinstance(meta, dict):
+                    decimals = meta.get("decimals")
+                    self.token_metadata.set(
+                        chain, contract, meta.get("symbol") or "???",
+                        18 if decimals is None else int(decimals),
+                    )
+            self.token_metadata.save()
+
             balances = []
             for tb in non_zero:
                 contract = tb["contractAddress"]
-                raw_balance = int(tb["tokenBalance"], 16)
-
-                # Fetch token metadata
-                meta_payload = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "alchemy_getTokenMetadata",
-                    "params": [contract],
-                }
-                try:
-                    async with session.post(url, json=meta_payload) as resp:
-                        meta_data = await resp.json()
-                    meta = meta_data.get("result", {})
-                    symbol = meta.get("symbol", "???")
-                    decimals = meta.get("decimals", 18)
-
-                    amount = Decimal(raw_balance) / Decimal(10 ** decimals)
-                    if amount > 0:
-                        balances.append(TokenBalance(
-                            symbol=symbol,
-                            chain=chain,
-                            amount=amount,
-                            decimals=decimals,
-                            contract_address=contract,
-                        ))
-                except Exception:
+                meta = self.token_metadata.get(chain, contract)
+                if meta is None:
                     continue
+                symbol, decimals = meta
+
+                amount = Decimal(int(tb["tokenBalance"], 16)) / Decimal(10 ** decimals)
+                if amount > 0:
+                    balances.append(TokenBalance(
+                        symbol=symbol,
+                        chain=chain,
+                        amount=amount,
+                        decimals=decimals,
+                        contract_address=contract,
+                    ))
 
             return balances
         except Exception as e:
-            import logging
             logging.warning(f"Alchemy token discovery failed on {chain}: {e}")
             return []
 
@@ -357,12 +538,7 @@ class EVMWalletTracker:
 
             # Also check hardcoded tokens (catches anything Alchemy misses)
             if chain in TRACKED_TOKENS:
-                for token_addr, (symbol, decimals) in TRACKED_TOKENS[chain].items():
-                    tasks.append(
-                        self._get_token_balance_task(
-                            address, chain, token_addr, symbol, decimals
-                        )
-                    )
+                tasks.append(self._get_tracked_token_balances_task(address, chain))
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -406,33 +582,28 @@ class EVMWalletTracker:
                 decimals=config.native_decimals,
             )
 
-    async def _get_token_balance_task(
+    async def _get_tracked_token_balances_task(
         self,
         address: str,
         chain: str,
-        token_address: str,
-        symbol: str,
-        decimals: int,
-    ) -> TokenBalance:
-        """Task wrapper for token balance fetch."""
+    ) -> List[TokenBalance]:
+        """Task wrapper for the TRACKED_TOKENS balance fetch on one chain."""
+        tokens = TRACKED_TOKENS[chain]
         try:
-            amount = await self.get_token_balance(address, chain, token_address, decimals)
-            return TokenBalance(
-                symbol=symbol,
-                chain=chain,
-                amount=amount,
-                decimals=decimals,
-                contract_address=token_address,
-            )
+            amounts = await self.get_token_balances(address, chain, tokens)
         except Exception as e:
-            print(f"Warning: Failed to get {symbol} on {chain}: {e}")
-            return TokenBalance(
-                symbol=symbol,
+            print(f"Warning: Failed to get tracked tokens on {chain}: {e}")
+            return []
+        return [
+            TokenBalance(
+                symbol=tokens[token_address][0],
                 chain=chain,
-                amount=Decimal("0"),
-                decimals=decimals,
+                amount=amount,
+                decimals=tokens[token_address][1],
                 contract_address=token_address,
             )
+            for token_address, amount in amounts.items()
+        ]
 
     async def get_wallet_summary(self, address: str) -> WalletSummary:
         """Get complete wallet summary for an address."""
@@ -452,13 +623,12 @@ class EVMWalletTracker:
         )
 
     async def get_all_wallets_summary(self) -> Dict[str, WalletSummary]:
-        """Get summaries for all configured addresses."""
-        summaries = {}
+        """Get summaries for all configured addresses.
 
-        for address in self.addresses:
-            summaries[address] = await self.get_wallet_summary(address)
-
-        return summaries
+        Addresses are fetched concurrently so their calls share batches.
+        """
+        results = await asyncio.gather(*(self.get_wallet_summary(a) for a in self.addresses))
+        return dict(zip(self.addresses, results))
 
     async def discover_related_wallets(
         self,
@@ -552,7 +722,6 @@ class EVMWalletTracker:
                                 })
 
                     except Exception as e:
-                        import logging
                         logging.warning(f"Transfer trace failed for {source_addr[:10]} on {chain}: {e}")
 
         # Filter by minimum transfers and check balances
@@ -38,10 +38,11 @@ import subprocess
 import json
 import logging
 import re
+import fnmatch
 import hashlib
 import time
 from datetime import datetime, timedelta
-from pathlib import Path
+from pathlib import Path, PurePath
 from mcp.server.fastmcp import FastMCP
 import psutil
 import httpx
@@ -120,6 +121,9 @@ try:
         get_all_circuit_breaker_states,
         HealthChecker,
         RateLimiter,
+        AsyncRateLimiter,
+        AsyncCircuitBreaker,
+        get_async_circuit_breaker,
         RetryError,
         CircuitBreakerOpenError
     )
@@ -140,6 +144,7 @@ try:
         get_cache,
         get_alert_manager,
         init_metrics_persistence,
+        enable_cache_disk_tier,
         create_file_alert_handler
     )
     SKIPPY_LIBS_AVAILABLE = True
@@ -161,6 +166,20 @@ except ImportError as e:
         except:
             return default or {}
 
+# Streaming reader for read_file (falls back to whole-file reads)
+try:
+    from skippy_file_reader import iter_lines, read_byte_range
+    SKIPPY_FILE_READER_AVAILABLE = True
+except ImportError:
+    SKIPPY_FILE_READER_AVAILABLE = False
+
+# Persistent content index for the search tools (falls back to tree walks)
+try:
+    from skippy_search_index import get_search_index
+    SKIPPY_SEARCH_INDEX_AVAILABLE = True
+except ImportError:
+    SKIPPY_SEARCH_INDEX_AVAILABLE = False
+
 # Suppress Google auth warnings at the environment level
 os.environ['PYTHONWARNINGS'] = 'ignore'
 warnings.filterwarnings("ignore")
@@ -231,7 +250,7 @@ if SKIPPY_RESILIENCE_AVAILABLE:
         success_threshold=2,
         timeout=60.0
     ))
-    _http_cb = get_circuit_breaker("http-api", CircuitBreakerConfig(
+    _http_cb = get_async_circuit_breaker("http-api", CircuitBreakerConfig(
         failure_threshold=10,  # More lenient for general HTTP
         success_threshold=2,
         timeout=60.0
@@ -242,8 +261,9 @@ if SKIPPY_RESILIENCE_AVAILABLE:
     _google_photos_limiter = RateLimiter(max_calls=30, period=60.0)  # 30 req/min
     _github_limiter = RateLimiter(max_calls=30, period=60.0)  # 30 req/min
     _pexels_limiter = RateLimiter(max_calls=200, period=3600.0)  # 200 req/hour
-    _http_limiter = RateLimiter(max_calls=100, period=60.0)  # 100 req/min for general HTTP
-    _brave_limiter = RateLimiter(max_calls=1, period=1.5)  # Brave Free tier: 1 req/1.5s (safe margin)
+    # Async tools use non-blocking limiters so throttling never stalls the event loop
+    _http_limiter = AsyncRateLimiter(max_calls=100, period=60.0)  # 100 req/min for general HTTP
+    _brave_limiter = AsyncRateLimiter(max_calls=1, period=1.5)  # Brave Free tier: 1 req/1.5s (safe margin)
 
     # Global health checker
     _health_checker = HealthChecker()
@@ -331,6 +351,14 @@ if SKIPPY_RESILIENCE_AVAILABLE:
             logger.warning(f"Metrics persistence init failed: {e}")
             _metrics_persistence = None
 
+        # Persist the graceful cache so stale fallbacks survive restarts
+        try:
+            enable_cache_disk_tier(
+                max_bytes=int(os.getenv("SKIPPY_CACHE_DISK_MB", "256")) * 1024 * 1024
+            )
+        except Exception as e:
+            logger.warning(f"Graceful cache disk tier init failed: {e}")
+
         # Alert on circuit breaker state changes
         def _cb_alert_on_open(service_name: str):
             _alert_manager.alert(
@@ -527,10 +555,15 @@ async def resilient_async_api_call(
     """
     Execute an async API call with circuit breaker, rate limiting, and retry.
 
+    Nothing here blocks the event loop: AsyncRateLimiter waits with
+    asyncio.sleep(), a legacy RateLimiter is waited on in a worker thread,
+    and the circuit breaker is consulted before every attempt so retries
+    stop as soon as it opens.
+
     Args:
         func: Async function to call
-        circuit_breaker: CircuitBreaker instance (optional)
-        rate_limiter: RateLimiter instance (optional)
+        circuit_breaker: AsyncCircuitBreaker (or CircuitBreaker) instance (optional)
+        rate_limiter: AsyncRateLimiter (or RateLimiter) instance (optional)
         max_retries: Maximum retry attempts (default 3)
         retry_delay: Base delay between retries in seconds (default 1.0)
         service_name: Name of the service for logging
@@ -543,18 +576,12 @@ async def resilient_async_api_call(
         CircuitBreakerOpenError: If circuit breaker is open
         RetryError: If all retries exhausted
     """
-    import asyncio
-
     # Start request tracing
     trace = None
     if _request_tracer and SKIPPY_ADVANCED_RESILIENCE:
         trace = _request_tracer.start_trace(service_name, operation_name)
 
-    # Apply rate limiting
-    if rate_limiter and SKIPPY_RESILIENCE_AVAILABLE:
-        rate_limiter._wait_if_needed()
-
-    # Check circuit breaker
+    # Fail fast before spending a rate limit token on an open circuit
     if circuit_breaker and SKIPPY_RESILIENCE_AVAILABLE:
         if not circuit_breaker._can_execute():
             if trace:
@@ -563,6 +590,20 @@ async def resilient_async_api_call(
                 f"Circuit breaker for '{service_name}' is OPEN. Service unavailable."
             )
 
+    # Apply rate limiting
+    if rate_limiter and SKIPPY_RESILIENCE_AVAILABLE:
+        if isinstance(rate_limiter, AsyncRateLimiter):
+            await rate_limiter.acquire()
+        else:
+            await asyncio.get_running_loop().run_in_executor(None, rate_limiter._wait_if_needed)
+
+    async_breaker = (
+        circuit_breaker
+        if SKIPPY_RESILIENCE_AVAILABLE and isinstance(circuit_breaker, AsyncCircuitBreaker)
+        else None
+    )
+    sync_breaker = circuit_breaker if SKIPPY_RESILIENCE_AVAILABLE and not async_breaker else None
+
     # Execute with retry logic
     last_exception = None
     attempt_count = 0
@@ -570,11 +611,12 @@ async def resilient_async_api_call(
     for attempt in range(1, max_retries + 1):
         attempt_count = attempt
         try:
-            result = await func(*args, **kwargs)
-
-            # Record success with circuit breaker
-            if circuit_breaker and SKIPPY_RESILIENCE_AVAILABLE:
-                circuit_breaker._on_success()
+            if async_breaker:
+                result = await async_breaker.call(func, *args, **kwargs)
+            else:
+                result = await func(*args, **kwargs)
+                if sync_breaker:
+                    sync_breaker._on_success()
 
             # End tracing
             if trace:
@@ -583,10 +625,17 @@ async def resilient_async_api_call(
 
             return result
 
+        except CircuitBreakerOpenError:
+            # Circuit opened during our retries - stop hammering the service
+            if trace:
+                trace.attempt_count = attempt_count
+                _request_tracer.end_trace(trace, success=False, error="Circuit breaker open")
+            raise
+
         except (ConnectionError, TimeoutError, OSError, httpx.ConnectError, httpx.TimeoutException) as e:
             last_exception = e
-            if circuit_breaker and SKIPPY_RESILIENCE_AVAILABLE:
-                circuit_breaker._on_failure()
+            if sync_breaker:
+                sync_breaker._on_failure()
 
             if attempt < max_retries:
                 delay = retry_delay * (2 ** (attempt - 1))  # Exponential backoff
@@ -610,8 +659,8 @@ async def resilient_async_api_call(
 
         except Exception as e:
             # Non-retryable error
-            if circuit_breaker and SKIPPY_RESILIENCE_AVAILABLE:
-                circuit_breaker._on_failure()
+            if sync_breaker:
+                sync_breaker._on_failure()
             if trace:
                 trace.attempt_count = attempt_count
                 _request_tracer.end_trace(trace, success=False, error=str(e))
@@ -631,21 +680,79 @@ async def resilient_async_api_call(
         raise last_exception
 
 
+def _search_candidates(root, query: str, file_pattern: str = "*", recursive: bool = True, regex: bool = False):
+    """
+    Get files under root that may contain query.
+
+    Uses the persistent content index to narrow the file set when available,
+    otherwise falls back to a plain glob walk. Callers must still verify matches.
+    """
+    root = Path(root).expanduser()
+    if SKIPPY_SEARCH_INDEX_AVAILABLE:
+        try:
+            candidates = get_search_index().candidates(
+                root, query, regex=regex, file_pattern=file_pattern, recursive=recursive
+            )
+            index_root = Path(os.path.abspath(root))
+            return [f for f in candidates if _matches_file_pattern(f, index_root, file_pattern)]
+        except Exception as e:
+            logger.warning(f"Search index unavailable for {root}, scanning files: {e}")
+
+    files = root.rglob(file_pattern) if recursive else root.glob(file_pattern)
+    return sorted(f for f in files if f.is_file())
+
+
+def _matches_file_pattern(file_path: Path, root: Path, file_pattern: str) -> bool:
+    """Match file_pattern against a path under root the way Path.rglob does."""
+    if file_pattern in ("", "*"):
+        return True
+    try:
+        rel_parts = file_path.relative_to(root).parts
+    except ValueError:
+        return False
+    pattern_parts = tuple(part for part in PurePath(file_pattern).parts if part != "**")
+    if len(pattern_parts) > len(rel_parts):
+        return False
+    tail = rel_parts[len(rel_parts) - len(pattern_parts):]
+    return all(fnmatch.fnmatchcase(part, pat) for part, pat in zip(tail, pattern_parts))
+
+
+def _record_search_matches(count: int):
+    """Feed verified match counts back into the index hit-rate statistics."""
+    if SKIPPY_SEARCH_INDEX_AVAILABLE:
+        try:
+            get_search_index().record_matches(count)
+        except Exception:
+            pass
+
+
 # ============================================================================
 # FILE OPERATIONS TOOLS
 # ============================================================================
 
 @mcp.tool()
-def read_file(file_path: str, start_line: int = 0, num_lines: int = -1) -> str:
+def read_file(
+    file_path: str,
+    start_line: int = 0,
+    num_lines: int = -1,
+    byte_offset: int = -1,
+    num_bytes: int = 65536
+) -> str:
     """Read contents of a file with security validation.
 
     SECURITY: File paths are validated to prevent directory traversal attacks
     and unauthorized file access.
 
+    Lines are streamed, and deep pages seek through a cached sparse
+    line-offset index, so memory use does not grow with file size.
+
     Args:
         file_path: Absolute path to the file to read
         start_line: Line number to start reading from (0-indexed, default 0)
         num_lines: Number of lines to read (-1 for all lines, default -1)
+        byte_offset: Read a raw byte range starting here instead of lines
+            (-1 disables byte mode, default -1)
+        num_bytes: Number of bytes to read in byte mode (default 65536, max 1 MB)
 
     Returns:
         File contents or error message
@@ -681,6 +788,19 @@ def read_file(file_path: str, start_line: int = 0, num_lines: int = -1) -> str:
 
         logger.info(f"Reading file: {path}")
 
+        if byte_offset >= 0:
+            if SKIPPY_FILE_READER_AVAILABLE:
+                data = read_byte_range(str(path), byte_offset, num_bytes)
+            else:
+                with open(path, 'rb') as f:
+                    f.seek(byte_offset)
+                    data = f.read(max(0, min(num_bytes, 1024 * 1024)))
+            # Binary-safe: undecodable bytes are shown as \xNN escapes
+            return data.decode('utf-8', errors='backslashreplace')
+
+        if SKIPPY_FILE_READER_AVAILABLE:
+            return ''.join(iter_lines(str(path), start_line, num_lines))
+
         with open(path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
 
@@ -789,38 +909,121 @@ def list_directory(directory_path: str, pattern: str = "*", recursive: bool = Fa
 
 
 @mcp.tool()
-def search_files(directory_path: str, search_term: str, file_pattern: str = "*.py") -> str:
+def search_files(directory_path: str, search_term: str, file_pattern: str = "*.py", use_regex: bool = False) -> str:
     """Search for text within files in a directory.
 
+    Candidate files are narrowed with the persistent content index, so
+    repeated searches only re-read files that can contain the term.
+
     Args:
         directory_path: Absolute path to the directory to search
-        search_term: Text to search for
+        search_term: Text (or regular expression) to search for
         file_pattern: Glob pattern for files to search (default '*.py')
+        use_regex: Treat search_term as a regular expression (default False)
     """
     try:
         path = Path(directory_path).expanduser()
         if not path.exists():
             return f"Error: Directory not found: {directory_path}"
 
+        if use_regex:
+            try:
+                matcher = re.compile(search_term).search
+            except re.error as e:
+                return f"Error: Invalid regular expression: {e}"
+        else:
+            def matcher(line):
+                return search_term in line
+
         matches = []
-        for file_path in path.rglob(file_pattern):
-            if file_path.is_file():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        for line_num, line in enumerate(f, 1):
-                            if search_term in line:
-                                matches.append(f"{file_path}:{line_num}: {line.strip()}")
-                except (UnicodeDecodeError, PermissionError):
-                    continue
+        matched_files = 0
+        for file_path in _search_candidates(path, search_term, file_pattern, regex=use_regex):
+            found = False
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    for line_num, line in enumerate(f, 1):
+                        if matcher(line):
+                            found = True
+                            matches.append(f"{file_path}:{line_num}: {line.strip()}")
+                            if len(matches) >= 100:
+                                break
+            except (UnicodeDecodeError, PermissionError, FileNotFoundError):
+                continue
+            matched_files += found
+            if len(matches) >= 100:  # Limit to first 100 matches
+                break
+
+        _record_search_matches(matched_files)
 
         if not matches:
             return f"No matches found for '{search_term}' in {file_pattern} files"
 
-        return '\n'.join(matches[:100])  # Limit to first 100 matches
+        return '\n'.join(matches)
     except Exception as e:
         return f"Error searching files: {str(e)}"
 
 
+@mcp.tool()
+def reindex(directory_path: str = SKIPPY_PATH, full: bool = False) -> str:
+    """Refresh the persistent search index for a directory tree.
+
+    Args:
+        directory_path: Directory to (re)index (default: Skippy base path)
+        full: Drop existing entries and rebuild from scratch (default False)
+    """
+    try:
+        if not SKIPPY_SEARCH_INDEX_AVAILABLE:
+            return "❌ Skippy search index not available"
+
+        path = Path(directory_path).expanduser()
+        if not path.is_dir():
+            return f"Error: Directory not found: {directory_path}"
+
+        index = get_search_index()
+        if full:
+            result = index.rebuild(path)
+        else:
+            result = index.refresh(path, force=True)
+
+        return (
+            f"✅ {'Rebuilt' if full else 'Refreshed'} search index for {result['root']}\n"
+            f"  • Indexed: {result['indexed']} files\n"
+            f"  • Unchanged: {result['unchanged']} files\n"
+            f"  • Removed: {result['removed']} files\n"
+            f"  • Time: {result['seconds']:.2f}s"
+        )
+    except Exception as e:
+        return f"❌ Error reindexing: {str(e)}"
+
+
+@mcp.tool()
+def search_index_stats() -> str:
+    """Get persistent search index statistics (size, hit rates, build times)."""
+    try:
+        if not SKIPPY_SEARCH_INDEX_AVAILABLE:
+            return "❌ Skippy search index not available"
+
+        stats = get_search_index().get_statistics()
+
+        return f"""🔎 Search Index Statistics
+
+Database: {stats['db_path']} ({stats['db_size_mb']:.2f} MB)
+Files: {stats['total_files']} (indexed {stats['indexed_files']}, oversize {stats['oversize_files']}, binary {stats['binary_files']})
+Postings: {stats['postings']:,}
+Roots: {stats['roots']}
+
+Queries: {stats['queries']} ({stats['narrowed_queries']} narrowed by index)
+Candidates Read: {stats['candidates']} of {stats['files_in_scope']} files in scope
+Skip Rate: {stats['skip_rate']:.1f}%
+Hit Rate: {stats['hit_rate']:.1f}%
+
+Refreshes: {stats['refreshes']} (last {stats['last_refresh_seconds']:.2f}s, total {stats['total_refresh_seconds']:.2f}s)
+Last Refresh: {stats['last_refresh'] or 'never'}
+"""
+    except Exception as e:
+        return f"❌ Error getting search index stats: {str(e)}"
+
+
 @mcp.tool()
 def get_file_info(file_path: str) -> str:
     """Get detailed information about a file or directory.
@@ -1486,20 +1689,29 @@ def search_skippy_scripts(keyword: str, category: str = "") -> str:
             search_path = category_path
 
         matches = []
-        for script_file in search_path.rglob('*.sh') + search_path.rglob('*.py'):
-            # Search in filename
+        scripts = sorted(list(search_path.rglob('*.sh')) + list(search_path.rglob('*.py')))
+
+        # Search in filename
+        for script_file in scripts:
             if keyword.lower() in script_file.name.lower():
                 matches.append(f"📄 {script_file.relative_to(Path(SCRIPTS_PATH))}")
-                continue
 
-            # Search in file content
-            try:
-                with open(script_file, 'r', encoding='utf-8') as f:
-                    content = f.read(500)  # Read first 500 chars for description
-                    if keyword.lower() in content.lower():
-                        matches.append(f"📄 {script_file.relative_to(Path(SCRIPTS_PATH))}")
-            except (UnicodeDecodeError, PermissionError):
-                continue
+        # Search in file content, only reading files the index says can match
+        name_matches = set(matches)
+        for pattern in ('*.sh', '*.py'):
+            for script_file in _search_candidates(search_path, keyword, pattern):
+                entry = f"📄 {script_file.relative_to(Path(SCRIPTS_PATH))}"
+                if entry in name_matches:
+                    continue
+                try:
+                    with open(script_file, 'r', encoding='utf-8') as f:
+                        content = f.read(500)  # Read first 500 chars for description
+                        if keyword.lower() in content.lower():
+                            matches.append(entry)
+                except (UnicodeDecodeError, PermissionError, FileNotFoundError):
+                    continue
+
+        _record_search_matches(len(matches) - len(name_matches))
 
         if not matches:
             return f"No scripts found matching '{keyword}'" + (f" in category '{category}'" if category else "")
@@ -1603,7 +1815,7 @@ def search_protocols(keyword: str) -> str:
         protocols_path = Path(CONVERSATIONS_PATH)
         matches = []
 
-        for protocol_file in protocols_path.glob('*protocol*.md'):
+        for protocol_file in _search_candidates(protocols_path, keyword, '*protocol*.md', recursive=False):
             try:
                 with open(protocol_file, 'r', encoding='utf-8') as f:
                     content = f.read()
@@ -1612,9 +1824,11 @@ def search_protocols(keyword: str) -> str:
                         lines = content.split('\n')[:5]
                         preview = ' '.join(lines).replace('#', '').strip()[:100]
                         matches.append(f"📋 {protocol_file.name}\n   {preview}...")
-            except (UnicodeDecodeError, PermissionError):
+            except (UnicodeDecodeError, PermissionError, FileNotFoundError):
                 continue
 
+        _record_search_matches(len(matches))
+
         if not matches:
             return f"No protocols found matching '{keyword}'"
 
@@ -1678,7 +1892,7 @@ def search_conversations(keyword: str, limit: int = 5) -> str:
         conversations_path = Path(CONVERSATIONS_PATH)
         matches = []
 
-        for conv_file in conversations_path.glob('*.md'):
+        for conv_file in _search_candidates(conversations_path, keyword, '*.md', recursive=False):
             if 'protocol' in conv_file.name.lower():
                 continue  # Skip protocols, focus on session transcripts
 
@@ -1690,9 +1904,11 @@ def search_conversations(keyword: str, limit: int = 5) -> str:
                         lines = content.split('\n')[:10]
                         date_line = next((l for l in lines if 'Date' in l or '202' in l), 'Date unknown')
                         matches.append((conv_file.name, date_line))
-            except (UnicodeDecodeError, PermissionError):
+            except (UnicodeDecodeError, PermissionError, FileNotFoundError):
                 continue
 
+        _record_search_matches(len(matches))
+
         if not matches:
             return f"No conversation transcripts found matching '{keyword}'"
 
@@ -3843,6 +4059,11 @@ Duration Statistics:
   • Avg: {summary.get('duration', {}).get('avg', 0):.3f}s
   • Total: {summary.get('duration', {}).get('total', 0):.3f}s
 
+Latency Percentiles:
+  • p50: {summary.get('duration', {}).get('p50', 0) * 1000:.2f}ms
+  • p95: {summary.get('duration', {}).get('p95', 0) * 1000:.2f}ms
+  • p99: {summary.get('duration', {}).get('p99', 0) * 1000:.2f}ms
+
 Recent Metrics:
 """
         for metric in summary.get('recent_metrics', [])[-3:]:
@@ -3943,10 +4164,33 @@ def skippy_cache_stats() -> str:
 Total Entries: {stats.get('total_entries', 0)}
 Valid Entries: {stats.get('valid_entries', 0)}
 Stale Entries: {stats.get('stale_entries', 0)}
-Total Hits: {stats.get('total_hits', 0)}
 Capacity Used: {stats.get('capacity_percent', 0):.1f}%
+
+Hits: {stats.get('total_hits', 0)} ({stats.get('stale_hits', 0)} stale)
+Misses: {stats.get('misses', 0)}
+Hit Rate: {stats.get('hit_rate', 0):.1f}%
+Evictions: {stats.get('evictions', 0)}
+Expirations: {stats.get('expirations', 0)}
 """
 
+        size_mb = stats.get('total_bytes', 0) / (1024 * 1024)
+        max_bytes = stats.get('max_bytes')
+        if max_bytes:
+            output += f"Memory: {size_mb:.2f} MB / {max_bytes / (1024 * 1024):.2f} MB\n"
+        else:
+            output += f"Memory: {size_mb:.2f} MB\n"
+
+        disk = stats.get('disk')
+        if disk and 'error' not in disk:
+            output += f"""
+Disk Tier: {disk['entries']} entries, {disk['total_bytes'] / (1024 * 1024):.2f} MB / {disk['max_bytes'] / (1024 * 1024):.0f} MB
+Disk Hits: {stats.get('disk_hits', 0)}
+Spilled: {stats.get('spills', 0)}
+Pending Flush: {stats.get('dirty_entries', 0)}
+"""
+        elif disk:
+            output += f"\nDisk Tier: ❌ {disk['error']}\n"
+
         return output
 
     except Exception as e:
@@ -3973,11 +4217,7 @@ def skippy_cache_clear(pattern: str = "") -> str:
         cache = get_cache()
 
         if pattern:
-            # Get count before
-            stats_before = cache.get_statistics()
-            cache.invalidate_pattern(pattern)
-            stats_after = cache.get_statistics()
-            cleared = stats_before['total_entries'] - stats_after['total_entries']
+            cleared = cache.invalidate_pattern(pattern)
             return f"✅ Cleared {cleared} cache entries matching '{pattern}'"
         else:
             stats = cache.get_statistics()
@@ -9896,7 +10136,7 @@ def scanner_launch_gui() -> str:
 # =============================================================================
 
 @mcp.tool()
-def rate_limited_web_search(
+async def rate_limited_web_search(
     query: str,
     num_results: int = 5
 ) -> str:
@@ -9913,14 +10153,12 @@ def rate_limited_web_search(
     Returns:
         JSON with search results or error message
     """
-    import time
-
-    # Apply rate limiting if available
+    # Apply rate limiting if available (waits without blocking other tools)
     if _brave_limiter:
-        _brave_limiter._wait_if_needed()
+        await _brave_limiter.acquire()
     else:
         # Fallback: simple delay
-        time.sleep(1.5)
+        await asyncio.sleep(1.5)
 
     try:
         num_results = min(num_results, 10)
@@ -9929,8 +10167,8 @@ def rate_limited_web_search(
         search_url = "https://html.duckduckgo.com/html/"
         params = {"q": query}
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(search_url, data=params)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.post(search_url, data=params)
             response.raise_for_status()
 
         # Parse results from HTML
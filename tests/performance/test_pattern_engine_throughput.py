@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the skippy_brain PatternEngine
+
+Generates a synthetic week of logs from a fixed set of message templates
+and measures how many events per second the engine analyzes, compared
+with the previous regex-per-event grouping and 20-event look-ahead
+correlation scan.
+"""
+
+import random
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+
+from skippy_brain.collectors import LogEvent
+from skippy_brain.patterns import PatternEngine, TemplateMiner
+
+
+TEMPLATES = [
+    ("auth", "Failed password for user {user} from {ip} port {port} ssh2"),
+    ("auth", "Accepted publickey for {user} from {ip} port {port}"),
+    ("fail2ban", "[sshd] Ban {ip}"),
+    ("mcp", "Tool {tool} failed after {ms}ms: connection reset by peer"),
+    ("mcp", "Request {hash} timed out waiting for {tool}"),
+    ("wordpress", "Backup of {path} failed: disk quota exceeded"),
+    ("wordpress", "Plugin {tool} raised warning in {path} on line {port}"),
+    ("journald", "{unit}.service: Main process exited, code=exited, status={port}/FAILURE"),
+    ("journald", "{unit}.service: Failed with result 'exit-code'."),
+    ("maintenance", "Cleanup removed {port} files from {path}"),
+    ("security", "BLOCKED: rm -rf {path} by hook {tool}"),
+    ("session", "Session {hash} warning: idle for {ms} seconds"),
+]
+USERS = ["root", "admin", "dave", "deploy", "www-data", "git"]
+TOOLS = ["wp_cli", "gmail_send", "github_pr", "fetch_url", "db_query"]
+UNITS = ["nginx", "php-fpm", "mysql", "redis", "cron"]
+
+
+def synthetic_events(count, seed=42):
+    """Events spread over 7 days, drawn from TEMPLATES with random parameters."""
+    rng = random.Random(seed)
+    start = datetime.now() - timedelta(days=7)
+    step = timedelta(days=7) / count
+    events = []
+    for i in range(count):
+        category, template = rng.choice(TEMPLATES)
+        message = template.format(
+            user=rng.choice(USERS),
+            ip=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            port=rng.randint(1, 65535),
+            tool=rng.choice(TOOLS),
+            ms=rng.randint(1, 30000),
+            hash=f"{rng.getrandbits(48):012x}",
+            path=f"/var/www/site{rng.randint(1, 9)}/wp-content/{rng.choice(TOOLS)}.php",
+            unit=rng.choice(UNITS),
+        )
+        events.append(LogEvent(
+            timestamp=(start + step * i).isoformat(),
+            source="app",
+            category=category,
+            level=rng.choice(["error", "error", "warning", "info"]),
+            message=message,
+        ))
+    return events
+
+
+def legacy_group_and_correlate(events):
+    """The previous grouping/correlation algorithms, for comparison."""
+    groups = defaultdict(list)
+    for event in events:
+        normalized = re.sub(r'\d+', 'N', event.message)
+        normalized = re.sub(r'/[\w/.-]+', '/PATH', normalized)
+        normalized = re.sub(r'\b[a-f0-9]{8,}\b', 'HASH', normalized)
+        groups[normalized[:100]].append(event)
+
+    sorted_events = sorted(events, key=lambda e: e.timestamp)
+    correlations = defaultdict(int)
+    for i, event_a in enumerate(sorted_events):
+        if event_a.level not in ('error', 'warning'):
+            continue
+        for event_b in sorted_events[i+1:i+20]:
+            if event_b.level not in ('error', 'warning'):
+                continue
+            if event_a.category != event_b.category:
+                key = f"{event_a.category}:{event_a.level} -> {event_b.category}:{event_b.level}"
+                correlations[key] += 1
+    return groups, correlations
+
+
+class TestPatternEngineThroughput:
+    """PatternEngine throughput on synthetic logs"""
+
+    @pytest.mark.performance
+    @pytest.mark.benchmark
+    def test_analyze_throughput(self, tmp_path):
+        """Measure events/second for a full analyze() over a week of logs"""
+        events = synthetic_events(100_000)
+        engine = PatternEngine()
+        engine.patterns_file = tmp_path / "patterns.json"
+
+        start = time.perf_counter()
+        patterns = engine.analyze(events)
+        duration = time.perf_counter() - start
+        rate = len(events) / duration
+
+        start = time.perf_counter()
+        legacy_group_and_correlate(events)
+        legacy_duration = time.perf_counter() - start
+
+        print(f"\n[PERF] PatternEngine.analyze: {rate:,.0f} events/s "
+              f"({duration:.2f}s for {len(events):,} events, {len(patterns)} patterns)")
+        print(f"[PERF] legacy grouping+correlation alone: "
+              f"{len(events) / legacy_duration:,.0f} events/s")
+
+        assert rate > 20_000, f"analyze() ran at {rate:,.0f} events/s (expected >20k)"
+
+    @pytest.mark.performance
+    @pytest.mark.benchmark
+    def test_template_mining_throughput(self):
+        """Measure TemplateMiner.add() rate and template count"""
+        events = synthetic_events(100_000, seed=7)
+        miner = TemplateMiner()
+
+        start = time.perf_counter()
+        for event in events:
+            miner.add(event.message)
+        duration = time.perf_counter() - start
+        rate = len(events) / duration
+
+        print(f"\n[PERF] TemplateMiner.add: {rate:,.0f} messages/s, "
+              f"{len(miner.clusters)} templates from {len(TEMPLATES)} generators")
+
+        # Parameters must not explode the template count
+        assert len(miner.clusters) <= 3 * len(TEMPLATES)
+        assert rate > 50_000, f"mining ran at {rate:,.0f} messages/s (expected >50k)"
+
+    @pytest.mark.performance
+    @pytest.mark.benchmark
+    def test_incremental_run_cost(self, tmp_path):
+        """Re-analyzing a window with few new events should stay cheap"""
+        events = synthetic_events(50_000)
+        engine = PatternEngine()
+        engine.patterns_file = tmp_path / "patterns.json"
+
+        start = time.perf_counter()
+        engine.analyze(events[:-500])
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.analyze(events)
+        warm = time.perf_counter() - start
+        print(f"\n[PERF] analyze of {len(events):,} events: cold {cold:.3f}s, "
+              f"warm with 500 new {warm:.3f}s ({len(events) / warm:,.0f} events/s)")
+
+        # Templates exist and correlations only consume the new events
+        assert warm < cold * 0.75, f"warm run {warm:.2f}s vs cold {cold:.2f}s"
+        assert warm < 2.0, f"incremental analyze took {warm:.2f}s (expected <2s)"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-m", "performance"])
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for skippy_performance instrumentation overhead
+
+Measures what @monitor_performance adds to a trivial function call in
+sampling mode (histogram only) versus full mode (psutil + JSON file).
+"""
+
+import time
+import pytest
+
+import skippy_performance
+from skippy_performance import PerformanceMonitor, monitor_performance
+
+
+def _per_call_us(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+@pytest.fixture
+def use_monitor(monkeypatch, tmp_path):
+    """Swap the global monitor used by the decorator."""
+    def install(**kwargs):
+        instance = PerformanceMonitor(metrics_dir=str(tmp_path), **kwargs)
+        monkeypatch.setattr(skippy_performance, "_global_monitor", instance)
+        return instance
+    return install
+
+
+class TestPerformanceMonitorOverhead:
+    """Decorator overhead benchmarks"""
+
+    @pytest.mark.performance
+    @pytest.mark.benchmark
+    def test_sampling_decorator_overhead(self, use_monitor):
+        """Measure per-call overhead of the decorator in sampling mode"""
+        instance = use_monitor(mode="sampling", sample_rate=0.0)
+
+        def bare():
+            return 1
+
+        decorated = monitor_performance(name="bench_op")(bare)
+
+        iterations = 50000
+        baseline = _per_call_us(bare, iterations)
+        instrumented = _per_call_us(decorated, iterations)
+        overhead = instrumented - baseline
+
+        print(f"\n[PERF] bare call: {baseline:.3f}us, decorated (sampling): "
+              f"{instrumented:.3f}us, overhead {overhead:.3f}us/call")
+
+        assert instance.get_summary("bench_op")["total_executions"] == iterations
+        assert overhead < 10, f"decorator overhead {overhead:.2f}us/call (expected <10us)"
+
+    @pytest.mark.performance
+    @pytest.mark.benchmark
+    def test_sampling_vs_full_mode(self, use_monitor, tmp_path):
+        """Compare sampling mode against full per-call capture"""
+        def work():
+            return sum(range(100))
+
+        use_monitor(mode="full")
+        full = monitor_performance(name="bench_full")(work)
+        full_us = _per_call_us(full, 200)
+        full_files = len(list(tmp_path.glob("bench_full_*.json")))
+
+        use_monitor(mode="sampling", sample_rate=0.01)
+        sampled = monitor_performance(name="bench_sampled")(work)
+        sampled_us = _per_call_us(sampled, 200)
+
+        print(f"\n[PERF] full mode: {full_us:.1f}us/call, "
+              f"sampling mode: {sampled_us:.1f}us/call "
+              f"({full_us / sampled_us:.0f}x faster)")
+
+        assert full_files >= 1
+        assert sampled_us < full_us
+
+    @pytest.mark.performance
+    @pytest.mark.benchmark
+    def test_histogram_memory_is_fixed(self, use_monitor):
+        """Histogram size does not grow with the number of calls"""
+        instance = use_monitor(mode="sampling", sample_rate=0.0)
+        for i in range(100000):
+            instance.record_duration("fixed_mem", (i % 1000) / 1000)
+
+        hist = instance.histograms["fixed_mem"]
+        print(f"\n[PERF] 100k samples in {len(hist.counts)} buckets, "
+              f"p99={hist.percentile(99) * 1000:.1f}ms")
+
+        assert len(hist.counts) == hist.NUM_BUCKETS
+        assert instance.metrics_history == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s", "-m", "performance"])
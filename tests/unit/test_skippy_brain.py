@@ -7,6 +7,8 @@ Tests cover:
 - SystemCollector, AppCollector, ClaudeCollector
 - PatternEngine and Pattern dataclass
 - PreventionGenerator and PreventionRule dataclass
+- LogTailer and EventStore (incremental ingestion)
+- TemplateMiner and CoOccurrenceCounter (streaming pattern state)
 """
 
 import json
@@ -23,9 +25,11 @@ from lib.python.skippy_brain import (
     ClaudeCollector,
     PatternEngine,
     PreventionGenerator,
+    EventStore,
+    LogTailer,
 )
 from lib.python.skippy_brain.collectors import LogEvent
-from lib.python.skippy_brain.patterns import Pattern
+from lib.python.skippy_brain.patterns import Pattern, TemplateMiner, CoOccurrenceCounter
 from lib.python.skippy_brain.prevention import PreventionRule
 
 
@@ -526,6 +530,196 @@ class TestPatternEngine:
         patterns = engine._detect_category_spikes([])
         assert patterns == []
 
+    def test_correlations_within_window(self):
+        """Test that A -> B correlations are counted within the time window."""
+        engine = PatternEngine(window_minutes=5)
+        base = datetime.now().replace(microsecond=0)
+        events = []
+        for i in range(3):
+            start = base + timedelta(hours=i)
+            events.append(LogEvent(timestamp=start.isoformat(), source="system",
+                                   category="mcp", level="error", message="down"))
+            events.append(LogEvent(timestamp=(start + timedelta(minutes=1)).isoformat(),
+                                   source="app", category="wordpress", level="error",
+                                   message="backup failed"))
+        # Outside the 5 minute window: not paired
+        events.append(LogEvent(timestamp=(base + timedelta(hours=2, minutes=30)).isoformat(),
+                               source="app", category="auth", level="error", message="late"))
+
+        patterns = engine._detect_correlations(events)
+        assert [p.name for p in patterns] == ["Correlation: mcp:error -> wordpress:error"]
+        assert patterns[0].frequency == 3
+
+    def test_pattern_state_persists_between_runs(self):
+        """Test that templates and correlation counts survive a restart."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = datetime.now().replace(microsecond=0)
+
+            def pair(offset_hours):
+                start = base + timedelta(hours=offset_hours)
+                return [
+                    LogEvent(timestamp=start.isoformat(), source="system",
+                             category="mcp", level="error", message="server 1 down"),
+                    LogEvent(timestamp=(start + timedelta(seconds=30)).isoformat(),
+                             source="app", category="wordpress", level="error",
+                             message="backup failed"),
+                ]
+
+            engine = PatternEngine()
+            engine.patterns_file = Path(tmpdir) / "patterns.json"
+            first_run = pair(0) + pair(1)
+            engine.analyze(first_run)
+
+            engine2 = PatternEngine()
+            engine2.patterns_file = Path(tmpdir) / "patterns.json"
+            # Old events are re-sent alongside the new ones; only new ones count
+            patterns = engine2.analyze(first_run + pair(2))
+            correlations = [p for p in patterns if p.id.startswith("corr_")]
+            assert len(correlations) == 1
+            assert correlations[0].frequency == 3
+            assert len(engine2.miner.clusters) == 2
+
+    def test_cluster_sizes_count_each_event_once(self):
+        """Test that re-analyzed events do not inflate cluster sizes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = datetime.now().replace(microsecond=0)
+            events = [
+                LogEvent(timestamp=(base + timedelta(minutes=i)).isoformat(), source="app",
+                         category="mcp", level="error", message=f"worker {i} crashed")
+                for i in range(4)
+            ]
+            engine = PatternEngine()
+            engine.patterns_file = Path(tmpdir) / "patterns.json"
+            engine.analyze(events)
+            engine.analyze(events)
+
+            (cluster,) = engine.miner.clusters.values()
+            assert cluster.size == 4
+
+            later = LogEvent(timestamp=(base + timedelta(hours=1)).isoformat(), source="app",
+                             category="mcp", level="error", message="worker 9 crashed")
+            patterns = engine.analyze(events + [later])
+            assert cluster.size == 5
+            recurring = [p for p in patterns if p.id.startswith("recurring_")]
+            assert recurring[0].frequency == 5
+
+    def test_late_stamped_events_counted_by_sequence(self):
+        """Test that sequence numbers, not timestamps, decide what is new."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = datetime.now().replace(microsecond=0)
+            events = [
+                LogEvent(timestamp=(base + timedelta(minutes=i)).isoformat(), source="app",
+                         category="mcp", level="error", message=f"worker {i} crashed", seq=i)
+                for i in range(3)
+            ]
+            engine = PatternEngine()
+            engine.patterns_file = Path(tmpdir) / "patterns.json"
+            engine.analyze(events)
+
+            late = LogEvent(timestamp=(base - timedelta(hours=1)).isoformat(), source="app",
+                            category="mcp", level="error", message="worker 7 crashed", seq=3)
+            engine.analyze(events + [late])
+            engine.analyze(events + [late])
+            (cluster,) = engine.miner.clusters.values()
+            assert cluster.size == 4
+
+
+class TestTemplateMiner:
+    """Tests for the Drain-style TemplateMiner."""
+
+    def test_similar_messages_share_template(self):
+        """Test that messages differing in parameters join one cluster."""
+        miner = TemplateMiner()
+        a = miner.add("User alice failed login from host web")
+        b = miner.add("User bob failed login from host db")
+        assert a.cluster_id == b.cluster_id
+        assert b.template_str == "User <*> failed login from host <*>"
+        assert b.size == 2
+
+    def test_different_messages_get_different_templates(self):
+        """Test that unrelated messages are kept apart."""
+        miner = TemplateMiner()
+        a = miner.add("Connection timeout")
+        b = miner.add("Authentication failed")
+        c = miner.add("Connection refused by peer")
+        assert len({a.cluster_id, b.cluster_id, c.cluster_id}) == 3
+
+    def test_numbers_and_paths_are_normalized(self):
+        """Test that numeric and path parameters do not split clusters."""
+        miner = TemplateMiner()
+        a = miner.add("Error in file /path/to/file.py line 42")
+        b = miner.add("Error in file /other/file.py line 99")
+        assert a.cluster_id == b.cluster_id
+        assert b.template_str == "Error in file /PATH line N"
+
+    def test_max_clusters(self):
+        """Test that no clusters are created beyond the limit."""
+        miner = TemplateMiner(max_clusters=2)
+        miner.add("alpha one")
+        miner.add("beta two three")
+        assert miner.add("gamma four five six") is None
+        assert len(miner.clusters) == 2
+
+    def test_round_trip(self):
+        """Test that a restored miner routes messages to the same clusters."""
+        miner = TemplateMiner()
+        cluster = miner.add("Disk sda full on host web")
+        restored = TemplateMiner()
+        restored.load_dict(json.loads(json.dumps(miner.to_dict())))
+        assert restored.add("Disk sdb full on host db").cluster_id == cluster.cluster_id
+
+
+class TestCoOccurrenceCounter:
+    """Tests for streaming co-occurrence counts."""
+
+    def _event(self, ts, category, level="error"):
+        return LogEvent(timestamp=ts.isoformat(), source="test", category=category,
+                        level=level, message="m")
+
+    def test_counts_pairs_and_skips_seen_events(self):
+        """Test counting within the window and the watermark."""
+        counter = CoOccurrenceCounter(window_seconds=60)
+        t = datetime.now().replace(microsecond=0)
+        events = [self._event(t, "a"), self._event(t + timedelta(seconds=10), "b")]
+
+        assert counter.update(events) == 2
+        assert counter.totals() == {"a:error -> b:error": 1}
+        # Re-feeding the same events changes nothing
+        assert counter.update(events) == 0
+        assert counter.totals() == {"a:error -> b:error": 1}
+
+    def test_late_stamped_event_counted_by_sequence(self):
+        """Test that an event ingested later but stamped earlier is not skipped."""
+        counter = CoOccurrenceCounter(window_seconds=60)
+        t = datetime.now().replace(microsecond=0)
+        first = self._event(t + timedelta(seconds=30), "a")
+        first.seq = 0
+        assert counter.update([first]) == 1
+
+        late = self._event(t, "b")
+        late.seq = 1
+        assert counter.update([first, late]) == 1
+        assert counter.totals() == {"a:error -> b:error": 1}
+        assert counter.update([first, late]) == 0
+
+        restored = CoOccurrenceCounter()
+        restored.load_dict(json.loads(json.dumps(counter.to_dict())))
+        assert restored.update([first, late]) == 0
+
+    def test_window_expires_old_events(self):
+        """Test that events outside the window are not paired."""
+        counter = CoOccurrenceCounter(window_seconds=60)
+        t = datetime.now().replace(microsecond=0)
+        counter.update([self._event(t, "a"), self._event(t + timedelta(minutes=5), "b")])
+        assert counter.totals() == {}
+
+    def test_info_events_ignored(self):
+        """Test that only errors and warnings take part."""
+        counter = CoOccurrenceCounter()
+        t = datetime.now().replace(microsecond=0)
+        counter.update([self._event(t, "a", "info"), self._event(t + timedelta(seconds=1), "b")])
+        assert counter.totals() == {}
+
 
 # =============================================================================
 # PreventionGenerator Tests
@@ -794,6 +988,246 @@ class TestBrain:
             assert errors[0].level == "error"
 
 
+# =============================================================================
+# Incremental Ingestion Tests
+# =============================================================================
+
+class TestLogTailer:
+    """Tests for LogTailer checkpointed reads."""
+
+    def test_reads_only_new_lines(self):
+        """Test that committed offsets skip already-read lines."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("one\ntwo\n")
+            tailer = LogTailer(Path(tmpdir) / "cp.json")
+
+            assert list(tailer.read_new_lines(log)) == ["one\n", "two\n"]
+            tailer.commit()
+
+            with open(log, "a") as f:
+                f.write("three\n")
+            assert list(tailer.read_new_lines(log)) == ["three\n"]
+
+    def test_checkpoint_survives_restart(self):
+        """Test that a new tailer resumes from the saved checkpoint."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("one\n")
+            checkpoint = Path(tmpdir) / "cp.json"
+            tailer = LogTailer(checkpoint)
+            list(tailer.read_new_lines(log))
+            tailer.commit()
+
+            with open(log, "a") as f:
+                f.write("two\n")
+            assert list(LogTailer(checkpoint).read_new_lines(log)) == ["two\n"]
+
+    def test_uncommitted_reads_are_repeated(self):
+        """Test that rollback re-reads lines from the last commit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("one\n")
+            tailer = LogTailer(Path(tmpdir) / "cp.json")
+            list(tailer.read_new_lines(log))
+            tailer.rollback()
+            assert list(tailer.read_new_lines(log)) == ["one\n"]
+
+    def test_partial_line_is_deferred(self):
+        """Test that a line without a newline is read once completed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("one\ntw")
+            tailer = LogTailer(Path(tmpdir) / "cp.json")
+            assert list(tailer.read_new_lines(log)) == ["one\n"]
+
+            with open(log, "a") as f:
+                f.write("o\n")
+            assert list(tailer.read_new_lines(log)) == ["two\n"]
+
+    def test_rotation_drains_old_file(self):
+        """Test that rotation reads the rest of the old file, then the new one."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("one\n")
+            tailer = LogTailer(Path(tmpdir) / "cp.json")
+            list(tailer.read_new_lines(log))
+            tailer.commit()
+
+            with open(log, "a") as f:
+                f.write("two\n")
+            log.rename(Path(tmpdir) / "app.log.1")
+            log.write_text("three\n")
+
+            assert list(tailer.read_new_lines(log)) == ["two\n", "three\n"]
+
+    def test_truncation_restarts_from_beginning(self):
+        """Test that a truncated file is re-read from offset 0."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("a long first line\n")
+            tailer = LogTailer(Path(tmpdir) / "cp.json")
+            list(tailer.read_new_lines(log))
+            tailer.commit()
+
+            with open(log, "w") as f:
+                f.write("new\n")
+            assert list(tailer.read_new_lines(log)) == ["new\n"]
+
+    def test_initial_read_is_bounded(self):
+        """Test that the first read of a large file only takes its tail."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_text("".join(f"line {i}\n" for i in range(1000)))
+            tailer = LogTailer(Path(tmpdir) / "cp.json", initial_bytes=100)
+            lines = list(tailer.read_new_lines(log))
+            assert 0 < len(lines) < 20
+            assert lines[-1] == "line 999\n"
+            assert all(line.startswith("line ") for line in lines)
+
+
+    def test_splits_only_on_newline(self):
+        """Test that Unicode line separators stay inside one record."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "app.log"
+            log.write_bytes("a\x0bb\x1cc\u2028d\r\ne\n".encode("utf-8"))
+            tailer = LogTailer(Path(tmpdir) / "cp.json")
+            assert list(tailer.read_new_lines(log)) == ["a\x0bb\x1cc\u2028d\r\n", "e\n"]
+
+    def test_tailed_lines_ignore_since(self):
+        """Test that late-appended lines with older timestamps are still collected."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "logs" / "monitoring" / "gmail_monitor.log"
+            log.parent.mkdir(parents=True)
+            log.write_text("[2026-01-25 12:44:17] [ERROR] late writer\n")
+
+            with patch.dict("os.environ", {"SKIPPY_HOME": tmpdir}):
+                collector = AppCollector()
+            since = datetime(2026, 2, 1)
+            assert collector._collect_gmail_monitor_logs(since) == []
+
+            collector.tailer = LogTailer(Path(tmpdir) / "cp.json")
+            events = collector._collect_gmail_monitor_logs(since)
+            assert [e.message for e in events] == ["late writer"]
+
+
+    def test_failing_line_does_not_wedge_the_source(self):
+        """Test that a line the collector chokes on is not re-read forever."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "logs" / "monitoring" / "gmail_monitor.log"
+            log.parent.mkdir(parents=True)
+            log.write_text(
+                "[2026-01-25 12:44:17] [ERROR] one\n"
+                "[2026-13-45 99:99:99] [ERROR] malformed date\n"
+                "[2026-01-25 12:44:19] [ERROR] three\n"
+            )
+            with patch.dict("os.environ", {"SKIPPY_HOME": tmpdir}):
+                collector = AppCollector()
+            collector.tailer = LogTailer(Path(tmpdir) / "cp.json")
+            since = datetime(2026, 1, 1)
+
+            assert [e.message for e in collector._collect_gmail_monitor_logs(since)] == ["one"]
+            assert [e.message for e in collector._collect_gmail_monitor_logs(since)] == ["three"]
+            assert collector._collect_gmail_monitor_logs(since) == []
+
+class TestEventStore:
+    """Tests for the day-partitioned EventStore."""
+
+    def _event(self, ts, message="msg"):
+        return LogEvent(timestamp=ts, source="app", category="test",
+                        level="error", message=message)
+
+    def test_append_partitions_by_day(self):
+        """Test that events are written to one file per day."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(Path(tmpdir))
+            store.append([
+                self._event("2026-03-01T10:00:00"),
+                self._event("2026-03-02T10:00:00"),
+                self._event("2026-03-02T11:00:00"),
+            ])
+            names = [p.name for p in store.partitions()]
+            assert names == ["events_20260301.jsonl", "events_20260302.jsonl"]
+
+    def test_load_since_and_limit(self):
+        """Test loading recent events with a time filter and limit."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(Path(tmpdir))
+            store.append([self._event(f"2026-03-0{d}T10:00:00", f"day {d}") for d in range(1, 6)])
+
+            recent = store.load(since=datetime(2026, 3, 3))
+            assert [e.message for e in recent] == ["day 3", "day 4", "day 5"]
+            assert [e.message for e in store.load(limit=2)] == ["day 4", "day 5"]
+
+    def test_prune_removes_old_partitions(self):
+        """Test that retention deletes whole partitions."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = EventStore(Path(tmpdir), retention_days=7)
+            old = (datetime.now() - timedelta(days=30)).isoformat()
+            store.append([self._event(old), self._event(datetime.now().isoformat())])
+
+            assert store.prune() == 1
+            assert len(store.partitions()) == 1
+
+
+class TestBrainIncremental:
+    """Tests for incremental Brain ingestion."""
+
+    def test_second_ingest_only_appends_new_events(self):
+        """Test that re-ingesting an unchanged log adds nothing."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            log = root / "logs" / "skippy_combined.log"
+            log.parent.mkdir()
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            log.write_text(f"[{now}] ERROR: disk full\n")
+
+            brain = Brain(data_dir=root / "learning")
+            brain.app_collector.skippy_root = root
+            with patch.object(SystemCollector, "collect", return_value=[]), \
+                 patch.object(ClaudeCollector, "collect", return_value=[]):
+                assert brain.ingest_all()["app"] == 1
+                assert brain.ingest_all()["app"] == 0
+
+                with open(log, "a") as f:
+                    f.write(f"[{now}] ERROR: disk still full\n")
+                assert brain.ingest_all()["app"] == 1
+
+            stored = brain.event_store.load()
+            assert [e.message for e in stored] == ["disk full", "disk still full"]
+            # Sequence numbers continue across restarts
+            assert [e.seq for e in stored] == [0, 1]
+            assert Brain(data_dir=root / "learning").next_seq == 2
+
+    def test_events_window_is_bounded(self):
+        """Test that the in-memory event list is capped at max_events."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            brain = Brain(data_dir=Path(tmpdir), max_events=3)
+            events = [
+                LogEvent(timestamp=datetime.now().isoformat(), source="system",
+                         category="journald", level="error", message=f"e{i}")
+                for i in range(5)
+            ]
+            with patch.object(SystemCollector, "collect", return_value=events), \
+                 patch.object(AppCollector, "collect", return_value=[]), \
+                 patch.object(ClaudeCollector, "collect", return_value=[]):
+                stats = brain.ingest_all()
+
+            assert stats["total"] == 5
+            assert [e.message for e in brain.events] == ["e2", "e3", "e4"]
+
+            brain2 = Brain(data_dir=Path(tmpdir), max_events=3)
+            brain2._load_events()
+            assert len(brain2.events) == 3
+
+    def test_non_incremental_mode(self):
+        """Test that incremental=False keeps full re-reads."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            brain = Brain(data_dir=Path(tmpdir), incremental=False)
+            assert brain.tailer is None
+            assert brain.app_collector.tailer is None
+
+
 # =============================================================================
 # Integration Tests
 # =============================================================================
@@ -0,0 +1,154 @@
+"""
+Unit tests for skippy_file_reader module.
+
+Tests cover:
+- LineOffsetIndex checkpoints and line counting
+- Line index cache keyed by (path, mtime, size)
+- iter_lines / read_lines paging
+- read_byte_range
+"""
+
+import os
+import pytest
+
+from skippy_file_reader import (
+    LineOffsetIndex,
+    get_line_index,
+    clear_line_index_cache,
+    iter_lines,
+    read_lines,
+    read_byte_range,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Isolate the module-level line index cache."""
+    clear_line_index_cache()
+    yield
+    clear_line_index_cache()
+
+
+@pytest.fixture
+def numbered_file(temp_dir):
+    """File with 1000 numbered lines."""
+    path = temp_dir / "numbered.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    return path
+
+
+class TestLineOffsetIndex:
+    """Tests for LineOffsetIndex class."""
+
+    def test_checkpoints_point_at_line_starts(self, numbered_file):
+        """Test every checkpoint offset is the start of its line."""
+        index = LineOffsetIndex(str(numbered_file), numbered_file.stat().st_size, block_size=64)
+        index.locate(999)
+
+        data = numbered_file.read_bytes()
+        assert index.checkpoints > 10
+        for line, offset in zip(index.lines, index.offsets):
+            assert data[offset:].startswith(f"line {line}\n".encode())
+
+    def test_built_lazily(self, numbered_file):
+        """Test the index only scans as deep as requested."""
+        index = LineOffsetIndex(str(numbered_file), numbered_file.stat().st_size, block_size=64)
+        index.locate(50)
+        shallow = index.checkpoints
+        index.locate(900)
+        assert index.checkpoints > shallow
+        assert not index.complete
+
+    def test_locate_returns_checkpoint_before_target(self, numbered_file):
+        """Test locate never overshoots the requested line."""
+        index = LineOffsetIndex(str(numbered_file), numbered_file.stat().st_size, block_size=64)
+        for target in (0, 7, 500, 999, 5000):
+            line, _ = index.locate(target)
+            assert line <= target
+
+    def test_line_count(self, temp_dir):
+        """Test line counting with and without trailing newline."""
+        with_newline = temp_dir / "a.txt"
+        with_newline.write_text("a\nb\nc\n")
+        without_newline = temp_dir / "b.txt"
+        without_newline.write_text("a\nb\nc")
+        empty = temp_dir / "c.txt"
+        empty.write_text("")
+
+        assert LineOffsetIndex(str(with_newline), 6, block_size=2).line_count() == 3
+        assert LineOffsetIndex(str(without_newline), 5, block_size=2).line_count() == 3
+        assert LineOffsetIndex(str(empty), 0).line_count() == 0
+
+
+class TestLineIndexCache:
+    """Tests for get_line_index caching."""
+
+    def test_cached_per_file_version(self, numbered_file):
+        """Test the same index is reused until the file changes."""
+        first = get_line_index(str(numbered_file))
+        assert get_line_index(str(numbered_file)) is first
+
+        with open(numbered_file, "a") as f:
+            f.write("line 1000\n")
+        st = numbered_file.stat()
+        os.utime(numbered_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert get_line_index(str(numbered_file)) is not first
+
+
+class TestReaders:
+    """Tests for line and byte readers."""
+
+    def test_matches_readlines_slicing(self, numbered_file):
+        """Test paging matches the old readlines() slicing behaviour."""
+        lines = numbered_file.read_text().splitlines(keepends=True)
+        for start, count in [(0, -1), (0, 5), (10, 3), (998, 10), (1000, 5), (-3, -1), (-2, 1)]:
+            expected = lines[start:] if count == -1 else lines[start:start + count]
+            assert read_lines(str(numbered_file), start, count) == "".join(expected)
+
+    def test_deep_page_with_small_blocks(self, numbered_file):
+        """Test deep pages are correct when seeking through many checkpoints."""
+        # Pre-seed the cache with a fine-grained index that read_lines will reuse
+        index = get_line_index(str(numbered_file), block_size=100)
+        assert read_lines(str(numbered_file), 777, 2) == "line 777\nline 778\n"
+        assert index.checkpoints > 50
+
+    def test_iter_lines_is_lazy(self, numbered_file):
+        """Test iter_lines yields without reading the rest of the file."""
+        gen = iter_lines(str(numbered_file), 5)
+        assert next(gen) == "line 5\n"
+        gen.close()
+
+    def test_crlf_normalized(self, temp_dir):
+        """Test Windows line endings are normalized like text mode."""
+        path = temp_dir / "crlf.txt"
+        path.write_bytes(b"one\r\ntwo\r\nthree")
+        assert read_lines(str(path), 1) == "two\nthree"
+
+    def test_bare_cr_normalized(self, temp_dir):
+        """Test bare carriage returns become newlines like text mode."""
+        path = temp_dir / "cr.txt"
+        path.write_bytes(b"one\rtwo\r\nthree\r")
+        with open(path, 'r', encoding='utf-8') as f:
+            expected = f.read()
+        assert read_lines(str(path)) == expected
+
+    def test_zero_lines(self, numbered_file):
+        """Test num_lines=0 returns nothing."""
+        assert read_lines(str(numbered_file), 10, 0) == ""
+
+    def test_invalid_utf8_raises(self, temp_dir):
+        """Test undecodable text still raises like the old reader."""
+        path = temp_dir / "bad.txt"
+        path.write_bytes(b"ok\n\xff\xfe\n")
+        with pytest.raises(UnicodeDecodeError):
+            read_lines(str(path))
+
+    def test_read_byte_range(self, temp_dir):
+        """Test byte ranges, including negative offsets and binary data."""
+        path = temp_dir / "data.bin"
+        path.write_bytes(bytes(range(256)))
+
+        assert read_byte_range(str(path), 10, 4) == bytes([10, 11, 12, 13])
+        assert read_byte_range(str(path), -2, 10) == bytes([254, 255])
+        assert read_byte_range(str(path), 300, 10) == b""
@@ -3,6 +3,7 @@ Unit tests for skippy_performance module.
 
 Tests cover:
 - PerformanceMetrics class
+- LatencyHistogram class
 - PerformanceMonitor class
 - Global convenience functions
 - monitor_performance decorator
@@ -19,6 +20,7 @@ from unittest.mock import patch, MagicMock, PropertyMock
 
 from skippy_performance import (
     PerformanceMetrics,
+    LatencyHistogram,
     PerformanceMonitor,
     SystemMonitor,
     monitor_performance,
@@ -189,6 +191,56 @@ class TestPerformanceMetrics:
         assert "0.00 B" in result
 
 
+# =============================================================================
+# LATENCY HISTOGRAM TESTS
+# =============================================================================
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram class."""
+
+    def test_empty(self):
+        """Test an empty histogram reports zeros."""
+        hist = LatencyHistogram()
+        assert hist.count == 0
+        assert hist.percentile(99) == 0.0
+        assert hist.to_dict()["buckets"] == {}
+
+    def test_bucket_bounds_round_trip(self):
+        """Test every bucket's bounds map back to that bucket."""
+        for index in range(LatencyHistogram.NUM_BUCKETS):
+            lower, upper = LatencyHistogram._bucket_bounds(index)
+            assert LatencyHistogram._bucket_index(lower) == index
+            assert LatencyHistogram._bucket_index(upper - 1) == index
+
+    def test_percentiles_within_relative_error(self):
+        """Test percentiles are within bucket precision of exact values."""
+        hist = LatencyHistogram()
+        values = [i / 10000 for i in range(1, 10001)]  # 0.1ms .. 1s
+        for v in values:
+            hist.record(v)
+
+        for pct in (50, 95, 99):
+            exact = values[int(len(values) * pct / 100) - 1]
+            assert hist.percentile(pct) == pytest.approx(exact, rel=0.04)
+
+    def test_min_max_exact(self):
+        """Test min, max and total are tracked exactly."""
+        hist = LatencyHistogram()
+        for v in (0.5, 0.001, 2.0):
+            hist.record(v)
+        assert hist.min == 0.001
+        assert hist.max == 2.0
+        assert hist.total == pytest.approx(2.501)
+        assert hist.percentile(100) == 2.0
+
+    def test_fixed_memory(self):
+        """Test huge durations are clamped into the last bucket."""
+        hist = LatencyHistogram()
+        hist.record(10 ** 6)
+        assert len(hist.counts) == LatencyHistogram.NUM_BUCKETS
+        assert hist.counts[-1] == 1
+
+
 # =============================================================================
 # PERFORMANCE MONITOR TESTS
 # =============================================================================
@@ -417,6 +469,72 @@ class TestPerformanceMonitor:
             # Should still return metrics with duration
             assert result.duration is not None
 
+    def test_summary_percentiles(self):
+        """Test get_summary reports latency percentiles."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monitor_instance = PerformanceMonitor(metrics_dir=tmpdir, mode="sampling", sample_rate=0)
+            for i in range(1, 101):
+                monitor_instance.record_duration("pct_test", i / 1000)
+
+            duration = monitor_instance.get_summary("pct_test")["duration"]
+            assert duration["p50"] == pytest.approx(0.050, rel=0.04)
+            assert duration["p95"] == pytest.approx(0.095, rel=0.04)
+            assert duration["p99"] == pytest.approx(0.099, rel=0.04)
+
+    def test_sampling_mode_skips_files_and_psutil(self):
+        """Test unsampled calls only update the histogram."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monitor_instance = PerformanceMonitor(metrics_dir=tmpdir, mode="sampling", sample_rate=0)
+
+            with patch.object(monitor_instance.process, 'cpu_percent') as cpu:
+                for _ in range(20):
+                    with monitor_instance.monitor("sampled_op") as metrics:
+                        pass
+            cpu.assert_not_called()
+
+            assert metrics.duration is not None
+            assert list(Path(tmpdir).iterdir()) == []
+            assert monitor_instance.metrics_history == {}
+            assert monitor_instance.get_summary("sampled_op")["total_executions"] == 20
+
+    def test_sampling_mode_samples_some_calls(self):
+        """Test sampled calls capture resources without per-call files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monitor_instance = PerformanceMonitor(metrics_dir=tmpdir, mode="sampling", sample_rate=1.0)
+            with monitor_instance.monitor("always_sampled") as metrics:
+                pass
+
+            assert metrics.memory_end is not None
+            assert len(monitor_instance.metrics_history["always_sampled"]) == 1
+            assert list(Path(tmpdir).glob("always_sampled_*.json")) == []
+
+    def test_history_bounded(self):
+        """Test per-operation history is capped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monitor_instance = PerformanceMonitor(metrics_dir=tmpdir, mode="sampling",
+                                                  sample_rate=1.0, history_size=3)
+            for _ in range(10):
+                with monitor_instance.monitor("bounded"):
+                    pass
+
+            assert len(monitor_instance.metrics_history["bounded"]) == 3
+            assert monitor_instance.get_summary("bounded")["total_executions"] == 10
+
+    def test_periodic_snapshot(self):
+        """Test histograms are written to one snapshot file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            monitor_instance = PerformanceMonitor(metrics_dir=tmpdir, mode="sampling",
+                                                  sample_rate=0, snapshot_interval=0)
+            monitor_instance.record_duration("snap_a", 0.01)
+            monitor_instance.record_duration("snap_b", 0.02)
+
+            files = list(Path(tmpdir).iterdir())
+            assert [f.name for f in files] == ["performance_snapshot.json"]
+            with open(files[0]) as f:
+                data = json.load(f)
+            assert set(data["operations"]) == {"snap_a", "snap_b"}
+            assert data["operations"]["snap_b"]["count"] == 1
+
 
 # =============================================================================
 # DECORATOR TESTS
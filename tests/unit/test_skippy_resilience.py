@@ -10,6 +10,7 @@ Tests cover:
 - CircuitState enum
 - CircuitBreakerOpenError exception
 - RateLimiter
+- AsyncRateLimiter and AsyncCircuitBreaker
 - safe_json_parse and safe_json_dumps
 - HealthChecker and HealthCheckResult
 - Global circuit breaker registry
@@ -18,6 +19,7 @@ Tests cover:
 import pytest
 import time
 import json
+import asyncio
 import threading
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
@@ -41,6 +43,8 @@ from skippy_resilience import (
     CircuitBreakerOpenError,
     # Rate limiter
     RateLimiter,
+    AsyncRateLimiter,
+    AsyncCircuitBreaker,
     # JSON utilities
     safe_json_parse,
     safe_json_dumps,
@@ -49,6 +53,7 @@ from skippy_resilience import (
     HealthChecker,
     # Registry
     get_circuit_breaker,
+    get_async_circuit_breaker,
     get_all_circuit_breaker_states,
     _circuit_breakers,
 )
@@ -778,6 +783,209 @@ class TestRateLimiter:
         assert documented.__doc__ == "Documentation here."
 
 
+# =============================================================================
+# AsyncRateLimiter Tests
+# =============================================================================
+
+class TestAsyncRateLimiter:
+    """Tests for AsyncRateLimiter class."""
+
+    def test_burst_is_immediate(self):
+        """Test calls within capacity don't wait."""
+        limiter = AsyncRateLimiter(max_calls=3, period=60.0)
+
+        async def run():
+            start = time.monotonic()
+            for _ in range(3):
+                await limiter.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) < 0.05
+        assert limiter.get_remaining_calls() == 0
+
+    def test_waits_for_refill(self):
+        """Test call beyond capacity waits for a token."""
+        limiter = AsyncRateLimiter(max_calls=2, period=0.2)  # one token per 0.1s
+
+        async def run():
+            await limiter.acquire()
+            await limiter.acquire()
+            start = time.monotonic()
+            await limiter.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.08
+
+    def test_fifo_order(self):
+        """Test throttled callers are released in arrival order."""
+        limiter = AsyncRateLimiter(max_calls=1, period=0.02)
+        order = []
+
+        async def worker(i):
+            await limiter.acquire()
+            order.append(i)
+
+        async def run():
+            await asyncio.gather(*(worker(i) for i in range(6)))
+
+        asyncio.run(run())
+        assert order == list(range(6))
+
+    def test_does_not_block_event_loop(self):
+        """Test other coroutines keep running while a caller is throttled."""
+        limiter = AsyncRateLimiter(max_calls=1, period=0.3)
+        ticks = []
+
+        async def ticker():
+            for _ in range(10):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await limiter.acquire()
+            await asyncio.gather(limiter.acquire(), ticker())
+
+        asyncio.run(run())
+        gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+        assert max(gaps) < 0.1
+
+    def test_cancelled_waiter_refunds_token(self):
+        """Test cancelling a throttled caller gives its reservation back."""
+        limiter = AsyncRateLimiter(max_calls=1, period=10.0)
+
+        async def run():
+            await limiter.acquire()
+            task = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0.01)
+            assert limiter.get_stats()["waiting"] == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        stats = limiter.get_stats()
+        assert stats["waiting"] == 0
+        assert stats["total_acquired"] == 1
+        # Back to an empty bucket rather than owing a second token
+        assert stats["available_tokens"] < 0.01
+
+    def test_try_acquire(self):
+        """Test non-waiting acquisition."""
+        limiter = AsyncRateLimiter(max_calls=1, period=60.0)
+        assert limiter.try_acquire() is True
+        assert limiter.try_acquire() is False
+
+    def test_decorator(self):
+        """Test decorator form preserves metadata and result."""
+        limiter = AsyncRateLimiter(max_calls=5, period=60.0)
+
+        @limiter
+        async def fetch():
+            """Fetch something."""
+            return 42
+
+        assert fetch.__name__ == "fetch"
+        assert asyncio.run(fetch()) == 42
+        assert limiter.get_remaining_calls() == 4
+
+
+# =============================================================================
+# AsyncCircuitBreaker Tests
+# =============================================================================
+
+class TestAsyncCircuitBreaker:
+    """Tests for AsyncCircuitBreaker class."""
+
+    def test_success_passes_through(self):
+        """Test successful calls return their result."""
+        cb = AsyncCircuitBreaker("async-ok")
+
+        async def ok():
+            return "done"
+
+        assert asyncio.run(cb.call(ok)) == "done"
+        assert cb.state == CircuitState.CLOSED
+
+    def test_opens_after_failures(self):
+        """Test circuit opens after failure threshold."""
+        cb = AsyncCircuitBreaker("async-fail", CircuitBreakerConfig(failure_threshold=2, timeout=60))
+
+        async def boom():
+            raise ConnectionError("down")
+
+        async def run():
+            for _ in range(2):
+                with pytest.raises(ConnectionError):
+                    await cb.call(boom)
+            with pytest.raises(CircuitBreakerOpenError):
+                await cb.call(boom)
+
+        asyncio.run(run())
+        assert cb.state == CircuitState.OPEN
+
+    def test_excluded_exceptions_not_counted(self):
+        """Test excluded exceptions don't trip the circuit."""
+        cb = AsyncCircuitBreaker(
+            "async-excluded",
+            CircuitBreakerConfig(failure_threshold=1, excluded_exceptions=(ValueError,))
+        )
+
+        async def bad_input():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            asyncio.run(cb.call(bad_input))
+        assert cb.state == CircuitState.CLOSED
+
+    def test_half_open_admits_one_trial_at_a_time(self):
+        """Test concurrent coroutines can't flood a half-open circuit."""
+        cb = AsyncCircuitBreaker(
+            "async-half-open",
+            CircuitBreakerConfig(failure_threshold=1, success_threshold=2, timeout=0.01)
+        )
+        cb._on_failure()
+        time.sleep(0.02)
+
+        async def slow_ok():
+            await asyncio.sleep(0.05)
+            return True
+
+        async def run():
+            return await asyncio.gather(cb.call(slow_ok), cb.call(slow_ok), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert results[0] is True
+        assert isinstance(results[1], CircuitBreakerOpenError)
+
+        # Slot released: the next trial completes recovery
+        assert asyncio.run(cb.call(slow_ok)) is True
+        assert cb.state == CircuitState.CLOSED
+
+    def test_decorator(self):
+        """Test decorator form."""
+        cb = AsyncCircuitBreaker("async-decorated")
+
+        @cb
+        async def documented():
+            """Docs."""
+            return 1
+
+        assert documented.__doc__ == "Docs."
+        assert asyncio.run(documented()) == 1
+
+    def test_registry(self):
+        """Test async breakers share the global registry."""
+        _circuit_breakers.pop("async-registry", None)
+        get_circuit_breaker("async-registry", CircuitBreakerConfig(failure_threshold=7))
+
+        cb = get_async_circuit_breaker("async-registry")
+        assert isinstance(cb, AsyncCircuitBreaker)
+        assert cb.config.failure_threshold == 7
+        assert get_async_circuit_breaker("async-registry") is cb
+        assert "async-registry" in get_all_circuit_breaker_states()
+        _circuit_breakers.pop("async-registry", None)
+
+
 # =============================================================================
 # safe_json_parse Tests
 # =============================================================================
@@ -5,8 +5,10 @@ Tests cover:
 - RequestTrace dataclass
 - RequestTracer class
 - MetricsPersistence class
+- TimeSeriesStore class
 - CacheEntry dataclass
 - GracefulCache class
+- DiskCacheTier class
 - AlertLevel and Alert classes
 - AlertManager class
 - Alert handler factory functions
@@ -15,6 +17,7 @@ Tests cover:
 
 import pytest
 import json
+import pickle
 import time
 import tempfile
 import threading
@@ -26,8 +29,10 @@ from skippy_resilience_advanced import (
     RequestTrace,
     RequestTracer,
     MetricsPersistence,
+    TimeSeriesStore,
     CacheEntry,
     GracefulCache,
+    DiskCacheTier,
     AlertLevel,
     Alert,
     AlertManager,
@@ -345,6 +350,7 @@ class TestMetricsPersistence:
                 "state": "open",
                 "failure_count": 5
             })
+            persistence.flush()
 
             cb_file = Path(tmpdir) / "circuit_breakers.json"
             assert cb_file.exists()
@@ -383,6 +389,7 @@ class TestMetricsPersistence:
                 {"request_id": "2", "service": "svc", "operation": "op2"}
             ]
             persistence.save_request_traces(traces)
+            persistence.flush()
 
             # Check file exists
             trace_files = list(Path(tmpdir).glob("traces_*.jsonl"))
@@ -401,8 +408,9 @@ class TestMetricsPersistence:
                 "status": "healthy",
                 "cpu_percent": 25.0
             })
+            persistence.flush()
 
-            snapshot_files = list(Path(tmpdir).glob("health_*.json"))
+            snapshot_files = list(Path(tmpdir).glob("health_*.jsonl"))
             assert len(snapshot_files) == 1
 
     def test_save_alert(self):
@@ -414,8 +422,9 @@ class TestMetricsPersistence:
                 "title": "Test Alert",
                 "message": "Test message"
             })
+            persistence.flush()
 
-            alerts_file = Path(tmpdir) / "alerts.jsonl"
+            alerts_file = Path(tmpdir) / f"alerts_{datetime.now().strftime('%Y%m%d')}.jsonl"
             assert alerts_file.exists()
 
             with open(alerts_file) as f:
@@ -569,6 +578,150 @@ class TestMetricsPersistence:
                 summary = persistence.get_metrics_summary()
                 assert "error" in summary
 
+    def test_writes_are_buffered(self):
+        """Test saves are held in memory until flushed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persistence = MetricsPersistence(tmpdir, flush_interval=60)
+            persistence.save_alert({"title": "buffered"})
+            persistence.save_request_traces([{"request_id": "1"}])
+
+            assert list(Path(tmpdir).iterdir()) == []
+            assert persistence.flush() == 2
+            assert len(list(Path(tmpdir).glob("*.jsonl"))) == 2
+            persistence.close()
+
+    def test_circuit_breaker_writes_coalesced(self):
+        """Test many state changes produce one file write per flush."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persistence = MetricsPersistence(tmpdir, flush_interval=60)
+            with patch.object(persistence, "_write_circuit_breaker_states",
+                              wraps=persistence._write_circuit_breaker_states) as write:
+                for i in range(50):
+                    persistence.save_circuit_breaker_state("cb", {"failure_count": i})
+                persistence.flush()
+                persistence.flush()
+
+            assert write.call_count == 1
+            with open(Path(tmpdir) / "circuit_breakers.json") as f:
+                assert json.load(f)["cb"]["failure_count"] == 49
+            persistence.close()
+
+    def test_synchronous_mode(self):
+        """Test flush_interval=0 writes on every save."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persistence = MetricsPersistence(tmpdir, flush_interval=0)
+            persistence.save_circuit_breaker_state("cb", {"state": "open"})
+            assert (Path(tmpdir) / "circuit_breakers.json").exists()
+
+    def test_background_flush(self):
+        """Test the writer thread flushes without an explicit call."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persistence = MetricsPersistence(tmpdir, flush_interval=0.05)
+            persistence.save_alert({"title": "background"})
+
+            deadline = time.time() + 2
+            while not list(Path(tmpdir).glob("alerts_*.jsonl")) and time.time() < deadline:
+                time.sleep(0.02)
+            assert list(Path(tmpdir).glob("alerts_*.jsonl"))
+            persistence.close()
+
+    def test_get_recent_traces_by_service(self):
+        """Test trace queries filter by service."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persistence = MetricsPersistence(tmpdir, flush_interval=60)
+            now = datetime.now().isoformat()
+            persistence.save_request_traces([
+                {"request_id": "1", "service": "github", "start_time": now},
+                {"request_id": "2", "service": "drive", "start_time": now},
+            ])
+
+            assert [t["request_id"] for t in persistence.get_recent_traces(service="drive")] == ["2"]
+            assert len(persistence.get_recent_traces()) == 2
+            persistence.close()
+
+    def test_get_recent_health_snapshots(self):
+        """Test health snapshots are queryable."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            persistence = MetricsPersistence(tmpdir, flush_interval=60)
+            persistence.save_health_snapshot({"status": "healthy"})
+
+            snapshots = persistence.get_recent_health_snapshots(hours=1)
+            assert len(snapshots) == 1
+            assert snapshots[0]["status"] == "healthy"
+            persistence.close()
+
+    def test_legacy_alerts_file_still_read(self):
+        """Test alerts written before segmenting are still returned."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            legacy = Path(tmpdir) / "alerts.jsonl"
+            legacy.write_text(json.dumps({"title": "old", "timestamp": datetime.now().isoformat()}) + "\n")
+
+            persistence = MetricsPersistence(tmpdir, flush_interval=60)
+            persistence.save_alert({"title": "new"})
+
+            titles = [a["title"] for a in persistence.get_recent_alerts(hours=1)]
+            assert titles == ["old", "new"]
+            persistence.close()
+
+
+class TestTimeSeriesStore:
+    """Tests for TimeSeriesStore class."""
+
+    def test_query_filters_by_time(self, temp_dir):
+        """Test only records inside the window are returned."""
+        store = TimeSeriesStore(temp_dir, "events", index_every=2)
+        base = datetime.now() - timedelta(minutes=30)
+        store.append_many([
+            (base + timedelta(minutes=i), {"i": i, "timestamp": (base + timedelta(minutes=i)).isoformat()})
+            for i in range(10)
+        ])
+
+        since = base + timedelta(minutes=4, seconds=30)
+        assert [r["i"] for r in store.query(since)] == [5, 6, 7, 8, 9]
+
+    def test_query_seeks_with_index(self, temp_dir):
+        """Test the timestamp index skips records before the window."""
+        store = TimeSeriesStore(temp_dir, "events", index_every=10)
+        base = datetime.now() - timedelta(minutes=30)
+        store.append_many([
+            (base + timedelta(seconds=i), {"i": i, "timestamp": (base + timedelta(seconds=i)).isoformat()})
+            for i in range(100)
+        ])
+
+        since = base + timedelta(seconds=55)
+        offset = store._seek_offset(store.segment_path(base), since)
+        data = store.segment_path(base).read_bytes()
+        assert json.loads(data[offset:].split(b"\n")[0])["i"] == 50
+        assert [r["i"] for r in store.query(since)][0] == 56
+
+    def test_records_partitioned_by_day(self, temp_dir):
+        """Test records land in their day's segment and queries span days."""
+        store = TimeSeriesStore(temp_dir, "events")
+        yesterday = datetime.now() - timedelta(days=1)
+        today = datetime.now() - timedelta(seconds=1)
+        store.append_many([
+            (yesterday, {"day": "yesterday", "timestamp": yesterday.isoformat()}),
+            (today, {"day": "today", "timestamp": today.isoformat()}),
+        ])
+
+        assert store.segment_path(yesterday).exists()
+        assert store.segment_path(today).exists()
+        assert store.segment_path(yesterday) != store.segment_path(today)
+        days = [r["day"] for r in store.query(yesterday - timedelta(minutes=1))]
+        assert days == ["yesterday", "today"]
+
+    def test_prune(self, temp_dir):
+        """Test old segments and their indexes are deleted."""
+        store = TimeSeriesStore(temp_dir, "events")
+        old = datetime.now() - timedelta(days=10)
+        store.append_many([(old, {"timestamp": old.isoformat()})])
+        store.append_many([(datetime.now(), {"timestamp": datetime.now().isoformat()})])
+
+        assert store.prune(keep_days=3) == 1
+        assert not store.segment_path(old).exists()
+        assert not store.segment_path(old).with_suffix(".idx").exists()
+        assert store.segment_path(datetime.now()).exists()
+
 
 # =============================================================================
 # CACHE ENTRY TESTS
@@ -833,6 +986,350 @@ class TestGracefulCache:
         # Cache still empty
         assert len(cache.cache) == 0
 
+    def test_eviction_is_lru(self):
+        """Test recently read entries survive eviction."""
+        cache = GracefulCache(max_entries=3)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key3", "value3")
+
+        cache.get("key1")  # key2 is now least recently used
+        cache.set("key4", "value4")
+
+        assert cache.get("key1") == "value1"
+        assert cache.get("key2") is None
+        assert cache.get_statistics()["evictions"] == 1
+
+    def test_overwrite_does_not_evict(self):
+        """Test overwriting an existing key at capacity keeps other entries."""
+        cache = GracefulCache(max_entries=2)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key1", "updated")
+
+        assert cache.get("key1") == "updated"
+        assert cache.get("key2") == "value2"
+        assert cache.get_statistics()["evictions"] == 0
+
+    def test_max_bytes_budget(self):
+        """Test entries are evicted to stay within the byte budget."""
+        cache = GracefulCache(max_entries=100, max_bytes=3000)
+        for i in range(10):
+            cache.set(f"key{i}", "x" * 1000)
+
+        stats = cache.get_statistics()
+        assert stats["total_bytes"] <= 3000
+        assert stats["total_entries"] < 10
+        assert cache.get("key9") == "x" * 1000
+
+    def test_byte_accounting(self):
+        """Test total_bytes tracks sets, overwrites and removals."""
+        cache = GracefulCache()
+        cache.set("key1", "x" * 500)
+        cache.set("key2", "y" * 500)
+        both = cache.get_statistics()["total_bytes"]
+        assert both >= 1000
+
+        cache.set("key1", "x")
+        cache.invalidate("key2")
+        assert cache.get_statistics()["total_bytes"] < both / 10
+
+        cache.clear()
+        assert cache.get_statistics()["total_bytes"] == 0
+
+    def test_hit_miss_counters(self):
+        """Test hit, miss and hit-rate statistics."""
+        cache = GracefulCache()
+        cache.set("key1", "value1")
+        cache.get("key1")
+        cache.get("key1")
+        cache.get("missing")
+
+        stats = cache.get_statistics()
+        assert stats["total_hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(200 / 3)
+
+    def test_stale_hits_counted(self):
+        """Test stale reads are counted and expired reads are misses."""
+        cache = GracefulCache(default_ttl=1)
+        cache.set("key1", "value1")
+        time.sleep(1.1)
+
+        assert cache.get("key1", allow_stale=True) == "value1"
+        assert cache.get("key1") is None
+
+        stats = cache.get_statistics()
+        assert stats["stale_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["expirations"] == 1
+
+    def test_refreshed_entry_not_stale(self):
+        """Test re-setting an expired key clears its stale state."""
+        cache = GracefulCache(default_ttl=1)
+        cache.set("key1", "value1")
+        time.sleep(1.1)
+        assert cache.get_statistics()["stale_entries"] == 1
+
+        cache.set("key1", "value2", ttl=3600)
+        assert cache.get_statistics()["stale_entries"] == 0
+        assert cache.cleanup_expired() == 0
+
+    def test_invalidate_prefix(self):
+        """Test prefix invalidation only removes matching keys."""
+        cache = GracefulCache()
+        cache.set("github:repos:a", 1)
+        cache.set("github:repos:b", 2)
+        cache.set("github:issues:a", 3)
+        cache.set("drive:repos:a", 4)
+
+        assert cache.invalidate_prefix("github:repos:") == 2
+        assert cache.get("github:repos:a") is None
+        assert cache.get("github:issues:a") == 3
+        assert cache.get("drive:repos:a") == 4
+        assert cache.invalidate_prefix("nothing:") == 0
+
+    def test_invalidate_prefix_nested_keys(self):
+        """Test a key that is a prefix of another key is handled."""
+        cache = GracefulCache()
+        cache.set("ab", 1)
+        cache.set("abc", 2)
+
+        cache.invalidate("abc")
+        assert cache.invalidate_prefix("a") == 1
+        assert len(cache.cache) == 0
+
+    def test_key_index_counted_in_byte_budget(self):
+        """Test the key index is charged against max_bytes."""
+        cache = GracefulCache(max_entries=1000, max_bytes=2000)
+        for i in range(500):
+            cache.set(f"k{i:03d}", 0)
+
+        stats = cache.get_statistics()
+        entry_bytes = sum(e.size_bytes for e in cache.cache.values())
+        assert stats["total_bytes"] > entry_bytes
+        assert stats["total_bytes"] <= 2000
+
+        expected = sorted(k for k in cache.cache if k.startswith("k49"))
+        assert expected
+        assert cache.invalidate_prefix("k49") == len(expected)
+        assert not any(k.startswith("k49") for k in cache.cache)
+
+    def test_invalidate_pattern_returns_count(self):
+        """Test invalidate_pattern returns the number of removed entries."""
+        cache = GracefulCache()
+        cache.set("svc:user:1", 1)
+        cache.set("svc:user:2", 2)
+        cache.set("svc:group:1", 3)
+
+        assert cache.invalidate_pattern("user") == 2
+
+
+# =============================================================================
+# DISK CACHE TIER TESTS
+# =============================================================================
+
+@pytest.fixture
+def disk_tier(temp_dir):
+    """Disk tier in a temporary directory."""
+    tier = DiskCacheTier(str(temp_dir / "cache.db"))
+    yield tier
+    tier.close()
+
+
+class TestDiskCacheTier:
+    """Tests for DiskCacheTier class."""
+
+    def test_put_and_get(self, disk_tier):
+        """Test entries round-trip with their metadata."""
+        entry = CacheEntry(
+            key="github:repos", value={"repos": [1, 2]},
+            timestamp=datetime.now() - timedelta(seconds=10), ttl_seconds=60
+        )
+        assert disk_tier.put(entry) is True
+
+        loaded = disk_tier.get("github:repos")
+        assert loaded.value == {"repos": [1, 2]}
+        assert loaded.ttl_seconds == 60
+        assert abs((loaded.timestamp - entry.timestamp).total_seconds()) < 0.01
+        assert loaded.expires_at == pytest.approx(entry.timestamp.timestamp() + 60)
+        assert disk_tier.get("missing") is None
+
+    def test_unpicklable_value_skipped(self, disk_tier):
+        """Test values that can't be pickled are not stored."""
+        entry = CacheEntry(key="lock", value=threading.Lock(), timestamp=datetime.now(), ttl_seconds=60)
+        assert disk_tier.put(entry) is False
+        assert disk_tier.get("lock") is None
+
+    def test_delete_prefix_and_pattern(self, disk_tier):
+        """Test prefix and substring deletion."""
+        now = datetime.now()
+        disk_tier.put_many([
+            CacheEntry(key=k, value=1, timestamp=now, ttl_seconds=60)
+            for k in ("drive:a", "drive:b", "github:drive", "github:x")
+        ])
+
+        assert disk_tier.delete_prefix("drive:") == 2
+        assert disk_tier.delete_pattern("drive") == 1
+        assert disk_tier.get_statistics()["entries"] == 1
+
+    def test_compact_to_byte_budget(self, temp_dir):
+        """Test compaction drops least recently accessed entries."""
+        tier = DiskCacheTier(str(temp_dir / "small.db"), max_bytes=5000)
+        try:
+            now = datetime.now()
+            for i in range(10):
+                tier.put(CacheEntry(key=f"key{i}", value="x" * 1000, timestamp=now, ttl_seconds=60))
+            tier.get("key0")  # Recently accessed, should survive
+
+            removed = tier.compact()
+
+            stats = tier.get_statistics()
+            assert removed > 0
+            assert stats["total_bytes"] <= 5000
+            assert tier.get("key0") is not None
+            assert tier.get("key1") is None
+        finally:
+            tier.close()
+
+
+class TestGracefulCacheDiskTier:
+    """Tests for GracefulCache with a disk tier attached."""
+
+    def test_evicted_entries_spill_and_reload(self, disk_tier):
+        """Test evicted entries are served from disk on a miss."""
+        cache = GracefulCache(max_entries=2, disk_tier=disk_tier, flush_interval=0)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+        cache.set("key3", "value3")  # Evicts key1 to disk
+
+        assert "key1" not in cache.cache
+        assert cache.get("key1") == "value1"
+        assert "key1" in cache.cache
+
+        stats = cache.get_statistics()
+        assert stats["spills"] >= 1
+        assert stats["disk_hits"] == 1
+
+    def test_write_through_pickles_once(self, disk_tier):
+        """Test the pickle taken to size an entry is the one written to disk."""
+        cache = GracefulCache(disk_tier=disk_tier, flush_interval=0)
+        with patch("skippy_resilience_advanced.pickle.dumps", wraps=pickle.dumps) as dumps:
+            cache.set("key1", {"payload": list(range(100))})
+            assert cache.flush() == 1
+        assert dumps.call_count == 1
+        assert cache.cache["key1"].blob is None  # Not kept once written
+        assert disk_tier.get("key1").value == {"payload": list(range(100))}
+
+    def test_disk_writes_do_not_hold_cache_lock(self, disk_tier):
+        """Test memory hits proceed while a flush is writing to disk."""
+        cache = GracefulCache(disk_tier=disk_tier, flush_interval=0)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+
+        writing = threading.Event()
+        release = threading.Event()
+        original_put_many = disk_tier.put_many
+
+        def slow_put_many(entries):
+            writing.set()
+            release.wait(5)
+            return original_put_many(entries)
+
+        disk_tier.put_many = slow_put_many
+        flusher = threading.Thread(target=cache.flush)
+        flusher.start()
+        try:
+            assert writing.wait(5)
+            started = time.monotonic()
+            assert cache.get("key2") == "value2"
+            cache.set("key3", "value3")
+            assert time.monotonic() - started < 1.0
+        finally:
+            release.set()
+            flusher.join(5)
+
+    def test_invalidate_during_disk_read_is_not_resurrected(self, disk_tier):
+        """Test a loaded entry is not promoted after a concurrent invalidate."""
+        cache = GracefulCache(max_entries=1, disk_tier=disk_tier, flush_interval=0)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")  # Spills key1
+
+        original_get = disk_tier.get
+        invalidator = threading.Thread(target=cache.invalidate, args=("key1",))
+
+        def get_then_invalidate(key):
+            entry = original_get(key)
+            epoch = cache._epoch
+            invalidator.start()
+            while cache._epoch == epoch:
+                time.sleep(0.001)
+            return entry
+
+        disk_tier.get = get_then_invalidate
+        assert cache.get("key1") == "value1"
+        invalidator.join(5)
+        assert "key1" not in cache.cache
+        assert original_get("key1") is None
+
+    def test_survives_restart(self, temp_dir):
+        """Test a new cache on the same file serves stale fallbacks."""
+        db_path = str(temp_dir / "restart.db")
+        first = GracefulCache(disk_tier=DiskCacheTier(db_path), flush_interval=0)
+        first.set("drive:search:policy", ["doc1.pdf"], ttl=1)
+        first.close()
+
+        time.sleep(1.1)
+        second = GracefulCache(disk_tier=DiskCacheTier(db_path), flush_interval=0)
+        try:
+            assert second.get("drive:search:policy") is None
+            assert second.get("drive:search:policy", allow_stale=True) == ["doc1.pdf"]
+        finally:
+            second.close()
+
+    def test_flush_writes_dirty_entries_once(self, disk_tier):
+        """Test flush only writes entries changed since the last flush."""
+        cache = GracefulCache(disk_tier=disk_tier, flush_interval=0)
+        cache.set("key1", "value1")
+        cache.set("key2", "value2")
+
+        assert cache.flush() == 2
+        assert cache.flush() == 0
+        cache.set("key1", "updated")
+        assert cache.flush() == 1
+        assert disk_tier.get("key1").value == "updated"
+
+    def test_invalidation_reaches_disk(self, disk_tier):
+        """Test invalidated entries are not resurrected from disk."""
+        cache = GracefulCache(disk_tier=disk_tier, flush_interval=0)
+        for key in ("svc:a", "svc:b", "other:svc", "keep"):
+            cache.set(key, key)
+        cache.flush()
+
+        cache.invalidate("keep")
+        cache.invalidate_prefix("svc:")
+        cache.invalidate_pattern("svc")
+
+        assert disk_tier.get_statistics()["entries"] == 0
+        assert cache.get("svc:a", allow_stale=True) is None
+
+        cache.set("key", "value")
+        cache.flush()
+        cache.clear()
+        assert cache.get("key", allow_stale=True) is None
+
+    def test_background_maintenance(self, disk_tier):
+        """Test the maintenance thread flushes dirty entries."""
+        cache = GracefulCache(disk_tier=disk_tier, flush_interval=0.05)
+        try:
+            cache.set("key1", "value1")
+            deadline = time.time() + 2
+            while disk_tier.get_statistics()["entries"] == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            assert disk_tier.get_statistics()["entries"] == 1
+        finally:
+            cache.close()
+
 
 # =============================================================================
 # ALERT TESTS
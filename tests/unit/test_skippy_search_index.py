@@ -0,0 +1,200 @@
+"""
+Unit tests for skippy_search_index module.
+
+Tests cover:
+- Trigram extraction and regex literal analysis
+- ContentIndex incremental refresh
+- Candidate narrowing for substring and regex queries
+- Line matching and statistics
+"""
+
+import os
+import pytest
+
+from skippy_search_index import (
+    ContentIndex,
+    extract_trigrams,
+    required_literals,
+    query_trigrams,
+)
+
+
+@pytest.fixture
+def index(temp_dir):
+    """Content index stored outside the searched tree."""
+    idx = ContentIndex(str(temp_dir / "index" / "search.db"), refresh_interval=0)
+    yield idx
+    idx.close()
+
+
+@pytest.fixture
+def tree(temp_dir):
+    """Small directory tree to index."""
+    root = temp_dir / "tree"
+    (root / "sub").mkdir(parents=True)
+    (root / "backup.sh").write_text("#!/bin/bash\n# Nightly backup\nrsync -a src dst\n")
+    (root / "monitor.py").write_text("import psutil\nprint('cpu monitor')\n")
+    (root / "sub" / "deploy.py").write_text("def deploy():\n    return 'Backup first'\n")
+    (root / "blob.bin").write_bytes(b"\x00\x01\x02backup\xff")
+    return root
+
+
+class TestQueryAnalysis:
+    """Tests for trigram and literal extraction."""
+
+    def test_extract_trigrams(self):
+        """Test lowercase trigram extraction."""
+        assert extract_trigrams("Abcd") == {"abc", "bcd"}
+        assert extract_trigrams("ab") == set()
+
+    def test_required_literals_plain(self):
+        """Test literal runs split by regex metacharacters."""
+        assert required_literals(r"def\s+deploy") == ["def", "deploy"]
+
+    def test_required_literals_alternation_not_narrowed(self):
+        """Test alternation yields no required literals."""
+        assert required_literals("backup|deploy") == []
+
+    def test_required_literals_group(self):
+        """Test literals inside plain groups are required."""
+        assert "rsync" in required_literals(r"(rsync) -a\w+")
+
+    def test_required_literals_invalid_regex(self):
+        """Test invalid regex is not narrowed."""
+        assert required_literals("(unclosed") == []
+
+    def test_query_trigrams_short_query(self):
+        """Test queries shorter than a trigram are not narrowed."""
+        assert query_trigrams("ab") == set()
+
+    def test_query_trigrams_capped(self):
+        """Test long queries use a bounded trigram subset."""
+        assert len(query_trigrams("abcdefghijklmnopqrstuvwxyz" * 2)) <= 16
+
+
+class TestContentIndex:
+    """Tests for ContentIndex class."""
+
+    def test_refresh_indexes_files(self, index, tree):
+        """Test initial refresh indexes text and binary files."""
+        result = index.refresh(tree)
+        assert result["indexed"] == 4
+        assert result["removed"] == 0
+
+        stats = index.get_statistics()
+        assert stats["indexed_files"] == 3
+        assert stats["binary_files"] == 1
+
+    def test_refresh_is_incremental(self, index, tree):
+        """Test only changed files are re-read."""
+        index.refresh(tree)
+        result = index.refresh(tree)
+        assert result["indexed"] == 0
+        assert result["unchanged"] == 4
+
+        target = tree / "monitor.py"
+        target.write_text("import psutil\nprint('memory monitor')\n")
+        st = target.stat()
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        result = index.refresh(tree)
+        assert result["indexed"] == 1
+        assert result["unchanged"] == 3
+
+    def test_refresh_throttled(self, temp_dir, tree):
+        """Test automatic refreshes honour refresh_interval."""
+        idx = ContentIndex(str(temp_dir / "throttled.db"), refresh_interval=60)
+        try:
+            assert idx.refresh(tree)["skipped"] is False
+            assert idx.refresh(tree)["skipped"] is True
+            assert idx.refresh(tree, force=True)["skipped"] is False
+        finally:
+            idx.close()
+
+    def test_refresh_removes_deleted_files(self, index, tree):
+        """Test deleted files are dropped from the index."""
+        index.refresh(tree)
+        (tree / "backup.sh").unlink()
+
+        result = index.refresh(tree)
+        assert result["removed"] == 1
+        assert all(p.name != "backup.sh" for p in index.candidates(tree, "rsync"))
+
+    def test_candidates_substring(self, index, tree):
+        """Test substring narrowing."""
+        names = {p.name for p in index.candidates(tree, "backup")}
+        # Case-insensitive narrowing, binary files excluded
+        assert names == {"backup.sh", "deploy.py"}
+
+    def test_candidates_file_pattern(self, index, tree):
+        """Test glob filtering of candidates."""
+        names = {p.name for p in index.candidates(tree, "backup", file_pattern="*.py")}
+        assert names == {"deploy.py"}
+
+    def test_candidates_non_recursive(self, index, tree):
+        """Test non-recursive scope."""
+        names = {p.name for p in index.candidates(tree, "backup", recursive=False)}
+        assert names == {"backup.sh"}
+
+    def test_candidates_regex(self, index, tree):
+        """Test regex narrowing via required literals."""
+        names = {p.name for p in index.candidates(tree, r"print\('cpu", regex=True)}
+        assert names == {"monitor.py"}
+
+    def test_candidates_short_query_returns_all_text(self, index, tree):
+        """Test short queries return every text file."""
+        assert len(index.candidates(tree, "py")) == 3
+
+    def test_oversize_files_always_candidates(self, temp_dir, tree):
+        """Test oversize files bypass narrowing."""
+        idx = ContentIndex(str(temp_dir / "small.db"), max_file_size=64, refresh_interval=0)
+        try:
+            (tree / "big.log").write_text("x" * 100)
+            names = {p.name for p in idx.candidates(tree, "nowhere to be found")}
+            assert names == {"big.log"}
+        finally:
+            idx.close()
+
+    def test_rebuild(self, index, tree):
+        """Test full rebuild re-indexes everything."""
+        index.refresh(tree)
+        result = index.rebuild(tree)
+        assert result["indexed"] == 4
+
+    def test_index_persists(self, temp_dir, tree):
+        """Test index survives reopening."""
+        db_path = str(temp_dir / "persist.db")
+        first = ContentIndex(db_path)
+        first.refresh(tree)
+        first.close()
+
+        second = ContentIndex(db_path)
+        try:
+            assert second.refresh(tree)["unchanged"] == 4
+        finally:
+            second.close()
+
+    def test_iter_matching_lines(self, index, tree):
+        """Test verified line matches."""
+        hits = list(index.iter_matching_lines(tree, "Backup"))
+        assert [(p.name, n) for p, n, _ in hits] == [("deploy.py", 2)]
+
+        hits = list(index.iter_matching_lines(tree, "backup", ignore_case=True))
+        assert {p.name for p, _, _ in hits} == {"backup.sh", "deploy.py"}
+
+        hits = list(index.iter_matching_lines(tree, r"^def\s+\w+", regex=True))
+        assert [(p.name, n) for p, n, _ in hits] == [("deploy.py", 1)]
+
+    def test_statistics(self, index, tree):
+        """Test query and hit-rate statistics."""
+        list(index.iter_matching_lines(tree, "psutil"))
+
+        stats = index.get_statistics()
+        assert stats["queries"] == 1
+        assert stats["narrowed_queries"] == 1
+        assert stats["candidates"] == 1
+        assert stats["files_in_scope"] == 3
+        assert stats["verified_matches"] == 1
+        assert stats["hit_rate"] == 100
+        assert stats["skip_rate"] == pytest.approx(200 / 3)
+        assert stats["refreshes"] == 1